@@ -8,6 +8,12 @@ from .transition_penalty_checker import TransitionPenaltyChecker
 from .system_decision_engine import SystemDecisionEngine, DecisionBand
 from .calibration_tracker import CalibrationTracker
 from .system_confidence_calculator import SystemConfidenceCalculator
+from .batch_underwriting_engine import BatchUnderwritingEngine
+from .nine_pd import NinePDVector
+from .verbosity import Verbosity
+from .system_optimizer import SystemOptimizer
+from .threshold_sweep import ThresholdSweep
+from .sector_registry import SectorRegistry
 
 __version__ = "1.1.0-PTC-FINAL"
 __all__ = [
@@ -16,5 +22,11 @@ __all__ = [
     'SystemDecisionEngine',
     'DecisionBand',
     'CalibrationTracker',
-    'SystemConfidenceCalculator'
+    'SystemConfidenceCalculator',
+    'BatchUnderwritingEngine',
+    'NinePDVector',
+    'Verbosity',
+    'SystemOptimizer',
+    'ThresholdSweep',
+    'SectorRegistry'
 ]
@@ -1,18 +1,37 @@
 """
 a2_underwriting_router.py - Production Fix v3
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
+from uuid import UUID
 from pydantic import BaseModel, Field
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+import asyncio
+import hashlib
+import json
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 from .system_fit_aggregator import SystemFitAggregator
 from .transition_penalty_checker import TransitionPenaltyChecker
-from .system_decision_engine import SystemDecisionEngine, DecisionBand
+from .system_decision_engine import SystemDecisionEngine, DecisionBand, ReasonCode
 from .calibration_tracker import CalibrationTracker
 from .system_confidence_calculator import SystemConfidenceCalculator
+from .batch_underwriting_engine import BatchUnderwritingEngine
+from .system_optimizer import CandidatePool
+from .nine_pd import NINE_PD_DIMENSIONS, PLA_STAGES, NinePDVector, stage_matrix
+from .calibration_store import CalibrationEventWriter, asyncpg_dsn
+from .data_support_index import DataSupportIndex
+from .request_capture import UnderwritingCapture
+from .verbosity import Verbosity
+from .sector_registry import SectorRegistry, SectorSnapshot
+from . import batch_jobs
+from app.config import settings
+from app.services.job_executor import job_executor
+from app.utils.lru_cache import LRUCache
+from app.utils.ndjson import ndjson_stream, NDJSONStreamingResponse
 
 router = APIRouter(prefix="/v1/a2", tags=["A2 System Underwriting"])
 
@@ -26,11 +45,18 @@ class NinePDProfile(BaseModel):
     autonomy: float = Field(..., ge=0.0, le=1.0)
     resonance: float = Field(..., ge=0.0, le=1.0)
     ethics: float = Field(..., ge=0.0, le=1.0)
+    
+    def to_vector(self) -> NinePDVector:
+        return NinePDVector.from_mapping(self)
 
 class StageProfiles(BaseModel):
     image: NinePDProfile
     video: NinePDProfile
     landing_page: NinePDProfile
+    
+    def to_matrix(self) -> np.ndarray:
+        """(3, 9) in PLA_STAGES x NINE_PD_DIMENSIONS order."""
+        return stage_matrix(self.image, self.video, self.landing_page)
 
 class DataSupportInput(BaseModel):
     similarity: float = Field(default=0.80, ge=0.0, le=1.0)
@@ -60,17 +86,175 @@ class A2UnderwritingResponse(BaseModel):
     system_fit: float
     system_fit_raw: float
     system_confidence: float
-    confidence_breakdown: ConfidenceBreakdown
+    confidence_breakdown: Optional[ConfidenceBreakdown] = None
     transition_penalty_sum: float
     triggered_penalties: List[str]
-    decision_rationale: List[str]
+    reason_codes: List[str] = Field(default_factory=list)
+    decision_rationale: Optional[List[str]] = None
+    audit: Optional[Dict[str, Any]] = None
     calibration_event_id: Optional[str] = None
 
+class A2BatchUnderwritingRequest(BaseModel):
+    """N systems as arrays; stage axis is image/video/landing_page, 9PD axis follows NinePDProfile field order."""
+    brand_id: str
+    sector: str = Field(default="BEAUTY_SKINCARE")
+    stage_profiles: List[List[List[float]]] = Field(..., description="(N, 3, 9) stage 9PD profiles")
+    stage_fits: List[List[float]] = Field(..., description="(N, 3) stage fits")
+    stage_confidences: List[List[float]] = Field(..., description="(N, 3) stage confidences")
+    stage_gates_passed: List[List[bool]] = Field(..., description="(N, S) stage gate flags")
+    data_support: Optional[List[List[float]]] = Field(default=None, description="(N, 2) similarity, sample_count")
+    measurement_quality: Union[float, List[float]] = Field(default=0.85)
+
+class A2BatchUnderwritingResponse(BaseModel):
+    brand_id: str
+    count: int
+    results: List[A2UnderwritingResponse]
+
+class StageCandidate(BaseModel):
+    candidate_id: str
+    profile: NinePDProfile
+    fit: float = Field(..., ge=0.0, le=1.0)
+    confidence: float
+    gate_passed: bool = Field(default=True)
+
+class A2OptimizeRequest(BaseModel):
+    brand_id: str
+    sector: str = Field(default="BEAUTY_SKINCARE")
+    images: List[StageCandidate]
+    videos: List[StageCandidate]
+    landing_pages: List[StageCandidate]
+    top_k: int = Field(default=10, ge=1, le=1000)
+    require_gates_passed: bool = Field(default=True)
+    data_support: Optional[DataSupportInput] = Field(default=None)
+    measurement_quality: float = Field(default=0.85, ge=0.0, le=1.0)
+
+class OptimizedSystem(BaseModel):
+    image_id: str
+    video_id: str
+    landing_page_id: str
+    decision: str
+    system_fit: float
+    system_fit_raw: float
+    system_confidence: float
+    transition_penalty_sum: float
+    triggered_penalties: List[str]
+
+class A2OptimizeResponse(BaseModel):
+    brand_id: str
+    systems: List[OptimizedSystem]
+    systems_total: int
+    systems_eligible: int
+    systems_scored: int
+
+class PerformanceUpdate(BaseModel):
+    event_id: UUID
+    actual_performance_percentile: float = Field(..., ge=0.0, le=1.0)
+
+class CalibrationPerformanceRequest(BaseModel):
+    updates: List[PerformanceUpdate]
+
+class CalibrationPerformanceResponse(BaseModel):
+    updated: int
+    not_found: List[str]
+    trigger_counts: Dict[str, int]
+    triggered_events: List[Dict[str, Any]]
+
 aggregator = SystemFitAggregator()
 penalty_checker = TransitionPenaltyChecker()
 decision_engine = SystemDecisionEngine()
-calibration_tracker = CalibrationTracker()
+calibration_tracker = CalibrationTracker(max_events=settings.CALIBRATION_MEMORY_EVENTS)
 confidence_calculator = SystemConfidenceCalculator()
+batch_engine = BatchUnderwritingEngine(
+    aggregator=aggregator,
+    penalty_checker=penalty_checker,
+    confidence_calculator=confidence_calculator,
+    decision_engine=decision_engine
+)
+underwriting_cache = LRUCache(maxsize=settings.A2_CACHE_MAXSIZE, ttl=settings.A2_CACHE_TTL)
+request_capture: Optional[UnderwritingCapture] = None
+# k-NN over profiles with backfilled outcomes; supplies data_support when a request omits it.
+# Seeded from stored profiles at startup (start_calibration_persistence)
+data_support_index: Optional[DataSupportIndex] = DataSupportIndex(
+    max_points=settings.A2_DATA_SUPPORT_MAX_POINTS
+) if settings.A2_DATA_SUPPORT_INDEX else None
+# Per-sector component snapshots; unconfigured sectors get the class-constant defaults above
+sector_registry = SectorRegistry()
+_sector_pool = None
+
+async def start_calibration_persistence():
+    """Attach a write-behind Postgres sink to the calibration tracker (app startup)."""
+    dsn = asyncpg_dsn(settings.DATABASE_URL)
+    if dsn is None:
+        logger.info("Calibration events kept in-process only (DATABASE_URL is not Postgres)")
+        return
+    writer = CalibrationEventWriter(
+        dsn=dsn,
+        flush_size=settings.CALIBRATION_FLUSH_SIZE,
+        flush_interval=settings.CALIBRATION_FLUSH_INTERVAL,
+        buffer_limit=settings.CALIBRATION_BUFFER_LIMIT
+    )
+    try:
+        await writer.start()
+    except Exception as e:
+        logger.error(f"Calibration persistence unavailable, continuing in-process: {str(e)}")
+        return
+    calibration_tracker.sink = writer
+    if data_support_index is not None:
+        await seed_data_support_index(writer)
+
+async def seed_data_support_index(writer: CalibrationEventWriter):
+    """Index the stored profiles of past events with outcomes, so every worker starts from the same history."""
+    try:
+        profiles = await writer.load_stage_profiles(data_support_index.max_points)
+    except Exception as e:
+        logger.error(f"Data support index not seeded, learning from new outcomes only: {str(e)}")
+        return
+    data_support_index.add(profiles)
+    logger.info(f"Data support index seeded with {len(profiles)} stored outcomes")
+
+async def stop_calibration_persistence():
+    """Drain pending calibration events to Postgres (app shutdown)."""
+    writer = calibration_tracker.sink
+    if writer is not None:
+        calibration_tracker.sink = None
+        await writer.stop()
+
+async def start_sector_registry():
+    """Load per-sector parameters and start polling for changes (app startup)."""
+    global _sector_pool
+    interval = settings.A2_SECTOR_RELOAD_INTERVAL
+    try:
+        if settings.A2_SECTOR_PARAMETERS_PATH:
+            sector_registry.load_file(settings.A2_SECTOR_PARAMETERS_PATH)
+            sector_registry.start_watching(interval, path=settings.A2_SECTOR_PARAMETERS_PATH)
+        elif settings.A2_SECTOR_PARAMETERS_FROM_DB and asyncpg_dsn(settings.DATABASE_URL):
+            import asyncpg
+            _sector_pool = await asyncpg.create_pool(asyncpg_dsn(settings.DATABASE_URL), min_size=1, max_size=1)
+            await sector_registry.load_db(_sector_pool)
+            sector_registry.start_watching(interval, pool=_sector_pool)
+    except Exception as e:
+        logger.error(f"A2 sector parameters unavailable, using built-in defaults: {str(e)}")
+
+async def stop_sector_registry():
+    global _sector_pool
+    await sector_registry.stop_watching()
+    if _sector_pool is not None:
+        await _sector_pool.close()
+        _sector_pool = None
+
+def start_request_capture():
+    """Record /underwrite bodies for replay when A2_CAPTURE_DIR is set (app startup)."""
+    global request_capture
+    if settings.A2_CAPTURE_DIR and request_capture is None:
+        request_capture = UnderwritingCapture(settings.A2_CAPTURE_DIR, segment_rows=settings.A2_CAPTURE_SEGMENT_ROWS)
+        logger.info(f"A2 request capture enabled: {settings.A2_CAPTURE_DIR}")
+
+def stop_request_capture():
+    """Write the final partial capture segment (app shutdown)."""
+    global request_capture
+    if request_capture is not None:
+        request_capture.close()
+        request_capture = None
 
 def safe_get_event_id(cal_event):
     """Safely extract event_id from object, dict, or UUID"""
@@ -103,95 +287,368 @@ def extract_penalty_names(penalties_list):
             result.append(str(name))
     return result
 
-@router.post("/underwrite", response_model=A2UnderwritingResponse)
-async def underwrite_pla_system(request: A2UnderwritingRequest):
+def underwriting_cache_key(request: A2UnderwritingRequest) -> str:
+    """Canonical hash of everything the computation depends on (brand_id is response-only)."""
+    normalized = request.model_dump(mode='json', exclude={'brand_id'})
+    if normalized['data_support'] is None:
+        normalized['data_support'] = DataSupportInput().model_dump(mode='json')
+    canonical = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def evaluate_system(request: A2UnderwritingRequest,
+                     verbosity: Verbosity = Verbosity.STANDARD,
+                     snapshot: Optional[SectorSnapshot] = None,
+                     profiles: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    Pure fit/penalty/confidence/decision pipeline; everything but brand_id and the calibration event.
+    MINIMAL skips the breakdown and rationale, FULL adds engine rationale and the audit detail.
+    Parameters come from the request sector's registry snapshot. profiles, if given, is the
+    request's stage_profiles already as the (3, 9) matrix.
+    """
+    snapshot = snapshot or sector_registry.get(request.sector)
+    # Extract profiles: one (3, 9) block, per-stage vectors are views into it
+    if profiles is None:
+        profiles = request.stage_profiles.to_matrix()
+    image_9pd, video_9pd, lp_9pd = NinePDVector.rows(profiles)
+    
+    # Check penalties
+    penalties = snapshot.penalty_checker.check_penalties(
+        image_9pd, video_9pd, lp_9pd,
+        verbosity=Verbosity.FULL if verbosity == Verbosity.FULL else Verbosity.MINIMAL
+    )
+    
+    # Calculate system fit
+    fit_result = snapshot.aggregator.aggregate(
+        image_fit=request.stage_fits.get('image', 0.0),
+        video_fit=request.stage_fits.get('video', 0.0),
+        landing_page_fit=request.stage_fits.get('landing_page', 0.0),
+        transition_penalty_sum=penalties['transition_penalty_sum']
+    )
+    
+    # Aggregate profile
+    aggregated_profile = NinePDVector((profiles[0] + profiles[1] + profiles[2]) / 3)
+    
+    # Handle data support
+    data_support = request.data_support if request.data_support else DataSupportInput()
+    
+    # Calculate confidence
+    confidence_result = snapshot.confidence_calculator.calculate(
+        stage_confidences=request.stage_confidences,
+        data_support={'similarity': data_support.similarity, 'sample_count': data_support.sample_count},
+        psychological_profile=aggregated_profile,
+        transition_penalty_sum=penalties['transition_penalty_sum'],
+        measurement_quality=request.measurement_quality,
+        verbosity=verbosity
+    )
+    system_confidence = confidence_result['system_confidence']
+    
+    # Make decision (rationale strings are only rendered for FULL)
+    decision_result = snapshot.decision_engine.make_decision(
+        system_fit=fit_result['system_fit'],
+        system_confidence=system_confidence,
+        transition_penalty_sum=penalties['transition_penalty_sum'],
+        stage_gates_passed=request.stage_gates_passed,
+        verbosity=Verbosity.FULL if verbosity == Verbosity.FULL else Verbosity.MINIMAL
+    )
+    
+    # Extract penalty names as strings
+    penalty_names = extract_penalty_names(penalties.get('triggered_penalty_ids', []))
+    
+    outcome = {
+        'decision': decision_result.get('decision', 'ERROR'),
+        'system_fit': fit_result['system_fit'],
+        'system_fit_raw': fit_result['system_fit_raw'],
+        'system_confidence': system_confidence,
+        'transition_penalty_sum': penalties['transition_penalty_sum'],
+        'triggered_penalties': penalty_names,
+        'reason_codes': decision_result['reason_codes']
+    }
+    if verbosity == Verbosity.MINIMAL:
+        return outcome
+    
+    outcome['confidence_breakdown'] = {
+        'stage_component': confidence_result['components']['stage_component'],
+        'data_support': confidence_result['components']['data_support'],
+        'risk_component': confidence_result['components']['risk_component'],
+        'transition_risk': confidence_result['components']['transition_risk'],
+        'measurement': confidence_result['components']['measurement'],
+        'final_confidence': system_confidence
+    }
+    if verbosity == Verbosity.FULL:
+        outcome['decision_rationale'] = decision_result['decision_rationale']
+        outcome['audit'] = {
+            'penalty_checks': [dict(c, id=getattr(c['id'], 'value', c['id'])) for c in penalties['all_checks']],
+            'weighted_contributions': confidence_result['weighted_contributions'],
+            'weights_used': confidence_result['weights_used'],
+            'stage_confidence_weights': confidence_result['stage_confidence_weights']
+        }
+    else:
+        # Handle missing rationale gracefully
+        outcome['decision_rationale'] = decision_result.get('rationale', [f"Decision: {outcome['decision']}"])
+    return outcome
+
+def _with_server_data_support(request: A2UnderwritingRequest, profiles: np.ndarray) -> A2UnderwritingRequest:
+    """request with data_support from the k-NN index if the client omitted it and the index is warm."""
+    if request.data_support is not None or data_support_index is None:
+        return request
+    support = data_support_index.query(profiles)
+    if support is None:
+        return request
+    similarity, sample_count = support
+    return request.model_copy(update={
+        'data_support': DataSupportInput.model_construct(similarity=similarity, sample_count=sample_count)
+    })
+
+def _underwrite(request: A2UnderwritingRequest, verbosity: Verbosity,
+                profiles: Optional[np.ndarray] = None) -> A2UnderwritingResponse:
+    """
+    Memoized evaluation plus a fresh calibration event; shared by /underwrite, /underwrite/stream
+    and the fused /v1/pipeline/underwrite (which passes its scored (3, 9) profiles along).
+    """
+    if profiles is None:
+        profiles = request.stage_profiles.to_matrix()
+    # Server-side data support is resolved before the memo key, so the key reflects it
+    request = _with_server_data_support(request, profiles)
+    # Identical systems are memoized; the calibration event is always fresh
+    snapshot = sector_registry.get(request.sector)
+    # Keyed by parameter content, so a reload under an unchanged version label never serves stale results
+    cache_key = f"{snapshot.digest}:{verbosity.value}:{underwriting_cache_key(request)}"
+    outcome = underwriting_cache.get(cache_key)
+    if outcome is None:
+        outcome = evaluate_system(request, verbosity, snapshot, profiles)
+        underwriting_cache.put(cache_key, outcome)
+    
+    # Track calibration
+    cal_event = calibration_tracker.track_evaluation(
+        sector_id=request.sector,
+        pla_system_sequence="image_video_landing_page",
+        system_confidence=outcome['system_confidence'],
+        stage_profile=profiles
+    )
+    if data_support_index is not None:
+        data_support_index.track(cal_event.event_id, profiles)
+    
+    return A2UnderwritingResponse(
+        brand_id=request.brand_id,
+        calibration_event_id=safe_get_event_id(cal_event),
+        **outcome
+    )
+
+@router.post("/underwrite", response_model=A2UnderwritingResponse, response_model_exclude_none=True)
+async def underwrite_pla_system(request: A2UnderwritingRequest,
+                                verbosity: Verbosity = Query(default=Verbosity.STANDARD)):
     logger.info(f"Processing underwriting for brand: {request.brand_id}")
     
     try:
-        # Extract profiles
-        image_9pd = request.stage_profiles.image.model_dump()
-        video_9pd = request.stage_profiles.video.model_dump()
-        lp_9pd = request.stage_profiles.landing_page.model_dump()
-        
-        # Check penalties
-        penalties = penalty_checker.check_penalties(image_9pd, video_9pd, lp_9pd)
-        
-        # Calculate system fit
-        fit_result = aggregator.aggregate(
-            image_fit=request.stage_fits.get('image', 0.0),
-            video_fit=request.stage_fits.get('video', 0.0),
-            landing_page_fit=request.stage_fits.get('landing_page', 0.0),
-            transition_penalty_sum=penalties['transition_penalty_sum']
-        )
+        if request_capture is not None:
+            request_capture.record(request.model_dump())
         
-        # Aggregate profile
-        aggregated_profile = {k: (image_9pd.get(k, 0.5) + video_9pd.get(k, 0.5) + lp_9pd.get(k, 0.5)) / 3 
-                             for k in image_9pd.keys()}
+        response = _underwrite(request, verbosity)
+        logger.info(f"Underwriting complete for {request.brand_id}: {response.decision}")
+        return response
         
-        # Handle data support
-        data_support = request.data_support if request.data_support else DataSupportInput()
-        
-        # Calculate confidence
-        confidence_result = confidence_calculator.calculate(
+    except Exception as e:
+        logger.error(f"ERROR in underwriting: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"A2 Underwriting Error: {str(e)}")
+
+@router.post("/underwrite/stream")
+async def underwrite_pla_system_stream(request: Request,
+                                       verbosity: Verbosity = Query(default=Verbosity.STANDARD)):
+    """
+    NDJSON in, NDJSON out: one A2UnderwritingRequest per line, one
+    A2UnderwritingResponse (or {"line": n, "error": ...}) per line in input
+    order, streamed as computed. Same pipeline, cache and calibration
+    tracking as /underwrite; the upload is parsed incrementally, so memory
+    is bounded regardless of its size.
+    """
+    logger.info("Processing streamed underwriting")
+    
+    def handle(line: bytes) -> bytes:
+        response = _underwrite(A2UnderwritingRequest.model_validate_json(line), verbosity)
+        return response.model_dump_json(exclude_none=True).encode('utf-8')
+    
+    return NDJSONStreamingResponse(ndjson_stream(request.stream(), handle))
+
+@router.post("/underwrite/batch", response_model=A2BatchUnderwritingResponse, response_model_exclude_none=True)
+async def underwrite_pla_system_batch(request: A2BatchUnderwritingRequest,
+                                      verbosity: Verbosity = Query(default=Verbosity.STANDARD)):
+    """FULL renders the engine rationale per row; per-row audit detail is only on /underwrite."""
+    n = len(request.stage_profiles)
+    logger.info(f"Processing batch underwriting for brand: {request.brand_id} ({n} systems)")
+    
+    snapshot = sector_registry.get(request.sector)
+    try:
+        profiles = np.asarray(request.stage_profiles, dtype=np.float64)
+        data_support = request.data_support
+        well_formed = profiles.shape[1:] == (len(PLA_STAGES), len(NINE_PD_DIMENSIONS))
+        if data_support is None and data_support_index is not None and well_formed:
+            data_support = data_support_index.query_many(profiles)
+        # Chunked onto the job executor; the loop stays free for other requests
+        result = await batch_jobs.evaluate_batch(
+            job_executor,
+            snapshot,
+            stage_profiles=profiles,
+            stage_fits=request.stage_fits,
             stage_confidences=request.stage_confidences,
-            data_support={'similarity': data_support.similarity, 'sample_count': data_support.sample_count},
-            psychological_profile=aggregated_profile,
-            transition_penalty_sum=penalties['transition_penalty_sum'],
+            stage_gates_passed=request.stage_gates_passed,
+            data_support=data_support,
             measurement_quality=request.measurement_quality
         )
-        system_confidence = confidence_result['system_confidence']
-        
-        # Make decision
-        decision_result = decision_engine.make_decision(
-            system_fit=fit_result['system_fit'],
-            system_confidence=system_confidence,
-            transition_penalty_sum=penalties['transition_penalty_sum'],
-            stage_gates_passed=request.stage_gates_passed
-        )
-        
-        # Handle missing rationale gracefully
-        rationale = decision_result.get('rationale', [f"Decision: {decision_result.get('decision', 'UNKNOWN')}"])
-        
-        # Track calibration
-        cal_event = calibration_tracker.track_evaluation(
-            sector_id=request.sector,
-            pla_system_sequence="image_video_landing_page",
-            system_confidence=system_confidence
-        )
-        
-        # Safely extract event_id and convert to string
-        cal_event_id = safe_get_event_id(cal_event)
-        
-        # Extract penalty names as strings
-        penalty_names = extract_penalty_names(penalties.get('triggered_penalties', []))
-        
-        logger.info(f"Underwriting complete for {request.brand_id}: {decision_result.get('decision')}")
-        
-        return A2UnderwritingResponse(
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"A2 Batch Underwriting Error: {str(e)}")
+    except Exception as e:
+        logger.error(f"ERROR in batch underwriting: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"A2 Underwriting Error: {str(e)}")
+    
+    decisions = BatchUnderwritingEngine.decision_labels(result['decision_codes'])
+    penalty_names = BatchUnderwritingEngine.triggered_penalty_names(result)
+    reason_codes = snapshot.decision_engine.reason_code_lists(snapshot.decision_engine.reason_mask_array(
+        result['system_fit'], result['system_confidence'], result['transition_penalty_sum'], request.stage_gates_passed
+    ))
+    components = {k: v.tolist() for k, v in result['confidence_components'].items()}
+    system_fit = result['system_fit'].tolist()
+    system_fit_raw = result['system_fit_raw'].tolist()
+    system_confidence = result['system_confidence'].tolist()
+    penalty_sum = result['transition_penalty_sum'].tolist()
+    
+    # Calibration events are created here, never in executor workers
+    cal_events = calibration_tracker.track_evaluations(
+        sector_id=request.sector,
+        pla_system_sequence="image_video_landing_page",
+        system_confidences=system_confidence,
+        stage_profiles=profiles
+    )
+    if data_support_index is not None and cal_events:
+        data_support_index.track_many([event.event_id for event in cal_events], profiles)
+    
+    results = []
+    for i in range(n):
+        if i and i % job_executor.chunk_rows == 0:
+            await asyncio.sleep(0)
+        row = A2UnderwritingResponse(
             brand_id=request.brand_id,
-            decision=decision_result.get('decision', 'ERROR'),
-            system_fit=fit_result['system_fit'],
-            system_fit_raw=fit_result['system_fit_raw'],
-            system_confidence=system_confidence,
-            confidence_breakdown=ConfidenceBreakdown(
-                stage_component=confidence_result['components']['stage_component'],
-                data_support=confidence_result['components']['data_support'],
-                risk_component=confidence_result['components']['risk_component'],
-                transition_risk=confidence_result['components']['transition_risk'],
-                measurement=confidence_result['components']['measurement'],
-                final_confidence=system_confidence
-            ),
-            transition_penalty_sum=penalties['transition_penalty_sum'],
-            triggered_penalties=penalty_names,
-            decision_rationale=rationale,
-            calibration_event_id=cal_event_id
+            decision=decisions[i],
+            system_fit=system_fit[i],
+            system_fit_raw=system_fit_raw[i],
+            system_confidence=system_confidence[i],
+            transition_penalty_sum=penalty_sum[i],
+            triggered_penalties=penalty_names[i],
+            reason_codes=reason_codes[i],
+            calibration_event_id=safe_get_event_id(cal_events[i])
         )
-        
+        if verbosity != Verbosity.MINIMAL:
+            row.confidence_breakdown = ConfidenceBreakdown(
+                stage_component=components['stage_component'][i],
+                data_support=components['data_support'][i],
+                risk_component=components['risk_component'][i],
+                transition_risk=components['transition_risk'][i],
+                measurement=components['measurement'][i],
+                final_confidence=system_confidence[i]
+            )
+            row.decision_rationale = [f"Decision: {decisions[i]}"]
+        if verbosity == Verbosity.FULL:
+            row.decision_rationale = snapshot.decision_engine.render_rationale(
+                DecisionBand(decisions[i]),
+                [ReasonCode(code) for code in reason_codes[i]],
+                system_fit[i], system_confidence[i], penalty_sum[i],
+                _gate_flags(request.stage_gates_passed[i])
+            )
+        results.append(row)
+    
+    logger.info(f"Batch underwriting complete for {request.brand_id}: {n} systems")
+    return A2BatchUnderwritingResponse(brand_id=request.brand_id, count=n, results=results)
+
+def _gate_flags(gates: List[bool]) -> Dict[str, bool]:
+    names = PLA_STAGES if len(gates) == len(PLA_STAGES) else [f"stage_{j}" for j in range(len(gates))]
+    return dict(zip(names, gates))
+
+def _candidate_pool(candidates: List[StageCandidate]) -> CandidatePool:
+    return CandidatePool(
+        profiles=np.array([c.profile.to_vector().array for c in candidates], dtype=np.float64).reshape(-1, len(NINE_PD_DIMENSIONS)),
+        fits=np.array([c.fit for c in candidates], dtype=np.float64),
+        confidences=np.array([c.confidence for c in candidates], dtype=np.float64),
+        gates=np.array([c.gate_passed for c in candidates], dtype=bool)
+    )
+
+@router.post("/optimize", response_model=A2OptimizeResponse)
+async def optimize_pla_system(request: A2OptimizeRequest):
+    logger.info(
+        f"Optimizing PLA system for brand: {request.brand_id} "
+        f"({len(request.images)}x{len(request.videos)}x{len(request.landing_pages)} candidates)"
+    )
+    
+    try:
+        data_support = request.data_support if request.data_support else DataSupportInput()
+        search = await job_executor.run(
+            batch_jobs.top_systems,
+            sector_registry.get(request.sector),
+            {
+                'image': _candidate_pool(request.images),
+                'video': _candidate_pool(request.videos),
+                'landing_page': _candidate_pool(request.landing_pages),
+                'top_k': request.top_k,
+                'data_support': (data_support.similarity, data_support.sample_count),
+                'measurement_quality': request.measurement_quality,
+                'require_gates_passed': request.require_gates_passed
+            },
+            rows=len(request.images) * len(request.videos) * len(request.landing_pages)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"A2 Optimization Error: {str(e)}")
     except Exception as e:
-        logger.error(f"ERROR in underwriting: {str(e)}")
+        logger.error(f"ERROR in system optimization: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"A2 Underwriting Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"A2 Optimization Error: {str(e)}")
+    
+    systems = []
+    result = search['result']
+    if result is not None:
+        decisions = BatchUnderwritingEngine.decision_labels(result['decision_codes'])
+        penalty_names = BatchUnderwritingEngine.triggered_penalty_names(result)
+        for row, (i, v, l) in enumerate(search['indices'].tolist()):
+            systems.append(OptimizedSystem(
+                image_id=request.images[i].candidate_id,
+                video_id=request.videos[v].candidate_id,
+                landing_page_id=request.landing_pages[l].candidate_id,
+                decision=decisions[row],
+                system_fit=float(result['system_fit'][row]),
+                system_fit_raw=float(result['system_fit_raw'][row]),
+                system_confidence=float(result['system_confidence'][row]),
+                transition_penalty_sum=float(result['transition_penalty_sum'][row]),
+                triggered_penalties=penalty_names[row]
+            ))
+    
+    return A2OptimizeResponse(brand_id=request.brand_id, systems=systems, **search['stats'])
+
+@router.post("/calibration/performance", response_model=CalibrationPerformanceResponse)
+async def backfill_calibration_performance(request: CalibrationPerformanceRequest):
+    logger.info(f"Backfilling performance for {len(request.updates)} calibration events")
+    
+    events = calibration_tracker.update_performance_many(
+        (u.event_id, u.actual_performance_percentile) for u in request.updates
+    )
+    
+    not_found = [str(u.event_id) for u, event in zip(request.updates, events) if event is None]
+    if data_support_index is not None:
+        data_support_index.add_outcomes(event.event_id for event in events if event is not None)
+    trigger_counts = {trigger_id: 0 for trigger_id in CalibrationTracker.TRIGGERS}
+    triggered_events = {}
+    for event in events:
+        if event is not None and event.trigger_id and event.event_id not in triggered_events:
+            trigger_counts[event.trigger_id] += 1
+            triggered_events[event.event_id] = event.to_dict()
+    
+    return CalibrationPerformanceResponse(
+        updated=len(events) - len(not_found),
+        not_found=not_found,
+        trigger_counts=trigger_counts,
+        triggered_events=list(triggered_events.values())
+    )
 
 @router.get("/health")
 async def health_check():
@@ -199,5 +656,12 @@ async def health_check():
         "status": "healthy",
         "component": "a2_underwriting",
         "version": "1.1.0-PTC-FINAL",
-        "pydantic_version": "v2"
+        "pydantic_version": "v2",
+        "underwriting_cache": underwriting_cache.stats(),
+        "executor": job_executor.stats(),
+        "data_support_index": data_support_index.stats() if data_support_index is not None else None,
+        "sector_parameters": {
+            "version": sector_registry.version,
+            "sectors": sector_registry.sectors()
+        }
     }
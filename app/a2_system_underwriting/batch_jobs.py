@@ -0,0 +1,84 @@
+"""
+batch_jobs.py
+A2 Executor Jobs
+Module-level entry points the router dispatches through JobExecutor, so they
+pickle by reference for process-pool workers. Pure computation only:
+calibration events are created by the caller once results are merged back.
+"""
+from typing import Dict, Any, List, Optional, Union
+
+import numpy as np
+
+from .batch_underwriting_engine import BatchUnderwritingEngine
+from .sector_registry import SectorSnapshot
+from app.services.job_executor import JobExecutor, chunk_slices
+
+
+def evaluate_chunk(snapshot: SectorSnapshot,
+                   stage_profiles: np.ndarray,
+                   stage_fits: np.ndarray,
+                   stage_confidences: np.ndarray,
+                   stage_gates_passed: np.ndarray,
+                   data_support: Optional[np.ndarray],
+                   measurement_quality: Union[float, np.ndarray]) -> Dict[str, Any]:
+    return snapshot.batch_engine.evaluate(
+        stage_profiles=stage_profiles,
+        stage_fits=stage_fits,
+        stage_confidences=stage_confidences,
+        stage_gates_passed=stage_gates_passed,
+        data_support=data_support,
+        measurement_quality=measurement_quality
+    )
+
+
+def top_systems(snapshot: SectorSnapshot, search: Dict[str, Any]) -> Dict[str, Any]:
+    return snapshot.optimizer.top_systems(**search)
+
+
+async def evaluate_batch(executor: JobExecutor,
+                         snapshot: SectorSnapshot,
+                         stage_profiles: List,
+                         stage_fits: List,
+                         stage_confidences: List,
+                         stage_gates_passed: List,
+                         data_support: Optional[List] = None,
+                         measurement_quality: Union[float, List[float]] = BatchUnderwritingEngine.DEFAULT_MEASUREMENT_QUALITY
+                         ) -> Dict[str, Any]:
+    """
+    BatchUnderwritingEngine.evaluate over executor.chunk_rows row chunks run
+    concurrently on the executor, merged back in row order. Row counts are
+    checked up front since each chunk only sees its own rows.
+    """
+    columns = {
+        'stage_profiles': np.asarray(stage_profiles, dtype=np.float64),
+        'stage_fits': np.asarray(stage_fits, dtype=np.float64),
+        'stage_confidences': np.asarray(stage_confidences, dtype=np.float64),
+        'stage_gates_passed': np.asarray(stage_gates_passed, dtype=bool)
+    }
+    if data_support is not None:
+        columns['data_support'] = np.asarray(data_support, dtype=np.float64)
+    measurement = np.asarray(measurement_quality, dtype=np.float64)
+    if measurement.ndim:
+        columns['measurement_quality'] = measurement
+
+    n = len(columns['stage_profiles'])
+    for name, column in columns.items():
+        if len(column) != n:
+            raise ValueError(f"{name} has {len(column)} rows, expected {n}")
+
+    def chunk(rows: slice) -> tuple:
+        return (
+            snapshot,
+            columns['stage_profiles'][rows],
+            columns['stage_fits'][rows],
+            columns['stage_confidences'][rows],
+            columns['stage_gates_passed'][rows],
+            columns['data_support'][rows] if data_support is not None else None,
+            measurement[rows] if measurement.ndim else measurement
+        )
+
+    if n == 0:
+        # Let the engine report shape errors for empty input
+        return evaluate_chunk(*chunk(slice(None)))
+    calls = [chunk(rows) for rows in chunk_slices(n, executor.chunk_rows)]
+    return BatchUnderwritingEngine.merge_results(await executor.map(evaluate_chunk, calls, rows=n))
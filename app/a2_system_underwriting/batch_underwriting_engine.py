@@ -0,0 +1,147 @@
+"""
+batch_underwriting_engine.py
+A2 Batch Underwriting Engine
+Evaluates N PLA systems column-wise with the same arithmetic as the scalar path
+"""
+from typing import Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+
+from .nine_pd import NINE_PD_DIMENSIONS, PLA_STAGES
+from .system_fit_aggregator import SystemFitAggregator
+from .transition_penalty_checker import TransitionPenaltyChecker
+from .system_decision_engine import SystemDecisionEngine, DECISION_BAND_ORDER
+from .system_confidence_calculator import SystemConfidenceCalculator
+
+
+class BatchUnderwritingEngine:
+    DEFAULT_DATA_SUPPORT = (0.80, 0.70)
+    DEFAULT_MEASUREMENT_QUALITY = 0.85
+
+    def __init__(self,
+                 aggregator: Optional[SystemFitAggregator] = None,
+                 penalty_checker: Optional[TransitionPenaltyChecker] = None,
+                 confidence_calculator: Optional[SystemConfidenceCalculator] = None,
+                 decision_engine: Optional[SystemDecisionEngine] = None):
+        self.aggregator = aggregator or SystemFitAggregator()
+        self.penalty_checker = penalty_checker or TransitionPenaltyChecker()
+        self.confidence_calculator = confidence_calculator or SystemConfidenceCalculator()
+        self.decision_engine = decision_engine or SystemDecisionEngine()
+
+    def evaluate(self,
+                 stage_profiles: np.ndarray,
+                 stage_fits: np.ndarray,
+                 stage_confidences: np.ndarray,
+                 stage_gates_passed: np.ndarray,
+                 data_support: Optional[np.ndarray] = None,
+                 measurement_quality: Union[float, np.ndarray] = DEFAULT_MEASUREMENT_QUALITY) -> Dict[str, Any]:
+        """
+        stage_profiles: (N, 3, 9) in PLA_STAGES x NINE_PD_DIMENSIONS order
+        stage_fits, stage_confidences: (N, 3) in PLA_STAGES order
+        stage_gates_passed: (N,) or (N, S) booleans
+        data_support: (N, 2) as (similarity, sample_count); defaults per DataSupportInput
+        measurement_quality: scalar or (N,)
+        """
+        profiles = self._as_matrix(stage_profiles, (len(PLA_STAGES), len(NINE_PD_DIMENSIONS)), "stage_profiles")
+        n = profiles.shape[0]
+        fits = self._as_matrix(stage_fits, (len(PLA_STAGES),), "stage_fits", n)
+        confidences = self._as_matrix(stage_confidences, (len(PLA_STAGES),), "stage_confidences", n)
+        gates = np.asarray(stage_gates_passed, dtype=bool)
+        if gates.shape[:1] != (n,) or gates.ndim > 2:
+            raise ValueError(f"stage_gates_passed must have shape (N,) or (N, S) with N={n}, got {gates.shape}")
+
+        if data_support is None:
+            support = np.empty((n, 2), dtype=np.float64)
+            support[:] = self.DEFAULT_DATA_SUPPORT
+        else:
+            support = self._as_matrix(data_support, (2,), "data_support", n)
+        measurement = np.asarray(measurement_quality, dtype=np.float64)
+        if measurement.ndim not in (0, 1) or (measurement.ndim == 1 and measurement.shape[0] != n):
+            raise ValueError(f"measurement_quality must be a scalar or have shape ({n},), got {measurement.shape}")
+
+        self._validate_unit_interval(profiles, "stage_profiles")
+        self._validate_unit_interval(support, "data_support")
+        self._validate_unit_interval(measurement, "measurement_quality")
+
+        penalties = self.penalty_checker.check_penalties_array(profiles)
+        penalty_sum = penalties['transition_penalty_sum']
+
+        fit_result = self.aggregator.aggregate_array(
+            image_fit=fits[:, 0],
+            video_fit=fits[:, 1],
+            landing_page_fit=fits[:, 2],
+            transition_penalty_sum=penalty_sum
+        )
+
+        aggregated_profile = (profiles[:, 0, :] + profiles[:, 1, :] + profiles[:, 2, :]) / 3
+
+        confidence_result = self.confidence_calculator.calculate_array(
+            stage_confidences=confidences,
+            data_support=support,
+            psychological_profile=aggregated_profile,
+            transition_penalty_sum=penalty_sum,
+            measurement_quality=measurement
+        )
+
+        decision_codes = self.decision_engine.make_decision_array(
+            system_fit=fit_result['system_fit'],
+            system_confidence=confidence_result['system_confidence'],
+            transition_penalty_sum=penalty_sum,
+            stage_gates_passed=gates
+        )
+
+        return {
+            'count': n,
+            'decision_codes': decision_codes,
+            'system_fit': fit_result['system_fit'],
+            'system_fit_raw': fit_result['system_fit_raw'],
+            'system_confidence': confidence_result['system_confidence'],
+            'confidence_components': confidence_result['components'],
+            'transition_penalty_sum': penalty_sum,
+            'triggered_penalties': penalties['triggered'],
+            'penalty_ids': penalties['penalty_ids']
+        }
+
+    @staticmethod
+    def merge_results(parts: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Concatenate evaluate() results of consecutive row chunks, in order."""
+        if len(parts) == 1:
+            return parts[0]
+        merged = {
+            key: np.concatenate([p[key] for p in parts])
+            for key in ('decision_codes', 'system_fit', 'system_fit_raw', 'system_confidence',
+                        'transition_penalty_sum', 'triggered_penalties')
+        }
+        merged['count'] = sum(p['count'] for p in parts)
+        merged['confidence_components'] = {
+            k: np.concatenate([p['confidence_components'][k] for p in parts])
+            for k in parts[0]['confidence_components']
+        }
+        merged['penalty_ids'] = parts[0]['penalty_ids']
+        return merged
+
+    @staticmethod
+    def decision_labels(decision_codes: np.ndarray) -> list:
+        labels = [band.value for band in DECISION_BAND_ORDER]
+        return [labels[code] for code in decision_codes.tolist()]
+
+    @staticmethod
+    def triggered_penalty_names(result: Dict[str, Any]) -> list:
+        ids = result['penalty_ids']
+        return [
+            [ids[j] for j, hit in enumerate(row) if hit]
+            for row in result['triggered_penalties'].tolist()
+        ]
+
+    def _as_matrix(self, values, row_shape: tuple, name: str, n: Optional[int] = None) -> np.ndarray:
+        array = np.asarray(values, dtype=np.float64)
+        if array.ndim != 1 + len(row_shape) or array.shape[1:] != row_shape:
+            raise ValueError(f"{name} must have shape (N, {', '.join(map(str, row_shape))}), got {array.shape}")
+        if n is not None and array.shape[0] != n:
+            raise ValueError(f"{name} has {array.shape[0]} rows, expected {n}")
+        return array
+
+    def _validate_unit_interval(self, values: np.ndarray, name: str):
+        invalid = ~((values >= 0.0) & (values <= 1.0))
+        if invalid.any():
+            raise ValueError(f"{name} values must be in [0,1], got {values[invalid].flat[0]}")
@@ -0,0 +1,229 @@
+"""
+calibration_store.py
+A2 Calibration Event Write-Behind Store
+Buffers CalibrationTracker events in-process and flushes them to Postgres
+(system_confidence_calibration_events, migration_001) in batches, and reads
+back the stage profiles of events with outcomes (migration_004) to seed
+DataSupportIndex.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+from .calibration_tracker import CalibrationEvent
+from .data_support_index import PROFILE_WIDTH
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "system_confidence_calibration_events"
+
+INSERT_COLUMNS = [
+    'event_id',
+    'timestamp',
+    'sector_id',
+    'pla_system_sequence',
+    'system_confidence',
+    'actual_performance_percentile',
+    'trigger_id',
+    'adjustment_delta',
+    'stage_profile'
+]
+
+UPDATE_SQL = f"""
+UPDATE {TABLE_NAME} AS e
+SET actual_performance_percentile = u.actual_performance_percentile,
+    trigger_id = u.trigger_id,
+    adjustment_delta = u.adjustment_delta
+FROM unnest($1::uuid[], $2::float8[], $3::varchar[], $4::float8[])
+    AS u(event_id, actual_performance_percentile, trigger_id, adjustment_delta)
+WHERE e.event_id = u.event_id
+""".strip()
+
+# Newest first, so a LIMIT keeps the most recent outcomes
+PROFILES_SQL = f"""
+SELECT stage_profile
+FROM {TABLE_NAME}
+WHERE actual_performance_percentile IS NOT NULL AND stage_profile IS NOT NULL
+ORDER BY timestamp DESC
+LIMIT $1
+""".strip()
+
+
+def asyncpg_dsn(database_url: Optional[str]) -> Optional[str]:
+    """Normalize a DATABASE_URL for asyncpg; None if it is not Postgres."""
+    if not database_url:
+        return None
+    scheme, sep, rest = database_url.partition("://")
+    if not sep or scheme.split("+")[0] not in ("postgres", "postgresql"):
+        return None
+    return f"postgresql://{rest}"
+
+
+class CalibrationEventWriter:
+    """
+    Write-behind sink for CalibrationTracker.
+
+    enqueue()/enqueue_update() are O(1) and never touch the network, so
+    request latency does not depend on the database. A background task
+    flushes when flush_size events are pending or every flush_interval
+    seconds, and stop() drains the buffer on shutdown. Both buffers are
+    bounded by buffer_limit; on overflow the oldest entries are dropped and
+    counted rather than growing process memory.
+    """
+
+    def __init__(self,
+                 dsn: Optional[str] = None,
+                 pool=None,
+                 flush_size: int = 500,
+                 flush_interval: float = 2.0,
+                 buffer_limit: int = 50_000):
+        self.dsn = dsn
+        self.pool = pool
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.buffer_limit = buffer_limit
+        self._inserts: deque = deque()
+        self._updates: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._owns_pool = pool is None
+        self.stats: Dict[str, int] = {
+            'flushed_inserts': 0,
+            'flushed_updates': 0,
+            'dropped': 0,
+            'flush_failures': 0
+        }
+
+    async def start(self):
+        if self.pool is None:
+            import asyncpg
+            self.pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=4)
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Calibration write-behind started (flush_size={self.flush_size}, interval={self.flush_interval}s)")
+
+    async def stop(self):
+        # Let the loop finish any in-flight flush and exit; cancelling it mid-flush would lose the drained batch
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._owns_pool and self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    def enqueue(self, event: CalibrationEvent):
+        self._push(self._inserts, event)
+
+    def enqueue_update(self, event: CalibrationEvent):
+        self._push(self._updates, event)
+
+    def pending(self) -> int:
+        return len(self._inserts) + len(self._updates)
+
+    async def flush(self):
+        if self.pool is None or not self.pending():
+            return
+        lock = self._flush_lock or asyncio.Lock()
+        async with lock:
+            inserts = self._drain(self._inserts)
+            updates = self._drain(self._updates)
+            try:
+                async with self.pool.acquire() as conn:
+                    # Inserts first: an update may refer to an event still in this batch
+                    if inserts:
+                        await conn.copy_records_to_table(
+                            TABLE_NAME,
+                            records=[self._insert_record(e) for e in inserts],
+                            columns=INSERT_COLUMNS
+                        )
+                        self.stats['flushed_inserts'] += len(inserts)
+                        inserts = []
+                    if updates:
+                        await conn.execute(UPDATE_SQL, *self._update_columns(updates))
+                        self.stats['flushed_updates'] += len(updates)
+                        updates = []
+            except BaseException as e:
+                # Includes cancellation: whatever was drained but not written goes back to the buffer
+                self._requeue(self._inserts, inserts)
+                self._requeue(self._updates, updates)
+                if not isinstance(e, Exception):
+                    raise
+                self.stats['flush_failures'] += 1
+                logger.error(f"Calibration flush failed, requeued {len(inserts)} inserts / {len(updates)} updates: {str(e)}")
+
+    async def load_stage_profiles(self, limit: int) -> np.ndarray:
+        """(N, 27) stage profiles of the newest limit events with a backfilled outcome, oldest first."""
+        if self.pool is None:
+            return np.empty((0, PROFILE_WIDTH))
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(PROFILES_SQL, limit)
+        profiles = [row['stage_profile'] for row in reversed(rows) if len(row['stage_profile']) == PROFILE_WIDTH]
+        if len(profiles) < len(rows):
+            logger.warning(f"Skipped {len(rows) - len(profiles)} stored stage profiles without {PROFILE_WIDTH} values")
+        return np.array(profiles, dtype=np.float64).reshape(-1, PROFILE_WIDTH)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _push(self, buffer: deque, event: CalibrationEvent):
+        if len(buffer) >= self.buffer_limit:
+            buffer.popleft()
+            self.stats['dropped'] += 1
+        buffer.append(event)
+        if self._wakeup is not None and len(buffer) >= self.flush_size:
+            self._wakeup.set()
+
+    def _drain(self, buffer: deque) -> list:
+        items = list(buffer)
+        buffer.clear()
+        return items
+
+    def _requeue(self, buffer: deque, items: list):
+        # Failed batch goes back in front of anything enqueued meanwhile
+        room = max(0, self.buffer_limit - len(buffer))
+        if len(items) > room:
+            self.stats['dropped'] += len(items) - room
+            items = items[len(items) - room:]
+        buffer.extendleft(reversed(items))
+
+    @staticmethod
+    def _insert_record(event: CalibrationEvent) -> tuple:
+        return (
+            event.event_id,
+            event.timestamp,
+            event.sector_id,
+            event.pla_system_sequence,
+            event.system_confidence,
+            event.actual_performance_percentile,
+            event.trigger_id,
+            event.adjustment_delta,
+            None if event.stage_profile is None else np.asarray(event.stage_profile, dtype=np.float64).ravel().tolist()
+        )
+
+    @staticmethod
+    def _update_columns(events: list) -> tuple:
+        # Last update per event wins
+        latest: Dict[Any, CalibrationEvent] = {e.event_id: e for e in events}
+        rows = list(latest.values())
+        return (
+            [e.event_id for e in rows],
+            [e.actual_performance_percentile for e in rows],
+            [e.trigger_id for e in rows],
+            [e.adjustment_delta for e in rows]
+        )
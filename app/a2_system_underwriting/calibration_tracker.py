@@ -3,11 +3,15 @@ calibration_tracker.py
 A2 Calibration Tracker
 Passive tracking for false positive/negative detection (Phase 3 activation)
 """
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Iterable, List, Tuple
+from array import array
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from uuid import uuid4, UUID
 
+import numpy as np
+
 
 @dataclass
 class CalibrationEvent:
@@ -19,6 +23,7 @@ class CalibrationEvent:
     actual_performance_percentile: Optional[float] = None
     trigger_id: Optional[str] = None
     adjustment_delta: Optional[float] = None
+    stage_profile: Optional[np.ndarray] = None  # (3, 9) profile underwritten; persisted to seed DataSupportIndex
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -33,6 +38,31 @@ class CalibrationEvent:
         }
 
 
+class OutcomeWindow:
+    """
+    Fixed-capacity ring buffer of outcome codes (CalibrationTracker.TRIGGER_ORDER
+    indices) for one (sector_id, pla_system_sequence) key, with running
+    per-code counts so push() is O(1).
+    """
+    __slots__ = ('outcomes', 'counts', 'cursor', 'size')
+    
+    def __init__(self, capacity: int, n_codes: int):
+        self.outcomes = array('b', bytes(capacity))
+        self.counts = array('l', [0]) * n_codes
+        self.cursor = 0
+        self.size = 0
+    
+    def push(self, code: int) -> None:
+        capacity = len(self.outcomes)
+        if self.size == capacity:
+            self.counts[self.outcomes[self.cursor]] -= 1
+        else:
+            self.size += 1
+        self.outcomes[self.cursor] = code
+        self.counts[code] += 1
+        self.cursor = (self.cursor + 1) % capacity
+
+
 class CalibrationTracker:
     TRIGGERS = {
         'FALSE_POSITIVE_CLUSTER': {
@@ -40,6 +70,7 @@ class CalibrationTracker:
             'performance_percentile_lt': 0.40,
             'count_window': 3,
             'action': 'decrease_confidence_baseline',
+            'delta_step': -0.05,
             'max_delta': -0.10
         },
         'FALSE_NEGATIVE_CLUSTER': {
@@ -47,17 +78,33 @@ class CalibrationTracker:
             'performance_percentile_gt': 0.65,
             'count_window': 3,
             'action': 'increase_confidence_baseline',
+            'delta_step': 0.05,
             'max_delta': 0.10
         }
     }
     
-    def __init__(self):
-        self.events = []
+    # Outcome codes; index 0 = no trigger. False positive takes precedence.
+    TRIGGER_ORDER = (None, 'FALSE_POSITIVE_CLUSTER', 'FALSE_NEGATIVE_CLUSTER')
+    
+    # Most recent outcomes per (sector_id, pla_system_sequence) that count_window is evaluated over
+    OUTCOME_WINDOW = 20
+    
+    def __init__(self, max_events: Optional[int] = None, sink=None):
+        """
+        max_events bounds the in-process window used for performance backfill
+        (oldest events are evicted); sink, if set, receives every new and
+        updated event for persistence (see calibration_store).
+        """
+        self.events = deque(maxlen=max_events)
+        self._events_by_id: Dict[UUID, CalibrationEvent] = {}
+        self._windows: Dict[Tuple[str, str], OutcomeWindow] = {}
+        self.sink = sink
     
     def track_evaluation(self,
                         sector_id: str,
                         pla_system_sequence: str,
-                        system_confidence: float) -> CalibrationEvent:
+                        system_confidence: float,
+                        stage_profile: Optional[np.ndarray] = None) -> CalibrationEvent:
         event = CalibrationEvent(
             event_id=uuid4(),
             timestamp=datetime.now(timezone.utc),
@@ -66,34 +113,148 @@ class CalibrationTracker:
             system_confidence=system_confidence,
             actual_performance_percentile=None,
             trigger_id=None,
-            adjustment_delta=0.0
+            adjustment_delta=0.0,
+            stage_profile=stage_profile
         )
+        if self.events.maxlen is not None and len(self.events) == self.events.maxlen:
+            evicted = self.events[0]
+            self._events_by_id.pop(evicted.event_id, None)
         self.events.append(event)
+        self._events_by_id[event.event_id] = event
+        if self.sink is not None:
+            self.sink.enqueue(event)
         return event
     
+    def track_evaluations(self,
+                          sector_id: str,
+                          pla_system_sequence: str,
+                          system_confidences: Iterable[float],
+                          stage_profiles: Optional[np.ndarray] = None) -> List[CalibrationEvent]:
+        """
+        One event per confidence, in order. Batch workers only compute
+        confidences; events are always created here, in the tracker's own
+        process, so ids, the backfill window and the sink stay consistent.
+        stage_profiles, if given, is (N, 3, 9) aligned with the confidences.
+        """
+        confidences = list(system_confidences)
+        profiles = [None] * len(confidences) if stage_profiles is None else stage_profiles
+        return [
+            self.track_evaluation(sector_id, pla_system_sequence, confidence, profile)
+            for confidence, profile in zip(confidences, profiles)
+        ]
+    
+    def get_event(self, event_id: UUID) -> Optional[CalibrationEvent]:
+        return self._events_by_id.get(event_id)
+    
     def update_performance(self, 
                           event_id: UUID, 
                           actual_performance_percentile: float) -> Optional[CalibrationEvent]:
-        for event in self.events:
-            if event.event_id == event_id:
-                event.actual_performance_percentile = actual_performance_percentile
-                trigger, delta = self._evaluate_triggers(event)
+        event = self._events_by_id.get(event_id)
+        if event is None:
+            return None
+        first_outcome = event.actual_performance_percentile is None
+        event.actual_performance_percentile = actual_performance_percentile
+        # Each event enters its outcome window once; corrections only update the percentile
+        if first_outcome:
+            trigger, delta = self._evaluate_triggers(event)
+            if trigger:
+                event.trigger_id = trigger
+                event.adjustment_delta = delta
+        if self.sink is not None:
+            self.sink.enqueue_update(event)
+        return event
+    
+    def update_performance_many(self,
+                                updates: Iterable[Tuple[UUID, float]]) -> List[Optional[CalibrationEvent]]:
+        """
+        Bulk backfill. Returns one entry per update, None where the event_id is
+        unknown. Outcomes for all matched events are classified in one
+        vectorized pass, then fed through the outcome windows in update order.
+        """
+        matched = []
+        results: List[Optional[CalibrationEvent]] = []
+        for event_id, percentile in updates:
+            event = self._events_by_id.get(event_id)
+            results.append(event)
+            if event is not None:
+                matched.append((event, percentile))
+        
+        if not matched:
+            return results
+        
+        confidences = np.fromiter((e.system_confidence for e, _ in matched), dtype=np.float64, count=len(matched))
+        percentiles = np.fromiter((p for _, p in matched), dtype=np.float64, count=len(matched))
+        outcome_codes = self._classify_outcomes_many(confidences, percentiles)
+        
+        for (event, percentile), code in zip(matched, outcome_codes.tolist()):
+            first_outcome = event.actual_performance_percentile is None
+            event.actual_performance_percentile = percentile
+            if first_outcome:
+                trigger, delta = self._record_outcome(event, code)
                 if trigger:
                     event.trigger_id = trigger
                     event.adjustment_delta = delta
-                return event
-        return None
+            if self.sink is not None:
+                self.sink.enqueue_update(event)
+        return results
+    
+    def window_counts(self, sector_id: str, pla_system_sequence: str) -> Dict[str, int]:
+        window = self._windows.get((sector_id, pla_system_sequence))
+        return {
+            trigger_id: (window.counts[code] if window else 0)
+            for code, trigger_id in enumerate(self.TRIGGER_ORDER) if trigger_id
+        }
     
     def _evaluate_triggers(self, event: CalibrationEvent) -> tuple:
-        if (event.system_confidence > self.TRIGGERS['FALSE_POSITIVE_CLUSTER']['system_confidence_gt'] and
-            event.actual_performance_percentile < self.TRIGGERS['FALSE_POSITIVE_CLUSTER']['performance_percentile_lt']):
-            return ('FALSE_POSITIVE_CLUSTER', -0.05)
+        code = self._classify_outcome(event.system_confidence, event.actual_performance_percentile)
+        return self._record_outcome(event, code)
+    
+    def _classify_outcome(self, confidence: float, percentile: float) -> int:
+        fp = self.TRIGGERS['FALSE_POSITIVE_CLUSTER']
+        fn = self.TRIGGERS['FALSE_NEGATIVE_CLUSTER']
+        if confidence > fp['system_confidence_gt'] and percentile < fp['performance_percentile_lt']:
+            return self.TRIGGER_ORDER.index('FALSE_POSITIVE_CLUSTER')
+        if confidence < fn['system_confidence_lt'] and percentile > fn['performance_percentile_gt']:
+            return self.TRIGGER_ORDER.index('FALSE_NEGATIVE_CLUSTER')
+        return 0
+    
+    def _classify_outcomes_many(self, confidences: np.ndarray, percentiles: np.ndarray) -> np.ndarray:
+        """Array form of _classify_outcome; returns int8 codes indexing TRIGGER_ORDER."""
+        fp = self.TRIGGERS['FALSE_POSITIVE_CLUSTER']
+        fn = self.TRIGGERS['FALSE_NEGATIVE_CLUSTER']
+        false_positive = (confidences > fp['system_confidence_gt']) & (percentiles < fp['performance_percentile_lt'])
+        false_negative = (confidences < fn['system_confidence_lt']) & (percentiles > fn['performance_percentile_gt'])
+        
+        codes = np.zeros(confidences.shape, dtype=np.int8)
+        codes[false_negative] = self.TRIGGER_ORDER.index('FALSE_NEGATIVE_CLUSTER')
+        codes[false_positive] = self.TRIGGER_ORDER.index('FALSE_POSITIVE_CLUSTER')
+        return codes
+    
+    def _record_outcome(self, event: CalibrationEvent, code: int) -> tuple:
+        """
+        Push one outcome into its key's window. A cluster trigger fires on a
+        false positive/negative outcome once count_window of them sit in the
+        last OUTCOME_WINDOW outcomes; the delta grows by delta_step per
+        count_window occurrences, capped at max_delta.
+        """
+        key = (event.sector_id, event.pla_system_sequence)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = OutcomeWindow(self.OUTCOME_WINDOW, len(self.TRIGGER_ORDER))
+        window.push(code)
         
-        if (event.system_confidence < self.TRIGGERS['FALSE_NEGATIVE_CLUSTER']['system_confidence_lt'] and
-            event.actual_performance_percentile > self.TRIGGERS['FALSE_NEGATIVE_CLUSTER']['performance_percentile_gt']):
-            return ('FALSE_NEGATIVE_CLUSTER', 0.05)
+        if not code:
+            return (None, 0.0)
+        trigger_id = self.TRIGGER_ORDER[code]
+        trigger = self.TRIGGERS[trigger_id]
+        count = window.counts[code]
+        if count < trigger['count_window']:
+            return (None, 0.0)
         
-        return (None, 0.0)
+        delta = trigger['delta_step'] * count / trigger['count_window']
+        if abs(delta) > abs(trigger['max_delta']):
+            delta = trigger['max_delta']
+        return (trigger_id, round(delta, 4))
     
     @staticmethod
     def get_sql_schema() -> str:
@@ -0,0 +1,189 @@
+"""
+data_support_index.py
+A2 Data Support Index
+Server-side (similarity, sample_count) from k-nearest-neighbour queries over
+the 27-dimensional stage profiles of past systems with known outcomes.
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from .nine_pd import NINE_PD_DIMENSIONS, PLA_STAGES
+
+logger = logging.getLogger(__name__)
+
+PROFILE_WIDTH = len(PLA_STAGES) * len(NINE_PD_DIMENSIONS)
+
+
+def _flat_profiles(profiles: np.ndarray) -> np.ndarray:
+    """(N, 27) from (3, 9), (27,), (N, 3, 9) or (N, 27) stage profiles."""
+    profiles = np.asarray(profiles, dtype=np.float64)
+    if profiles.size % PROFILE_WIDTH or profiles.shape[-1] not in (PROFILE_WIDTH, len(NINE_PD_DIMENSIONS)):
+        raise ValueError(f"stage profiles must have shape (..., 3, 9) or (..., 27), got {profiles.shape}")
+    return profiles.reshape(-1, PROFILE_WIDTH)
+
+
+class DataSupportIndex:
+    """
+    k-NN index over historical system profiles, fed by calibration outcomes.
+
+    track() remembers the (3, 9) profile behind each calibration event;
+    add_outcomes() moves the profiles of events whose performance has been
+    backfilled into the index. New points go to a small fresh buffer that is
+    searched by brute force next to the built index, and are folded in (a
+    rebuild) every rebuild_every points, keeping at most max_points, newest
+    first. Queries are an exact brute-force distance scan over numpy arrays;
+    that is the intended backend (no scipy dependency) and stays around a
+    millisecond per query up to MAX_POINTS.
+
+    The index is per process. At startup the router seeds it with add() from
+    the stage profiles stored alongside calibration events that have an
+    outcome (calibration_store, migration_004), newest max_points, so every
+    worker and restart starts from the same history; afterwards each worker
+    also learns from the outcomes of events it underwrote itself.
+
+    query() returns None until min_points outcomes are indexed, so callers
+    keep the DataSupportInput defaults on a cold index. Otherwise, over the k
+    nearest neighbours at Euclidean distance d:
+        similarity   = 1 - mean(d) / SIMILARITY_DISTANCE   (clipped to [0, 1])
+        sample_count = (# neighbours with d <= RADIUS) / k
+    both rounded to 4 places so identical systems map to identical inputs.
+    """
+
+    K = 20                      # neighbours per query
+    RADIUS = 0.5                # distance within which a neighbour counts as a supporting sample
+    SIMILARITY_DISTANCE = 1.0   # mean neighbour distance at which similarity reaches 0
+    MIN_POINTS = 100            # indexed outcomes before query() answers
+    REBUILD_EVERY = 1024        # fresh points before the index is rebuilt
+    MAX_POINTS = 50_000         # indexed outcomes kept (oldest dropped on rebuild)
+    MAX_PENDING = 100_000       # tracked events awaiting an outcome (oldest dropped)
+
+    def __init__(self,
+                 k: Optional[int] = None,
+                 radius: Optional[float] = None,
+                 similarity_distance: Optional[float] = None,
+                 min_points: Optional[int] = None,
+                 rebuild_every: Optional[int] = None,
+                 max_points: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        self.k = k or self.K
+        self.radius = self.RADIUS if radius is None else radius
+        self.similarity_distance = similarity_distance or self.SIMILARITY_DISTANCE
+        self.min_points = self.MIN_POINTS if min_points is None else min_points
+        self.rebuild_every = rebuild_every or self.REBUILD_EVERY
+        self.max_points = max_points or self.MAX_POINTS
+        self.max_pending = max_pending or self.MAX_PENDING
+        if self.max_points < self.k:
+            raise ValueError(f"max_points ({self.max_points}) must be >= k ({self.k})")
+        self._pending: 'OrderedDict[UUID, np.ndarray]' = OrderedDict()
+        # Built index: points and their squared norms, swapped as one tuple
+        self._built: Tuple[np.ndarray, np.ndarray] = (np.empty((0, PROFILE_WIDTH)), np.empty(0))
+        self._fresh = np.empty((self.rebuild_every, PROFILE_WIDTH), dtype=np.float64)
+        self._n_fresh = 0
+        self.rebuilds = 0
+        self.dropped_pending = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._built[0]) + self._n_fresh
+
+    def track(self, event_id: UUID, profiles: np.ndarray):
+        """Remember the stage profiles underwritten as event_id until its outcome arrives."""
+        self.track_many([event_id], profiles)
+
+    def track_many(self, event_ids: Sequence[UUID], profiles: np.ndarray):
+        flat = _flat_profiles(profiles)
+        if len(flat) != len(event_ids):
+            raise ValueError(f"{len(event_ids)} event ids for {len(flat)} profiles")
+        for event_id, row in zip(event_ids, flat):
+            self._pending[event_id] = row
+        overflow = len(self._pending) - self.max_pending
+        for _ in range(max(overflow, 0)):
+            self._pending.popitem(last=False)
+            self.dropped_pending += 1
+
+    def add_outcomes(self, event_ids: Iterable[UUID]) -> int:
+        """Index the tracked profiles of events with a backfilled outcome; returns how many were added."""
+        rows = [row for row in (self._pending.pop(event_id, None) for event_id in event_ids) if row is not None]
+        if rows:
+            self.add(np.array(rows))
+        return len(rows)
+
+    def add(self, profiles: np.ndarray):
+        """Index profiles directly, e.g. when seeding from historical outcomes."""
+        flat = _flat_profiles(profiles)
+        start = 0
+        while start < len(flat):
+            take = min(self.rebuild_every - self._n_fresh, len(flat) - start)
+            self._fresh[self._n_fresh:self._n_fresh + take] = flat[start:start + take]
+            self._n_fresh += take
+            start += take
+            if self._n_fresh == self.rebuild_every:
+                self.rebuild()
+
+    def rebuild(self):
+        """Fold the fresh buffer into the built index."""
+        points = np.concatenate([self._built[0], self._fresh[:self._n_fresh]])[-self.max_points:]
+        self._built = (points, np.einsum('ij,ij->i', points, points))
+        self._n_fresh = 0
+        self.rebuilds += 1
+        logger.debug(f"Data support index rebuilt: {len(points)} points")
+
+    def query(self, profiles: np.ndarray) -> Optional[Tuple[float, float]]:
+        """(similarity, sample_count) for one system's stage profiles, or None on a cold index."""
+        support = self.query_many(profiles)
+        return None if support is None else tuple(support[0].tolist())
+
+    def query_many(self, profiles: np.ndarray) -> Optional[np.ndarray]:
+        """(N, 2) (similarity, sample_count) for N systems, or None on a cold index."""
+        flat = _flat_profiles(profiles)
+        if self.size < max(self.min_points, 1):
+            return None
+        distances = self._neighbour_distances(flat)
+        similarity = np.clip(1.0 - distances.mean(axis=1) / self.similarity_distance, 0.0, 1.0)
+        sample_count = (distances <= self.radius).sum(axis=1) / self.k
+        return np.round(np.column_stack([similarity, sample_count]), 4)
+
+    def _neighbour_distances(self, queries: np.ndarray) -> np.ndarray:
+        """(N, min(k, size)) distances to the nearest indexed points."""
+        points, norms = self._built
+        k = min(self.k, self.size)
+        candidates = []
+        if len(points):
+            candidates.append(self._brute_force(queries, points, norms, k))
+        if self._n_fresh:
+            fresh = self._fresh[:self._n_fresh]
+            candidates.append(self._brute_force(queries, fresh, np.einsum('ij,ij->i', fresh, fresh), k))
+        distances = np.concatenate(candidates, axis=1) if len(candidates) > 1 else candidates[0]
+        if distances.shape[1] > k:
+            distances = np.partition(distances, k - 1, axis=1)[:, :k]
+        return distances
+
+    @staticmethod
+    def _brute_force(queries: np.ndarray, points: np.ndarray, norms: np.ndarray, k: int) -> np.ndarray:
+        """k smallest distances per query via |q|^2 - 2 q.p + |p|^2, in row chunks bounding the (Q, M) block."""
+        k = min(k, len(points))
+        rows = max(1, 4_000_000 // len(points))
+        out = np.empty((len(queries), k), dtype=np.float64)
+        for start in range(0, len(queries), rows):
+            block = queries[start:start + rows]
+            squared = np.einsum('ij,ij->i', block, block)[:, None] - 2.0 * (block @ points.T) + norms
+            if k < len(points):
+                squared = np.partition(squared, k - 1, axis=1)[:, :k]
+            out[start:start + len(block)] = np.sqrt(np.maximum(squared, 0.0))
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'points': self.size,
+            'pending_outcomes': len(self._pending),
+            'ready': self.size >= max(self.min_points, 1),
+            'backend': 'brute_force',
+            'rebuilds': self.rebuilds,
+            'dropped_pending': self.dropped_pending,
+            'k': self.k,
+            'radius': self.radius
+        }
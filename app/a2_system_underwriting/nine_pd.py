@@ -0,0 +1,82 @@
+"""
+nine_pd.py
+A2 Nine Dimensions (9PD) Profile Layout
+"""
+from collections.abc import Mapping
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+# Fixed dimension order; matches NinePDProfile field order in the router
+NINE_PD_DIMENSIONS = (
+    'presence',
+    'trust',
+    'authenticity',
+    'momentum',
+    'taste',
+    'empathy',
+    'autonomy',
+    'resonance',
+    'ethics'
+)
+
+# PLA system stage order (Image→Video→Landing Page)
+PLA_STAGES = ('image', 'video', 'landing_page')
+
+DIMENSION_INDEX = {dim: i for i, dim in enumerate(NINE_PD_DIMENSIONS)}
+
+
+class NinePDVector(Mapping):
+    """
+    Fixed-order 9PD profile backed by a float64 array of shape (9,).
+
+    Reads like the dict form (profile['trust'], .get(), .items(), **profile)
+    so existing dict consumers accept it unchanged, while array-aware code
+    uses .array directly. Built from an existing array it is a view, not a
+    copy: rows(stage_matrix) yields per-stage vectors sharing the (3, 9)
+    buffer, and np.asarray(vector) returns the same memory.
+    """
+    __slots__ = ('array',)
+
+    def __init__(self, values):
+        array = np.asarray(values, dtype=np.float64)
+        if array.shape != (len(NINE_PD_DIMENSIONS),):
+            raise ValueError(f"NinePDVector needs {len(NINE_PD_DIMENSIONS)} values, got shape {array.shape}")
+        self.array = array
+
+    @classmethod
+    def from_mapping(cls, profile, default: float = 0.5) -> 'NinePDVector':
+        """From a dict, NinePDProfile (or any object with 9PD attributes) or another vector."""
+        if isinstance(profile, NinePDVector):
+            return profile
+        if isinstance(profile, Mapping):
+            return cls([profile.get(dim, default) for dim in NINE_PD_DIMENSIONS])
+        return cls([getattr(profile, dim, default) for dim in NINE_PD_DIMENSIONS])
+
+    @classmethod
+    def rows(cls, matrix: np.ndarray) -> Tuple['NinePDVector', ...]:
+        """One vector view per row of a (S, 9) matrix."""
+        return tuple(cls(row) for row in np.asarray(matrix, dtype=np.float64))
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(zip(NINE_PD_DIMENSIONS, self.array.tolist()))
+
+    def __getitem__(self, dim: str) -> float:
+        return float(self.array[DIMENSION_INDEX[dim]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(NINE_PD_DIMENSIONS)
+
+    def __len__(self) -> int:
+        return len(NINE_PD_DIMENSIONS)
+
+    def __array__(self, dtype=None):
+        return self.array if dtype is None else self.array.astype(dtype, copy=False)
+
+    def __repr__(self) -> str:
+        return f"NinePDVector({self.to_dict()})"
+
+
+def stage_matrix(*profiles) -> np.ndarray:
+    """(S, 9) array from per-stage profiles in any accepted form."""
+    return np.stack([NinePDVector.from_mapping(p).array for p in profiles])
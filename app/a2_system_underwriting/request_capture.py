@@ -0,0 +1,182 @@
+"""
+request_capture.py
+A2 Underwriting Request Capture
+Records /v1/a2/underwrite request bodies into compressed columnar .npz
+segments for offline replay (see request_replay.py).
+"""
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, Mapping, Optional
+
+import numpy as np
+
+from .nine_pd import NINE_PD_DIMENSIONS, PLA_STAGES
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+
+# Defaults the router applies to missing stage keys, so replay reproduces them
+MISSING_STAGE_FIT = 0.0
+MISSING_STAGE_CONFIDENCE = 0.5
+
+
+def _empty_columns(rows: int) -> Dict[str, np.ndarray]:
+    stages, dims = len(PLA_STAGES), len(NINE_PD_DIMENSIONS)
+    return {
+        'captured_at': np.zeros(rows, dtype=np.float64),
+        'brand_id': np.empty(rows, dtype=object),
+        'sector': np.empty(rows, dtype=object),
+        'stage_profiles': np.zeros((rows, stages, dims), dtype=np.float64),
+        'stage_fits': np.zeros((rows, stages), dtype=np.float64),
+        'stage_confidences': np.zeros((rows, stages), dtype=np.float64),
+        'stage_gates_passed': np.zeros((rows, stages), dtype=bool),
+        # NaN rows mean data_support was omitted (router default applies)
+        'data_support': np.zeros((rows, 2), dtype=np.float64),
+        'measurement_quality': np.zeros(rows, dtype=np.float64)
+    }
+
+
+class UnderwritingCapture:
+    """
+    Columnar recorder for underwriting request bodies.
+
+    record() copies one request into preallocated typed arrays (profiles
+    (N, 3, 9), fits/confidences/gates (N, 3), data_support (N, 2),
+    measurement_quality (N,)); every segment_rows requests the buffer is
+    handed to a background thread and written as one compressed .npz segment,
+    so capture costs the request path a few array stores. Only the
+    image/video/landing_page gate keys are kept. Segment names carry the
+    process id and a random tag, so workers sharing a directory never write
+    the same path; a failed write is logged and leaves no .tmp file behind.
+    """
+
+    def __init__(self, directory: str, segment_rows: int = 50_000):
+        if segment_rows <= 0:
+            raise ValueError(f"segment_rows must be > 0, got {segment_rows}")
+        self.directory = directory
+        self.segment_rows = segment_rows
+        os.makedirs(directory, exist_ok=True)
+        self._prefix = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._columns = _empty_columns(segment_rows)
+        self._rows = 0
+        self._segments = 0
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='a2-capture')
+        self.captured = 0
+        self.write_failures = 0
+
+    def record(self, payload: Mapping[str, Any]):
+        """payload is an underwriting request body (dict or A2UnderwritingRequest.model_dump())."""
+        i = self._rows
+        columns = self._columns
+        columns['captured_at'][i] = time.time()
+        columns['brand_id'][i] = payload['brand_id']
+        columns['sector'][i] = payload.get('sector', 'BEAUTY_SKINCARE')
+        profiles = payload['stage_profiles']
+        for s, stage in enumerate(PLA_STAGES):
+            profile = profiles[stage]
+            columns['stage_profiles'][i, s] = [profile[dim] for dim in NINE_PD_DIMENSIONS]
+        fits = payload['stage_fits']
+        confidences = payload['stage_confidences']
+        gates = payload['stage_gates_passed']
+        columns['stage_fits'][i] = [fits.get(stage, MISSING_STAGE_FIT) for stage in PLA_STAGES]
+        columns['stage_confidences'][i] = [confidences.get(stage, MISSING_STAGE_CONFIDENCE) for stage in PLA_STAGES]
+        columns['stage_gates_passed'][i] = [gates.get(stage, True) for stage in PLA_STAGES]
+        data_support = payload.get('data_support')
+        if data_support is None:
+            columns['data_support'][i] = np.nan
+        else:
+            columns['data_support'][i] = [data_support['similarity'], data_support['sample_count']]
+        columns['measurement_quality'][i] = payload.get('measurement_quality', 0.85)
+
+        self._rows += 1
+        self.captured += 1
+        if self._rows == self.segment_rows:
+            self._rotate()
+
+    def flush(self):
+        if self._rows:
+            self._rotate()
+
+    def close(self):
+        self.flush()
+        self._writer.shutdown(wait=True)
+
+    def _rotate(self):
+        columns, rows = self._columns, self._rows
+        self._segments += 1
+        path = os.path.join(self.directory, f"a2-capture-{self._prefix}-{self._segments:05d}.npz")
+        self._columns = _empty_columns(self.segment_rows)
+        self._rows = 0
+        future = self._writer.submit(self._write, path, columns, rows)
+        future.add_done_callback(lambda f: self._written(f, path, rows))
+
+    def _written(self, future, path: str, rows: int):
+        # Runs on the writer thread: only logs and counts
+        error = future.exception()
+        if error is not None:
+            self.write_failures += 1
+            logger.error(f"A2 capture segment {path} failed, {rows} requests lost: {str(error)}")
+
+    @staticmethod
+    def _write(path: str, columns: Dict[str, np.ndarray], rows: int):
+        data = {name: column[:rows] for name, column in columns.items()}
+        data['brand_id'] = data['brand_id'].astype(str)
+        data['sector'] = data['sector'].astype(str)
+        tmp = path + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                np.savez_compressed(f, version=np.int32(CAPTURE_VERSION), **data)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        logger.info(f"A2 capture segment written: {path} ({rows} requests)")
+
+
+def load_capture(path: str) -> Dict[str, np.ndarray]:
+    """Load one capture segment, or every *.npz segment of a directory in name order."""
+    if os.path.isdir(path):
+        files = sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith('.npz'))
+    else:
+        files = [path]
+    if not files:
+        raise ValueError(f"No capture segments found in {path}")
+
+    parts = []
+    for name in files:
+        with np.load(name) as data:
+            version = int(data['version']) if 'version' in data.files else None
+            if version != CAPTURE_VERSION:
+                raise ValueError(f"Unsupported capture version {version} in {name}")
+            parts.append({k: data[k] for k in data.files if k != 'version'})
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def capture_payloads(columns: Mapping[str, np.ndarray], limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Rebuild JSON request bodies from captured columns."""
+    n = len(columns['measurement_quality']) if limit is None else min(limit, len(columns['measurement_quality']))
+    profiles = columns['stage_profiles'].tolist()
+    fits = columns['stage_fits'].tolist()
+    confidences = columns['stage_confidences'].tolist()
+    gates = columns['stage_gates_passed'].tolist()
+    data_support = columns['data_support'].tolist()
+    for i in range(n):
+        payload = {
+            'brand_id': str(columns['brand_id'][i]),
+            'sector': str(columns['sector'][i]),
+            'stage_profiles': {
+                stage: dict(zip(NINE_PD_DIMENSIONS, profiles[i][s])) for s, stage in enumerate(PLA_STAGES)
+            },
+            'stage_fits': dict(zip(PLA_STAGES, fits[i])),
+            'stage_confidences': dict(zip(PLA_STAGES, confidences[i])),
+            'stage_gates_passed': dict(zip(PLA_STAGES, gates[i])),
+            'measurement_quality': float(columns['measurement_quality'][i])
+        }
+        if not np.isnan(data_support[i][0]):
+            payload['data_support'] = {'similarity': data_support[i][0], 'sample_count': data_support[i][1]}
+        yield payload
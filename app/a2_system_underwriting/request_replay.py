@@ -0,0 +1,189 @@
+"""
+request_replay.py
+A2 Underwriting Replay Harness
+Replays captured /v1/a2/underwrite traffic (request_capture.py) in-process
+or over HTTP at a fixed arrival rate and reports throughput and latency.
+
+Usage:
+    python -m app.a2_system_underwriting.request_replay captures/ --mode inprocess
+    python -m app.a2_system_underwriting.request_replay captures/ --mode batch --batch-size 1000
+    python -m app.a2_system_underwriting.request_replay captures/ --mode http \\
+        --url http://localhost:8080 --rate 500 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .request_capture import load_capture, capture_payloads
+from .a2_underwriting_router import A2UnderwritingRequest, evaluate_system, batch_engine
+from .verbosity import Verbosity
+
+REPLAY_MODES = ('inprocess', 'batch', 'http')
+
+
+def latency_report(latencies: Sequence[float], errors: int, duration: float, requests: int) -> Dict[str, Any]:
+    """Throughput over wall time and latency percentiles in milliseconds."""
+    ms = np.asarray(latencies, dtype=np.float64) * 1000.0
+    report = {
+        'requests': requests,
+        'errors': errors,
+        'duration_s': round(duration, 4),
+        'throughput_rps': round(requests / duration, 2) if duration > 0 else 0.0
+    }
+    if len(ms):
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        report['latency_ms'] = {
+            'mean': round(float(ms.mean()), 4),
+            'p50': round(float(p50), 4),
+            'p95': round(float(p95), 4),
+            'p99': round(float(p99), 4),
+            'max': round(float(ms.max()), 4)
+        }
+    return report
+
+
+def replay_inprocess(columns: Mapping[str, np.ndarray],
+                     rate: Optional[float] = None,
+                     limit: Optional[int] = None,
+                     verbosity: Verbosity = Verbosity.STANDARD) -> Dict[str, Any]:
+    """
+    Request validation plus the underwriting pipeline, one request at a time
+    (no cache, no calibration tracking). With rate set, arrivals are paced on
+    a fixed schedule and latency is measured from the scheduled arrival, so
+    a slow request delays, and is charged to, the ones queued behind it.
+    """
+    payloads = list(capture_payloads(columns, limit))
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    for i, payload in enumerate(payloads):
+        scheduled = start + i / rate if rate else time.perf_counter()
+        wait = scheduled - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            evaluate_system(A2UnderwritingRequest(**payload), verbosity)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - scheduled)
+    return latency_report(latencies, errors, time.perf_counter() - start, len(payloads))
+
+
+def replay_batch(columns: Mapping[str, np.ndarray],
+                 batch_size: int = 1000,
+                 limit: Optional[int] = None) -> Dict[str, Any]:
+    """Captured columns straight into BatchUnderwritingEngine; latency is per batch."""
+    n = len(columns['measurement_quality']) if limit is None else min(limit, len(columns['measurement_quality']))
+    data_support = columns['data_support'][:n].copy()
+    omitted = np.isnan(data_support[:, 0])
+    data_support[omitted] = batch_engine.DEFAULT_DATA_SUPPORT
+    latencies = []
+    start = time.perf_counter()
+    for lo in range(0, n, batch_size):
+        rows = slice(lo, min(lo + batch_size, n))
+        began = time.perf_counter()
+        batch_engine.evaluate(
+            stage_profiles=columns['stage_profiles'][rows],
+            stage_fits=columns['stage_fits'][rows],
+            stage_confidences=columns['stage_confidences'][rows],
+            stage_gates_passed=columns['stage_gates_passed'][rows],
+            data_support=data_support[rows],
+            measurement_quality=columns['measurement_quality'][rows]
+        )
+        latencies.append(time.perf_counter() - began)
+    report = latency_report(latencies, 0, time.perf_counter() - start, n)
+    report['batch_size'] = batch_size
+    return report
+
+
+async def replay_http(columns: Mapping[str, np.ndarray],
+                      base_url: str = "http://localhost:8080",
+                      rate: Optional[float] = None,
+                      concurrency: int = 16,
+                      limit: Optional[int] = None,
+                      verbosity: Verbosity = Verbosity.STANDARD,
+                      client=None) -> Dict[str, Any]:
+    """
+    POST captured bodies to {base_url}/v1/a2/underwrite. With rate set this
+    is open-loop (arrivals on a fixed schedule, at most `concurrency` in
+    flight, latency from scheduled arrival); without it, `concurrency`
+    closed-loop workers send back to back.
+    """
+    import httpx
+
+    payloads = list(capture_payloads(columns, limit))
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(base_url=base_url, timeout=30.0)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def send(payload: Dict[str, Any], scheduled: float):
+        nonlocal errors
+        async with semaphore:
+            if scheduled is None:
+                scheduled = loop.time()
+            try:
+                response = await client.post("/v1/a2/underwrite", json=payload,
+                                             params={'verbosity': Verbosity(verbosity).value})
+                if response.status_code != 200:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(loop.time() - scheduled)
+
+    try:
+        if rate:
+            tasks = []
+            for i, payload in enumerate(payloads):
+                scheduled = start + i / rate
+                delay = scheduled - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(send(payload, scheduled)))
+            await asyncio.gather(*tasks)
+        else:
+            await asyncio.gather(*(send(payload, None) for payload in payloads))
+    finally:
+        if owns_client:
+            await client.aclose()
+    return latency_report(latencies, errors, loop.time() - start, len(payloads))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay captured A2 underwriting traffic")
+    parser.add_argument('capture', help="Capture segment (.npz) or directory of segments")
+    parser.add_argument('--mode', choices=REPLAY_MODES, default='inprocess')
+    parser.add_argument('--rate', type=float, default=None, help="Arrivals per second (default: as fast as possible)")
+    parser.add_argument('--limit', type=int, default=None, help="Replay at most this many requests")
+    parser.add_argument('--url', default="http://localhost:8080", help="Base URL for --mode http")
+    parser.add_argument('--concurrency', type=int, default=16, help="Max in-flight requests for --mode http")
+    parser.add_argument('--verbosity', choices=[v.value for v in Verbosity], default=Verbosity.STANDARD.value)
+    parser.add_argument('--batch-size', type=int, default=1000, help="Rows per engine call for --mode batch")
+    args = parser.parse_args(argv)
+
+    columns = load_capture(args.capture)
+    if args.mode == 'inprocess':
+        report = replay_inprocess(columns, rate=args.rate, limit=args.limit, verbosity=Verbosity(args.verbosity))
+    elif args.mode == 'batch':
+        report = replay_batch(columns, batch_size=args.batch_size, limit=args.limit)
+    else:
+        report = asyncio.run(replay_http(columns, args.url, rate=args.rate,
+                                         concurrency=args.concurrency, limit=args.limit,
+                                         verbosity=Verbosity(args.verbosity)))
+    report['mode'] = args.mode
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
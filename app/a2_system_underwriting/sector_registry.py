@@ -0,0 +1,276 @@
+"""
+sector_registry.py
+A2 Per-Sector Parameter Registry
+Compiles per-sector overrides of the A2 class constants (stage weights,
+confidence weights, decision thresholds, penalty rules) into immutable
+component snapshots and hot-reloads them from a JSON file or Postgres.
+"""
+import asyncio
+import copy
+import functools
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+
+from .system_fit_aggregator import SystemFitAggregator
+from .transition_penalty_checker import TransitionPenaltyChecker
+from .system_confidence_calculator import SystemConfidenceCalculator
+from .system_decision_engine import SystemDecisionEngine
+from .batch_underwriting_engine import BatchUnderwritingEngine
+from .system_optimizer import SystemOptimizer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VERSION = "builtin"
+
+TABLE_NAME = "a2_sector_parameters"
+
+# Newest row first: its version labels the loaded configuration
+SELECT_SQL = f"SELECT sector_id, parameters, version FROM {TABLE_NAME} ORDER BY updated_at DESC, sector_id"
+
+# Parameter name -> (component class, class constant) it overrides
+PARAMETERS = {
+    'stage_weights': (SystemFitAggregator, 'STAGE_WEIGHTS'),
+    'penalty_cap': (SystemFitAggregator, 'PENALTY_CAP'),
+    'confidence_weights': (SystemConfidenceCalculator, 'WEIGHTS'),
+    'stage_confidence_weights': (SystemConfidenceCalculator, 'STAGE_CONFIDENCE_WEIGHTS'),
+    'thresholds': (SystemDecisionEngine, 'THRESHOLDS'),
+    'penalty_rules': (TransitionPenaltyChecker, 'PENALTY_RULES'),
+}
+
+
+@dataclass(frozen=True)
+class SectorSnapshot:
+    """
+    Ready-to-use components for one sector; never mutated after compile.
+    Pickles as its (sector, parameters, version) source, so process-pool
+    workers rebuild it once per version instead of receiving the components.
+    digest identifies the parameter content (version is only a label, and
+    a reload may change parameters under the same label); results derived
+    from a snapshot are keyed by it.
+    """
+    sector: str
+    version: str
+    parameters: str
+    digest: str
+    aggregator: SystemFitAggregator
+    penalty_checker: TransitionPenaltyChecker
+    confidence_calculator: SystemConfidenceCalculator
+    decision_engine: SystemDecisionEngine
+    batch_engine: BatchUnderwritingEngine
+    optimizer: SystemOptimizer
+    
+    def __reduce__(self):
+        return (_compiled_sector, (self.sector, self.parameters, self.version))
+
+
+@dataclass(frozen=True)
+class _RegistryState:
+    version: str
+    default: SectorSnapshot
+    sectors: Mapping[str, SectorSnapshot]
+
+
+def _merge(base: Any, override: Any) -> Any:
+    """Deep-merge override dicts into a copy of base; lists and scalars replace."""
+    if isinstance(base, dict) and isinstance(override, Mapping):
+        merged = {k: copy.deepcopy(v) for k, v in base.items()}
+        for key, value in override.items():
+            if key not in base:
+                raise ValueError(f"Unknown parameter key '{key}' (expected one of {sorted(base)})")
+            merged[key] = _merge(base[key], value)
+        return merged
+    if isinstance(base, (int, float)) and not isinstance(base, bool):
+        if isinstance(override, bool) or not isinstance(override, (int, float)):
+            raise ValueError(f"Expected a number, got {override!r}")
+        return float(override)
+    return copy.deepcopy(override)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def compile_sector(sector: str, overrides: Optional[Mapping[str, Any]] = None,
+                   version: str = DEFAULT_VERSION) -> SectorSnapshot:
+    """Validate overrides against the class defaults and build the sector's components."""
+    overrides = overrides or {}
+    unknown = set(overrides) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Sector {sector}: unknown parameters {sorted(unknown)}")
+
+    params = {}
+    for name, (component, constant) in PARAMETERS.items():
+        default = getattr(component, constant)
+        try:
+            params[name] = _merge(default, overrides[name]) if name in overrides else copy.deepcopy(default)
+        except ValueError as e:
+            raise ValueError(f"Sector {sector}: {name}: {e}") from e
+    for name in ('stage_weights', 'confidence_weights', 'stage_confidence_weights'):
+        total = sum(params[name].values())
+        if abs(total - 1.0) > 1e-6:
+            raise ValueError(f"Sector {sector}: {name} must sum to 1.0, got {total}")
+
+    # Penalty rules are compiled (and validated) by the checker itself
+    try:
+        penalty_checker = TransitionPenaltyChecker(rules=params['penalty_rules'])
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Sector {sector}: penalty_rules: {e}") from e
+    penalty_checker.PENALTY_RULES = _freeze(params['penalty_rules'])
+    aggregator = SystemFitAggregator(stage_weights=_freeze(params['stage_weights']), penalty_cap=params['penalty_cap'])
+    confidence_calculator = SystemConfidenceCalculator(
+        weights=_freeze(params['confidence_weights']),
+        stage_confidence_weights=_freeze(params['stage_confidence_weights'])
+    )
+    decision_engine = SystemDecisionEngine(thresholds=_freeze(params['thresholds']))
+    batch_engine = BatchUnderwritingEngine(
+        aggregator=aggregator,
+        penalty_checker=penalty_checker,
+        confidence_calculator=confidence_calculator,
+        decision_engine=decision_engine
+    )
+    parameters = json.dumps(overrides, sort_keys=True, separators=(',', ':'))
+    return SectorSnapshot(
+        sector=sector,
+        version=version,
+        parameters=parameters,
+        digest=hashlib.sha256(parameters.encode('utf-8')).hexdigest()[:16],
+        aggregator=aggregator,
+        penalty_checker=penalty_checker,
+        confidence_calculator=confidence_calculator,
+        decision_engine=decision_engine,
+        batch_engine=batch_engine,
+        optimizer=SystemOptimizer(engine=batch_engine)
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _compiled_sector(sector: str, parameters: str, version: str) -> SectorSnapshot:
+    return compile_sector(sector, json.loads(parameters), version=version)
+
+
+class SectorRegistry:
+    """
+    Sector -> SectorSnapshot lookup with atomic hot reload.
+
+    All state lives behind one reference (_state). load() compiles the whole
+    new configuration off to the side and then rebinds that reference, so a
+    request calling get() sees either the old or the new parameter set,
+    never a mix, and never takes a lock or parses anything. A configuration
+    that fails validation is rejected and the current snapshots stay live.
+
+    Configuration shape (file or rows from a2_sector_parameters):
+        {"version": "...", "sectors": {"BEAUTY_SKINCARE": {"thresholds": {...}}, ...}}
+    Sectors without an entry use the built-in class constants.
+    """
+
+    def __init__(self):
+        default = compile_sector('*')
+        self._state = _RegistryState(version=DEFAULT_VERSION, default=default, sectors=MappingProxyType({}))
+        self._source_mtime: Optional[float] = None
+        self._db_config: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> str:
+        return self._state.version
+
+    def get(self, sector: Optional[str]) -> SectorSnapshot:
+        state = self._state
+        return state.sectors.get(sector, state.default)
+
+    def sectors(self) -> Dict[str, str]:
+        state = self._state
+        return {sector: snapshot.version for sector, snapshot in state.sectors.items()}
+
+    def load(self, config: Mapping[str, Any]) -> str:
+        version = str(config.get('version', DEFAULT_VERSION))
+        sectors = config.get('sectors', {})
+        if not isinstance(sectors, Mapping):
+            raise ValueError("'sectors' must be an object of sector_id -> parameters")
+        compiled = {
+            sector: compile_sector(sector, overrides, version=f"{version}:{sector}")
+            for sector, overrides in sectors.items()
+        }
+        default = compile_sector('*', config.get('default'), version=f"{version}:*")
+        # The swap: one reference assignment
+        self._state = _RegistryState(version=version, default=default, sectors=MappingProxyType(compiled))
+        logger.info(f"A2 sector parameters loaded: version={version}, sectors={sorted(compiled)}")
+        return version
+
+    def load_file(self, path: str) -> str:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        mtime = os.stat(path).st_mtime
+        version = self.load(config)
+        self._source_mtime = mtime
+        return version
+
+    async def load_db(self, pool) -> str:
+        """Rows of a2_sector_parameters (migration_002); the '*' row, if any, sets the default."""
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(SELECT_SQL)
+        sectors = {}
+        versions = []
+        # Rows arrive newest first (SELECT_SQL); version strings are labels, not ordered
+        for row in rows:
+            parameters = row['parameters']
+            if isinstance(parameters, str):
+                parameters = json.loads(parameters)
+            sectors[row['sector_id']] = parameters
+            versions.append(str(row['version']))
+        default = sectors.pop('*', None)
+        config = {'version': versions[0] if versions else DEFAULT_VERSION, 'sectors': sectors, 'default': default}
+        if config == self._db_config:
+            return self.version
+        version = self.load(config)
+        self._db_config = config
+        return version
+
+    def reload_file_if_changed(self, path: str) -> bool:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError as e:
+            logger.error(f"A2 sector parameters unavailable: {str(e)}")
+            return False
+        if mtime == self._source_mtime:
+            return False
+        try:
+            self.load_file(path)
+        except (OSError, ValueError) as e:
+            # json.JSONDecodeError is a ValueError
+            logger.error(f"A2 sector parameters rejected, keeping version {self.version}: {str(e)}")
+            self._source_mtime = mtime
+            return False
+        return True
+
+    def start_watching(self, interval: float, path: Optional[str] = None, pool=None):
+        """Poll the file (by mtime) or the table every interval seconds."""
+        async def watch():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    if path:
+                        self.reload_file_if_changed(path)
+                    elif pool is not None:
+                        await self.load_db(pool)
+                except Exception as e:
+                    logger.error(f"A2 sector parameter reload failed, keeping version {self.version}: {str(e)}")
+        self._task = asyncio.create_task(watch())
+
+    async def stop_watching(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
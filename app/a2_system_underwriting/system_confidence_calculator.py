@@ -3,9 +3,15 @@ system_confidence_calculator.py
 A2 System Confidence Calculator
 Implements PTC 5-component weighted formula
 """
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
+from app.utils.rounding import round_array
+from .nine_pd import NinePDVector
+from .verbosity import Verbosity
+
 
 @dataclass
 class ConfidenceComponents:
@@ -31,12 +37,21 @@ class SystemConfidenceCalculator:
         'landing_page': 0.40
     }
     
+    def __init__(self,
+                 weights: Optional[Dict[str, float]] = None,
+                 stage_confidence_weights: Optional[Dict[str, float]] = None):
+        if weights is not None:
+            self.WEIGHTS = weights
+        if stage_confidence_weights is not None:
+            self.STAGE_CONFIDENCE_WEIGHTS = stage_confidence_weights
+    
     def calculate(self,
                  stage_confidences: Dict[str, float],
                  data_support: Dict[str, float],
-                 psychological_profile: Dict[str, float],
+                 psychological_profile: Mapping[str, float],
                  transition_penalty_sum: float,
-                 measurement_quality: float = 0.85) -> Dict[str, Any]:
+                 measurement_quality: float = 0.85,
+                 verbosity: Verbosity = Verbosity.FULL) -> Dict[str, Any]:
         stage_component = (
             self.STAGE_CONFIDENCE_WEIGHTS['image'] * stage_confidences.get('image', 0.5) +
             self.STAGE_CONFIDENCE_WEIGHTS['video'] * stage_confidences.get('video', 0.5) +
@@ -47,7 +62,10 @@ class SystemConfidenceCalculator:
         sample_quality = data_support.get('sample_count', 0.7)
         data_support_score = (0.6 * similarity) + (0.4 * sample_quality)
         
-        dimension_values = list(psychological_profile.values())
+        if isinstance(psychological_profile, NinePDVector):
+            dimension_values = psychological_profile.array.tolist()
+        else:
+            dimension_values = list(psychological_profile.values())
         if len(dimension_values) > 0:
             mean_dim = sum(dimension_values) / len(dimension_values)
             variance = sum((x - mean_dim) ** 2 for x in dimension_values) / len(dimension_values)
@@ -76,7 +94,7 @@ class SystemConfidenceCalculator:
         
         system_confidence = max(0.0, min(1.0, system_confidence))
         
-        return {
+        result = {
             'system_confidence': round(system_confidence, 4),
             'components': {
                 'stage_component': round(components.stage_component, 4),
@@ -84,14 +102,82 @@ class SystemConfidenceCalculator:
                 'risk_component': round(components.risk_component, 4),
                 'transition_risk': round(components.transition_risk, 4),
                 'measurement': round(components.measurement, 4)
-            },
-            'weighted_contributions': {
-                'stage_component': round(self.WEIGHTS['stage_component'] * components.stage_component, 4),
-                'data_support': round(self.WEIGHTS['data_support'] * components.data_support, 4),
-                'risk_component': round(self.WEIGHTS['risk_component'] * components.risk_component, 4),
-                'transition_risk': round(self.WEIGHTS['transition_risk'] * components.transition_risk, 4),
-                'measurement': round(self.WEIGHTS['measurement'] * components.measurement, 4)
-            },
-            'weights_used': self.WEIGHTS,
-            'stage_confidence_weights': self.STAGE_CONFIDENCE_WEIGHTS
+            }
+        }
+        if verbosity == Verbosity.MINIMAL:
+            return result
+        result['weighted_contributions'] = {
+            'stage_component': round(self.WEIGHTS['stage_component'] * components.stage_component, 4),
+            'data_support': round(self.WEIGHTS['data_support'] * components.data_support, 4),
+            'risk_component': round(self.WEIGHTS['risk_component'] * components.risk_component, 4),
+            'transition_risk': round(self.WEIGHTS['transition_risk'] * components.transition_risk, 4),
+            'measurement': round(self.WEIGHTS['measurement'] * components.measurement, 4)
+        }
+        if verbosity == Verbosity.FULL:
+            result['weights_used'] = dict(self.WEIGHTS)
+            result['stage_confidence_weights'] = dict(self.STAGE_CONFIDENCE_WEIGHTS)
+        return result
+    
+    def calculate_array(self,
+                        stage_confidences: np.ndarray,
+                        data_support: np.ndarray,
+                        psychological_profile: np.ndarray,
+                        transition_penalty_sum: np.ndarray,
+                        measurement_quality: np.ndarray) -> Dict[str, Any]:
+        """
+        Column-wise twin of calculate(). stage_confidences is (N, 3) in
+        image/video/landing_page order, data_support is (N, 2) as
+        (similarity, sample_count), psychological_profile is (N, D).
+        """
+        stage_confidences = np.asarray(stage_confidences, dtype=np.float64)
+        data_support = np.asarray(data_support, dtype=np.float64)
+        profile = np.asarray(psychological_profile, dtype=np.float64)
+        transition_penalty_sum = np.asarray(transition_penalty_sum, dtype=np.float64)
+        measurement_score = np.asarray(measurement_quality, dtype=np.float64)
+        
+        stage_component = (
+            self.STAGE_CONFIDENCE_WEIGHTS['image'] * stage_confidences[:, 0] +
+            self.STAGE_CONFIDENCE_WEIGHTS['video'] * stage_confidences[:, 1] +
+            self.STAGE_CONFIDENCE_WEIGHTS['landing_page'] * stage_confidences[:, 2]
+        )
+        
+        data_support_score = (0.6 * data_support[:, 0]) + (0.4 * data_support[:, 1])
+        
+        # Sequential column sums keep the scalar summation order (np.sum is pairwise)
+        n_dims = profile.shape[1]
+        if n_dims > 0:
+            total = np.zeros(profile.shape[0], dtype=np.float64)
+            for d in range(n_dims):
+                total = total + profile[:, d]
+            mean_dim = total / n_dims
+            squared = np.zeros(profile.shape[0], dtype=np.float64)
+            for d in range(n_dims):
+                squared = squared + (profile[:, d] - mean_dim) ** 2
+            variance = squared / n_dims
+            risk_component = np.maximum(0.0, 1.0 - (variance * 2))
+        else:
+            risk_component = np.full(profile.shape[0], 0.5)
+        
+        transition_risk = np.maximum(0.0, 1.0 - (transition_penalty_sum * 2))
+        measurement_score = np.broadcast_to(measurement_score, stage_component.shape)
+        
+        system_confidence = (
+            self.WEIGHTS['stage_component'] * stage_component +
+            self.WEIGHTS['data_support'] * data_support_score +
+            self.WEIGHTS['risk_component'] * risk_component +
+            self.WEIGHTS['transition_risk'] * transition_risk +
+            self.WEIGHTS['measurement'] * measurement_score
+        )
+        
+        system_confidence = np.maximum(0.0, np.minimum(1.0, system_confidence))
+        
+        return {
+            'system_confidence': round_array(system_confidence),
+            'components': {
+                'stage_component': round_array(stage_component),
+                'data_support': round_array(data_support_score),
+                'risk_component': round_array(risk_component),
+                'transition_risk': round_array(transition_risk),
+                'measurement': round_array(measurement_score)
+            }
         }
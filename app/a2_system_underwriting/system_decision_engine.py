@@ -2,9 +2,13 @@
 system_decision_engine.py
 A2 System Decision Engine
 """
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from enum import Enum
 
+import numpy as np
+
+from .verbosity import Verbosity
+
 
 class DecisionBand(Enum):
     AUTO_LAUNCH = "AUTO_LAUNCH"
@@ -12,6 +16,27 @@ class DecisionBand(Enum):
     NO_LAUNCH = "NO_LAUNCH"
 
 
+class ReasonCode(Enum):
+    FIT_BELOW_NO_LAUNCH = "FIT_BELOW_NO_LAUNCH"
+    CONFIDENCE_BELOW_NO_LAUNCH = "CONFIDENCE_BELOW_NO_LAUNCH"
+    PENALTY_ABOVE_NO_LAUNCH = "PENALTY_ABOVE_NO_LAUNCH"
+    STAGE_GATES_FAILED = "STAGE_GATES_FAILED"
+    FIT_BELOW_AUTO_LAUNCH = "FIT_BELOW_AUTO_LAUNCH"
+    CONFIDENCE_BELOW_AUTO_LAUNCH = "CONFIDENCE_BELOW_AUTO_LAUNCH"
+    PENALTY_ABOVE_AUTO_LAUNCH = "PENALTY_ABOVE_AUTO_LAUNCH"
+    AUTO_LAUNCH_CONDITIONS_MET = "AUTO_LAUNCH_CONDITIONS_MET"
+
+
+# Integer band codes used by the array paths: index into this tuple
+DECISION_BAND_ORDER = tuple(DecisionBand)
+REASON_CODE_ORDER = tuple(ReasonCode)
+
+
+def _threshold(value: float) -> str:
+    # Rationale quotes thresholds with two decimals ("0.70"), or in full when finer
+    return f"{value:.2f}" if round(value, 2) == value else repr(value)
+
+
 class SystemDecisionEngine:
     THRESHOLDS = {
         'auto_launch': {
@@ -33,92 +58,172 @@ class SystemDecisionEngine:
         }
     }
     
+    def __init__(self, thresholds: Optional[Dict[str, Dict[str, Any]]] = None):
+        if thresholds is not None:
+            self.THRESHOLDS = thresholds
+    
     def make_decision(self,
                      system_fit: float,
                      system_confidence: float,
                      transition_penalty_sum: float,
-                     stage_gates_passed: Dict[str, bool]) -> Dict[str, Any]:
-        rationale = []
-        
-        no_launch_triggered = self._check_no_launch(
-            system_fit, system_confidence, transition_penalty_sum, 
-            stage_gates_passed, rationale
-        )
-        
-        if no_launch_triggered:
-            return {
-                'decision': DecisionBand.NO_LAUNCH.value,
-                'decision_rationale': rationale,
-                'system_fit': system_fit,
-                'system_confidence': system_confidence,
-                'transition_penalty_sum': transition_penalty_sum
-            }
-        
-        auto_launch_eligible = self._check_auto_launch(
-            system_fit, system_confidence, transition_penalty_sum,
-            stage_gates_passed, rationale
-        )
-        
-        if auto_launch_eligible:
-            return {
-                'decision': DecisionBand.AUTO_LAUNCH.value,
-                'decision_rationale': rationale,
-                'system_fit': system_fit,
-                'system_confidence': system_confidence,
-                'transition_penalty_sum': transition_penalty_sum
-            }
+                     stage_gates_passed: Dict[str, bool],
+                     verbosity: Verbosity = Verbosity.FULL) -> Dict[str, Any]:
+        reasons = self._no_launch_reasons(system_fit, system_confidence, transition_penalty_sum, stage_gates_passed)
+        if reasons:
+            decision = DecisionBand.NO_LAUNCH
+        else:
+            reasons = self._auto_launch_failures(system_fit, system_confidence, transition_penalty_sum, stage_gates_passed)
+            if reasons:
+                decision = DecisionBand.HUMAN_REVIEW
+            else:
+                decision = DecisionBand.AUTO_LAUNCH
+                reasons = [ReasonCode.AUTO_LAUNCH_CONDITIONS_MET]
         
-        rationale.append("System does not meet AUTO_LAUNCH thresholds and does not trigger NO_LAUNCH")
-        return {
-            'decision': DecisionBand.HUMAN_REVIEW.value,
-            'decision_rationale': rationale,
+        result = {
+            'decision': decision.value,
+            'reason_codes': [r.value for r in reasons],
             'system_fit': system_fit,
             'system_confidence': system_confidence,
             'transition_penalty_sum': transition_penalty_sum
         }
+        if verbosity != Verbosity.MINIMAL:
+            result['decision_rationale'] = self.render_rationale(
+                decision, reasons, system_fit, system_confidence, transition_penalty_sum, stage_gates_passed
+            )
+        return result
     
-    def _check_no_launch(self, fit: float, conf: float, penalty: float,
-                        gates: Dict[str, bool], rationale: List[str]) -> bool:
-        triggered = False
-        
+    def _no_launch_reasons(self, fit: float, conf: float, penalty: float,
+                           gates: Dict[str, bool]) -> List['ReasonCode']:
+        reasons = []
         if fit < self.THRESHOLDS['no_launch']['max_system_fit']:
-            rationale.append(f"system_fit {fit} < 0.70 (NO_LAUNCH threshold)")
-            triggered = True
-            
+            reasons.append(ReasonCode.FIT_BELOW_NO_LAUNCH)
         if conf < self.THRESHOLDS['no_launch']['max_system_confidence']:
-            rationale.append(f"system_confidence {conf} < 0.50 (NO_LAUNCH threshold)")
-            triggered = True
-            
+            reasons.append(ReasonCode.CONFIDENCE_BELOW_NO_LAUNCH)
         if penalty > self.THRESHOLDS['no_launch']['max_transition_penalty']:
-            rationale.append(f"transition_penalty_sum {penalty} > 0.18 (NO_LAUNCH threshold)")
-            triggered = True
-            
+            reasons.append(ReasonCode.PENALTY_ABOVE_NO_LAUNCH)
+        if not all(gates.values()):
+            reasons.append(ReasonCode.STAGE_GATES_FAILED)
+        return reasons
+    
+    def _auto_launch_failures(self, fit: float, conf: float, penalty: float,
+                              gates: Dict[str, bool]) -> List['ReasonCode']:
+        reasons = []
+        if not fit >= self.THRESHOLDS['auto_launch']['min_system_fit']:
+            reasons.append(ReasonCode.FIT_BELOW_AUTO_LAUNCH)
+        if not conf >= self.THRESHOLDS['auto_launch']['min_system_confidence']:
+            reasons.append(ReasonCode.CONFIDENCE_BELOW_AUTO_LAUNCH)
+        if not penalty <= self.THRESHOLDS['auto_launch']['max_transition_penalty']:
+            reasons.append(ReasonCode.PENALTY_ABOVE_AUTO_LAUNCH)
         if not all(gates.values()):
-            failed_stages = [k for k, v in gates.items() if not v]
-            rationale.append(f"Stage gates failed for: {failed_stages}")
-            triggered = True
-            
-        return triggered
+            reasons.append(ReasonCode.STAGE_GATES_FAILED)
+        return reasons
     
-    def _check_auto_launch(self, fit: float, conf: float, penalty: float,
-                          gates: Dict[str, bool], rationale: List[str]) -> bool:
-        checks = [
-            (fit >= self.THRESHOLDS['auto_launch']['min_system_fit'], 
-             f"system_fit {fit} >= 0.82"),
-            (conf >= self.THRESHOLDS['auto_launch']['min_system_confidence'],
-             f"system_confidence {conf} >= 0.72"),
-            (penalty <= self.THRESHOLDS['auto_launch']['max_transition_penalty'],
-             f"transition_penalty_sum {penalty} <= 0.08"),
-            (all(gates.values()), "All stage gates passed")
+    def render_rationale(self,
+                         decision: DecisionBand,
+                         reasons: List['ReasonCode'],
+                         fit: float, conf: float, penalty: float,
+                         gates: Dict[str, bool]) -> List[str]:
+        """Human-readable rationale for a decision's reason codes (only built on request)."""
+        auto, no = self.THRESHOLDS['auto_launch'], self.THRESHOLDS['no_launch']
+        if decision == DecisionBand.NO_LAUNCH:
+            messages = {
+                ReasonCode.FIT_BELOW_NO_LAUNCH: f"system_fit {fit} < {_threshold(no['max_system_fit'])} (NO_LAUNCH threshold)",
+                ReasonCode.CONFIDENCE_BELOW_NO_LAUNCH: f"system_confidence {conf} < {_threshold(no['max_system_confidence'])} (NO_LAUNCH threshold)",
+                ReasonCode.PENALTY_ABOVE_NO_LAUNCH: f"transition_penalty_sum {penalty} > {_threshold(no['max_transition_penalty'])} (NO_LAUNCH threshold)",
+                ReasonCode.STAGE_GATES_FAILED: f"Stage gates failed for: {[k for k, v in gates.items() if not v]}"
+            }
+            return [messages[r] for r in reasons]
+        
+        checks = {
+            ReasonCode.FIT_BELOW_AUTO_LAUNCH: f"system_fit {fit} >= {_threshold(auto['min_system_fit'])}",
+            ReasonCode.CONFIDENCE_BELOW_AUTO_LAUNCH: f"system_confidence {conf} >= {_threshold(auto['min_system_confidence'])}",
+            ReasonCode.PENALTY_ABOVE_AUTO_LAUNCH: f"transition_penalty_sum {penalty} <= {_threshold(auto['max_transition_penalty'])}",
+            ReasonCode.STAGE_GATES_FAILED: "All stage gates passed"
+        }
+        if decision == DecisionBand.AUTO_LAUNCH:
+            return ["All AUTO_LAUNCH conditions satisfied: " + ", ".join(checks.values())]
+        return [
+            f"AUTO_LAUNCH conditions not met: {[checks[r] for r in reasons]}",
+            "System does not meet AUTO_LAUNCH thresholds and does not trigger NO_LAUNCH"
         ]
+    
+    def make_decision_array(self,
+                            system_fit: np.ndarray,
+                            system_confidence: np.ndarray,
+                            transition_penalty_sum: np.ndarray,
+                            stage_gates_passed: np.ndarray,
+                            thresholds: Optional[Dict[str, Dict[str, Any]]] = None) -> np.ndarray:
+        """
+        Returns int8 band codes indexing DECISION_BAND_ORDER. stage_gates_passed
+        is (N,) "all gates passed" or (N, S) per-stage gate flags. thresholds
+        defaults to THRESHOLDS; its values may be arrays that broadcast against
+        the rows, e.g. (G, 1) to band N rows under G threshold sets at once.
+        """
+        thresholds = thresholds or self.THRESHOLDS
+        fit = np.asarray(system_fit, dtype=np.float64)
+        conf = np.asarray(system_confidence, dtype=np.float64)
+        penalty = np.asarray(transition_penalty_sum, dtype=np.float64)
+        gates = np.asarray(stage_gates_passed, dtype=bool)
+        if gates.ndim == 2:
+            gates = gates.all(axis=1)
         
-        all_passed = all(check[0] for check in checks)
+        no_launch = (
+            (fit < thresholds['no_launch']['max_system_fit']) |
+            (conf < thresholds['no_launch']['max_system_confidence']) |
+            (penalty > thresholds['no_launch']['max_transition_penalty']) |
+            ~gates
+        )
+        auto_launch = (
+            (fit >= thresholds['auto_launch']['min_system_fit']) &
+            (conf >= thresholds['auto_launch']['min_system_confidence']) &
+            (penalty <= thresholds['auto_launch']['max_transition_penalty']) &
+            gates
+        )
         
-        if all_passed:
-            rationale.append("All AUTO_LAUNCH conditions satisfied: " + 
-                           ", ".join([c[1] for c in checks]))
-        else:
-            failed = [c[1] for c in checks if not c[0]]
-            rationale.append(f"AUTO_LAUNCH conditions not met: {failed}")
-            
-        return all_passed
+        codes = np.where(
+            auto_launch,
+            np.int8(DECISION_BAND_ORDER.index(DecisionBand.AUTO_LAUNCH)),
+            np.int8(DECISION_BAND_ORDER.index(DecisionBand.HUMAN_REVIEW))
+        )
+        return np.where(no_launch, np.int8(DECISION_BAND_ORDER.index(DecisionBand.NO_LAUNCH)), codes).astype(np.int8, copy=False)
+    
+    def reason_mask_array(self,
+                          system_fit: np.ndarray,
+                          system_confidence: np.ndarray,
+                          transition_penalty_sum: np.ndarray,
+                          stage_gates_passed: np.ndarray) -> np.ndarray:
+        """(N, len(REASON_CODE_ORDER)) bool: the reason codes make_decision() reports per row."""
+        fit = np.asarray(system_fit, dtype=np.float64)
+        conf = np.asarray(system_confidence, dtype=np.float64)
+        penalty = np.asarray(transition_penalty_sum, dtype=np.float64)
+        gates = np.asarray(stage_gates_passed, dtype=bool)
+        if gates.ndim == 2:
+            gates = gates.all(axis=1)
+        
+        no_launch = {
+            ReasonCode.FIT_BELOW_NO_LAUNCH: fit < self.THRESHOLDS['no_launch']['max_system_fit'],
+            ReasonCode.CONFIDENCE_BELOW_NO_LAUNCH: conf < self.THRESHOLDS['no_launch']['max_system_confidence'],
+            ReasonCode.PENALTY_ABOVE_NO_LAUNCH: penalty > self.THRESHOLDS['no_launch']['max_transition_penalty'],
+            ReasonCode.STAGE_GATES_FAILED: ~gates
+        }
+        is_no_launch = np.logical_or.reduce(list(no_launch.values()))
+        auto_failures = {
+            ReasonCode.FIT_BELOW_AUTO_LAUNCH: ~(fit >= self.THRESHOLDS['auto_launch']['min_system_fit']),
+            ReasonCode.CONFIDENCE_BELOW_AUTO_LAUNCH: ~(conf >= self.THRESHOLDS['auto_launch']['min_system_confidence']),
+            ReasonCode.PENALTY_ABOVE_AUTO_LAUNCH: ~(penalty <= self.THRESHOLDS['auto_launch']['max_transition_penalty'])
+        }
+        is_human_review = ~is_no_launch & np.logical_or.reduce(list(auto_failures.values()))
+        
+        mask = np.zeros((len(fit), len(REASON_CODE_ORDER)), dtype=bool)
+        for code, hit in no_launch.items():
+            mask[:, REASON_CODE_ORDER.index(code)] = hit & is_no_launch
+        for code, hit in auto_failures.items():
+            mask[:, REASON_CODE_ORDER.index(code)] = hit & is_human_review
+        mask[:, REASON_CODE_ORDER.index(ReasonCode.AUTO_LAUNCH_CONDITIONS_MET)] = ~is_no_launch & ~is_human_review
+        return mask
+    
+    @staticmethod
+    def reason_code_lists(mask: np.ndarray) -> List[List[str]]:
+        """Per-row reason code strings from reason_mask_array(), in make_decision() order."""
+        names = [code.value for code in REASON_CODE_ORDER]
+        return [[names[j] for j in row] for row in (np.flatnonzero(r) for r in mask)]
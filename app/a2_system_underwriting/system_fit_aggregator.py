@@ -2,7 +2,11 @@
 system_fit_aggregator.py
 A2 System Fit Aggregation Engine
 """
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.utils.rounding import round_array
 
 
 class SystemFitAggregator:
@@ -13,6 +17,12 @@ class SystemFitAggregator:
     }
     PENALTY_CAP = 0.25
     
+    def __init__(self, stage_weights: Optional[Dict[str, float]] = None, penalty_cap: Optional[float] = None):
+        if stage_weights is not None:
+            self.STAGE_WEIGHTS = stage_weights
+        if penalty_cap is not None:
+            self.PENALTY_CAP = penalty_cap
+    
     def aggregate(self, 
                   image_fit: float, 
                   video_fit: float, 
@@ -43,6 +53,38 @@ class SystemFitAggregator:
             }
         }
     
+    def aggregate_array(self,
+                        image_fit: np.ndarray,
+                        video_fit: np.ndarray,
+                        landing_page_fit: np.ndarray,
+                        transition_penalty_sum: np.ndarray) -> Dict[str, np.ndarray]:
+        image_fit = np.asarray(image_fit, dtype=np.float64)
+        video_fit = np.asarray(video_fit, dtype=np.float64)
+        landing_page_fit = np.asarray(landing_page_fit, dtype=np.float64)
+        transition_penalty_sum = np.asarray(transition_penalty_sum, dtype=np.float64)
+        
+        self._validate_fit_array(image_fit, "image_fit")
+        self._validate_fit_array(video_fit, "video_fit")
+        self._validate_fit_array(landing_page_fit, "landing_page_fit")
+        if (transition_penalty_sum < 0).any():
+            bad = int(np.argmax(transition_penalty_sum < 0))
+            raise ValueError(f"Penalty sum must be >= 0, got {transition_penalty_sum[bad]} at index {bad}")
+        
+        system_fit_raw = (
+            self.STAGE_WEIGHTS['image'] * image_fit +
+            self.STAGE_WEIGHTS['video'] * video_fit +
+            self.STAGE_WEIGHTS['landing_page'] * landing_page_fit
+        )
+        
+        capped_penalty = np.minimum(transition_penalty_sum, self.PENALTY_CAP)
+        system_fit = np.maximum(0.0, np.minimum(1.0, system_fit_raw - capped_penalty))
+        
+        return {
+            'system_fit_raw': round_array(system_fit_raw),
+            'system_fit': round_array(system_fit),
+            'penalty_applied': round_array(capped_penalty)
+        }
+    
     def _validate_fit_score(self, score: float, name: str):
         if not 0.0 <= score <= 1.0:
             raise ValueError(f"{name} must be in [0,1], got {score}")
@@ -50,3 +92,9 @@ class SystemFitAggregator:
     def _validate_penalty(self, penalty: float):
         if penalty < 0:
             raise ValueError(f"Penalty sum must be >= 0, got {penalty}")
+    
+    def _validate_fit_array(self, scores: np.ndarray, name: str):
+        invalid = ~((scores >= 0.0) & (scores <= 1.0))
+        if invalid.any():
+            bad = int(np.argmax(invalid))
+            raise ValueError(f"{name} must be in [0,1], got {scores[bad]} at index {bad}")
@@ -0,0 +1,233 @@
+"""
+system_optimizer.py
+A2 System Optimizer
+Top-k Image→Video→Landing Page combinations from candidate pools
+"""
+from typing import Dict, Any, Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .batch_underwriting_engine import BatchUnderwritingEngine
+from .nine_pd import PLA_STAGES
+
+
+class CandidatePool(NamedTuple):
+    """One stage's candidates: profiles (n, 9), fits (n,), confidences (n,), gates (n,)."""
+    profiles: np.ndarray
+    fits: np.ndarray
+    confidences: np.ndarray
+    gates: np.ndarray
+
+
+class SystemOptimizer:
+    """
+    Branch-and-bound search over image x video x landing-page pools.
+
+    Transition penalties only compare adjacent stages, so every (image, video)
+    pair falls into one of 2^R_iv penalty classes and every (video, landing
+    page) pair into one of 2^R_vl. For a fixed video and class pair the
+    penalty is constant and system_fit is separable, which gives an exact
+    per-video upper bound and lets the search visit only the best few
+    candidates of each class. Final ordering is by system_fit, then
+    system_confidence, computed exactly by the BatchUnderwritingEngine.
+
+    Every triplet that can reach the k-th best fit is scored, however many
+    tie: candidates are scored in batches of at most MAX_CANDIDATES and the
+    running top-k is carried into the next batch, so memory is bounded but
+    a large tie group costs time rather than correctness.
+    """
+    # Slack between the unrounded search arithmetic and the rounded scores
+    FIT_TOLERANCE = 5e-4
+    MAX_CANDIDATES = 200_000  # triplets per scoring batch
+
+    def __init__(self, engine: Optional[BatchUnderwritingEngine] = None):
+        self.engine = engine or BatchUnderwritingEngine()
+
+    def top_systems(self,
+                    image: CandidatePool,
+                    video: CandidatePool,
+                    landing_page: CandidatePool,
+                    top_k: int = 10,
+                    data_support: Optional[Tuple[float, float]] = None,
+                    measurement_quality: float = BatchUnderwritingEngine.DEFAULT_MEASUREMENT_QUALITY,
+                    require_gates_passed: bool = True) -> Dict[str, Any]:
+        pools = [self._as_pool(pool, stage) for pool, stage in zip((image, video, landing_page), PLA_STAGES)]
+        # Index maps back into the caller's pools after gate filtering
+        keep = [
+            np.flatnonzero(pool.gates) if require_gates_passed else np.arange(len(pool.fits))
+            for pool in pools
+        ]
+        img, vid, lp = [CandidatePool(*(column[idx] for column in pool)) for pool, idx in zip(pools, keep)]
+        stats = {
+            'systems_total': int(np.prod([len(p.fits) for p in pools], dtype=np.int64)),
+            'systems_eligible': int(len(img.fits)) * int(len(vid.fits)) * int(len(lp.fits)),
+            'systems_scored': 0
+        }
+        if min(len(img.fits), len(vid.fits), len(lp.fits)) == 0 or top_k <= 0:
+            return {'indices': np.empty((0, 3), dtype=np.intp), 'result': None, 'stats': stats}
+
+        search = self._prepare(img, vid, lp)
+        threshold = self._kth_best_fit(search, top_k)
+        empty = np.empty(0, dtype=np.intp)
+        best, best_result = (empty, empty, empty), None
+        for batch in self._collect(search, threshold - self.FIT_TOLERANCE):
+            stats['systems_scored'] += int(len(batch[0]))
+            # The running top-k competes with the new batch
+            i_idx, v_idx, l_idx = (np.concatenate([kept, new]) for kept, new in zip(best, batch))
+            result = self._evaluate(img, vid, lp, i_idx, v_idx, l_idx, data_support, measurement_quality)
+            order = np.lexsort((-result['system_confidence'], -result['system_fit']))[:top_k]
+            best, best_result = (i_idx[order], v_idx[order], l_idx[order]), self._take(result, order)
+        if best_result is None:
+            best_result = self._take(
+                self._evaluate(img, vid, lp, empty, empty, empty, data_support, measurement_quality), empty
+            )
+
+        i_idx, v_idx, l_idx = best
+        indices = np.stack([keep[0][i_idx], keep[1][v_idx], keep[2][l_idx]], axis=1)
+        return {'indices': indices, 'result': best_result, 'stats': stats}
+
+    def _evaluate(self, img: CandidatePool, vid: CandidatePool, lp: CandidatePool,
+                  i_idx: np.ndarray, v_idx: np.ndarray, l_idx: np.ndarray,
+                  data_support: Optional[Tuple[float, float]], measurement_quality: float) -> Dict[str, Any]:
+        return self.engine.evaluate(
+            stage_profiles=np.stack([img.profiles[i_idx], vid.profiles[v_idx], lp.profiles[l_idx]], axis=1),
+            stage_fits=np.stack([img.fits[i_idx], vid.fits[v_idx], lp.fits[l_idx]], axis=1),
+            stage_confidences=np.stack([img.confidences[i_idx], vid.confidences[v_idx], lp.confidences[l_idx]], axis=1),
+            stage_gates_passed=np.stack([img.gates[i_idx], vid.gates[v_idx], lp.gates[l_idx]], axis=1),
+            data_support=None if data_support is None else np.tile(np.asarray(data_support, dtype=np.float64), (len(i_idx), 1)),
+            measurement_quality=measurement_quality
+        )
+
+    def _prepare(self, img: CandidatePool, vid: CandidatePool, lp: CandidatePool) -> Dict[str, Any]:
+        table = self.engine.penalty_checker.table
+        iv_rules = np.flatnonzero((table.from_stage == 0) & (table.to_stage == 1))
+        vl_rules = np.flatnonzero((table.from_stage == 1) & (table.to_stage == 2))
+        if len(iv_rules) + len(vl_rules) != len(table.ids):
+            raise ValueError("SystemOptimizer only supports adjacent-stage transition penalties")
+
+        weights = self.engine.aggregator.STAGE_WEIGHTS
+        cap = self.engine.aggregator.PENALTY_CAP
+        code_iv, pen_iv = self._pair_classes(img.profiles, vid.profiles, iv_rules, table)
+        code_vl, pen_vl = self._pair_classes(vid.profiles, lp.profiles, vl_rules, table)
+
+        a = weights['image'] * img.fits
+        c = weights['video'] * vid.fits
+        b = weights['landing_page'] * lp.fits
+
+        # Best image / landing page contribution per (class, video)
+        best_a = np.stack([np.where(code_iv == k, a[:, None], -np.inf).max(axis=0) for k in range(len(pen_iv))])
+        best_b = np.stack([np.where(code_vl == k, b[None, :], -np.inf).max(axis=1) for k in range(len(pen_vl))])
+        capped = np.minimum(pen_iv[:, None] + pen_vl[None, :], cap)
+        bound = c[:, None, None] + best_a.T[:, :, None] + best_b.T[:, None, :] - capped[None, :, :]
+        bound = np.minimum(bound, 1.0)
+
+        img_order = np.argsort(-a, kind='stable')
+        lp_order = np.argsort(-b, kind='stable')
+        video_bound = bound.reshape(len(c), -1).max(axis=1)
+        return {
+            'a': a, 'b': b, 'c': c,
+            'code_iv': code_iv, 'code_vl': code_vl, 'capped': capped,
+            'bound': bound, 'video_bound': video_bound,
+            'video_order': np.argsort(-video_bound, kind='stable'),
+            'img_order': img_order, 'lp_order': lp_order
+        }
+
+    def _kth_best_fit(self, s: Dict[str, Any], k: int) -> float:
+        best = np.empty(0)
+        threshold = -np.inf
+        for v in s['video_order'].tolist():
+            if s['video_bound'][v] < threshold:
+                break
+            img_codes = s['code_iv'][s['img_order'], v]
+            lp_codes = s['code_vl'][v, s['lp_order']]
+            for ci, cl in self._open_classes(s['bound'][v], threshold):
+                # Only the top-k of each class can reach the global top-k
+                imgs = s['img_order'][img_codes == ci][:k]
+                lps = s['lp_order'][lp_codes == cl][:k]
+                fits = s['c'][v] + s['a'][imgs][:, None] + s['b'][lps][None, :] - s['capped'][ci, cl]
+                best = np.concatenate([best, np.clip(fits, 0.0, 1.0).ravel()])
+                if len(best) > k:
+                    best = np.partition(best, len(best) - k)[-k:]
+                if len(best) == k:
+                    threshold = best.min()
+        return float(threshold)
+
+    def _collect(self, s: Dict[str, Any], threshold: float) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """All (image, video, landing page) triplets whose search fit is >= threshold, in batches of ~MAX_CANDIDATES."""
+        found = []
+        total = 0
+        for v in s['video_order'].tolist():
+            if s['video_bound'][v] < threshold:
+                break
+            img_codes = s['code_iv'][s['img_order'], v]
+            lp_codes = s['code_vl'][v, s['lp_order']]
+            for ci, cl in self._open_classes(s['bound'][v], threshold):
+                imgs = s['img_order'][img_codes == ci]
+                lps = s['lp_order'][lp_codes == cl]
+                a, b = s['a'][imgs], s['b'][lps]
+                if threshold <= 0.0:
+                    need = -np.inf  # the fit floor of 0.0 already meets the threshold
+                else:
+                    need = threshold - s['c'][v] + s['capped'][ci, cl]
+                # Both sides are sorted descending, so each cut is a prefix
+                keep_img = a + b[0] >= need
+                imgs, a = imgs[keep_img], a[keep_img]
+                if not len(imgs):
+                    continue
+                keep_lp = b + a[0] >= need
+                lps, b = lps[keep_lp], b[keep_lp]
+                # Image rows per slice, so no single (rows, landing pages) block exceeds the batch
+                rows = max(1, self.MAX_CANDIDATES // len(lps))
+                for start in range(0, len(imgs), rows):
+                    ii, ll = np.nonzero(a[start:start + rows, None] + b[None, :] >= need)
+                    found.append((imgs[start + ii], np.full(len(ii), v), lps[ll]))
+                    total += len(ii)
+                    if total >= self.MAX_CANDIDATES:
+                        yield tuple(np.concatenate(column) for column in zip(*found))
+                        found, total = [], 0
+        if total:
+            yield tuple(np.concatenate(column) for column in zip(*found))
+
+    @staticmethod
+    def _open_classes(bound: np.ndarray, threshold: float):
+        """(image class, landing page class) pairs that are non-empty and can reach threshold."""
+        return zip(*np.nonzero(np.isfinite(bound) & (bound >= threshold)))
+
+    @staticmethod
+    def _pair_classes(from_profiles: np.ndarray, to_profiles: np.ndarray, rules: np.ndarray, table) -> Tuple[np.ndarray, np.ndarray]:
+        """Bitmask of triggered rules for every (from, to) pair, and the penalty of each bitmask."""
+        codes = np.zeros((len(from_profiles), len(to_profiles)), dtype=np.int32)
+        for bit, j in enumerate(rules.tolist()):
+            dim = table.dimension[j]
+            delta = to_profiles[None, :, dim] - from_profiles[:, None, dim]
+            hit = delta > table.threshold[j] if table.is_gt[j] else delta < table.threshold[j]
+            codes |= hit.astype(np.int32) << bit
+        penalties = np.array([
+            sum(float(table.penalty[j]) for bit, j in enumerate(rules.tolist()) if mask >> bit & 1)
+            for mask in range(1 << len(rules))
+        ])
+        return codes, penalties
+
+    @staticmethod
+    def _as_pool(pool: CandidatePool, stage: str) -> CandidatePool:
+        profiles = np.asarray(pool.profiles, dtype=np.float64).reshape(-1, 9)
+        n = len(profiles)
+        fits = np.asarray(pool.fits, dtype=np.float64).reshape(n)
+        confidences = np.asarray(pool.confidences, dtype=np.float64).reshape(n)
+        gates = np.asarray(pool.gates, dtype=bool).reshape(n)
+        if ((fits < 0.0) | (fits > 1.0)).any():
+            raise ValueError(f"{stage} fits must be in [0,1]")
+        return CandidatePool(profiles, fits, confidences, gates)
+
+    @staticmethod
+    def _take(result: Dict[str, Any], order: np.ndarray) -> Dict[str, Any]:
+        taken = {}
+        for key, value in result.items():
+            if isinstance(value, np.ndarray):
+                taken[key] = value[order]
+            elif isinstance(value, dict):
+                taken[key] = {k: v[order] for k, v in value.items()}
+            else:
+                taken[key] = value
+        taken['count'] = len(order)
+        return taken
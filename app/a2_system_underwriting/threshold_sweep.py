@@ -0,0 +1,219 @@
+"""
+threshold_sweep.py
+A2 Threshold What-If Sweep
+Re-bands a stored corpus of underwriting outcomes under a grid of
+SystemDecisionEngine.THRESHOLDS variants.
+
+Usage:
+    python -m app.a2_system_underwriting.threshold_sweep corpus.npz \\
+        --grid auto_launch.min_system_fit=0.78:0.86:0.02 \\
+        --grid no_launch.max_transition_penalty=0.15,0.18,0.21
+"""
+import argparse
+import copy
+import itertools
+import json
+import sys
+from typing import Dict, Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .system_decision_engine import SystemDecisionEngine, DECISION_BAND_ORDER
+
+# Threshold entries read by SystemDecisionEngine.make_decision_array
+SWEEP_PARAMETERS = (
+    ('auto_launch', 'min_system_fit'),
+    ('auto_launch', 'min_system_confidence'),
+    ('auto_launch', 'max_transition_penalty'),
+    ('no_launch', 'max_system_fit'),
+    ('no_launch', 'max_system_confidence'),
+    ('no_launch', 'max_transition_penalty'),
+)
+
+CORPUS_COLUMNS = ('system_fit', 'system_confidence', 'transition_penalty_sum', 'gates_passed')
+
+
+def load_corpus(path: str) -> Dict[str, np.ndarray]:
+    """
+    Load (system_fit, system_confidence, transition_penalty_sum, gates_passed)
+    columns from .npz (one array per column; gates_passed may be (N,) or
+    (N, S)) or from a .csv with a header row naming the columns.
+    """
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            missing = [c for c in CORPUS_COLUMNS if c not in data.files]
+            if missing:
+                raise ValueError(f"Corpus {path} is missing columns: {missing}")
+            return {c: data[c] for c in CORPUS_COLUMNS}
+    if path.endswith('.csv'):
+        data = np.genfromtxt(path, delimiter=',', names=True, dtype=np.float64)
+        missing = [c for c in CORPUS_COLUMNS if c not in (data.dtype.names or ())]
+        if missing:
+            raise ValueError(f"Corpus {path} is missing columns: {missing}")
+        return {c: np.atleast_1d(data[c]) for c in CORPUS_COLUMNS}
+    raise ValueError(f"Unsupported corpus format: {path} (expected .npz or .csv)")
+
+
+def threshold_grid(axes: Mapping[str, Sequence[float]],
+                   base: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Cartesian product of threshold values. Keys are "band.parameter"
+    (e.g. "auto_launch.min_system_fit"); parameters not on an axis keep
+    their value from base (default SystemDecisionEngine.THRESHOLDS).
+    """
+    base = base or SystemDecisionEngine.THRESHOLDS
+    keys = []
+    for key in axes:
+        band, _, name = key.partition('.')
+        if (band, name) not in SWEEP_PARAMETERS:
+            raise ValueError(f"Unknown threshold '{key}'; expected one of {['.'.join(p) for p in SWEEP_PARAMETERS]}")
+        keys.append((band, name))
+
+    grid = []
+    for values in itertools.product(*(list(v) for v in axes.values())):
+        thresholds = copy.deepcopy(base)
+        for (band, name), value in zip(keys, values):
+            thresholds[band][name] = float(value)
+        grid.append(thresholds)
+    return grid
+
+
+class ThresholdSweep:
+    """
+    Evaluates every threshold set in one broadcast (G, cells) pass of
+    SystemDecisionEngine.make_decision_array, so the what-if banding is the
+    production banding. Rows are first collapsed into cells the grid cannot
+    distinguish (see _bucket_rows) and cells are processed in chunks to bound
+    the (G, cells) working set.
+    """
+    CHUNK_ELEMENTS = 4_000_000
+
+    def __init__(self, decision_engine: Optional[SystemDecisionEngine] = None):
+        self.decision_engine = decision_engine or SystemDecisionEngine()
+
+    def run(self,
+            corpus: Mapping[str, np.ndarray],
+            threshold_sets: Sequence[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        if not threshold_sets:
+            raise ValueError("threshold_sets must not be empty")
+        n_sets = len(threshold_sets)
+        n_bands = len(DECISION_BAND_ORDER)
+        grid = {
+            band: {
+                name: np.array([float(t[band][name]) for t in threshold_sets])[:, None]
+                for b, name in SWEEP_PARAMETERS if b == band
+            }
+            for band in ('auto_launch', 'no_launch')
+        }
+        fit, conf, penalty, gates, weights = self._bucket_rows(corpus, grid)
+
+        counts = np.zeros(n_sets * n_bands, dtype=np.int64)
+        offsets = (np.arange(n_sets) * n_bands)[:, None]
+        chunk = max(1, self.CHUNK_ELEMENTS // n_sets)
+        for start in range(0, len(fit), chunk):
+            rows = slice(start, start + chunk)
+            codes = self.decision_engine.make_decision_array(
+                fit[rows], conf[rows], penalty[rows], gates[rows], thresholds=grid
+            )
+            counts += np.bincount(
+                (codes + offsets).ravel(),
+                weights=np.broadcast_to(weights[rows], codes.shape).ravel(),
+                minlength=n_sets * n_bands
+            ).astype(np.int64)
+
+        return {
+            'rows': int(weights.sum()),
+            'cells': int(len(weights)),
+            'bands': [band.value for band in DECISION_BAND_ORDER],
+            'threshold_sets': [
+                {f"{band}.{name}": float(t[band][name]) for band, name in SWEEP_PARAMETERS}
+                for t in threshold_sets
+            ],
+            'counts': counts.reshape(n_sets, n_bands)
+        }
+
+    @staticmethod
+    def _bucket_rows(corpus: Mapping[str, np.ndarray], grid: Dict[str, Dict[str, np.ndarray]]):
+        """
+        Collapse rows into cells that no threshold in the grid can tell apart.
+
+        Along each axis a row is ranked against the distinct grid values
+        (respecting the strictness of the comparisons make_decision_array
+        applies on that axis) and replaced by a representative value of the
+        same rank, so every threshold set bands the cell exactly as it would
+        band each of its rows. Cost is O(rows * log(grid values)) regardless
+        of the number of threshold sets.
+        """
+        fit = np.asarray(corpus['system_fit'], dtype=np.float64).ravel()
+        n = len(fit)
+        conf = np.asarray(corpus['system_confidence'], dtype=np.float64).reshape(n)
+        penalty = np.asarray(corpus['transition_penalty_sum'], dtype=np.float64).reshape(n)
+        gates = np.asarray(corpus['gates_passed']).astype(bool).reshape(n, -1).all(axis=1)
+
+        axes = []
+        for values, name, side in ((fit, 'system_fit', 'right'),
+                                   (conf, 'system_confidence', 'right'),
+                                   (penalty, 'transition_penalty', 'left')):
+            cuts = np.unique(np.concatenate([
+                grid['auto_launch'][f"min_{name}" if side == 'right' else f"max_{name}"].ravel(),
+                grid['no_launch'][f"max_{name}"].ravel()
+            ]))
+            # fit/confidence use `<` / `>=`: rank = #cuts <= x, representative = largest such cut.
+            # penalty uses `>` / `<=`: rank = #cuts < x, representative = smallest cut >= x.
+            ranks = np.searchsorted(cuts, values, side=side)
+            if side == 'right':
+                representative = np.concatenate([[-np.inf], cuts])
+            else:
+                representative = np.concatenate([cuts, [np.inf]])
+            axes.append((ranks, representative))
+        axes.append((gates.astype(np.intp), np.array([False, True])))
+
+        shape = tuple(len(rep) for _, rep in axes)
+        cells = np.ravel_multi_index(tuple(ranks for ranks, _ in axes), shape)
+        weights = np.bincount(cells, minlength=int(np.prod(shape)))
+        occupied = np.flatnonzero(weights)
+        coords = np.unravel_index(occupied, shape)
+        columns = [rep[idx] for (_, rep), idx in zip(axes, coords)]
+        return (*columns, weights[occupied])
+
+
+def format_table(result: Dict[str, Any]) -> str:
+    params = [f"{band}.{name}" for band, name in SWEEP_PARAMETERS]
+    header = params + result['bands']
+    lines = ["\t".join(header)]
+    for thresholds, counts in zip(result['threshold_sets'], result['counts'].tolist()):
+        lines.append("\t".join([f"{thresholds[p]:g}" for p in params] + [str(c) for c in counts]))
+    return "\n".join(lines)
+
+
+def _parse_axis(spec: str):
+    key, sep, values = spec.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Expected band.parameter=values, got '{spec}'")
+    if ':' in values:
+        start, stop, step = (float(v) for v in values.split(':'))
+        # Inclusive stop, rounded to tame float drift in the step
+        points = np.round(np.arange(start, stop + step / 2, step), 6)
+        return key, points.tolist()
+    return key, [float(v) for v in values.split(',')]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="A2 decision threshold what-if sweep")
+    parser.add_argument('corpus', help=".npz or .csv with columns " + ", ".join(CORPUS_COLUMNS))
+    parser.add_argument('--grid', action='append', type=_parse_axis, default=[],
+                        help="band.parameter=start:stop:step or comma-separated values (repeatable)")
+    parser.add_argument('--json', action='store_true', help="Emit JSON instead of a TSV table")
+    args = parser.parse_args(argv)
+
+    result = ThresholdSweep().run(load_corpus(args.corpus), threshold_grid(dict(args.grid)))
+    if args.json:
+        json.dump(dict(result, counts=result['counts'].tolist()), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(format_table(result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,10 +2,16 @@
 transition_penalty_checker.py
 A2 Transition Penalty Checker
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
+from app.utils.rounding import round_array
+from .nine_pd import NINE_PD_DIMENSIONS, PLA_STAGES, stage_matrix
+from .verbosity import Verbosity
+
 
 class PenaltyID(Enum):
     IMG_VID_TRUST_DROP = "IMG_VID_TRUST_DROP"
@@ -26,13 +32,77 @@ class PenaltyResult:
     rationale: str
 
 
+# Stage indices (into PLA_STAGES) for each transition: (from, to)
+TRANSITION_STAGES = {
+    'image_to_video': (PLA_STAGES.index('image'), PLA_STAGES.index('video')),
+    'video_to_landing_page': (PLA_STAGES.index('video'), PLA_STAGES.index('landing_page'))
+}
+
+COMPARISONS = ('lt', 'gt')
+
+# Every key check_penalties / _build_details reads from a rule
+RULE_KEYS = ('id', 'transition', 'dimension', 'comparison', 'threshold', 'penalty', 'rationale')
+
+
+@dataclass(frozen=True)
+class CompiledPenaltyTable:
+    """
+    Penalty rules as parallel arrays, one entry per rule:
+    triggered = (to - from) < threshold for 'lt', (to - from) > threshold for 'gt'.
+    """
+    ids: Tuple[str, ...]
+    from_stage: np.ndarray
+    to_stage: np.ndarray
+    dimension: np.ndarray
+    is_gt: np.ndarray
+    threshold: np.ndarray
+    penalty: np.ndarray
+
+
+def compile_penalty_rules(rules: List[Dict[str, Any]]) -> CompiledPenaltyTable:
+    for rule in rules:
+        if not isinstance(rule, Mapping):
+            raise ValueError(f"Penalty rule must be an object, got {rule!r}")
+        missing = [key for key in RULE_KEYS if key not in rule]
+        if missing:
+            raise ValueError(f"Penalty rule {rule.get('id', '?')} is missing {missing}")
+        for key in ('threshold', 'penalty'):
+            if isinstance(rule[key], bool) or not isinstance(rule[key], (int, float)):
+                raise ValueError(f"Expected a number for {key!r} in rule {rule['id']}, got {rule[key]!r}")
+        if not isinstance(rule['rationale'], str):
+            raise ValueError(f"Expected a string for 'rationale' in rule {rule['id']}, got {rule['rationale']!r}")
+        if rule['transition'] not in TRANSITION_STAGES:
+            raise ValueError(f"Unknown transition {rule['transition']!r} in rule {rule['id']}")
+        if rule['dimension'] not in NINE_PD_DIMENSIONS:
+            raise ValueError(f"Unknown dimension {rule['dimension']!r} in rule {rule['id']}")
+        if rule['comparison'] not in COMPARISONS:
+            raise ValueError(f"Unknown comparison {rule['comparison']!r} in rule {rule['id']}")
+    
+    columns = {
+        'from_stage': np.array([TRANSITION_STAGES[r['transition']][0] for r in rules], dtype=np.intp),
+        'to_stage': np.array([TRANSITION_STAGES[r['transition']][1] for r in rules], dtype=np.intp),
+        'dimension': np.array([NINE_PD_DIMENSIONS.index(r['dimension']) for r in rules], dtype=np.intp),
+        'is_gt': np.array([r['comparison'] == 'gt' for r in rules], dtype=bool),
+        'threshold': np.array([r['threshold'] for r in rules], dtype=np.float64),
+        'penalty': np.array([r['penalty'] for r in rules], dtype=np.float64)
+    }
+    for column in columns.values():
+        column.setflags(write=False)
+    
+    return CompiledPenaltyTable(
+        ids=tuple(getattr(r['id'], 'value', r['id']) for r in rules),
+        **columns
+    )
+
+
 class TransitionPenaltyChecker:
     PENALTY_RULES = [
         {
             'id': PenaltyID.IMG_VID_TRUST_DROP,
             'transition': 'image_to_video',
             'dimension': 'trust',
-            'check': lambda v, i: v - i < -0.10,
+            'comparison': 'lt',
+            'threshold': -0.10,
             'penalty': 0.10,
             'rationale': 'Trust regression after attention capture predicts shallow engagement'
         },
@@ -40,7 +110,8 @@ class TransitionPenaltyChecker:
             'id': PenaltyID.IMG_VID_MOMENTUM_SPIKE,
             'transition': 'image_to_video',
             'dimension': 'momentum',
-            'check': lambda v, i: v - i > 0.20,
+            'comparison': 'gt',
+            'threshold': 0.20,
             'penalty': 0.06,
             'rationale': 'Early urgency escalation increases reactance before value formation'
         },
@@ -48,7 +119,8 @@ class TransitionPenaltyChecker:
             'id': PenaltyID.VID_LP_TRUST_INSUFFICIENT_LIFT,
             'transition': 'video_to_landing_page',
             'dimension': 'trust',
-            'check': lambda lp, v: lp - v < 0.10,
+            'comparison': 'lt',
+            'threshold': 0.10,
             'penalty': 0.08,
             'rationale': 'LP must materially increase trust to resolve risk'
         },
@@ -56,7 +128,8 @@ class TransitionPenaltyChecker:
             'id': PenaltyID.VID_LP_AUTONOMY_DROP,
             'transition': 'video_to_landing_page',
             'dimension': 'autonomy',
-            'check': lambda lp, v: lp - v < -0.10,
+            'comparison': 'lt',
+            'threshold': -0.10,
             'penalty': 0.07,
             'rationale': 'Coercive LP following persuasive video triggers reactance'
         },
@@ -64,47 +137,58 @@ class TransitionPenaltyChecker:
             'id': PenaltyID.VID_LP_MOMENTUM_NO_TAPER,
             'transition': 'video_to_landing_page',
             'dimension': 'momentum',
-            'check': lambda lp, v: lp - v > 0.00,
+            'comparison': 'gt',
+            'threshold': 0.00,
             'penalty': 0.06,
             'rationale': 'Failure to taper urgency undermines decision confidence'
         }
     ]
     
-    def check_penalties(self, 
-                       image_9pd: Dict[str, float],
-                       video_9pd: Dict[str, float],
-                       landing_page_9pd: Dict[str, float]) -> Dict[str, Any]:
-        results = []
-        total_penalty = 0.0
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None):
+        if rules is not None:
+            self.PENALTY_RULES = rules
+        self.table = compile_penalty_rules(self.PENALTY_RULES)
+    
+    def evaluate(self, stage_profiles: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        stage_profiles: (3, 9) or (N, 3, 9) in PLA_STAGES x NINE_PD_DIMENSIONS order.
+        Returns (deltas, triggered, unrounded penalty sums) shaped (..., R), (..., R), (...).
+        """
+        profiles = np.asarray(stage_profiles, dtype=np.float64)
+        if profiles.shape[-2:] != (len(PLA_STAGES), len(NINE_PD_DIMENSIONS)) or profiles.ndim not in (2, 3):
+            raise ValueError(f"stage_profiles must have shape (3, 9) or (N, 3, 9), got {profiles.shape}")
         
-        for rule in self.PENALTY_RULES:
-            if rule['transition'] == 'image_to_video':
-                from_val = image_9pd.get(rule['dimension'], 0.5)
-                to_val = video_9pd.get(rule['dimension'], 0.5)
-            else:
-                from_val = video_9pd.get(rule['dimension'], 0.5)
-                to_val = landing_page_9pd.get(rule['dimension'], 0.5)
-            
-            delta = to_val - from_val
-            triggered = rule['check'](to_val, from_val)
-            penalty = rule['penalty'] if triggered else 0.0
-            
-            result = PenaltyResult(
-                id=rule['id'].value,
-                transition=rule['transition'],
-                dimension=rule['dimension'],
-                triggered=triggered,
-                delta=round(delta, 4),
-                penalty_value=penalty,
-                rationale=rule['rationale']
-            )
-            results.append(result)
-            total_penalty += penalty
+        table = self.table
+        deltas = profiles[..., table.to_stage, table.dimension] - profiles[..., table.from_stage, table.dimension]
+        triggered = np.where(table.is_gt, deltas > table.threshold, deltas < table.threshold)
+        masked = np.where(triggered, table.penalty, 0.0)
         
-        return {
-            'transition_penalty_sum': round(total_penalty, 4),
-            'triggered_penalties': [r for r in results if r.triggered],
-            'all_checks': [
+        # Accumulate in rule order so sums match the original per-rule loop bit for bit
+        total_penalty = np.zeros(profiles.shape[:-2], dtype=np.float64)
+        for j in range(len(table.ids)):
+            total_penalty = total_penalty + masked[..., j]
+        return deltas, triggered, total_penalty
+    
+    def check_penalties(self, 
+                       image_9pd: Mapping[str, float],
+                       video_9pd: Mapping[str, float],
+                       landing_page_9pd: Mapping[str, float],
+                       verbosity: Verbosity = Verbosity.FULL) -> Dict[str, Any]:
+        # dicts, NinePDProfile models or NinePDVector; missing dimensions default to 0.5
+        profiles = stage_matrix(image_9pd, video_9pd, landing_page_9pd)
+        deltas, triggered, total_penalty = self.evaluate(profiles)
+        
+        triggered_flags = triggered.tolist()
+        result = {
+            'transition_penalty_sum': round(float(total_penalty), 4),
+            'triggered_penalty_ids': [rule_id for rule_id, hit in zip(self.table.ids, triggered_flags) if hit]
+        }
+        if verbosity == Verbosity.MINIMAL:
+            return result
+        details = self._build_details(deltas.tolist(), triggered_flags)
+        result['triggered_penalties'] = [r for r in details if r.triggered]
+        if verbosity == Verbosity.FULL:
+            result['all_checks'] = [
                 {
                     'id': r.id,
                     'transition': r.transition,
@@ -113,6 +197,33 @@ class TransitionPenaltyChecker:
                     'delta': r.delta,
                     'penalty_value': r.penalty_value,
                     'rationale': r.rationale
-                } for r in results
+                } for r in details
             ]
+        return result
+    
+    def check_penalties_array(self, stage_profiles: np.ndarray) -> Dict[str, Any]:
+        """stage_profiles: (N, 3, 9) array in PLA_STAGES x NINE_PD_DIMENSIONS order."""
+        profiles = np.asarray(stage_profiles, dtype=np.float64)
+        if profiles.ndim != 3:
+            raise ValueError(f"stage_profiles must have shape (N, 3, 9), got {profiles.shape}")
+        
+        _, triggered, total_penalty = self.evaluate(profiles)
+        return {
+            'transition_penalty_sum': round_array(total_penalty),
+            'triggered': triggered,
+            'penalty_ids': list(self.table.ids)
         }
+    
+    def _build_details(self, deltas: List[float], triggered: List[bool]) -> List[PenaltyResult]:
+        return [
+            PenaltyResult(
+                id=self.table.ids[j],
+                transition=rule['transition'],
+                dimension=rule['dimension'],
+                triggered=triggered[j],
+                delta=round(deltas[j], 4),
+                penalty_value=rule['penalty'] if triggered[j] else 0.0,
+                rationale=rule['rationale']
+            )
+            for j, rule in enumerate(self.PENALTY_RULES)
+        ]
@@ -0,0 +1,19 @@
+"""
+verbosity.py
+A2 Result Verbosity Levels
+"""
+from enum import Enum
+
+
+class Verbosity(str, Enum):
+    """
+    How much human-readable detail A2 components render.
+
+    MINIMAL: scores, decision and compact reason/penalty codes only.
+    STANDARD: adds confidence components and the triggered penalty records.
+    FULL: adds rationale strings and audit breakdowns (all penalty checks,
+    weighted contributions, weights used).
+    """
+    MINIMAL = "minimal"
+    STANDARD = "standard"
+    FULL = "full"
@@ -10,6 +10,7 @@ Endpoints:
 
 from fastapi import APIRouter, HTTPException, status
 from typing import Optional
+import logging
 import uuid
 
 from app.agents.video_generation.agent import VideoGenerationAgent
@@ -19,14 +20,46 @@ from app.agents.video_generation.models import (
     VideoGenerationOutputResult,
     VideoAgentStatus
 )
+from app.config import settings
+from app.database.video_repository import RecordConflictError, StoreUnavailableError, VideoRepository
+
+logger = logging.getLogger(__name__)
 
 # Initialize router and agent
 router = APIRouter(prefix="/agents/video", tags=["video_generation"])
 agent = VideoGenerationAgent()
 
-# In-memory storage (for Phase 2.1 - will migrate to database in production)
-instructions_cache = {}
-outputs_cache = {}
+# Instructions and outputs: DATABASE_URL tables behind a bounded LRU (writes 503 until started)
+video_store = VideoRepository(
+    cache_maxsize=settings.VIDEO_STORE_CACHE_MAXSIZE,
+    flush_size=settings.VIDEO_STORE_FLUSH_SIZE,
+    flush_interval=settings.VIDEO_STORE_FLUSH_INTERVAL
+)
+
+
+async def start_video_store():
+    """
+    Attach the pooled database engine to video_store (app startup). If that
+    fails the app still starts, but saves answer 503 and health reports the
+    store as unavailable.
+    """
+    try:
+        engine = VideoRepository.create_engine(settings.DATABASE_URL, pool_size=settings.VIDEO_STORE_POOL_SIZE)
+        await video_store.start(engine)
+    except Exception as e:
+        logger.error(f"Video store database unavailable, instructions and results will not be stored: {str(e)}")
+        return
+    logger.info(f"Video store persisting to {engine.dialect.name}")
+
+
+async def stop_video_store():
+    """Commit pending saves and close the pool (app shutdown)."""
+    await video_store.stop()
+
+
+# Registered on the router, so any app that mounts it runs them
+router.add_event_handler("startup", start_video_store)
+router.add_event_handler("shutdown", stop_video_store)
 
 
 @router.post(
@@ -58,7 +91,9 @@ async def translate_sbox_to_instruction(
     - estimated_generation_time: Seconds (typically 45)
     - estimated_cost: USD
     
-    **Status:** 201 Created
+    **Status:**
+    - 201 Created
+    - 503 Service Unavailable: Instruction store has no database
     """
     try:
         # Validate SBOX parameters have all 16 dimensions
@@ -81,11 +116,17 @@ async def translate_sbox_to_instruction(
         # Generate instruction using agent
         instruction = agent.translate(request)
         
-        # Cache instruction (Phase 2.1 - later: save to database)
-        instructions_cache[instruction.instruction_id] = instruction
+        await video_store.save_instruction(instruction, request)
         
         return instruction
     
+    except HTTPException:
+        raise
+    except StoreUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -120,13 +161,14 @@ async def get_instruction(
     - 200 OK: Instruction found
     - 404 Not Found: Instruction not found
     """
-    if instruction_id not in instructions_cache:
+    instruction = await video_store.get_instruction(instruction_id)
+    if instruction is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Instruction {instruction_id} not found"
         )
     
-    return instructions_cache[instruction_id]
+    return instruction
 
 
 @router.post(
@@ -157,11 +199,19 @@ async def store_video_result(
     **Output:**
     - VideoGenerationOutputResult (same as input, confirmed)
     
-    **Status:** 201 Created
+    **Status:**
+    - 201 Created
+    - 404 Not Found: Instruction not found
+    - 409 Conflict: output_id or runway_generation_id already stored
+    - 503 Service Unavailable: Result store has no database
     """
     try:
+        # Without a database the instruction could never be found: report that, not a 404
+        if video_store.engine is None:
+            raise StoreUnavailableError("Video store has no database attached")
+        
         # Verify instruction exists
-        if output.instruction_id not in instructions_cache:
+        if await video_store.get_instruction(output.instruction_id) is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Instruction {output.instruction_id} not found"
@@ -171,11 +221,22 @@ async def store_video_result(
         if not output.output_id:
             output.output_id = f"vgen_output_{uuid.uuid4().hex[:12]}"
         
-        # Cache output (Phase 2.1 - later: save to database)
-        outputs_cache[output.output_id] = output
+        await video_store.save_output(output)
         
         return output
     
+    except HTTPException:
+        raise
+    except RecordConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Result already stored: {str(e)}"
+        )
+    except StoreUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -205,13 +266,14 @@ async def get_output(
     - 200 OK: Output found
     - 404 Not Found: Output not found
     """
-    if output_id not in outputs_cache:
+    output = await video_store.get_output(output_id)
+    if output is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Output {output_id} not found"
         )
     
-    return outputs_cache[output_id]
+    return output
 
 
 @router.get(
@@ -253,7 +315,8 @@ async def health_check():
     - agent: video_generation
     - version: Agent version
     - timestamp: Current time
+    - store: Instruction/output store backend, cache and write stats
     
     **Status:** 200 OK
     """
-    return agent.health_check()
+    return dict(agent.health_check(), store=video_store.stats())
@@ -4,16 +4,83 @@ Asset Scoring API Routes - Phase 2.5A
 FastAPI router for 9PD (Nine Dimensions) scoring pipeline.
 """
 
-from fastapi import APIRouter, HTTPException
-from app.asset_scoring.asset_schema import AssetProperties
-from app.asset_scoring.asset_scorer import AssetScorer
+import json
+import logging
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from app.asset_scoring.asset_schema import AssetProperties, AssetBatchRequest
+from app.asset_scoring.asset_scorer import AssetScorer, SCORER_VERSION, RULEBOOK_VERSION
+from app.asset_scoring.audit_log import AssetAuditLog
+from app.asset_scoring.rulebook import rulebooks
+from app.asset_scoring.score_cache import AssetScoreCache, CachedAssetScorer
+from app.config import settings
+from app.services.job_executor import job_executor, chunk_slices
+from app.utils.ndjson import ndjson_stream, NDJSONStreamingResponse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["asset"])
 scorer = AssetScorer()
+score_cache = AssetScoreCache(
+    maxsize=settings.ASSET_SCORE_CACHE_MAXSIZE,
+    ttl=settings.ASSET_SCORE_CACHE_TTL,
+    redis_ttl=settings.ASSET_SCORE_REDIS_TTL
+)
+cached_scorer = CachedAssetScorer(scorer, score_cache)
+audit_log: Optional[AssetAuditLog] = None
+
+
+async def start_asset_score_cache():
+    """Attach the shared Redis tier when REDIS_URL is set (app startup)."""
+    if not settings.REDIS_URL:
+        logger.info("Asset score cache is in-process only (REDIS_URL not set)")
+        return
+    try:
+        import redis.asyncio as aioredis
+        client = aioredis.from_url(settings.REDIS_URL)
+        await client.ping()
+    except Exception as e:
+        logger.error(f"Asset score cache Redis tier unavailable, continuing in-process: {str(e)}")
+        return
+    score_cache.redis = client
+
+
+async def stop_asset_score_cache():
+    client = score_cache.redis
+    if client is not None:
+        score_cache.redis = None
+        await client.aclose()
+
+
+def start_asset_audit_log():
+    """Record every scored asset when ASSET_AUDIT_DIR is set (app startup)."""
+    global audit_log
+    if settings.ASSET_AUDIT_DIR and audit_log is None:
+        audit_log = AssetAuditLog(settings.ASSET_AUDIT_DIR, segment_rows=settings.ASSET_AUDIT_SEGMENT_ROWS)
+        logger.info(f"Asset audit log enabled: {settings.ASSET_AUDIT_DIR}")
+
+
+def stop_asset_audit_log():
+    """Write the final partial audit segment (app shutdown)."""
+    global audit_log
+    if audit_log is not None:
+        audit_log.close()
+        audit_log = None
+
+
+def _require_rulebook(rulebook_version: str):
+    """Unknown rulebook versions are a client error, not a scoring failure."""
+    try:
+        rulebooks.get(rulebook_version)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 @router.post("/asset/score")
-async def score_asset(asset: AssetProperties, trace: bool = False):
+async def score_asset(asset: AssetProperties, trace: bool = False,
+                      rulebook_version: str = RULEBOOK_VERSION):
     """
     Phase 2.5A — Asset Properties → 9PD Scoring Pipeline (rule-based 2.5A-v1)
     
@@ -22,18 +89,106 @@ async def score_asset(asset: AssetProperties, trace: bool = False):
     Args:
         asset: AssetProperties with observable creative attributes
         trace: If true, returns per-dimension rule contributions for governance audit
+        rulebook_version: Any loaded rulebook version (default: current)
         
     Returns:
         dict: 9PD score vector with versioning and optional trace metadata
     """
+    _require_rulebook(rulebook_version)
     try:
-        result = scorer.score(asset, trace=trace)
-        return result
+        result = await cached_scorer.score(asset, trace=trace, rulebook_version=rulebook_version)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Asset scoring failed: {str(e)}"
         )
+    if audit_log is not None:
+        audit_log.record(asset, rulebook_version)
+    return result
+
+
+@router.post("/asset/score/batch")
+async def score_asset_batch(request: AssetBatchRequest, trace: bool = False,
+                            rulebook_version: str = RULEBOOK_VERSION):
+    """
+    Batch /asset/score: every asset in one vectorized pass.
+    
+    Results are identical to scoring each asset through /asset/score, in
+    request order. Cached profiles are reused; the misses are chunked onto
+    the job executor so the event loop stays free.
+    
+    Returns:
+        dict: count and per-asset score results
+    """
+    _require_rulebook(rulebook_version)
+    assets = request.assets
+
+    async def compute(missing, version):
+        chunks = await job_executor.map(
+            scorer.score_matrix,
+            [(missing[rows], version) for rows in chunk_slices(len(missing), job_executor.chunk_rows)],
+            rows=len(missing)
+        )
+        return (np.concatenate([profiles for profiles, _ in chunks]),
+                np.concatenate([aggression for _, aggression in chunks]))
+
+    try:
+        results = await cached_scorer.score_batch(assets, trace=trace, rulebook_version=rulebook_version,
+                                                  compute=compute)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Asset batch scoring failed: {str(e)}"
+        )
+    if audit_log is not None:
+        audit_log.record_many(assets, rulebook_version)
+    return {"count": len(results), "results": results}
+
+
+@router.post("/asset/score/stream")
+async def score_asset_stream(request: Request, trace: bool = False,
+                             rulebook_version: str = RULEBOOK_VERSION):
+    """
+    Streamed /asset/score for backfills.
+    
+    Body is NDJSON, one AssetProperties record per line. Each line's score
+    result (or {"line": n, "error": ...}) is streamed back as NDJSON in
+    input order; the upload is parsed incrementally with bounded memory.
+    Backfills bypass the score cache, which they would only flush.
+    """
+    _require_rulebook(rulebook_version)
+
+    def handle(line: bytes) -> bytes:
+        asset = AssetProperties.model_validate_json(line)
+        result = scorer.score(asset, trace=trace, rulebook_version=rulebook_version)
+        if audit_log is not None:
+            audit_log.record(asset, rulebook_version)
+        return json.dumps(result).encode("utf-8")
+
+    return NDJSONStreamingResponse(ndjson_stream(request.stream(), handle))
+
+
+@router.get("/asset/audit/{asset_id}")
+async def asset_audit_trace(asset_id: str):
+    """
+    Trace for the most recent scoring of asset_id, rendered from the audit log.
+    
+    Same body as /asset/score?trace=true returned at the time (under the
+    rulebook version it was scored with), plus an "audit" block with the
+    record time, segment and the rule conditions that fired.
+    """
+    if audit_log is None:
+        raise HTTPException(status_code=503, detail="Asset audit log is disabled (ASSET_AUDIT_DIR not set)")
+    try:
+        record = audit_log.lookup(asset_id)
+        if record is not None:
+            return audit_log.render(record, scorer)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Asset audit lookup failed: {str(e)}"
+        )
+    raise HTTPException(status_code=404, detail=f"No audit record for asset {asset_id}")
 
 
 @router.get("/asset/scorer/health")
@@ -41,7 +196,10 @@ async def scorer_health():
     """Health check for asset scoring service."""
     return {
         "status": "healthy",
-        "scorer_version": "2.5A-v1",
-        "rulebook_version": "2026-02-14.1",
-        "mode": "rule_based_deterministic"
+        "scorer_version": SCORER_VERSION,
+        "rulebook_version": RULEBOOK_VERSION,
+        "rulebook_versions_loaded": rulebooks.versions(),
+        "mode": "rule_based_deterministic",
+        "score_cache": score_cache.stats(),
+        "audit_log": audit_log.stats() if audit_log is not None else None
     }
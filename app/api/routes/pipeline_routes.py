@@ -0,0 +1,123 @@
+# app/api/routes/pipeline_routes.py
+"""
+Fused Asset -> Underwriting Pipeline Route
+One request scores the image, video and landing-page assets (Phase 2.5A
+rule-based scorer) and underwrites the resulting PLA system (A2), replacing
+three /v1/asset/score calls plus /v1/a2/underwrite.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from app.a2_system_underwriting import a2_underwriting_router as a2
+from app.a2_system_underwriting.a2_underwriting_router import (
+    A2UnderwritingRequest,
+    A2UnderwritingResponse,
+    DataSupportInput,
+    NinePDProfile,
+    StageProfiles,
+    _underwrite,
+)
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS, PLA_STAGES
+from app.a2_system_underwriting.verbosity import Verbosity
+from app.api.routes import asset_routes
+from app.api.routes.asset_routes import cached_scorer, _require_rulebook
+from app.asset_scoring.asset_schema import AssetProperties
+from app.asset_scoring.asset_scorer import RULEBOOK_VERSION
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v1", tags=["pipeline"])
+
+
+class StageAssets(BaseModel):
+    image: AssetProperties
+    video: AssetProperties
+    landing_page: AssetProperties
+
+
+class PipelineUnderwritingRequest(BaseModel):
+    """A2UnderwritingRequest with stage assets in place of pre-scored stage profiles."""
+    brand_id: str
+    sector: str = Field(default="BEAUTY_SKINCARE")
+    stage_assets: StageAssets
+    stage_fits: Dict[str, float]
+    stage_confidences: Dict[str, float]
+    stage_gates_passed: Dict[str, bool]
+    data_support: Optional[DataSupportInput] = Field(default=None)
+    measurement_quality: float = Field(default=0.85, ge=0.0, le=1.0)
+
+
+class PipelineUnderwritingResponse(A2UnderwritingResponse):
+    stage_scores: Dict[str, Dict[str, Any]] = Field(
+        ..., description="Per-stage /v1/asset/score response (image, video, landing_page)"
+    )
+
+
+def _underwriting_request(request: PipelineUnderwritingRequest, profiles: np.ndarray) -> A2UnderwritingRequest:
+    """
+    The A2 request the scored profiles describe. Built without re-validation
+    (scores come from the scorer, already in range), and shaped exactly like
+    a client-sent one, so /v1/a2/underwrite memo entries are shared.
+    """
+    stage_profiles = StageProfiles.model_construct(**{
+        stage: NinePDProfile.model_construct(**dict(zip(NINE_PD_DIMENSIONS, row)))
+        for stage, row in zip(PLA_STAGES, profiles.tolist())
+    })
+    return A2UnderwritingRequest.model_construct(
+        brand_id=request.brand_id,
+        sector=request.sector,
+        stage_profiles=stage_profiles,
+        stage_fits=request.stage_fits,
+        stage_confidences=request.stage_confidences,
+        stage_gates_passed=request.stage_gates_passed,
+        data_support=request.data_support,
+        measurement_quality=request.measurement_quality
+    )
+
+
+@router.post("/pipeline/underwrite", response_model=PipelineUnderwritingResponse, response_model_exclude_none=True)
+async def underwrite_assets(request: PipelineUnderwritingRequest,
+                            verbosity: Verbosity = Query(default=Verbosity.STANDARD),
+                            trace: bool = False,
+                            rulebook_version: str = RULEBOOK_VERSION):
+    """
+    Asset properties in, PLA underwriting decision out, in one round trip.
+
+    The three stage assets are scored together (score cache included) and
+    their profiles go to the A2 pipeline as one (3, 9) matrix; the result is
+    the /v1/a2/underwrite response plus each stage's /v1/asset/score body.
+
+    Args:
+        request: stage assets plus fits, confidences, gates and data support
+        verbosity: A2 response detail (minimal | standard | full)
+        trace: If true, stage scores include the governance trace
+        rulebook_version: Any loaded rulebook version (default: current)
+    """
+    _require_rulebook(rulebook_version)
+    logger.info(f"Processing pipeline underwriting for brand: {request.brand_id}")
+    assets = [getattr(request.stage_assets, stage) for stage in PLA_STAGES]
+    try:
+        entries = await cached_scorer.entries(assets, rulebook_version)
+        profiles = np.array([entry[:-1] for entry in entries], dtype=np.float64)
+        stage_scores = cached_scorer.envelopes(assets, entries, trace=trace, rulebook_version=rulebook_version)
+
+        underwriting_request = _underwriting_request(request, profiles)
+        if a2.request_capture is not None:
+            a2.request_capture.record(underwriting_request.model_dump())
+        response = _underwrite(underwriting_request, verbosity, profiles)
+    except Exception as e:
+        logger.error(f"ERROR in pipeline underwriting: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Pipeline Underwriting Error: {str(e)}")
+
+    if asset_routes.audit_log is not None:
+        asset_routes.audit_log.record_many(assets, rulebook_version)
+    logger.info(f"Pipeline underwriting complete for {request.brand_id}: {response.decision}")
+    return PipelineUnderwritingResponse.model_construct(
+        stage_scores=dict(zip(PLA_STAGES, stage_scores)),
+        **dict(response)
+    )
@@ -1,6 +1,6 @@
 # app/asset_scoring/asset_schema.py
 from pydantic import BaseModel, Field
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 class AssetProperties(BaseModel):
     """
@@ -10,7 +10,7 @@ class AssetProperties(BaseModel):
     Note: 'trace' is NOT included here - it is a query parameter on the API endpoint
     to keep asset properties pure (observable inputs only).
     
-    # TODO Phase 2.5B: Add automated extraction from raw files
+    Phase 2.5B: image_extraction.py / video_extraction.py measure these from raw files.
     # TODO Phase 3: Expand with embedding vectors for semantic scoring
     """
     asset_id: str = Field(..., description="Unique identifier from SBOX generation")
@@ -45,7 +45,7 @@ class AssetProperties(BaseModel):
         description="Color saturation level (0.0=grayscale, 1.0=neon)"
     )
 
-    # Video-specific properties (scaffold — Phase 2.5B)
+    # Video-specific properties (pacing, scene_count, on_screen_text_density measured by video_extraction.py)
     pacing: Optional[float] = Field(
         default=None, ge=0.0, le=1.0, 
         description="Video pacing speed (0.0=slow, 1.0=rapid cuts)"
@@ -80,3 +80,8 @@ class AssetProperties(BaseModel):
                 "saturation": 0.65
             }
         }
+
+
+class AssetBatchRequest(BaseModel):
+    """Many assets scored in one call (POST /v1/asset/score/batch)."""
+    assets: List[AssetProperties] = Field(..., description="Assets to score, results in the same order")
@@ -7,23 +7,15 @@ Version: 2.5A-v1
 Rulebook: 2026-02-14.1
 Schema: A2.NinePDProfile.v1
 
-# TODO Phase 2.5B: Add raw file -> property extraction layer
+# Phase 2.5B: raw image/video -> properties in image_extraction.py / video_extraction.py
 # TODO Phase 3: Replace rule engine with Claude-assisted scoring
 """
 
+from typing import List, Sequence
+
+from app.a2_system_underwriting.nine_pd import NinePDVector, NINE_PD_DIMENSIONS
 from .asset_schema import AssetProperties
-from .dimension_rules import (
-    compute_aggression,
-    score_presence,
-    score_trust,
-    score_authenticity,
-    score_momentum,
-    score_taste,
-    score_empathy,
-    score_autonomy,
-    score_resonance,
-    score_ethics,
-)
+from .rulebook import CompiledRulebook, rulebooks
 
 # Version constants for governance and audit trails
 SCORER_VERSION = "2.5A-v1"
@@ -46,29 +38,67 @@ class AssetScorer:
         dict: NinePDProfile-compatible score vector with governance metadata
     """
 
-    def score(self, asset: AssetProperties, trace: bool = False) -> dict:
+    def score(self, asset: AssetProperties, trace: bool = False,
+              rulebook_version: str = RULEBOOK_VERSION) -> dict:
         """
         Execute all 9 dimension scoring rules with governance audit trail.
         
         Trace mode returns aggression penalties and input snapshots for PTC
         calibration disputes without polluting the core asset schema.
+        rulebook_version picks any loaded rulebook (see rulebook.py);
+        unknown versions raise ValueError.
         """
-        # Compute shared aggression penalty term
-        aggression = compute_aggression(asset)
-
-        # Score all 9 dimensions
-        profile = {
-            "presence":     round(score_presence(asset), 4),
-            "trust":        round(score_trust(asset, aggression), 4),
-            "authenticity": round(score_authenticity(asset), 4),
-            "momentum":     round(score_momentum(asset), 4),
-            "taste":        round(score_taste(asset), 4),
-            "empathy":      round(score_empathy(asset), 4),
-            "autonomy":     round(score_autonomy(asset, aggression), 4),
-            "resonance":    round(score_resonance(asset), 4),
-            "ethics":       round(score_ethics(asset, aggression), 4),
-        }
+        rulebook = rulebooks.get(rulebook_version)
+        # Feature bits -> per-dimension table lookups (shared aggression term included)
+        values, aggression = rulebook.score_row(asset)
+        profile = dict(zip(NINE_PD_DIMENSIONS, values))
+        return self._envelope(asset, profile, aggression, rulebook, trace)
+
+    def score_vector(self, asset: AssetProperties,
+                     rulebook_version: str = RULEBOOK_VERSION) -> NinePDVector:
+        """
+        Profile only, as a NinePDVector in NINE_PD_DIMENSIONS order.
+        
+        Same rounded values as score()["nine_pd_profile"] without the
+        governance envelope; feeds A2 underwriting without a dict hop.
+        """
+        return NinePDVector(rulebooks.get(rulebook_version).score_row(asset)[0])
+
+    def score_batch(self, assets: Sequence[AssetProperties], trace: bool = False,
+                    rulebook_version: str = RULEBOOK_VERSION) -> List[dict]:
+        """
+        score() for many assets, element for element identical to it.
+        
+        Feature bucketing runs once over property columns and each
+        dimension is one vectorized table lookup; only the per-asset
+        response envelope is built row by row.
+        """
+        rulebook = rulebooks.get(rulebook_version)
+        profiles, aggression = rulebook.score_many(assets)
+        return [
+            self._envelope(asset, dict(zip(NINE_PD_DIMENSIONS, values)), asset_aggression, rulebook, trace)
+            for asset, values, asset_aggression in zip(assets, profiles.tolist(), aggression.tolist())
+        ]
+
+    def score_matrix(self, assets: Sequence[AssetProperties],
+                     rulebook_version: str = RULEBOOK_VERSION):
+        """
+        Rounded (N, 9) profiles in NINE_PD_DIMENSIONS order plus the
+        unrounded (N,) aggression term.
+        """
+        return rulebooks.get(rulebook_version).score_many(assets)
+
+    def envelope(self, asset: AssetProperties, values: Sequence[float], aggression: float,
+                 trace: bool = False, rulebook_version: str = RULEBOOK_VERSION) -> dict:
+        """
+        score() response for an already computed profile (values in
+        NINE_PD_DIMENSIONS order) and aggression term, e.g. from a cache.
+        """
+        return self._envelope(asset, dict(zip(NINE_PD_DIMENSIONS, values)), aggression,
+                              rulebooks.get(rulebook_version), trace)
 
+    def _envelope(self, asset: AssetProperties, profile: dict, aggression: float,
+                  rulebook: CompiledRulebook, trace: bool) -> dict:
         # Assemble response with governance metadata
         result = {
             "asset_id": asset.asset_id,
@@ -76,17 +106,17 @@ class AssetScorer:
             "nine_pd_profile": profile,
             "nine_pd_schema_version": NINE_PD_SCHEMA_VERSION,
             "scorer_version": SCORER_VERSION,
-            "rulebook_version": RULEBOOK_VERSION,
+            "rulebook_version": rulebook.version,
             "trace_enabled": trace,
         }
 
         # Add audit trail if requested (query param, not asset property)
         if trace:
-            result["trace"] = self._build_trace(asset, aggression, profile)
+            result["trace"] = self._build_trace(asset, aggression, rulebook)
 
         return result
 
-    def _build_trace(self, asset: AssetProperties, aggression: float, profile: dict) -> dict:
+    def _build_trace(self, asset: AssetProperties, aggression: float, rulebook: CompiledRulebook) -> dict:
         """
         Returns per-dimension rule contributions for governance audit.
         
@@ -97,9 +127,8 @@ class AssetScorer:
         return {
             "aggression_penalty": round(aggression, 4),
             "aggression_effects": {
-                "autonomy_delta": round(-aggression * 0.8, 4),
-                "ethics_delta":   round(-aggression * 0.6, 4),
-                "trust_delta":    round(-aggression * 0.3, 4),
+                f"{dimension}_delta": round(-aggression * weight, 4)
+                for dimension, weight in rulebook.aggression_effects.items()
             },
             "inputs": {
                 "color_temperature": asset.color_temperature,
@@ -0,0 +1,404 @@
+# app/asset_scoring/audit_log.py
+"""
+Append-only audit log of scored assets for PTC calibration disputes.
+
+Each scored asset is recorded as its input snapshot (one typed column per
+observable property) plus the rulebook version; the request path only does
+array stores. Every segment_rows records the buffer is handed to a
+background thread, which buckets the whole segment at once into a packed
+rule-firing bitmask (CompiledRulebook.feature_matrix_columns) and writes one
+compressed .npz segment. Segments are never rewritten. Segment names carry
+the process id and a random tag, so workers sharing ASSET_AUDIT_DIR never
+write to the same path.
+
+Traces are rendered on demand from a record: the bitmask drives the
+rulebook's score tables (CompiledRulebook.score_bits), so a historical
+asset's profile and trace are reproduced without re-bucketing its inputs.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .asset_schema import AssetProperties
+from .asset_scorer import AssetScorer
+from .rulebook import _PROPERTY_KINDS, rulebooks
+from app.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+AUDIT_VERSION = 1
+
+# Flag columns: -1 = unset (None), else 0/1
+_FLAG_UNSET = -1
+
+
+def _empty_columns(rows: int) -> Dict[str, np.ndarray]:
+    columns = {
+        'recorded_at': np.zeros(rows, dtype=np.float64),
+        'asset_id': np.empty(rows, dtype=object),
+        'asset_type': np.empty(rows, dtype=object),
+        'rulebook_version': np.empty(rows, dtype=object),
+    }
+    for name, kind in _PROPERTY_KINDS.items():
+        if kind == "number":
+            columns[name] = np.full(rows, np.nan, dtype=np.float64)
+        elif kind == "flag":
+            columns[name] = np.full(rows, _FLAG_UNSET, dtype=np.int8)
+        else:
+            columns[name] = np.empty(rows, dtype=object)
+    return columns
+
+
+def snapshot_columns(columns: Mapping[str, np.ndarray], rows=slice(None)) -> Dict[str, np.ndarray]:
+    """Snapshot columns (buffer or loaded segment) in the shapes rulebook.property_column() produces (unset flags False)."""
+    out = {}
+    for name, kind in _PROPERTY_KINDS.items():
+        column = columns[name][rows]
+        out[name] = column == 1 if kind == "flag" else column
+    return out
+
+
+def feature_bit_columns(columns: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    """(n, bytes) uint8 little-endian packed feature bits, each row under its own rulebook version."""
+    versions = columns['rulebook_version'][:n].astype(str)
+    width = max([(len(rulebooks.get(v).features) + 7) // 8 for v in set(versions.tolist())], default=0)
+    packed = np.zeros((n, width), dtype=np.uint8)
+    for version in set(versions.tolist()):
+        rows = np.flatnonzero(versions == version)
+        rulebook = rulebooks.get(version)
+        matrix = rulebook.feature_matrix_columns(snapshot_columns(columns, rows), len(rows))
+        bits = np.packbits(matrix, axis=1, bitorder='little')
+        packed[rows, :bits.shape[1]] = bits
+    return packed
+
+
+def load_audit_segment(path: str) -> Dict[str, np.ndarray]:
+    """All columns of one written audit segment."""
+    with np.load(path) as data:
+        version = int(data['version']) if 'version' in data.files else None
+        if version != AUDIT_VERSION:
+            raise ValueError(f"Unsupported audit log version {version} in {path}")
+        return {k: data[k] for k in data.files if k != 'version'}
+
+
+class AssetAuditLog:
+    """
+    Segment-rotated, compressed, append-only record of scored assets.
+
+    record() costs the request path a few array stores. lookup(asset_id)
+    finds the record with the newest recorded_at, wherever it is: the open
+    buffer, this worker's segments or other workers' segments in the same
+    directory. Segments are visited by their newest recorded_at, each by
+    binary search over its sorted asset_id column, and the walk stops once a
+    segment's newest record is older than the best match so far. Per-segment
+    asset_id indexes and decoded segments live in small LRUs, so memory does
+    not grow with the archive; only each segment's newest recorded_at (one
+    float) is kept for all of them. The directory listing is refreshed at
+    most every SEGMENT_LIST_TTL seconds.
+    Not thread-safe; record() and lookup() run on the event loop, and writer
+    completions are handed back to it (or collected on the next rotation /
+    close() when there is no running loop).
+
+    A segment whose write fails WRITE_ATTEMPTS times stays readable from
+    memory and is resubmitted on the next rotation; beyond MAX_FAILED_SEGMENTS
+    such segments the oldest is dropped (logged and counted), bounding memory
+    while the disk is unwritable.
+    """
+
+    WRITE_ATTEMPTS = 3          # tries per submission before a segment counts as failed
+    WRITE_BACKOFF = 0.5         # seconds before the first retry, doubled per retry
+    MAX_FAILED_SEGMENTS = 4     # failed segments held in memory for resubmission
+    SEGMENT_LIST_TTL = 1.0      # seconds a directory listing is reused by lookup()
+
+    def __init__(self, directory: str, segment_rows: int = 50_000, cached_segments: int = 4,
+                 cached_indexes: int = 64):
+        if segment_rows <= 0:
+            raise ValueError(f"segment_rows must be > 0, got {segment_rows}")
+        self.directory = directory
+        self.segment_rows = segment_rows
+        os.makedirs(directory, exist_ok=True)
+        self._prefix = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._columns = _empty_columns(segment_rows)
+        self._rows = 0
+        self._segments = 0
+        # Segments not known to be on disk yet: path -> (columns, rows, future or None once failed)
+        self._pending: Dict[str, tuple] = {}
+        # path -> (sorted asset_ids, row order, recorded_at in sorted order)
+        self._indexes = LRUCache(maxsize=cached_indexes)
+        # path -> newest recorded_at in the segment; read once per segment
+        self._newest: Dict[str, float] = {}
+        self._listing: tuple = (-np.inf, [])
+        self._decoded = LRUCache(maxsize=cached_segments)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='asset-audit')
+        self.recorded = 0
+        self.write_failures = 0
+        self.segments_dropped = 0
+
+    def record(self, asset: AssetProperties, rulebook_version: str):
+        i = self._rows
+        columns = self._columns
+        columns['recorded_at'][i] = time.time()
+        columns['asset_id'][i] = asset.asset_id
+        columns['asset_type'][i] = asset.asset_type
+        columns['rulebook_version'][i] = rulebook_version
+        for name, kind in _PROPERTY_KINDS.items():
+            value = getattr(asset, name)
+            if kind == "flag":
+                columns[name][i] = _FLAG_UNSET if value is None else int(value)
+            elif kind == "number":
+                columns[name][i] = np.nan if value is None else value
+            else:
+                columns[name][i] = value
+
+        self._rows += 1
+        self.recorded += 1
+        if self._rows == self.segment_rows:
+            self._rotate()
+
+    def record_many(self, assets: Sequence[AssetProperties], rulebook_version: str):
+        for asset in assets:
+            self.record(asset, rulebook_version)
+
+    def flush(self):
+        if self._rows:
+            self._rotate()
+
+    def close(self):
+        self.flush()
+        # Last chance for segments that failed earlier, then wait for every write
+        self._resubmit_failed()
+        self._writer.shutdown(wait=True)
+        self._collect()
+        for path in list(self._pending):
+            logger.error(f"Asset audit segment {path} lost on close ({self._pending[path][1]} assets)")
+
+    def _rotate(self):
+        columns, rows = self._columns, self._rows
+        self._segments += 1
+        path = os.path.join(self.directory, f"asset-audit-{self._prefix}-{self._segments:05d}.npz")
+        self._columns = _empty_columns(self.segment_rows)
+        self._rows = 0
+        self._newest[path] = float(columns['recorded_at'][:rows].max())
+        self._collect()
+        self._resubmit_failed()
+        self._submit(path, columns, rows)
+
+    def _submit(self, path: str, columns: Dict[str, np.ndarray], rows: int):
+        future = self._writer.submit(self._write, path, columns, rows, self.WRITE_ATTEMPTS, self.WRITE_BACKOFF)
+        self._pending[path] = (columns, rows, future)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # The callback runs on the writer thread; _pending is only touched on the loop
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(self._written, path, f))
+
+    def _written(self, path: str, future):
+        entry = self._pending.get(path)
+        if entry is None or entry[2] is not future:
+            return
+        if future.exception() is None:
+            del self._pending[path]
+            return
+        # Keep the rows readable from memory until a resubmission succeeds
+        self.write_failures += 1
+        self._pending[path] = (entry[0], entry[1], None)
+        failed = [p for p, (_, _, f) in self._pending.items() if f is None]
+        for oldest in failed[:max(len(failed) - self.MAX_FAILED_SEGMENTS, 0)]:
+            _, dropped_rows, _ = self._pending.pop(oldest)
+            self._indexes.pop(oldest)
+            self._newest.pop(oldest, None)
+            self.segments_dropped += 1
+            logger.error(f"Asset audit segment {oldest} dropped after repeated write failures ({dropped_rows} assets)")
+
+    def _collect(self):
+        """Settle finished writes (no-loop path, and anything a loop callback has not reached yet)."""
+        for path, (_, _, future) in list(self._pending.items()):
+            if future is not None and future.done():
+                self._written(path, future)
+
+    def _resubmit_failed(self):
+        for path, (columns, rows, future) in list(self._pending.items()):
+            if future is None:
+                self._submit(path, columns, rows)
+
+    @staticmethod
+    def _write(path: str, columns: Dict[str, np.ndarray], rows: int, attempts: int = 1, backoff: float = 0.0):
+        for attempt in range(1, attempts + 1):
+            try:
+                AssetAuditLog._write_segment(path, columns, rows)
+                return
+            except Exception as e:
+                logger.error(f"Asset audit segment {path} failed (attempt {attempt}/{attempts}): {str(e)}")
+                if attempt == attempts:
+                    raise
+                time.sleep(backoff * 2 ** (attempt - 1))
+
+    @staticmethod
+    def _write_segment(path: str, columns: Dict[str, np.ndarray], rows: int):
+        data = {name: column[:rows] for name, column in columns.items()}
+        for name in ('asset_id', 'asset_type', 'rulebook_version'):
+            data[name] = data[name].astype(str)
+        for name, kind in _PROPERTY_KINDS.items():
+            if kind == "category":
+                data[name] = data[name].astype(str)
+        data['feature_bits'] = feature_bit_columns(columns, rows)
+        tmp = path + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                np.savez_compressed(f, version=np.int32(AUDIT_VERSION), **data)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        logger.info(f"Asset audit segment written: {path} ({rows} assets)")
+
+    @staticmethod
+    def _index(asset_ids: np.ndarray, recorded_at: np.ndarray) -> tuple:
+        # Stable sort keeps equal ids in record order, so the last match is the latest
+        order = np.argsort(asset_ids, kind='stable')
+        return asset_ids[order], order, recorded_at[order]
+
+    def segments(self) -> List[str]:
+        on_disk = {
+            os.path.join(self.directory, f) for f in os.listdir(self.directory)
+            if f.startswith('asset-audit-') and f.endswith('.npz')
+        }
+        return sorted(on_disk | set(self._pending))
+
+    def _segment_index(self, path: str) -> tuple:
+        index = self._indexes.get(path)
+        if index is None:
+            pending = self._pending.get(path)
+            if pending is not None:
+                columns, rows, _ = pending
+                index = self._index(columns['asset_id'][:rows].astype(str), columns['recorded_at'][:rows])
+            else:
+                with np.load(path) as data:
+                    version = int(data['version']) if 'version' in data.files else None
+                    if version != AUDIT_VERSION:
+                        raise ValueError(f"Unsupported audit log version {version} in {path}")
+                    index = self._index(data['asset_id'], data['recorded_at'])
+            self._indexes.put(path, index)
+        return index
+
+    def _segment_newest(self, path: str) -> float:
+        newest = self._newest.get(path)
+        if newest is None:
+            with np.load(path) as data:
+                recorded_at = data['recorded_at']
+            newest = self._newest[path] = float(recorded_at.max()) if len(recorded_at) else -np.inf
+        return newest
+
+    def _listed_segments(self) -> List[str]:
+        listed_at, paths = self._listing
+        now = time.monotonic()
+        if now - listed_at >= self.SEGMENT_LIST_TTL:
+            paths = self.segments()
+            self._listing = (now, paths)
+        # This worker's segments are known without waiting for the next listing
+        return sorted(set(paths) | set(self._pending))
+
+    def _segment_columns(self, path: str) -> Dict[str, np.ndarray]:
+        columns = self._decoded.get(path)
+        if columns is None:
+            columns = load_audit_segment(path)
+            self._decoded.put(path, columns)
+        return columns
+
+    def lookup(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        """Record of asset_id with the newest recorded_at across buffer and segments, or None."""
+        best_at, best_row, best_path = -np.inf, None, None
+        matches = np.flatnonzero(self._columns['asset_id'][:self._rows] == asset_id)
+        if len(matches):
+            best_row = int(matches[-1])
+            best_at = float(self._columns['recorded_at'][best_row])
+        newest = {path: self._segment_newest(path) for path in self._listed_segments()}
+        for path in sorted(newest, key=newest.get, reverse=True):
+            if newest[path] <= best_at:
+                break
+            ids, order, recorded_at = self._segment_index(path)
+            start = int(np.searchsorted(ids, asset_id, side='left'))
+            end = int(np.searchsorted(ids, asset_id, side='right'))
+            if start == end:
+                continue
+            # Newest within the segment; on equal times the later row wins
+            at = recorded_at[start:end]
+            i = end - 1 - int(np.argmax(at[::-1]))
+            if at[i - start] > best_at:
+                best_at, best_row, best_path = float(at[i - start]), int(order[i]), path
+        if best_row is None:
+            return None
+        if best_path is None:
+            return self._decode(self._columns, best_row, None)
+        pending = self._pending.get(best_path)
+        if pending is not None:
+            return self._decode(pending[0], best_row, best_path)
+        return self._decode(self._segment_columns(best_path), best_row, best_path)
+
+    @staticmethod
+    def _decode(columns: Dict[str, np.ndarray], row: int, path: Optional[str]) -> Dict[str, Any]:
+        fields = {'asset_id': str(columns['asset_id'][row]), 'asset_type': str(columns['asset_type'][row])}
+        for name, kind in _PROPERTY_KINDS.items():
+            value = columns[name][row]
+            if kind == "flag":
+                fields[name] = None if value == _FLAG_UNSET else bool(value)
+            elif kind == "number":
+                fields[name] = None if np.isnan(value) else float(value)
+            else:
+                fields[name] = str(value)
+        if fields['scene_count'] is not None:
+            fields['scene_count'] = int(fields['scene_count'])
+        asset = AssetProperties(**fields)
+        version = str(columns['rulebook_version'][row])
+        rulebook = rulebooks.get(version)
+        if 'feature_bits' in columns:
+            bits = np.unpackbits(columns['feature_bits'][row], bitorder='little')[:len(rulebook.features)]
+            feature_bits = bits.astype(bool).tolist()
+        else:
+            # Open buffer or a segment still being written: bucket this one row now
+            feature_bits = rulebook.feature_bits(asset)
+        return {
+            'asset': asset,
+            'rulebook_version': version,
+            'recorded_at': float(columns['recorded_at'][row]),
+            'feature_bits': feature_bits,
+            'segment': os.path.basename(path) if path else None
+        }
+
+    def render(self, record: Dict[str, Any], scorer: AssetScorer) -> dict:
+        """The trace=true score result a record reproduces, plus its audit metadata."""
+        rulebook = rulebooks.get(record['rulebook_version'])
+        values, aggression = rulebook.score_bits(record['feature_bits'])
+        result = scorer.envelope(record['asset'], values, aggression, trace=True,
+                                 rulebook_version=record['rulebook_version'])
+        result["audit"] = {
+            "recorded_at": record['recorded_at'],
+            "segment": record['segment'],
+            "rules_fired": [
+                {"property": f.property, "op": f.op, "value": f.value}
+                for f, fired in zip(rulebook.features, record['feature_bits']) if fired
+            ]
+        }
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'directory': self.directory,
+            'segment_rows': self.segment_rows,
+            'buffered': self._rows,
+            'recorded': self.recorded,
+            'segments_written': self._segments,
+            'segments_pending': len(self._pending),
+            'segments_failed': sum(1 for _, _, future in self._pending.values() if future is None),
+            'segments_dropped': self.segments_dropped,
+            'write_failures': self.write_failures
+        }
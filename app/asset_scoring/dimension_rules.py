@@ -17,6 +17,10 @@ Rules derived from conversion psychology heuristics:
 
 Rulebook Version: 2026-02-14.1
 
+Reference implementation. AssetScorer scores through the compiled tables in
+rulebook.py, whose RULEBOOK_2026_02_14_1 restates these rules term for term;
+change both together (test_rulebook.py checks they agree).
+
 # TODO Phase 3: Replace rule heuristics with Claude-assisted scoring
 # Maintain v1 as fallback and calibration baseline.
 """
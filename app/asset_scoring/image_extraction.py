@@ -0,0 +1,278 @@
+# app/asset_scoring/image_extraction.py
+"""
+Asset Property Extraction - Phase 2.5B (images)
+Raw image file -> AssetProperties, CPU only.
+
+Images are decoded straight to a small RGB array (JPEG DCT scaling via
+Image.draft, then a bilinear thumbnail of at most MAX_SIDE pixels), and every
+property is a handful of vectorized NumPy reductions over that array:
+
+    saturation          mean HSV saturation (max - min) / max
+    color_temperature   mean red-minus-blue balance against WARM_THRESHOLD
+    visual_complexity   luminance edge density blended with histogram entropy
+    text_density        share of 8x8 blocks that look like glyphs: dense
+                        edges, high contrast and two-tone luminance
+    background_style    border strip: flat -> clean, smooth and saturated ->
+                        abstract, textured -> lifestyle
+
+cta_present, face_present and product_visible are not measured; they keep
+the schema defaults unless supplied as overrides.
+
+Usage (NDJSON to stdout, one line per image, input order):
+    python -m app.asset_scoring.image_extraction images/ --workers 8
+    python -m app.asset_scoring.image_extraction images/ --score --trace
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .asset_schema import AssetProperties
+from .asset_scorer import AssetScorer, RULEBOOK_VERSION
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif', '.tif', '.tiff')
+
+# ITU-R BT.601 luma weights
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+class ImageExtractor:
+    """
+    Measures observable AssetProperties from an RGB pixel array.
+    Deterministic; thresholds are class constants, overridable per instance.
+    """
+
+    MAX_SIDE = 256                 # longest side after downsampling (pixels)
+    WARM_THRESHOLD = 0.04          # mean (R - B) beyond +/- this is warm / cool
+    EDGE_THRESHOLD = 0.08          # luminance step counted as an edge
+    EDGE_SATURATION = 0.35         # edge density at which the edge term maxes out
+    COMPLEXITY_EDGE_WEIGHT = 0.6   # rest of visual_complexity is histogram entropy
+    ENTROPY_BINS = 32
+    TEXT_BLOCK = 8                 # pixels per side of a text detection block
+    TEXT_EDGE_DENSITY = 0.2        # edge share a block needs to look like glyphs
+    TEXT_CONTRAST = 0.3            # luminance range a block needs
+    TEXT_TWO_TONE = 0.7            # share of block pixels near its darkest or lightest tone
+    BORDER_FRACTION = 0.08         # border strip width, per side
+    CLEAN_BORDER_STD = 0.06        # border luminance std below this is flat
+    CLEAN_BORDER_EDGES = 0.03      # ... with at most this edge density
+    ABSTRACT_SATURATION = 0.45     # smooth border at least this saturated is abstract
+    ABSTRACT_BORDER_EDGES = 0.12
+
+    def __init__(self, **thresholds: float):
+        for name, value in thresholds.items():
+            if not name.isupper() or not hasattr(type(self), name):
+                raise ValueError(f"Unknown extractor threshold '{name}'")
+            setattr(self, name, value)
+
+    def load(self, path: str) -> np.ndarray:
+        """Decode an image file to a (H, W, 3) uint8 array, longest side <= MAX_SIDE."""
+        from PIL import Image
+
+        with Image.open(path) as image:
+            # JPEG: decode at reduced scale instead of full size then resizing
+            image.draft('RGB', (self.MAX_SIDE, self.MAX_SIDE))
+            image = image.convert('RGB')
+            image.thumbnail((self.MAX_SIDE, self.MAX_SIDE), Image.Resampling.BILINEAR)
+            return np.asarray(image, dtype=np.uint8)
+
+    def measure(self, pixels: np.ndarray) -> Dict[str, Any]:
+        """Measured properties of a (H, W, 3) RGB array (uint8, or float in [0, 1])."""
+        if pixels.ndim != 3 or pixels.shape[2] != 3 or min(pixels.shape[:2]) < 2:
+            raise ValueError(f"Expected an (H, W, 3) RGB array of at least 2x2, got shape {pixels.shape}")
+        rgb = pixels.astype(np.float32)
+        if pixels.dtype == np.uint8:
+            rgb /= 255.0
+
+        high = rgb.max(axis=2)
+        low = rgb.min(axis=2)
+        saturation = np.divide(high - low, high, out=np.zeros_like(high), where=high > 0)
+        luma = rgb @ _LUMA
+        edges = self._edges(luma)
+
+        warmth = float(np.mean(rgb[..., 0] - rgb[..., 2]))
+        if warmth > self.WARM_THRESHOLD:
+            color_temperature = "warm"
+        elif warmth < -self.WARM_THRESHOLD:
+            color_temperature = "cool"
+        else:
+            color_temperature = "neutral"
+
+        return {
+            "color_temperature": color_temperature,
+            "saturation": _unit(saturation.mean()),
+            "visual_complexity": _unit(self._complexity(luma, edges)),
+            "text_density": _unit(self._text_density(luma, edges)),
+            "background_style": self._background(luma, saturation, edges),
+        }
+
+    def _edges(self, luma: np.ndarray) -> np.ndarray:
+        """(H, W) bool: pixels whose step to the right or below exceeds EDGE_THRESHOLD."""
+        edges = np.zeros(luma.shape, dtype=bool)
+        edges[:, :-1] |= np.abs(np.diff(luma, axis=1)) > self.EDGE_THRESHOLD
+        edges[:-1, :] |= np.abs(np.diff(luma, axis=0)) > self.EDGE_THRESHOLD
+        return edges
+
+    def _complexity(self, luma: np.ndarray, edges: np.ndarray) -> float:
+        edge_term = min(edges.mean() / self.EDGE_SATURATION, 1.0)
+        counts = np.bincount(np.minimum((luma * self.ENTROPY_BINS).astype(np.intp), self.ENTROPY_BINS - 1).ravel(),
+                             minlength=self.ENTROPY_BINS)
+        p = counts[counts > 0] / luma.size
+        entropy = float(-(p * np.log2(p)).sum()) / np.log2(self.ENTROPY_BINS)
+        return self.COMPLEXITY_EDGE_WEIGHT * edge_term + (1.0 - self.COMPLEXITY_EDGE_WEIGHT) * entropy
+
+    def _text_density(self, luma: np.ndarray, edges: np.ndarray) -> float:
+        b = self.TEXT_BLOCK
+        rows, cols = luma.shape[0] // b, luma.shape[1] // b
+        if rows == 0 or cols == 0:
+            return 0.0
+        # (rows, cols, b*b) views of each block
+        blocks = luma[:rows * b, :cols * b].reshape(rows, b, cols, b).swapaxes(1, 2).reshape(rows, cols, b * b)
+        block_edges = edges[:rows * b, :cols * b].reshape(rows, b, cols, b).mean(axis=(1, 3))
+        low = blocks.min(axis=2, keepdims=True)
+        high = blocks.max(axis=2, keepdims=True)
+        spread = high - low
+        near = (blocks - low < 0.25 * spread) | (high - blocks < 0.25 * spread)
+        text = ((block_edges > self.TEXT_EDGE_DENSITY)
+                & (spread[..., 0] > self.TEXT_CONTRAST)
+                & (near.mean(axis=2) > self.TEXT_TWO_TONE))
+        return float(text.mean())
+
+    def _background(self, luma: np.ndarray, saturation: np.ndarray, edges: np.ndarray) -> str:
+        h, w = luma.shape
+        band = max(1, int(round(min(h, w) * self.BORDER_FRACTION)))
+        border = np.zeros((h, w), dtype=bool)
+        border[:band] = border[-band:] = True
+        border[:, :band] = border[:, -band:] = True
+        border_edges = edges[border].mean()
+        if luma[border].std() < self.CLEAN_BORDER_STD and border_edges <= self.CLEAN_BORDER_EDGES:
+            return "clean"
+        if saturation[border].mean() >= self.ABSTRACT_SATURATION and border_edges <= self.ABSTRACT_BORDER_EDGES:
+            return "abstract"
+        return "lifestyle"
+
+    def extract(self, path: str, asset_id: Optional[str] = None, **overrides: Any) -> AssetProperties:
+        """
+        AssetProperties for one image file, ready for AssetScorer.score.
+        asset_id defaults to the file name without extension; overrides
+        supply the unmeasured fields (e.g. cta_present=True).
+        """
+        properties = self.measure(self.load(path))
+        properties.update(overrides)
+        if asset_id is None:
+            asset_id = os.path.splitext(os.path.basename(path))[0]
+        return AssetProperties(asset_id=asset_id, asset_type="image", **properties)
+
+
+def _unit(value: float) -> float:
+    return round(min(max(float(value), 0.0), 1.0), 4)
+
+
+def image_paths(root: str, extensions: Tuple[str, ...] = IMAGE_EXTENSIONS) -> Iterator[str]:
+    """root itself if it is a file, else files under it with these extensions in sorted walk order."""
+    if os.path.isfile(root):
+        yield root
+        return
+    for directory, subdirs, files in os.walk(root):
+        subdirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(extensions):
+                yield os.path.join(directory, name)
+
+
+def _extract_job(job: Tuple[str, Any]) -> Tuple[str, Optional[dict], Optional[str]]:
+    # Module-level so pool workers can unpickle it; results cross back as plain dicts
+    path, extractor = job
+    try:
+        return path, extractor.extract(path).model_dump(), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {str(e)}"
+
+
+def extract_files(paths: Iterable[str],
+                  extractor: Any,
+                  workers: Optional[int] = None,
+                  chunksize: int = 16) -> Iterator[Tuple[str, Optional[AssetProperties], Optional[str]]]:
+    """
+    Stream (path, AssetProperties, None) or (path, None, error) per file, in
+    input order, as workers finish; extractor is any picklable object with
+    extract(path) -> AssetProperties. workers defaults to the CPU count and
+    runs spawn-context worker processes (decode is CPU bound); workers=1
+    extracts in this process. Workers return small property dicts, never
+    pixels, so memory does not grow with image size or count.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = ((path, extractor) for path in paths)
+    if workers == 1:
+        results = map(_extract_job, jobs)
+        pool = None
+    else:
+        pool = multiprocessing.get_context('spawn').Pool(workers)
+        results = pool.imap(_extract_job, jobs, chunksize=chunksize)
+    try:
+        for path, properties, error in results:
+            yield path, AssetProperties(**properties) if properties is not None else None, error
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def extract_images(paths: Iterable[str],
+                   workers: Optional[int] = None,
+                   chunksize: int = 16,
+                   extractor: Optional[ImageExtractor] = None
+                   ) -> Iterator[Tuple[str, Optional[AssetProperties], Optional[str]]]:
+    """extract_files() with an ImageExtractor (default thresholds unless given)."""
+    return extract_files(paths, extractor or ImageExtractor(), workers=workers, chunksize=chunksize)
+
+
+def write_ndjson(results: Iterable[Tuple[str, Optional[AssetProperties], Optional[str]]],
+                 scorer: Optional[AssetScorer] = None,
+                 trace: bool = False,
+                 rulebook_version: str = RULEBOOK_VERSION,
+                 unit: str = "images") -> int:
+    """Write extract_files() results to stdout as NDJSON (scored if scorer is given); rate to stderr."""
+    count = errors = 0
+    start = time.perf_counter()
+    for path, asset, error in results:
+        count += 1
+        if error is not None:
+            errors += 1
+            line: Dict[str, Any] = {"path": path, "error": error}
+        elif scorer is not None:
+            line = scorer.score(asset, trace=trace, rulebook_version=rulebook_version)
+        else:
+            line = asset.model_dump()
+        sys.stdout.write(json.dumps(line) + "\n")
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed * 60 if elapsed > 0 else 0.0
+    sys.stderr.write(f"{count} {unit} ({errors} errors) in {elapsed:.1f}s, {rate:.0f} {unit}/min\n")
+    return count
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract AssetProperties from image files as NDJSON")
+    parser.add_argument('paths', nargs='+', help="Image files or directories")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=16, help="Images per worker task")
+    parser.add_argument('--max-side', type=int, default=ImageExtractor.MAX_SIDE, help="Downsampled longest side")
+    parser.add_argument('--score', action='store_true', help="Emit AssetScorer results instead of properties")
+    parser.add_argument('--trace', action='store_true', help="Include the trace with --score")
+    parser.add_argument('--rulebook-version', default=RULEBOOK_VERSION)
+    args = parser.parse_args(argv)
+
+    paths = (path for root in args.paths for path in image_paths(root))
+    results = extract_images(paths, workers=args.workers, chunksize=args.chunksize,
+                             extractor=ImageExtractor(MAX_SIDE=args.max_side))
+    write_ndjson(results, scorer=AssetScorer() if args.score else None, trace=args.trace,
+                 rulebook_version=args.rulebook_version)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,426 @@
+# app/asset_scoring/rulebook.py
+"""
+Declarative 9PD Rulebook — compiled to lookup tables
+
+Each rulebook version is data: a base score per dimension plus additive
+terms, where a term fires when all of its conditions hold. A condition is
+one threshold or categorical test on one AssetProperties field. Compiling
+a rulebook assigns every distinct condition a feature bit and tabulates,
+per dimension, the final rounded score for every combination of the bits
+that dimension reads. Scoring is then feature bucketing plus one table
+lookup per dimension.
+
+RULEBOOK_2026_02_14_1 restates dimension_rules.py (the reference
+implementation) term for term; the tables are built with the same float
+operations in the same order, so scores are bit-identical to it.
+"""
+
+import copy
+from typing import Any, Dict, List, Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS
+from .asset_schema import AssetProperties
+
+# Largest per-dimension feature count (table of 2**n entries)
+MAX_DIMENSION_FEATURES = 16
+
+
+def _when(prop: str, op: str = "true", value: Any = None) -> Dict[str, Any]:
+    return {"property": prop, "op": op, "value": value}
+
+
+RULEBOOK_2026_02_14_1 = {
+    "version": "2026-02-14.1",
+    "round_digits": 4,
+    "aggression": {
+        "base": 0.0,
+        "cap": 0.30,
+        "terms": [
+            {"when": [_when("cta_present")], "add": 0.15},
+            {"when": [_when("saturation", "gt", 0.85)], "add": 0.10},
+            {"when": [_when("text_density", "gt", 0.35)], "add": 0.05},
+        ],
+        # Dimension -> multiplier subtracted as aggression * weight (trace order)
+        "effects": {"autonomy": 0.8, "ethics": 0.6, "trust": 0.3},
+    },
+    "dimensions": {
+        "presence": {
+            "base": 0.5, "cap": 1.0, "floor": None,
+            "terms": [
+                {"when": [_when("face_present")], "add": 0.20},
+                {"when": [_when("saturation", "gt", 0.7)], "add": 0.15},
+                {"when": [_when("visual_complexity", "lt", 0.4)], "add": 0.10},
+                {"when": [_when("text_density", "lt", 0.2)], "add": 0.05},
+            ],
+        },
+        "trust": {
+            "base": 0.5, "cap": 1.0, "floor": 0.0,
+            "terms": [
+                {"when": [_when("color_temperature", "eq", "cool")], "add": 0.15},
+                {"when": [_when("background_style", "eq", "clean")], "add": 0.15},
+                {"when": [_when("text_density", "gt", 0.2)], "add": 0.10},
+                {"when": [_when("product_visible")], "add": 0.10},
+            ],
+        },
+        "authenticity": {
+            "base": 0.5, "cap": 1.0, "floor": None,
+            "terms": [
+                {"when": [_when("background_style", "eq", "lifestyle")], "add": 0.20},
+                {"when": [_when("face_present")], "add": 0.15},
+                {"when": [_when("saturation", "lt", 0.6)], "add": 0.10},
+                {"when": [_when("color_temperature", "eq", "warm")], "add": 0.05},
+            ],
+        },
+        "momentum": {
+            "base": 0.5, "cap": 1.0, "floor": None,
+            "terms": [
+                {"when": [_when("cta_present")], "add": 0.20},
+                {"when": [_when("saturation", "gt", 0.75)], "add": 0.15},
+                {"when": [_when("visual_complexity", "gt", 0.6)], "add": 0.10},
+                {"when": [_when("color_temperature", "eq", "warm")], "add": 0.05},
+                {"when": [_when("pacing", "gt", 0.7)], "add": 0.10},
+                {"when": [_when("scene_count", "gt", 8)], "add": 0.05},
+            ],
+        },
+        "taste": {
+            "base": 0.5, "cap": 1.0, "floor": None,
+            "terms": [
+                {"when": [_when("background_style", "eq", "clean")], "add": 0.20},
+                {"when": [_when("visual_complexity", "lt", 0.35)], "add": 0.15},
+                {"when": [_when("saturation", "gt", 0.5), _when("saturation", "lt", 0.75)], "add": 0.10},
+                {"when": [_when("color_temperature", "eq", "neutral")], "add": 0.05},
+            ],
+        },
+        "empathy": {
+            "base": 0.5, "cap": 1.0, "floor": None,
+            "terms": [
+                {"when": [_when("face_present")], "add": 0.25},
+                {"when": [_when("background_style", "eq", "lifestyle")], "add": 0.15},
+                {"when": [_when("color_temperature", "eq", "warm")], "add": 0.10},
+                {"when": [_when("narration_present")], "add": 0.10},
+            ],
+        },
+        "autonomy": {
+            "base": 0.5, "cap": 1.0, "floor": 0.0,
+            "terms": [
+                {"when": [_when("cta_present", "false")], "add": 0.15},
+                {"when": [_when("text_density", "lt", 0.15)], "add": 0.10},
+                {"when": [_when("background_style", "eq", "clean")], "add": 0.10},
+                {"when": [_when("visual_complexity", "lt", 0.4)], "add": 0.05},
+            ],
+        },
+        "resonance": {
+            "base": 0.5, "cap": 1.0, "floor": None,
+            "terms": [
+                {"when": [_when("product_visible")], "add": 0.15},
+                {"when": [_when("color_temperature", "eq", "warm"), _when("face_present")], "add": 0.15},
+                {"when": [_when("background_style", "eq", "lifestyle")], "add": 0.10},
+            ],
+        },
+        "ethics": {
+            "base": 0.5, "cap": 1.0, "floor": 0.0,
+            "terms": [
+                {"when": [_when("text_density", "lt", 0.3)], "add": 0.10},
+                {"when": [_when("background_style", "ne", "abstract")], "add": 0.10},
+            ],
+        },
+    },
+}
+
+# Built-in rulebooks, compiled at import; add new versions here
+RULEBOOK_SPECS = (RULEBOOK_2026_02_14_1,)
+
+
+class Feature(NamedTuple):
+    """One bucketing test: property <op> value."""
+    property: str
+    op: str
+    value: Any = None
+
+
+_PROPERTY_KINDS = {
+    "color_temperature": "category",
+    "background_style": "category",
+    "text_density": "number",
+    "visual_complexity": "number",
+    "saturation": "number",
+    "cta_present": "flag",
+    "face_present": "flag",
+    "product_visible": "flag",
+    "pacing": "number",
+    "scene_count": "number",
+    "narration_present": "flag",
+    "sfx_present": "flag",
+    "on_screen_text_density": "number",
+}
+
+# Condition operators per property kind; unset (None) fields never satisfy gt/lt/true
+_OPS_BY_KIND = {
+    "flag": ("true", "false"),
+    "number": ("gt", "lt"),
+    "category": ("eq", "ne"),
+}
+
+
+def property_column(assets: Sequence[AssetProperties], name: str) -> np.ndarray:
+    """One property across assets; unset numbers are NaN, unset flags False."""
+    values = [getattr(a, name) for a in assets]
+    kind = _PROPERTY_KINDS[name]
+    if kind == "category":
+        return np.array(values, dtype=object)
+    if kind == "flag":
+        return np.fromiter((bool(v) for v in values), dtype=bool, count=len(values))
+    return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(values))
+
+
+# Scalar feature tests, identical to the rules' Python comparisons (None never passes gt/lt)
+_ROW_TESTS = {
+    "true": lambda value, _: bool(value),
+    "false": lambda value, _: not value,
+    "eq": lambda value, target: value == target,
+    "ne": lambda value, target: value != target,
+    "gt": lambda value, target: value is not None and value > target,
+    "lt": lambda value, target: value is not None and value < target,
+}
+
+
+def _test_column(feature: Feature, column: np.ndarray) -> np.ndarray:
+    op = feature.op
+    if op == "true":
+        return column
+    if op == "false":
+        return ~column
+    if op == "eq":
+        return column == feature.value
+    if op == "ne":
+        return column != feature.value
+    # NaN (unset) compares False
+    if op == "gt":
+        return column > feature.value
+    return column < feature.value
+
+
+class DimensionTable(NamedTuple):
+    """Rounded score for each combination of the features (bit j = features[j]) a dimension reads."""
+    features: np.ndarray    # (k,) indices into CompiledRulebook.features
+    weights: np.ndarray     # (k,) 1 << j
+    scores: np.ndarray      # (2**k,)
+
+
+class CompiledRulebook:
+    """
+    A rulebook version ready to score: its distinct features, one
+    DimensionTable per 9PD dimension and an (unrounded) aggression table.
+    Immutable once built; safe to share between requests and threads.
+    """
+
+    def __init__(self, version: str, features: Tuple[Feature, ...],
+                 dimensions: Dict[str, DimensionTable], aggression: DimensionTable,
+                 aggression_effects: Dict[str, float], spec: Dict[str, Any]):
+        self.version = version
+        self.features = features
+        self.dimensions = dimensions
+        self.aggression = aggression
+        self.aggression_effects = aggression_effects
+        self.spec = spec
+        self._dimension_tables = [dimensions[dim] for dim in NINE_PD_DIMENSIONS]
+        # Plain-Python copies for the one-asset path (no per-call NumPy overhead)
+        self._row_tests = [(f.property, _ROW_TESTS[f.op], f.value) for f in features]
+        self._row_tables = [
+            (tuple(zip(table.features.tolist(), table.weights.tolist())), table.scores.tolist())
+            for table in self._dimension_tables + [aggression]
+        ]
+
+    def feature_bits(self, asset: AssetProperties) -> List[bool]:
+        return [test(getattr(asset, prop), target) for prop, test, target in self._row_tests]
+
+    def feature_matrix(self, assets: Sequence[AssetProperties]) -> np.ndarray:
+        """(N, F) bool: the bucketing step, one column per feature."""
+        columns = {}
+        for feature in self.features:
+            if feature.property not in columns:
+                columns[feature.property] = property_column(assets, feature.property)
+        return self.feature_matrix_columns(columns, len(assets))
+
+    def feature_matrix_columns(self, columns: Mapping[str, np.ndarray], n: int) -> np.ndarray:
+        """feature_matrix() over property columns shaped as property_column() returns them."""
+        matrix = np.empty((n, len(self.features)), dtype=bool)
+        for j, feature in enumerate(self.features):
+            matrix[:, j] = _test_column(feature, columns[feature.property])
+        return matrix
+
+    def score_row(self, asset: AssetProperties) -> Tuple[List[float], float]:
+        """Rounded profile values in NINE_PD_DIMENSIONS order and the aggression term."""
+        return self.score_bits(self.feature_bits(asset))
+
+    def score_bits(self, bits: Sequence[bool]) -> Tuple[List[float], float]:
+        """score_row() from an asset's feature_bits(), e.g. a logged rule-firing mask."""
+        values = []
+        for features, scores in self._row_tables:
+            index = 0
+            for f, weight in features:
+                if bits[f]:
+                    index += weight
+            values.append(scores[index])
+        return values[:-1], values[-1]
+
+    def score_many(self, assets: Sequence[AssetProperties]) -> Tuple[np.ndarray, np.ndarray]:
+        """Rounded (N, 9) profiles and (N,) aggression."""
+        return self.score_feature_matrix(self.feature_matrix(assets))
+
+    def score_feature_matrix(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """score_many() from an (N, F) feature matrix."""
+        profiles = np.empty((matrix.shape[0], len(NINE_PD_DIMENSIONS)), dtype=np.float64)
+        for d, table in enumerate(self._dimension_tables):
+            profiles[:, d] = table.scores[self._indices(table, matrix)]
+        return profiles, self.aggression.scores[self._indices(self.aggression, matrix)]
+
+    @staticmethod
+    def _indices(table: DimensionTable, matrix: np.ndarray) -> np.ndarray:
+        return matrix[:, table.features].astype(np.intp) @ table.weights
+
+
+def _validate_condition(condition: Mapping[str, Any], where: str) -> Feature:
+    prop, op = condition.get("property"), condition.get("op", "true")
+    if prop not in _PROPERTY_KINDS:
+        raise ValueError(f"{where}: unknown property '{prop}'")
+    if op not in _OPS_BY_KIND[_PROPERTY_KINDS[prop]]:
+        raise ValueError(f"{where}: op '{op}' not valid for {prop} (expected one of {list(_OPS_BY_KIND[_PROPERTY_KINDS[prop]])})")
+    value = condition.get("value")
+    if _PROPERTY_KINDS[prop] == "number" and (isinstance(value, bool) or not isinstance(value, (int, float))):
+        raise ValueError(f"{where}: {prop} {op} needs a numeric value, got {value!r}")
+    if _PROPERTY_KINDS[prop] == "category" and not isinstance(value, str):
+        raise ValueError(f"{where}: {prop} {op} needs a string value, got {value!r}")
+    return Feature(prop, op, value)
+
+
+def _compile_terms(terms: Sequence[Mapping[str, Any]], where: str,
+                   feature_ids: Dict[Feature, int]) -> List[Tuple[List[int], float]]:
+    compiled = []
+    for t, term in enumerate(terms):
+        conditions = term.get("when") or []
+        if not conditions:
+            raise ValueError(f"{where} term {t}: 'when' must list at least one condition")
+        ids = []
+        for condition in conditions:
+            feature = _validate_condition(condition, f"{where} term {t}")
+            ids.append(feature_ids.setdefault(feature, len(feature_ids)))
+        compiled.append((ids, float(term["add"])))
+    return compiled
+
+
+def _accumulate(base: float, terms: List[Tuple[List[int], float]], bits: Dict[int, bool]) -> float:
+    # Same sequence of float additions as the reference rule functions
+    score = base
+    for ids, add in terms:
+        if all(bits[i] for i in ids):
+            score += add
+    return score
+
+
+def _table(feature_list: List[int], evaluate) -> DimensionTable:
+    if len(feature_list) > MAX_DIMENSION_FEATURES:
+        raise ValueError(f"Dimension reads {len(feature_list)} features (max {MAX_DIMENSION_FEATURES})")
+    scores = np.empty(1 << len(feature_list), dtype=np.float64)
+    for index in range(len(scores)):
+        bits = {f: bool(index >> j & 1) for j, f in enumerate(feature_list)}
+        scores[index] = evaluate(bits)
+    scores.setflags(write=False)
+    return DimensionTable(
+        features=np.array(feature_list, dtype=np.intp),
+        weights=np.left_shift(1, np.arange(len(feature_list), dtype=np.intp)),
+        scores=scores
+    )
+
+
+def compile_rulebook(spec: Mapping[str, Any]) -> CompiledRulebook:
+    """Validate a declarative rulebook and tabulate every dimension."""
+    spec = copy.deepcopy(dict(spec))
+    version = spec.get("version")
+    if not isinstance(version, str) or not version:
+        raise ValueError("Rulebook needs a non-empty string 'version'")
+    digits = int(spec.get("round_digits", 4))
+    dimensions = spec.get("dimensions", {})
+    missing = [d for d in NINE_PD_DIMENSIONS if d not in dimensions]
+    unknown = [d for d in dimensions if d not in NINE_PD_DIMENSIONS]
+    if missing or unknown:
+        raise ValueError(f"Rulebook {version}: missing dimensions {missing}, unknown dimensions {unknown}")
+
+    feature_ids: Dict[Feature, int] = {}
+    aggression_spec = spec.get("aggression", {"base": 0.0, "cap": 0.0, "terms": [], "effects": {}})
+    aggression_terms = _compile_terms(aggression_spec.get("terms", []), f"Rulebook {version} aggression", feature_ids)
+    aggression_base = float(aggression_spec.get("base", 0.0))
+    aggression_cap = float(aggression_spec["cap"])
+    effects = {dim: float(w) for dim, w in aggression_spec.get("effects", {}).items()}
+    if any(dim not in NINE_PD_DIMENSIONS for dim in effects):
+        raise ValueError(f"Rulebook {version}: aggression effects on unknown dimensions {sorted(set(effects) - set(NINE_PD_DIMENSIONS))}")
+    aggression_features = sorted({i for ids, _ in aggression_terms for i in ids})
+
+    def aggression_value(bits):
+        return min(_accumulate(aggression_base, aggression_terms, bits), aggression_cap)
+
+    tables = {}
+    for dim in NINE_PD_DIMENSIONS:
+        dim_spec = dimensions[dim]
+        terms = _compile_terms(dim_spec.get("terms", []), f"Rulebook {version} {dim}", feature_ids)
+        base = float(dim_spec.get("base", 0.5))
+        cap = dim_spec.get("cap")
+        floor = dim_spec.get("floor")
+        weight = effects.get(dim)
+        used = {i for ids, _ in terms for i in ids}
+        if weight is not None:
+            used.update(aggression_features)
+
+        def evaluate(bits, terms=terms, base=base, cap=cap, floor=floor, weight=weight):
+            score = _accumulate(base, terms, bits)
+            if weight is not None:
+                score -= aggression_value(bits) * weight
+            if cap is not None:
+                score = min(score, cap)
+            if floor is not None:
+                score = max(score, floor)
+            return round(score, digits)
+
+        tables[dim] = _table(sorted(used), evaluate)
+
+    features = tuple(sorted(feature_ids, key=feature_ids.get))
+    return CompiledRulebook(
+        version=version,
+        features=features,
+        dimensions=tables,
+        aggression=_table(aggression_features, aggression_value),
+        aggression_effects=effects,
+        spec=spec
+    )
+
+
+class RulebookRegistry:
+    """
+    Compiled rulebooks by version, all loaded side by side. get() is a dict
+    lookup; nothing is parsed or compiled per request.
+    """
+
+    def __init__(self, specs: Sequence[Mapping[str, Any]] = ()):
+        self._compiled: Dict[str, CompiledRulebook] = {}
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: Mapping[str, Any]) -> CompiledRulebook:
+        compiled = compile_rulebook(spec)
+        # Replace the mapping rather than mutate it, so concurrent get() calls see a consistent view
+        self._compiled = {**self._compiled, compiled.version: compiled}
+        return compiled
+
+    def get(self, version: str) -> CompiledRulebook:
+        compiled = self._compiled.get(version)
+        if compiled is None:
+            raise ValueError(f"Unknown rulebook version '{version}' (loaded: {self.versions()})")
+        return compiled
+
+    def versions(self) -> List[str]:
+        return sorted(self._compiled)
+
+
+rulebooks = RulebookRegistry(RULEBOOK_SPECS)
@@ -0,0 +1,405 @@
+# app/asset_scoring/rulebook_drift.py
+"""
+Rulebook Drift Report
+Re-scores the stored asset archive under an old and a new rulebook version
+and reports which assets move, and by how much, before the new version
+becomes the default.
+
+The archive is streamed in chunks to spawn-context worker processes: audit
+log segments (audit_log.py, already columnar, scored straight from their
+property columns) and/or NDJSON files of AssetProperties (chunk_rows lines
+per task). Each worker buckets its chunk once per version, takes the (N, 9)
+profile delta and returns a small partial (histogram counts, sums, band
+changes, its own top movers), so only partials cross process boundaries
+and at most 2 x workers chunks are in flight.
+
+The audit log holds one record per scoring event, so an asset re-scored
+over time appears in several segments. A first pass over the archive
+collects 64-bit hashes of every record's asset_id (and, for audit rows,
+its recorded_at); only the latest record per asset is re-scored. Audit
+rows are ordered by recorded_at, never by segment name, which with several
+writers sharing a directory is worker start order. NDJSON rows carry no
+time: they rank after every audit row, later lines (paths as given,
+directories in name order) winning. The report gives both counts: records
+(valid rows read) and assets (distinct ids).
+NDJSON lines that fail to parse or validate are skipped and counted as
+invalid_lines, as the streaming endpoint does, instead of aborting the run.
+
+Band: the asset's mean 9PD score placed on the A2 system-fit thresholds
+(AUTO_LAUNCH / HUMAN_REVIEW / NO_LAUNCH) - the routing an asset would
+contribute to, as a proxy, since archived assets carry no system context.
+
+Usage:
+    python -m app.asset_scoring.rulebook_drift audit/ --old 2026-02-14.1 --new 2026-06-01.1
+    python -m app.asset_scoring.rulebook_drift assets.ndjson --rulebook candidate.json --new 2026-06-01.1 --top 50
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import ValidationError
+
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS
+from app.a2_system_underwriting.system_decision_engine import SystemDecisionEngine
+from .asset_schema import AssetProperties
+from .asset_scorer import RULEBOOK_VERSION
+from .audit_log import load_audit_segment, snapshot_columns
+from .rulebook import rulebooks
+
+BANDS = ("AUTO_LAUNCH", "HUMAN_REVIEW", "NO_LAUNCH")
+
+# Band floors on the mean profile score, from the A2 system-fit thresholds
+BAND_FLOORS = (
+    SystemDecisionEngine.THRESHOLDS['auto_launch']['min_system_fit'],
+    SystemDecisionEngine.THRESHOLDS['human_review']['min_system_fit'],
+)
+
+# Delta histogram: 0.025-wide bins over [-0.5, 0.5]; larger moves land in the end bins
+DELTA_EDGES = np.round(np.linspace(-0.5, 0.5, 41), 4)
+
+
+def asset_bands(profiles: np.ndarray) -> np.ndarray:
+    """(N,) uint8 index into BANDS for (N, 9) profiles."""
+    mean = profiles.mean(axis=1)
+    return np.where(mean >= BAND_FLOORS[0], 0, np.where(mean >= BAND_FLOORS[1], 1, 2)).astype(np.uint8)
+
+
+def _profiles(chunk: Tuple[str, Any], version: str) -> np.ndarray:
+    kind, data = chunk
+    rulebook = rulebooks.get(version)
+    if kind == 'segment':
+        matrix = rulebook.feature_matrix_columns(snapshot_columns(data), len(data['asset_id']))
+        return rulebook.score_feature_matrix(matrix)[0]
+    return rulebook.score_many(data)[0]
+
+
+def _id_hashes(asset_ids: Sequence[str]) -> np.ndarray:
+    """(N,) uint64 hashes of asset ids; compact enough to hold one per archived record."""
+    digests = b"".join(hashlib.blake2b(str(a).encode('utf-8'), digest_size=8).digest() for a in asset_ids)
+    return np.frombuffer(digests, dtype=np.uint64)
+
+
+def chunk_asset_ids(source: Tuple[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    First pass over one source (runs in a worker): (hashes, valid,
+    recorded_at) per row. valid is False for NDJSON lines that do not parse
+    as AssetProperties; recorded_at is +inf for NDJSON rows.
+    """
+    kind, data = source
+    if kind == 'segment':
+        with np.load(data) as segment:
+            asset_ids = segment['asset_id']
+            recorded_at = segment['recorded_at']
+        return _id_hashes(asset_ids), np.ones(len(asset_ids), dtype=bool), recorded_at
+    asset_ids = []
+    for line in data:
+        try:
+            asset_ids.append(AssetProperties.model_validate_json(line).asset_id)
+        except ValidationError:
+            asset_ids.append(None)
+    valid = np.array([a is not None for a in asset_ids], dtype=bool)
+    hashes = np.zeros(len(asset_ids), dtype=np.uint64)
+    hashes[valid] = _id_hashes([a for a in asset_ids if a is not None])
+    return hashes, valid, np.full(len(asset_ids), np.inf)
+
+
+def latest_rows(ids: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]]) -> List[np.ndarray]:
+    """
+    Per-source keep masks selecting, for every asset id, the valid row with
+    the newest recorded_at, ties (and NDJSON rows) going to the later row
+    in archive order.
+    """
+    if not ids:
+        return []
+    hashes, valid, recorded_at = (np.concatenate(column) for column in zip(*ids))
+    rows = np.flatnonzero(valid)
+    # Sorted by id, then time, then archive position: the last row of each id group wins
+    order = rows[np.lexsort((rows, recorded_at[rows], hashes[rows]))]
+    grouped = hashes[order]
+    last = np.append(grouped[1:] != grouped[:-1], True) if len(order) else np.empty(0, dtype=bool)
+    keep = np.zeros(len(hashes), dtype=bool)
+    keep[order[last]] = True
+    return np.split(keep, np.cumsum([len(h) for h, _, _ in ids])[:-1])
+
+
+def drift_chunk(source: Tuple[str, Any], old_version: str, new_version: str,
+                top: int, max_band_changes: int, keep: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    Partial drift report for one segment path or list of NDJSON lines (runs
+    in a worker), over the rows selected by keep (default: all).
+    """
+    kind, data = source
+    if kind == 'segment':
+        columns = load_audit_segment(data)
+        if keep is not None:
+            columns = {name: column[keep] for name, column in columns.items()}
+        chunk = ('segment', columns)
+        asset_ids = columns['asset_id']
+    else:
+        lines = data if keep is None else [line for line, k in zip(data, keep.tolist()) if k]
+        assets = [AssetProperties.model_validate_json(line) for line in lines]
+        chunk = ('assets', assets)
+        asset_ids = np.array([a.asset_id for a in assets], dtype=str)
+
+    old = _profiles(chunk, old_version)
+    new = _profiles(chunk, new_version)
+    # Profiles are rounded to 4 places; so is their difference, so deltas bin on exact edges
+    delta = np.round(new - old, 4)
+    moved = np.abs(delta)
+    changed = moved > 0
+
+    # Histogram per dimension in one bincount: dimension d uses bins [d*B, (d+1)*B)
+    n_bins = len(DELTA_EDGES) - 1
+    bins = np.clip(np.searchsorted(DELTA_EDGES, delta, side='right') - 1, 0, n_bins - 1)
+    bins += np.arange(len(NINE_PD_DIMENSIONS)) * n_bins
+    histogram = np.bincount(bins.ravel(), minlength=len(NINE_PD_DIMENSIONS) * n_bins)
+
+    old_bands, new_bands = asset_bands(old), asset_bands(new)
+    transitions = np.bincount(old_bands.astype(np.intp) * len(BANDS) + new_bands,
+                              minlength=len(BANDS) ** 2)
+    band_rows = np.flatnonzero(old_bands != new_bands)[:max_band_changes]
+
+    total = moved.sum(axis=1)
+    k = min(top, len(total))
+    top_rows = np.argpartition(-total, k - 1)[:k] if k else np.array([], dtype=np.intp)
+    return {
+        'assets': len(delta),
+        'changed_assets': int(changed.any(axis=1).sum()),
+        'changed': changed.sum(axis=0),
+        'delta_sum': delta.sum(axis=0),
+        'abs_delta_sum': moved.sum(axis=0),
+        'max_abs_delta': moved.max(axis=0) if len(delta) else np.zeros(len(NINE_PD_DIMENSIONS)),
+        'histogram': histogram.reshape(len(NINE_PD_DIMENSIONS), n_bins),
+        'transitions': transitions.reshape(len(BANDS), len(BANDS)),
+        'band_changes': [
+            {'asset_id': str(asset_ids[i]), 'from': BANDS[old_bands[i]], 'to': BANDS[new_bands[i]],
+             'old_mean': round(float(old[i].mean()), 4), 'new_mean': round(float(new[i].mean()), 4)}
+            for i in band_rows.tolist()
+        ],
+        'top_movers': [
+            (float(total[i]), str(asset_ids[i]), delta[i].round(4).tolist())
+            for i in top_rows.tolist() if total[i] > 0
+        ]
+    }
+
+
+def archive_sources(paths: Sequence[str], chunk_rows: int = 50_000) -> Iterator[Tuple[str, Any]]:
+    """
+    Tasks over the archive: one per audit segment (.npz, directories are
+    walked in name order) and one per chunk_rows lines of .ndjson files.
+    NDJSON is read lazily, a chunk at a time.
+    """
+    for root in paths:
+        if os.path.isdir(root):
+            files = sorted(os.path.join(root, f) for f in os.listdir(root) if f.endswith(('.npz', '.ndjson')))
+        else:
+            files = [root]
+        for path in files:
+            if path.endswith('.npz'):
+                yield ('segment', path)
+                continue
+            lines: List[bytes] = []
+            with open(path, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        lines.append(line)
+                    if len(lines) == chunk_rows:
+                        yield ('ndjson', lines)
+                        lines = []
+            if lines:
+                yield ('ndjson', lines)
+
+
+def _ordered_results(pool: Optional[ProcessPoolExecutor], fn: Callable, tasks: Iterator[tuple],
+                     workers: int) -> Iterator[Any]:
+    """fn(*task) for each task, in task order; at most 2 x workers tasks submitted at a time."""
+    if pool is None:
+        for task in tasks:
+            yield fn(*task)
+        return
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= 2 * workers:
+            yield pending.popleft().result()
+        pending.append(pool.submit(fn, *task))
+    while pending:
+        yield pending.popleft().result()
+
+
+class DriftReport:
+    """Merges drift_chunk() partials; every field is additive except the bounded top-N lists."""
+
+    def __init__(self, old_version: str, new_version: str, top: int = 20, max_band_changes: int = 10_000):
+        self.old_version = old_version
+        self.new_version = new_version
+        self.top = top
+        self.max_band_changes = max_band_changes
+        dims = len(NINE_PD_DIMENSIONS)
+        self.records = 0
+        self.invalid_lines = 0
+        self.assets = 0
+        self.changed_assets = 0
+        self.changed = np.zeros(dims, dtype=np.int64)
+        self.delta_sum = np.zeros(dims)
+        self.abs_delta_sum = np.zeros(dims)
+        self.max_abs_delta = np.zeros(dims)
+        self.histogram = np.zeros((dims, len(DELTA_EDGES) - 1), dtype=np.int64)
+        self.transitions = np.zeros((len(BANDS), len(BANDS)), dtype=np.int64)
+        self.band_changes: List[Dict[str, Any]] = []
+        self._movers: List[tuple] = []
+
+    def add(self, part: Dict[str, Any]):
+        self.assets += part['assets']
+        self.changed_assets += part['changed_assets']
+        self.changed += part['changed']
+        self.delta_sum += part['delta_sum']
+        self.abs_delta_sum += part['abs_delta_sum']
+        np.maximum(self.max_abs_delta, part['max_abs_delta'], out=self.max_abs_delta)
+        self.histogram += part['histogram']
+        self.transitions += part['transitions']
+        room = self.max_band_changes - len(self.band_changes)
+        if room > 0:
+            self.band_changes.extend(part['band_changes'][:room])
+        for mover in part['top_movers']:
+            if len(self._movers) < self.top:
+                heapq.heappush(self._movers, mover)
+            elif mover > self._movers[0]:
+                heapq.heapreplace(self._movers, mover)
+
+    def to_dict(self) -> Dict[str, Any]:
+        n = max(self.assets, 1)
+        band_changed = int(self.transitions.sum() - np.trace(self.transitions))
+        return {
+            'old_version': self.old_version,
+            'new_version': self.new_version,
+            'records': self.records,
+            'invalid_lines': self.invalid_lines,
+            'assets': self.assets,
+            'changed_assets': self.changed_assets,
+            'dimensions': {
+                dim: {
+                    'changed': int(self.changed[d]),
+                    'mean_delta': round(float(self.delta_sum[d] / n), 6),
+                    'mean_abs_delta': round(float(self.abs_delta_sum[d] / n), 6),
+                    'max_abs_delta': round(float(self.max_abs_delta[d]), 4),
+                    # Only non-empty bins: {lower edge: count}
+                    'histogram': {
+                        f"{DELTA_EDGES[b]:+.3f}": int(count)
+                        for b, count in enumerate(self.histogram[d].tolist()) if count
+                    }
+                }
+                for d, dim in enumerate(NINE_PD_DIMENSIONS)
+            },
+            'band_changes': {
+                'count': band_changed,
+                'transitions': {
+                    f"{BANDS[a]}->{BANDS[b]}": int(self.transitions[a, b])
+                    for a in range(len(BANDS)) for b in range(len(BANDS))
+                    if a != b and self.transitions[a, b]
+                },
+                'assets': self.band_changes,
+                'truncated': band_changed > len(self.band_changes)
+            },
+            'top_movers': [
+                {'asset_id': asset_id, 'total_abs_delta': round(total, 4),
+                 'deltas': {dim: d for dim, d in zip(NINE_PD_DIMENSIONS, deltas) if d}}
+                for total, asset_id, deltas in sorted(self._movers, reverse=True)
+            ]
+        }
+
+
+def _register_specs(specs: Sequence[Mapping[str, Any]]):
+    for spec in specs:
+        rulebooks.register(spec)
+
+
+def drift_report(paths: Sequence[str], old_version: str, new_version: str,
+                 workers: Optional[int] = None, chunk_rows: int = 50_000,
+                 top: int = 20, max_band_changes: int = 10_000,
+                 specs: Sequence[Mapping[str, Any]] = ()) -> Dict[str, Any]:
+    """
+    Stream the archive at paths through both rulebook versions and merge
+    the partials, re-scoring only the latest record per asset_id. The
+    archive is read twice: once for asset_id hashes, once to score.
+    workers=1 runs in this process; otherwise spawn-context worker processes
+    (default: CPU count) with at most 2 x workers chunks submitted at a time,
+    so the archive is never held in memory.
+
+    specs are rulebook specs not built into rulebook.py (e.g. a candidate
+    under review); they are registered here and in every worker.
+    """
+    _register_specs(specs)
+    # Unknown versions fail here, not in every worker
+    rulebooks.get(old_version)
+    rulebooks.get(new_version)
+    report = DriftReport(old_version, new_version, top=top, max_band_changes=max_band_changes)
+    args = (old_version, new_version, top, max_band_changes)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_register_specs, initargs=(list(specs),))
+    try:
+        ids = list(_ordered_results(pool, chunk_asset_ids, ((s,) for s in archive_sources(paths, chunk_rows)),
+                                    workers))
+        for _, valid, _ in ids:
+            report.records += int(valid.sum())
+            report.invalid_lines += int(len(valid) - valid.sum())
+        # archive_sources yields the same chunks again, so masks line up with sources
+        tasks = (
+            (source, *args, keep)
+            for source, keep in zip(archive_sources(paths, chunk_rows), latest_rows(ids)) if keep.any()
+        )
+        for part in _ordered_results(pool, drift_chunk, tasks, workers):
+            report.add(part)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    elapsed = time.perf_counter() - start
+    result = report.to_dict()
+    result['elapsed_s'] = round(elapsed, 3)
+    result['assets_per_s'] = round(report.assets / elapsed, 1) if elapsed > 0 else 0.0
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rulebook re-score drift report over the asset archive")
+    parser.add_argument('paths', nargs='+', help="Audit log directories/segments (.npz) or AssetProperties .ndjson files")
+    parser.add_argument('--old', default=RULEBOOK_VERSION, help="Baseline rulebook version (default: current)")
+    parser.add_argument('--new', required=True, help="Candidate rulebook version")
+    parser.add_argument('--rulebook', action='append', default=[],
+                        help="JSON rulebook spec file to load first (repeatable)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-rows', type=int, default=50_000, help="NDJSON lines per task")
+    parser.add_argument('--top', type=int, default=20, help="Top movers to report")
+    parser.add_argument('--max-band-changes', type=int, default=10_000, help="Band-changed assets to list")
+    args = parser.parse_args(argv)
+
+    specs = []
+    for path in args.rulebook:
+        with open(path, 'r', encoding='utf-8') as f:
+            specs.append(json.load(f))
+    try:
+        report = drift_report(args.paths, args.old, args.new, workers=args.workers, chunk_rows=args.chunk_rows,
+                              top=args.top, max_band_changes=args.max_band_changes, specs=specs)
+    except ValueError as e:
+        parser.error(str(e))
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+# app/asset_scoring/score_cache.py
+"""
+Two-tier cache in front of AssetScorer: an in-process LRU per worker and an
+optional shared Redis tier, so repeated scoring of the same properties (hub
+pipeline, orchestrator, governance audits) is computed once per fleet.
+
+Keys are scoped by SCORER_VERSION and rulebook version, so a version bump
+addresses a fresh keyspace; stale entries are never read again and simply
+age out (LRU eviction locally, TTL in Redis). No flush is needed.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from .asset_schema import AssetProperties
+from .asset_scorer import AssetScorer, SCORER_VERSION, RULEBOOK_VERSION
+from app.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "asset-score"
+
+# Cached value: the 9 rounded profile values followed by the raw aggression term
+Entry = Tuple[float, ...]
+ENTRY_WIDTH = 10
+
+
+def asset_cache_key(asset: AssetProperties, rulebook_version: str = RULEBOOK_VERSION) -> str:
+    """
+    Canonical hash of the observable properties, scoped by scorer and
+    rulebook version. asset_id and asset_type are only echoed in the
+    response envelope, so identical creatives share one entry.
+    """
+    properties = asset.model_dump(mode='json', exclude={'asset_id', 'asset_type'})
+    canonical = json.dumps(properties, sort_keys=True, separators=(',', ':'))
+    digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    return f"{KEY_PREFIX}:{SCORER_VERSION}:{rulebook_version}:{digest}"
+
+
+class AssetScoreCache:
+    """
+    LRU tier (per process) over an optional Redis tier (shared).
+
+    Lookups go local first, then one MGET to Redis for the remaining keys;
+    Redis hits are copied into the local tier. Writes go to both tiers,
+    Redis in one pipelined round trip. Entries are immutable per key, so
+    concurrent workers writing the same key is harmless.
+
+    Redis is an accelerator, not a dependency: any Redis error is logged,
+    the tier is skipped for retry_after seconds and scoring continues on the
+    local tier alone.
+    """
+
+    RETRY_AFTER = 30.0  # seconds Redis is bypassed after an error
+
+    def __init__(self, maxsize: int = 20000, ttl: Optional[float] = None,
+                 redis=None, redis_ttl: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.redis = redis
+        self.redis_ttl = redis_ttl
+        self.retry_after = self.RETRY_AFTER if retry_after is None else retry_after
+        self._redis_down_until = 0.0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+
+    def _redis_available(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, operation: str, error: Exception):
+        self.redis_errors += 1
+        self._redis_down_until = time.monotonic() + self.retry_after
+        logger.warning(f"Asset score cache: Redis {operation} failed, local tier only for "
+                       f"{self.retry_after}s: {str(error)}")
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Entry]]:
+        entries = [self.local.get(key) for key in keys]
+        missing = [i for i, entry in enumerate(entries) if entry is None]
+        if not missing or not self._redis_available():
+            return entries
+        try:
+            values = await self.redis.mget([keys[i] for i in missing])
+        except Exception as e:
+            self._redis_failed("MGET", e)
+            return entries
+        for i, value in zip(missing, values):
+            if value is None:
+                self.redis_misses += 1
+                continue
+            try:
+                entry = self._decode(value)
+            except (ValueError, TypeError) as e:
+                # A corrupt or foreign value is a miss; the rescored entry overwrites it
+                self.redis_errors += 1
+                self.redis_misses += 1
+                logger.warning(f"Asset score cache: unreadable Redis value for {keys[i]}: {str(e)}")
+                continue
+            self.redis_hits += 1
+            self.local.put(keys[i], entry)
+            entries[i] = entry
+        return entries
+
+    @staticmethod
+    def _decode(value) -> Entry:
+        values = json.loads(value)
+        if not isinstance(values, list) or len(values) != ENTRY_WIDTH:
+            raise ValueError(f"expected a list of {ENTRY_WIDTH} numbers")
+        return tuple(float(v) for v in values)
+
+    async def get(self, key: str) -> Optional[Entry]:
+        return (await self.get_many([key]))[0]
+
+    async def put_many(self, items: Sequence[Tuple[str, Entry]]):
+        for key, entry in items:
+            self.local.put(key, entry)
+        if not items or not self._redis_available():
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, entry in items:
+                pipe.set(key, json.dumps(entry, separators=(',', ':')), ex=self.redis_ttl)
+            await pipe.execute()
+        except Exception as e:
+            self._redis_failed("SET", e)
+
+    async def put(self, key: str, entry: Entry):
+        await self.put_many([(key, entry)])
+
+    def clear(self):
+        """Local tier only; shared entries are retired by version bumps and TTL."""
+        self.local.clear()
+
+    def stats(self):
+        lookups = self.redis_hits + self.redis_misses
+        return {
+            'local': self.local.stats(),
+            'redis': {
+                'enabled': self.redis is not None,
+                'available': self._redis_available(),
+                'ttl_seconds': self.redis_ttl,
+                'hits': self.redis_hits,
+                'misses': self.redis_misses,
+                'errors': self.redis_errors,
+                'hit_rate': round(self.redis_hits / lookups, 4) if lookups else 0.0
+            },
+            'key_scope': f"{KEY_PREFIX}:{SCORER_VERSION}:<rulebook_version>"
+        }
+
+
+class CachedAssetScorer:
+    """
+    AssetScorer.score / score_batch behind an AssetScoreCache. Results are
+    identical to the uncached scorer: the profile and aggression come from
+    the cache and the envelope (ids, versions, trace) is rebuilt per call.
+    """
+
+    def __init__(self, scorer: AssetScorer, cache: AssetScoreCache):
+        self.scorer = scorer
+        self.cache = cache
+
+    async def score(self, asset: AssetProperties, trace: bool = False,
+                    rulebook_version: str = RULEBOOK_VERSION) -> dict:
+        return (await self.score_batch([asset], trace=trace, rulebook_version=rulebook_version))[0]
+
+    async def score_batch(self, assets: Sequence[AssetProperties], trace: bool = False,
+                          rulebook_version: str = RULEBOOK_VERSION,
+                          compute=None) -> List[dict]:
+        entries = await self.entries(assets, rulebook_version, compute=compute)
+        return self.envelopes(assets, entries, trace=trace, rulebook_version=rulebook_version)
+
+    async def entries(self, assets: Sequence[AssetProperties],
+                      rulebook_version: str = RULEBOOK_VERSION,
+                      compute=None) -> List[Entry]:
+        """
+        Cached (9 profile values..., aggression) per asset.
+
+        compute(missing_assets, rulebook_version) -> ((M, 9) profiles, (M,)
+        aggression), awaited, scores the cache misses; defaults to
+        AssetScorer.score_matrix on the loop. Duplicate properties within a
+        batch are scored once.
+        """
+        keys = [asset_cache_key(asset, rulebook_version) for asset in assets]
+        entries = await self.cache.get_many(keys)
+
+        first_miss = {}
+        for i, entry in enumerate(entries):
+            if entry is None and keys[i] not in first_miss:
+                first_miss[keys[i]] = i
+        if first_miss:
+            missing = [assets[i] for i in first_miss.values()]
+            if compute is None:
+                profiles, aggression = self.scorer.score_matrix(missing, rulebook_version)
+            else:
+                profiles, aggression = await compute(missing, rulebook_version)
+            computed = {
+                key: (*values, asset_aggression)
+                for key, values, asset_aggression in zip(first_miss, profiles.tolist(), aggression.tolist())
+            }
+            await self.cache.put_many(list(computed.items()))
+            entries = [computed[key] if entry is None else entry for key, entry in zip(keys, entries)]
+        return entries
+
+    def envelopes(self, assets: Sequence[AssetProperties], entries: Sequence[Entry], trace: bool = False,
+                  rulebook_version: str = RULEBOOK_VERSION) -> List[dict]:
+        """score() responses for assets from their entries()."""
+        return [
+            self.scorer.envelope(asset, entry[:-1], entry[-1], trace=trace, rulebook_version=rulebook_version)
+            for asset, entry in zip(assets, entries)
+        ]
@@ -152,3 +152,61 @@ class TestAssetScorer:
         assert result["rulebook_version"] == "2026-02-14.1"
         assert "trace_enabled" in result
         assert result["trace_enabled"] == False  # default
+    
+    def test_score_vector_matches_profile_dict(self):
+        """Schema: score_vector() carries the exact nine_pd_profile values in schema order."""
+        asset = AssetProperties(asset_id="vector_test", asset_type="image", cta_present=True, text_density=0.5)
+        scorer = AssetScorer()
+        vector = scorer.score_vector(asset)
+        assert vector == scorer.score(asset)["nine_pd_profile"]
+        assert list(vector) == list(scorer.score(asset)["nine_pd_profile"])
+
+
+class TestAssetScorerBatch:
+    """score_batch must reproduce score() exactly, including rounding and trace."""
+
+    @staticmethod
+    def _assets(n):
+        import random
+        rng = random.Random(7)
+        # Values on the rule thresholds exercise every strict comparison
+        edges = [0.15, 0.2, 0.3, 0.35, 0.4, 0.5, 0.6, 0.7, 0.75, 0.85]
+        unit = lambda: rng.choice([rng.random(), rng.choice(edges)])
+        return [
+            AssetProperties(
+                asset_id=f"batch_{i}",
+                asset_type=rng.choice(["image", "video"]),
+                color_temperature=rng.choice(["warm", "cool", "neutral"]),
+                text_density=unit(),
+                visual_complexity=unit(),
+                cta_present=rng.random() < 0.5,
+                face_present=rng.random() < 0.5,
+                product_visible=rng.random() < 0.7,
+                background_style=rng.choice(["clean", "lifestyle", "abstract"]),
+                saturation=unit(),
+                pacing=rng.choice([None, unit()]),
+                scene_count=rng.choice([None, 0, 8, 9]),
+                narration_present=rng.choice([None, True, False]),
+            )
+            for i in range(n)
+        ]
+
+    def test_batch_matches_scalar_exactly(self):
+        assets = self._assets(3000)
+        scorer = AssetScorer()
+        assert scorer.score_batch(assets, trace=True) == [scorer.score(a, trace=True) for a in assets]
+        assert scorer.score_batch(assets[:50]) == [scorer.score(a) for a in assets[:50]]
+        assert scorer.score_batch([]) == []
+
+    def test_batch_endpoint(self):
+        from fastapi.testclient import TestClient
+        from app.main import app
+        client = TestClient(app)
+        assets = [a.model_dump() for a in self._assets(40)]
+        response = client.post("/v1/asset/score/batch?trace=true", json={"assets": assets})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["count"] == 40
+        assert body["results"][7] == client.post("/v1/asset/score?trace=true", json=assets[7]).json()
+        bad = client.post("/v1/asset/score/batch", json={"assets": [{"asset_id": "x", "asset_type": "audio"}]})
+        assert bad.status_code == 422
@@ -0,0 +1,171 @@
+# app/asset_scoring/tests/test_audit_log.py
+"""
+Audit log: traces rendered from logged records must equal the live
+trace=true result, from the open buffer, in-flight and written segments.
+"""
+
+import asyncio
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.routes import asset_routes
+from app.asset_scoring.asset_schema import AssetProperties
+from app.asset_scoring.asset_scorer import AssetScorer, RULEBOOK_VERSION
+from app.asset_scoring import audit_log
+from app.asset_scoring.audit_log import AssetAuditLog
+
+
+def _assets(n, tag=""):
+    numbers = [0.1, 0.2, 0.35, 0.4, 0.6, 0.7, 0.75, 0.9]
+    return [
+        AssetProperties(
+            asset_id=f"asset_{i}", asset_type="video" if i % 2 else "image",
+            color_temperature=["warm", "cool", "neutral"][i % 3],
+            background_style=["clean", "lifestyle", "abstract"][(i // 3) % 3],
+            cta_present=bool(i % 2), face_present=bool(i % 5), product_visible=bool(i % 7),
+            text_density=numbers[i % 8], visual_complexity=numbers[(i * 3) % 8],
+            saturation=numbers[(i * 5 + len(tag)) % 8],
+            pacing=[None, 0.8, 0.2][i % 3], scene_count=[None, 9, 2][(i + 1) % 3],
+            narration_present=[None, True, False][i % 3],
+        )
+        for i in range(n)
+    ]
+
+
+def _without_audit(result):
+    return {k: v for k, v in result.items() if k != "audit"}
+
+
+class TestAssetAuditLog:
+
+    def test_rendered_trace_matches_live_scoring(self, tmp_path):
+        scorer = AssetScorer()
+        log = AssetAuditLog(str(tmp_path), segment_rows=7)
+        first, second = _assets(30), _assets(30, tag="rescored")[:10]
+        log.record_many(first, RULEBOOK_VERSION)
+        # Re-scored assets: the latest record wins
+        log.record_many(second, RULEBOOK_VERSION)
+        latest = {asset.asset_id: asset for asset in first + second}
+
+        # Open buffer and segments still being written
+        for asset_id, asset in latest.items():
+            rendered = log.render(log.lookup(asset_id), scorer)
+            assert _without_audit(rendered) == scorer.score(asset, trace=True)
+        log.close()
+
+        # A fresh log over the same directory reads the written segments
+        reopened = AssetAuditLog(str(tmp_path), segment_rows=7)
+        assert len(reopened.segments()) == 6
+        for asset_id, asset in latest.items():
+            record = reopened.lookup(asset_id)
+            assert record["asset"] == asset
+            rendered = reopened.render(record, scorer)
+            assert _without_audit(rendered) == scorer.score(asset, trace=True)
+            fired = rendered["audit"]["rules_fired"]
+            assert ({"property": "cta_present", "op": "true", "value": None} in fired) == asset.cta_present
+        assert reopened.lookup("never_scored") is None
+        reopened.close()
+
+    def test_workers_sharing_a_directory_write_distinct_segments(self, tmp_path):
+        # Two logs opened in the same second, as two workers would be
+        logs = [AssetAuditLog(str(tmp_path), segment_rows=3) for _ in range(2)]
+        for log in logs:
+            log.record_many(_assets(6), RULEBOOK_VERSION)
+            log.close()
+        names = os.listdir(tmp_path)
+        assert len(names) == 4 and all(name.startswith("asset-audit-") for name in names)
+        assert logs[0]._prefix != logs[1]._prefix and str(os.getpid()) in logs[0]._prefix
+
+    def test_lookup_returns_newest_record_across_workers(self, tmp_path, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(audit_log.time, "time", lambda: clock[0])
+        monkeypatch.setattr(AssetAuditLog, "SEGMENT_LIST_TTL", 0.0)
+        older, newer = _assets(4), _assets(4, tag="newer")
+        early = AssetAuditLog(str(tmp_path), segment_rows=2, cached_indexes=2)
+        late = AssetAuditLog(str(tmp_path), segment_rows=2, cached_indexes=2)
+        # The worker that started last sorts last by name but holds the older records
+        late._prefix, early._prefix = "29990101T000000-2-b", "20000101T000000-1-a"
+
+        late.record_many(older[:2], RULEBOOK_VERSION)   # written segment
+        late.record(older[2], RULEBOOK_VERSION)         # open buffer
+        clock[0] = 200.0
+        early.record_many(newer[:3], RULEBOOK_VERSION)
+        early.flush()
+        early.close()
+
+        for log in (late, AssetAuditLog(str(tmp_path), segment_rows=2)):
+            for i in range(3):
+                assert log.lookup(f"asset_{i}")["asset"] == newer[i]
+        late.record(older[3], RULEBOOK_VERSION)
+        assert late.lookup("asset_3")["asset"] == older[3]
+        late.close()
+
+        # A miss visits every segment, but only cached_indexes of their indexes are kept
+        assert late.lookup("never_scored") is None
+        assert len(late._indexes) <= 2
+
+    def test_failed_segments_are_retried_then_bounded(self, tmp_path, monkeypatch):
+        write_segment = AssetAuditLog._write_segment
+        broken = [True]
+
+        def flaky(path, columns, rows):
+            if broken[0]:
+                raise OSError("disk full")
+            write_segment(path, columns, rows)
+
+        monkeypatch.setattr(AssetAuditLog, "_write_segment", staticmethod(flaky))
+        monkeypatch.setattr(AssetAuditLog, "WRITE_ATTEMPTS", 2)
+        monkeypatch.setattr(AssetAuditLog, "WRITE_BACKOFF", 0.0)
+        monkeypatch.setattr(AssetAuditLog, "MAX_FAILED_SEGMENTS", 2)
+
+        async def settle(log, done):
+            for _ in range(500):
+                if done(log.stats()):
+                    return
+                await asyncio.sleep(0.01)
+            raise AssertionError(log.stats())
+
+        async def scenario():
+            log = AssetAuditLog(str(tmp_path), segment_rows=2)
+            log.record_many(_assets(6), RULEBOOK_VERSION)
+            await settle(log, lambda stats: stats["segments_failed"] + stats["segments_dropped"] == 3)
+            failing = log.stats()
+            # Failed segments stay readable; the oldest beyond the bound is dropped
+            assert log.lookup("asset_5")["asset"] == _assets(6)[5]
+            assert log.lookup("asset_0") is None
+
+            broken[0] = False
+            log.record_many(_assets(8)[6:], RULEBOOK_VERSION)
+            await settle(log, lambda stats: stats["segments_pending"] == 0)
+            log.close()
+            return failing
+
+        failing = asyncio.run(scenario())
+        assert failing["segments_failed"] == 2 and failing["segments_dropped"] == 1
+        # Each rotation resubmits the failed segments, so there may be more failures than segments
+        assert failing["write_failures"] >= 3
+        reopened = AssetAuditLog(str(tmp_path), segment_rows=2)
+        assert len(reopened.segments()) == 3
+        assert [reopened.lookup(f"asset_{i}")["asset"] for i in range(2, 8)] == _assets(8)[2:]
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+        reopened.close()
+
+    def test_audit_endpoint(self, tmp_path, monkeypatch):
+        client = TestClient(app)
+        monkeypatch.setattr(asset_routes, "audit_log", None)
+        assert client.get("/v1/asset/audit/asset_1").status_code == 503
+
+        log = AssetAuditLog(str(tmp_path), segment_rows=4)
+        monkeypatch.setattr(asset_routes, "audit_log", log)
+        assets = _assets(6)
+        expected = client.post("/v1/asset/score?trace=true", json=assets[0].model_dump()).json()
+        client.post("/v1/asset/score/batch", json={"assets": [a.model_dump() for a in assets[1:]]})
+        response = client.get("/v1/asset/audit/asset_0")
+        assert response.status_code == 200
+        assert _without_audit(response.json()) == expected
+        assert client.get("/v1/asset/audit/asset_5").json()["asset_id"] == "asset_5"
+        assert client.get("/v1/asset/audit/unknown").status_code == 404
+        assert client.get("/v1/asset/scorer/health").json()["audit_log"]["recorded"] == 6
+        log.close()
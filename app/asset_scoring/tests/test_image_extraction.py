@@ -0,0 +1,82 @@
+# app/asset_scoring/tests/test_image_extraction.py
+"""
+Phase 2.5B image property extraction: measured properties on synthetic
+images, file decoding, and the streamed multiprocess pipeline.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.asset_scoring.asset_scorer import AssetScorer
+from app.asset_scoring.image_extraction import ImageExtractor, extract_images, image_paths
+
+
+def _solid(rgb, shape=(120, 160)):
+    pixels = np.zeros(shape + (3,), dtype=np.uint8)
+    pixels[...] = rgb
+    return pixels
+
+
+def _text_card():
+    """Black glyph strokes on a white card with a wide empty margin."""
+    pixels = _solid((255, 255, 255), (200, 300))
+    for row in range(40, 160, 16):
+        for col in range(40, 260, 6):
+            pixels[row:row + 8, col:col + 2] = 0
+    return pixels
+
+
+class TestImageExtractor:
+
+    def test_color_temperature_and_saturation(self):
+        extractor = ImageExtractor()
+        warm = extractor.measure(_solid((230, 140, 60)))
+        cool = extractor.measure(_solid((60, 120, 220)))
+        gray = extractor.measure(_solid((128, 128, 128)))
+        assert (warm["color_temperature"], cool["color_temperature"], gray["color_temperature"]) == \
+            ("warm", "cool", "neutral")
+        assert gray["saturation"] == 0.0
+        assert warm["saturation"] > 0.7
+
+    def test_text_complexity_and_background(self):
+        extractor = ImageExtractor()
+        card = extractor.measure(_text_card())
+        blank = extractor.measure(_solid((255, 255, 255)))
+        noise = extractor.measure(np.random.default_rng(7).integers(0, 256, (128, 128, 3), dtype=np.uint8))
+        assert card["text_density"] > 0.15 and blank["text_density"] == 0.0
+        assert card["background_style"] == "clean"
+        # Random noise is complex but not two-tone text
+        assert noise["visual_complexity"] > 0.9 > card["visual_complexity"] > blank["visual_complexity"]
+        assert noise["text_density"] == 0.0
+        assert noise["background_style"] == "lifestyle"
+
+    def test_rejects_non_rgb_and_unknown_thresholds(self):
+        with pytest.raises(ValueError):
+            ImageExtractor().measure(np.zeros((10, 10), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            ImageExtractor(NOT_A_THRESHOLD=1.0)
+
+    def test_pipeline_streams_in_order_and_feeds_scorer(self, tmp_path):
+        Image.fromarray(_text_card()).save(tmp_path / "a_card.png")
+        Image.fromarray(_solid((230, 140, 60), (900, 1200))).save(tmp_path / "b_warm.jpg", quality=90)
+        (tmp_path / "c_broken.jpg").write_bytes(b"not an image")
+        paths = list(image_paths(str(tmp_path)))
+        assert [p.rsplit("/", 1)[-1] for p in paths] == ["a_card.png", "b_warm.jpg", "c_broken.jpg"]
+
+        inline = list(extract_images(paths, workers=1))
+        pooled = list(extract_images(paths, workers=2, chunksize=1))
+        assert inline == pooled
+        (_, card, _), (_, warm, _), (_, broken, error) = inline
+        assert card.asset_id == "a_card" and card.asset_type == "image"
+        assert card.text_density > 0.15
+        # JPEG decoded at reduced scale, still warm
+        assert warm.color_temperature == "warm"
+        assert broken is None and "UnidentifiedImageError" in error
+        assert AssetScorer().score(card)["asset_id"] == "a_card"
+
+    def test_overrides_fill_unmeasured_fields(self, tmp_path):
+        path = tmp_path / "cta.png"
+        Image.fromarray(_text_card()).save(path)
+        asset = ImageExtractor().extract(str(path), asset_id="sbox_1", cta_present=True)
+        assert asset.asset_id == "sbox_1" and asset.cta_present is True
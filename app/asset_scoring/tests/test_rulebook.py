@@ -0,0 +1,99 @@
+# app/asset_scoring/tests/test_rulebook.py
+"""
+Rulebook compiler: compiled lookup tables must reproduce the reference
+dimension_rules.py functions exactly, and versions must coexist.
+"""
+
+import copy
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.asset_scoring import dimension_rules as rules
+from app.asset_scoring.asset_schema import AssetProperties
+from app.asset_scoring.asset_scorer import AssetScorer, RULEBOOK_VERSION
+from app.asset_scoring.rulebook import RULEBOOK_2026_02_14_1, compile_rulebook, rulebooks
+
+
+def _reference_profile(asset):
+    aggression = rules.compute_aggression(asset)
+    return [
+        round(rules.score_presence(asset), 4),
+        round(rules.score_trust(asset, aggression), 4),
+        round(rules.score_authenticity(asset), 4),
+        round(rules.score_momentum(asset), 4),
+        round(rules.score_taste(asset), 4),
+        round(rules.score_empathy(asset), 4),
+        round(rules.score_autonomy(asset, aggression), 4),
+        round(rules.score_resonance(asset), 4),
+        round(rules.score_ethics(asset, aggression), 4),
+    ], aggression
+
+
+def _grid_assets():
+    """Every categorical/flag combination crossed with values on and around each threshold."""
+    numbers = [0.1, 0.15, 0.2, 0.3, 0.35, 0.4, 0.5, 0.6, 0.7, 0.75, 0.85, 0.9]
+    i = 0
+    for color, background, cta, face, product, narration in itertools.product(
+            ["warm", "cool", "neutral"], ["clean", "lifestyle", "abstract"],
+            [False, True], [False, True], [False, True], [None, False, True]):
+        for k in range(4):
+            i += 1
+            yield AssetProperties(
+                asset_id=f"grid_{i}", asset_type="video" if k % 2 else "image",
+                color_temperature=color, background_style=background,
+                cta_present=cta, face_present=face, product_visible=product,
+                narration_present=narration,
+                text_density=numbers[(i * 5) % len(numbers)],
+                visual_complexity=numbers[(i * 7) % len(numbers)],
+                saturation=numbers[(i * 3 + k) % len(numbers)],
+                pacing=[None, 0.7, 0.71, 0.2][k],
+                scene_count=[None, 8, 9, 0][(k + i) % 4],
+            )
+
+
+class TestRulebookCompiler:
+
+    def test_compiled_tables_match_reference_rules(self):
+        assets = list(_grid_assets())
+        rulebook = rulebooks.get(RULEBOOK_VERSION)
+        profiles, aggression = rulebook.score_many(assets)
+        for asset, row, row_aggression in zip(assets, profiles.tolist(), aggression.tolist()):
+            expected, expected_aggression = _reference_profile(asset)
+            assert row == expected, asset.asset_id
+            assert rulebook.score_row(asset) == (expected, expected_aggression)
+            assert row_aggression == expected_aggression
+
+    def test_versions_coexist_and_are_selected_per_call(self):
+        spec = copy.deepcopy(RULEBOOK_2026_02_14_1)
+        spec["version"] = "test-2099-01-01.1"
+        spec["dimensions"]["presence"]["terms"][0]["add"] = 0.05
+        rulebooks.register(spec)
+        asset = AssetProperties(asset_id="face", asset_type="image", face_present=True)
+        scorer = AssetScorer()
+        current = scorer.score(asset)
+        variant = scorer.score(asset, rulebook_version="test-2099-01-01.1")
+        assert current["rulebook_version"] == RULEBOOK_VERSION
+        assert variant["rulebook_version"] == "test-2099-01-01.1"
+        assert round(current["nine_pd_profile"]["presence"] - variant["nine_pd_profile"]["presence"], 4) == 0.15
+        assert {k: v for k, v in current["nine_pd_profile"].items() if k != "presence"} == \
+            {k: v for k, v in variant["nine_pd_profile"].items() if k != "presence"}
+
+        client = TestClient(app)
+        response = client.post("/v1/asset/score?rulebook_version=test-2099-01-01.1", json=asset.model_dump())
+        assert response.json() == variant
+        assert client.post("/v1/asset/score?rulebook_version=nope", json=asset.model_dump()).status_code == 422
+        assert "test-2099-01-01.1" in client.get("/v1/asset/scorer/health").json()["rulebook_versions_loaded"]
+
+    def test_invalid_specs_rejected(self):
+        bad_property = copy.deepcopy(RULEBOOK_2026_02_14_1)
+        bad_property["dimensions"]["trust"]["terms"][0]["when"][0]["property"] = "glossiness"
+        bad_op = copy.deepcopy(RULEBOOK_2026_02_14_1)
+        bad_op["dimensions"]["trust"]["terms"][2]["when"][0]["op"] = "eq"
+        missing = copy.deepcopy(RULEBOOK_2026_02_14_1)
+        del missing["dimensions"]["ethics"]
+        for spec in (bad_property, bad_op, missing):
+            with pytest.raises(ValueError):
+                compile_rulebook(spec)
@@ -0,0 +1,146 @@
+# app/asset_scoring/tests/test_rulebook_drift.py
+"""
+Rulebook drift report: merged per-chunk partials must equal a direct
+re-score of the whole archive, in process and across worker processes.
+"""
+
+import copy
+import json
+
+import numpy as np
+
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS
+from app.asset_scoring.asset_scorer import RULEBOOK_VERSION
+from app.asset_scoring import audit_log
+from app.asset_scoring.audit_log import AssetAuditLog
+from app.asset_scoring.rulebook import RULEBOOK_2026_02_14_1, rulebooks
+from app.asset_scoring.rulebook_drift import BANDS, asset_bands, drift_report, main
+from app.asset_scoring.tests.test_audit_log import _assets
+
+CANDIDATE = "test-drift-2099-01-01.1"
+
+
+def _candidate_spec():
+    spec = copy.deepcopy(RULEBOOK_2026_02_14_1)
+    spec["version"] = CANDIDATE
+    spec["dimensions"]["presence"]["terms"][0]["add"] = 0.3
+    spec["dimensions"]["trust"]["terms"][0]["add"] = -0.2
+    return spec
+
+
+def _expected(assets):
+    old, _ = rulebooks.get(RULEBOOK_VERSION).score_many(assets)
+    new, _ = rulebooks.get(CANDIDATE).score_many(assets)
+    return old, new
+
+
+class TestRulebookDrift:
+
+    def test_report_matches_direct_rescore(self, tmp_path):
+        spec = _candidate_spec()
+        rulebooks.register(spec)
+        assets = _assets(60)
+        log = AssetAuditLog(str(tmp_path / "audit"), segment_rows=16)
+        log.record_many(assets[:40], RULEBOOK_VERSION)
+        log.close()
+        ndjson = tmp_path / "assets.ndjson"
+        ndjson.write_text("\n".join(a.model_dump_json() for a in assets[40:]) + "\n")
+        paths = [str(tmp_path / "audit"), str(ndjson)]
+
+        old, new = _expected(assets)
+        delta = new - old
+        report = drift_report(paths, RULEBOOK_VERSION, CANDIDATE, workers=1, chunk_rows=7, top=5)
+        assert report["assets"] == report["records"] == 60 and report["invalid_lines"] == 0
+        assert report["changed_assets"] == int((np.abs(delta) > 5e-5).any(axis=1).sum())
+        for d, dim in enumerate(NINE_PD_DIMENSIONS):
+            summary = report["dimensions"][dim]
+            assert sum(summary["histogram"].values()) == 60
+            assert summary["changed"] == int((np.abs(delta[:, d]) > 5e-5).sum())
+            assert summary["max_abs_delta"] == round(float(np.abs(delta[:, d]).max()), 4)
+        assert report["dimensions"]["ethics"]["changed"] == 0
+
+        old_bands, new_bands = asset_bands(old), asset_bands(new)
+        moved = {assets[i].asset_id: (BANDS[old_bands[i]], BANDS[new_bands[i]])
+                 for i in np.flatnonzero(old_bands != new_bands)}
+        assert report["band_changes"]["count"] == len(moved)
+        assert {a["asset_id"]: (a["from"], a["to"]) for a in report["band_changes"]["assets"]} == moved
+
+        totals = np.abs(delta).sum(axis=1)
+        movers = report["top_movers"]
+        assert len(movers) == 5
+        assert [m["total_abs_delta"] for m in movers] == sorted(np.round(totals, 4), reverse=True)[:5]
+
+        # Worker processes only see the candidate through specs
+        parallel = drift_report(paths, RULEBOOK_VERSION, CANDIDATE, workers=2, chunk_rows=7, top=5, specs=[spec])
+        for key in ("elapsed_s", "assets_per_s"):
+            report.pop(key), parallel.pop(key)
+        # Band-changed assets arrive in completion order
+        for result in (report, parallel):
+            result["band_changes"]["assets"].sort(key=lambda a: a["asset_id"])
+        assert parallel == report
+
+    def test_latest_record_per_asset_and_bad_lines(self, tmp_path):
+        rulebooks.register(_candidate_spec())
+        first, rescored = _assets(30), _assets(30, tag="rescored")
+        log = AssetAuditLog(str(tmp_path / "audit"), segment_rows=8)
+        log.record_many(first, RULEBOOK_VERSION)
+        # Re-scored in later segments: only these records count
+        log.record_many(rescored[:12], RULEBOOK_VERSION)
+        log.close()
+        ndjson = tmp_path / "assets.ndjson"
+        extra = _assets(36, tag="ndjson")[30:]
+        lines = [a.model_dump_json() for a in extra]
+        lines[2:2] = ['{"asset_id": "broken"', '{"asset_id": "asset_99"}', "not json"]
+        # Also the latest record of asset_0, after the audit log in archive order
+        lines.append(rescored[0].model_copy(update={"asset_id": "asset_0", "saturation": 0.95}).model_dump_json())
+        ndjson.write_text("\n".join(lines) + "\n")
+        paths = [str(tmp_path / "audit"), str(ndjson)]
+
+        latest = {a.asset_id: a for a in first + rescored[:12] + extra}
+        latest["asset_0"] = latest["asset_0"].model_copy(update={"saturation": 0.95})
+        old, new = _expected(list(latest.values()))
+        totals = np.abs(new - old).sum(axis=1)
+
+        for workers in (1, 2):
+            report = drift_report(paths, RULEBOOK_VERSION, CANDIDATE, workers=workers, chunk_rows=4, top=50,
+                                  specs=[_candidate_spec()])
+            assert report["records"] == 30 + 12 + 6 + 1 and report["invalid_lines"] == 3
+            assert report["assets"] == 36
+            assert sum(report["dimensions"]["presence"]["histogram"].values()) == 36
+            movers = report["top_movers"]
+            assert len({m["asset_id"] for m in movers}) == len(movers) == int((totals > 0).sum())
+            assert sorted(m["total_abs_delta"] for m in movers) == sorted(np.round(totals[totals > 0], 4))
+
+    def test_latest_record_is_chosen_by_recorded_at(self, tmp_path, monkeypatch):
+        rulebooks.register(_candidate_spec())
+        clock = [100.0]
+        monkeypatch.setattr(audit_log.time, "time", lambda: clock[0])
+        older = _assets(10)
+        # Re-scored after a face edit: the presence term flips for every asset
+        newer = [a.model_copy(update={"face_present": not a.face_present}) for a in older]
+        # Two writers sharing the directory: the one whose segments sort last holds the older records
+        stale = AssetAuditLog(str(tmp_path), segment_rows=4)
+        fresh = AssetAuditLog(str(tmp_path), segment_rows=4)
+        stale._prefix, fresh._prefix = "29990101T000000-2-b", "20000101T000000-1-a"
+        stale.record_many(older, RULEBOOK_VERSION)
+        stale.close()
+        clock[0] = 200.0
+        fresh.record_many(newer, RULEBOOK_VERSION)
+        fresh.close()
+
+        report = drift_report([str(tmp_path)], RULEBOOK_VERSION, CANDIDATE, workers=1, top=10)
+        old, new = _expected(newer)
+        totals = np.round(np.abs(new - old).sum(axis=1), 4)
+        assert report["records"] == 20 and report["assets"] == 10
+        assert sorted(m["total_abs_delta"] for m in report["top_movers"]) == sorted(totals[totals > 0])
+        assert report["dimensions"]["presence"]["changed"] == int((np.abs(new - old)[:, 0] > 5e-5).sum())
+
+    def test_cli(self, tmp_path, capsys):
+        spec_path = tmp_path / "candidate.json"
+        spec_path.write_text(json.dumps(_candidate_spec()))
+        ndjson = tmp_path / "assets.ndjson"
+        ndjson.write_text("\n".join(a.model_dump_json() for a in _assets(10)))
+        assert main([str(ndjson), "--new", CANDIDATE, "--rulebook", str(spec_path), "--workers", "1"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["old_version"] == RULEBOOK_VERSION and report["assets"] == 10
+        assert report["dimensions"]["presence"]["changed"] > 0
@@ -0,0 +1,123 @@
+# app/asset_scoring/tests/test_score_cache.py
+"""
+Two-tier score cache: cached results must equal uncached scoring, tiers
+share entries, version bumps change keys, and Redis failures degrade.
+"""
+
+import asyncio
+import json
+
+from app.asset_scoring.asset_schema import AssetProperties
+from app.asset_scoring.asset_scorer import AssetScorer, RULEBOOK_VERSION
+from app.asset_scoring.score_cache import AssetScoreCache, CachedAssetScorer, asset_cache_key
+
+
+class FakeRedis:
+    """The slice of redis.asyncio.Redis the cache uses, backed by a dict."""
+
+    def __init__(self, fail: bool = False):
+        self.store = {}
+        self.fail = fail
+        self.calls = 0
+
+    async def mget(self, keys):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("redis down")
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            def set(self, key, value, ex=None):
+                self.ops.append((key, value.encode("utf-8")))
+
+            async def execute(self):
+                redis.calls += 1
+                if redis.fail:
+                    raise ConnectionError("redis down")
+                redis.store.update(self.ops)
+
+        return Pipeline()
+
+
+def _assets():
+    return [
+        AssetProperties(asset_id=f"a{i}", asset_type="image", text_density=0.05 * i,
+                        saturation=0.9 if i % 2 else 0.4, cta_present=bool(i % 3))
+        for i in range(12)
+    ]
+
+
+class TestAssetScoreCache:
+
+    def test_cached_results_match_scorer(self):
+        scorer = AssetScorer()
+        cached = CachedAssetScorer(scorer, AssetScoreCache(maxsize=100))
+        assets = _assets()
+        for trace in (False, True):
+            expected = [scorer.score(asset, trace=trace) for asset in assets]
+            assert asyncio.run(cached.score_batch(assets, trace=trace)) == expected
+            # Second pass is all local hits
+            assert asyncio.run(cached.score_batch(assets, trace=trace)) == expected
+        assert cached.cache.local.stats()["hits"] >= 2 * len(assets)
+
+    def test_key_ignores_ids_and_scopes_version(self):
+        a = AssetProperties(asset_id="x", asset_type="image", saturation=0.8)
+        b = AssetProperties(asset_id="y", asset_type="video", saturation=0.8)
+        c = AssetProperties(asset_id="x", asset_type="image", saturation=0.81)
+        assert asset_cache_key(a) == asset_cache_key(b)
+        assert asset_cache_key(a) != asset_cache_key(c)
+        assert asset_cache_key(a, RULEBOOK_VERSION) != asset_cache_key(a, "2099-01-01.1")
+        # Same key still gets its own ids back in the envelope
+        cached = CachedAssetScorer(AssetScorer(), AssetScoreCache(maxsize=10))
+        result_a = asyncio.run(cached.score(a))
+        result_b = asyncio.run(cached.score(b))
+        assert (result_b["asset_id"], result_b["asset_type"]) == ("y", "video")
+        assert result_a["nine_pd_profile"] == result_b["nine_pd_profile"]
+
+    def test_redis_tier_shared_between_workers(self):
+        redis = FakeRedis()
+        scorer = AssetScorer()
+        worker_1 = CachedAssetScorer(scorer, AssetScoreCache(maxsize=100, redis=redis))
+        worker_2 = CachedAssetScorer(scorer, AssetScoreCache(maxsize=100, redis=redis))
+        assets = _assets()
+        expected = asyncio.run(worker_1.score_batch(assets, trace=True))
+
+        def fail(missing, version):
+            raise AssertionError("worker 2 should not score")
+
+        assert asyncio.run(worker_2.score_batch(assets, trace=True, compute=fail)) == expected
+        assert worker_2.cache.stats()["redis"]["hits"] == len(assets)
+
+    def test_redis_failure_degrades_to_local(self):
+        redis = FakeRedis(fail=True)
+        cache = AssetScoreCache(maxsize=100, redis=redis, retry_after=60)
+        cached = CachedAssetScorer(AssetScorer(), cache)
+        assets = _assets()
+        expected = [AssetScorer().score(asset) for asset in assets]
+        assert asyncio.run(cached.score_batch(assets)) == expected
+        assert asyncio.run(cached.score_batch(assets)) == expected
+        stats = cache.stats()["redis"]
+        # One failed MGET, then the tier is bypassed until retry_after
+        assert stats["errors"] == 1 and not stats["available"]
+        assert redis.calls == 1
+
+    def test_corrupt_redis_values_are_rescored(self):
+        redis = FakeRedis()
+        cache = AssetScoreCache(maxsize=100, redis=redis)
+        cached = CachedAssetScorer(AssetScorer(), cache)
+        assets = _assets()[:4]
+        keys = [asset_cache_key(asset) for asset in assets]
+        redis.store.update({keys[0]: b"{not json", keys[1]: b"[0.5, 0.5]", keys[2]: b'{"a": 1}'})
+        expected = [AssetScorer().score(asset) for asset in assets]
+        assert asyncio.run(cached.score_batch(assets)) == expected
+        stats = cache.stats()["redis"]
+        # Unreadable values are misses, counted as errors without bypassing the tier
+        assert stats["errors"] == 3 and stats["misses"] == 4 and stats["available"]
+        # The rescored entries overwrite the bad values
+        assert all(len(json.loads(redis.store[key])) == 10 for key in keys)
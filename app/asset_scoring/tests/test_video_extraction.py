@@ -0,0 +1,131 @@
+# app/asset_scoring/tests/test_video_extraction.py
+"""
+Phase 2.5B video analysis: cut detection, pacing and on-screen text from
+sampled frames, the bounded (streamed) frame consumption, and the PPM
+frame pipe from ffmpeg (a stand-in script, and the real binary when
+installed).
+"""
+
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from app.asset_scoring.asset_scorer import AssetScorer
+from app.asset_scoring.asset_schema import AssetProperties
+from app.asset_scoring.video_extraction import VideoAnalyzer, ffmpeg_frames
+
+SCENE_COLORS = [(230, 140, 60), (40, 90, 200), (20, 160, 70), (240, 240, 240)]
+
+
+def _scenes(seconds_per_scene, scenes, fps=4, shape=(64, 36), seed=3):
+    """Solid-color scenes with mild per-frame noise (no cut inside a scene)."""
+    rng = np.random.default_rng(seed)
+    for s in range(scenes):
+        base = np.array(SCENE_COLORS[s % len(SCENE_COLORS)], dtype=np.int16)
+        for _ in range(int(seconds_per_scene * fps)):
+            noise = rng.integers(-6, 7, shape + (3,), dtype=np.int16)
+            yield np.clip(base + noise, 0, 255).astype(np.uint8)
+
+
+class TestVideoAnalyzer:
+
+    def test_counts_cuts_across_batches(self):
+        # 12 scenes of 2.5 s: 11 cuts, several across BATCH_FRAMES boundaries
+        properties = VideoAnalyzer(BATCH_FRAMES=7).analyze(_scenes(2.5, 12), fps=4)
+        assert properties["scene_count"] == 12
+        # 11 cuts in 30 s = 22 cuts/min
+        assert properties["pacing"] == round(22 / 30, 4)
+        assert VideoAnalyzer(BATCH_FRAMES=64).analyze(_scenes(2.5, 12), fps=4) == properties
+
+    def test_fast_cuts_fire_momentum_modifiers(self):
+        fast = VideoAnalyzer().analyze(_scenes(1.0, 20), fps=4)
+        slow = VideoAnalyzer().analyze(_scenes(20.0, 2), fps=4)
+        assert fast["pacing"] > 0.7 and fast["scene_count"] > 8
+        assert slow["pacing"] < 0.2 and slow["scene_count"] == 2
+        scorer = AssetScorer()
+        asset = AssetProperties(asset_id="fast", asset_type="video", **fast)
+        without_video = asset.model_copy(update={"pacing": None, "scene_count": None})
+        gain = scorer.score(asset)["nine_pd_profile"]["momentum"] - \
+            scorer.score(without_video)["nine_pd_profile"]["momentum"]
+        # Fast pacing (+0.10) and high scene count (+0.05)
+        assert round(gain, 4) == 0.15
+
+    def test_flashes_within_min_scene_are_one_cut(self):
+        frames = list(_scenes(5.0, 1))
+        flash = np.full_like(frames[0], 255)
+        frames = frames[:10] + [flash] + frames[10:]
+        assert VideoAnalyzer(MIN_SCENE_SECONDS=0.5).analyze(frames, fps=4)["scene_count"] == 2
+
+    def test_on_screen_text_density(self):
+        frame = np.full((128, 96, 3), 255, dtype=np.uint8)
+        for row in range(20, 100, 16):
+            for col in range(10, 86, 6):
+                frame[row:row + 8, col:col + 2] = 0
+        properties = VideoAnalyzer().analyze([frame] * 8, fps=4)
+        assert properties["on_screen_text_density"] > 0.1
+        assert properties["scene_count"] == 1 and properties["pacing"] == 0.0
+
+    def test_frames_are_consumed_lazily(self):
+        pulled = []
+
+        def frames():
+            for i, frame in enumerate(_scenes(10.0, 3)):
+                pulled.append(i)
+                yield frame
+
+        # A generator is never materialized: each frame is pulled once, in order
+        VideoAnalyzer(BATCH_FRAMES=8).analyze(frames(), fps=4)
+        assert pulled == list(range(120))
+        with pytest.raises(ValueError):
+            VideoAnalyzer().analyze(iter([]), fps=4)
+
+
+def _fake_ffmpeg(tmp_path, frames, stderr_bytes, exit_code=0):
+    """Executable that logs stderr_bytes of noise first, then writes frames as PPM like ffmpeg -c:v ppm."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"""#!{sys.executable}
+import sys
+sys.stderr.write("w" * {stderr_bytes})
+sys.stderr.flush()
+for color, (height, width) in {frames!r}:
+    sys.stdout.buffer.write(b"P6\\n%d %d\\n255\\n" % (width, height) + bytes(color) * (width * height))
+sys.exit({exit_code})
+""")
+    script.chmod(0o755)
+    return str(script)
+
+
+class TestFfmpegFrames:
+
+    def test_ppm_frames_with_noisy_stderr(self, tmp_path):
+        # 1 MB of stderr before any frame: more than a pipe buffer holds
+        frames = [((200, 30, 10), (2, 4)), ((0, 0, 255), (2, 4)), ((9, 9, 9), (3, 5))]
+        ffmpeg = _fake_ffmpeg(tmp_path, frames, stderr_bytes=1 << 20)
+        decoded = list(ffmpeg_frames("clip.mp4", 4, 64, ffmpeg=ffmpeg))
+        assert [frame.shape for frame in decoded] == [(2, 4, 3), (2, 4, 3), (3, 5, 3)]
+        assert [tuple(frame[-1, -1].tolist()) for frame in decoded] == [color for color, _ in frames]
+
+    def test_failure_quotes_stderr(self, tmp_path):
+        ffmpeg = _fake_ffmpeg(tmp_path, [], stderr_bytes=10, exit_code=1)
+        with pytest.raises(ValueError, match="decoded no frames from clip.mp4: wwwwwwwwww"):
+            list(ffmpeg_frames("clip.mp4", 4, 64, ffmpeg=ffmpeg))
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg binary not installed")
+    def test_real_ffmpeg_two_scene_clip(self, tmp_path):
+        clip = str(tmp_path / "clip.mkv")
+        sources = []
+        for color in ("red", "blue"):
+            sources += ["-f", "lavfi", "-i", f"color=c={color}:s=96x64:d=2:r=25"]
+        subprocess.run(["ffmpeg", "-v", "error", *sources, "-filter_complex", "concat=n=2:v=1",
+                        "-c:v", "ffv1", clip], check=True)
+
+        frames = list(ffmpeg_frames(clip, 4, 48))
+        assert abs(len(frames) - 16) <= 1
+        assert max(frames[0].shape[:2]) == 48
+        assert frames[0][..., 0].mean() > 200 and frames[-1][..., 2].mean() > 200
+
+        properties = VideoAnalyzer().extract(clip, narration_present=False)
+        assert properties.asset_id == "clip" and properties.scene_count == 2
@@ -0,0 +1,210 @@
+# app/asset_scoring/video_extraction.py
+"""
+Asset Property Extraction - Phase 2.5B (video)
+Raw video file -> AssetProperties with pacing, scene_count and
+on_screen_text_density, CPU only.
+
+A local ffmpeg decodes, samples (SAMPLE_FPS) and downscales (longest side
+ImageExtractor.MAX_SIDE) in one pass and pipes PPM frames to us; frames
+never touch disk. ffmpeg is a system binary, not a pip requirement: it must
+be on PATH (or passed as --ffmpeg) wherever this runs; the Procfile web
+process does not install it. Frames are consumed in BATCH_FRAMES stacks: cut detection
+is vectorized frame differencing over the stack (mean absolute luma change
+and 32-bin luma histogram distance to the previous frame), so memory is one
+stack of small frames whatever the video length. A 120 s 1080x1920 video at
+the defaults is 480 frames of 144x256, about 3.5 MB per stack.
+
+One frame per MEASURE_EVERY_SECONDS also goes through ImageExtractor.measure
+for the still-image properties and on-screen text. narration_present and
+sfx_present need audio analysis and are left unset.
+
+Usage (NDJSON to stdout, one line per video, input order):
+    python -m app.asset_scoring.video_extraction videos/ --workers 4
+    python -m app.asset_scoring.video_extraction videos/ --score --ffmpeg /usr/local/bin/ffmpeg
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .asset_schema import AssetProperties
+from .asset_scorer import AssetScorer, RULEBOOK_VERSION
+from .image_extraction import ImageExtractor, extract_files, image_paths, write_ndjson, _LUMA, _unit
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.m4v', '.webm', '.mkv', '.avi')
+
+# Tail of ffmpeg's stderr quoted in errors
+_STDERR_TAIL = 4096
+
+
+def ffmpeg_frames(path: str, fps: float, max_side: int, ffmpeg: str = "ffmpeg") -> Iterator[np.ndarray]:
+    """
+    (H, W, 3) uint8 frames of path sampled at fps, longest side <= max_side,
+    decoded by an ffmpeg subprocess. Frames arrive as PPM, whose headers carry
+    the post-rotation size, so no separate probe is needed. Raises ValueError
+    if ffmpeg fails before producing a frame.
+
+    stderr goes to a temporary file rather than a pipe: a pipe nobody reads
+    until stdout ends would block ffmpeg once it filled, with us blocked on
+    stdout (a deadlock on noisy inputs).
+    """
+    scale = f"scale=w={max_side}:h={max_side}:force_original_aspect_ratio=decrease"
+    command = [ffmpeg, "-v", "error", "-nostdin", "-i", path, "-an", "-sn",
+               "-vf", f"fps={fps},{scale}", "-f", "image2pipe", "-c:v", "ppm", "pipe:1"]
+    stderr = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+    frames = 0
+    try:
+        while True:
+            magic = process.stdout.readline()
+            if not magic:
+                break
+            width, height = (int(v) for v in process.stdout.readline().split())
+            process.stdout.readline()  # maxval, always 255 for rgb24
+            size = width * height * 3
+            data = process.stdout.read(size)
+            if len(data) < size:
+                break
+            frames += 1
+            yield np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        stderr.seek(max(stderr.seek(0, os.SEEK_END) - _STDERR_TAIL, 0))
+        errors = stderr.read().decode("utf-8", "replace").strip()
+        stderr.close()
+    if frames == 0:
+        raise ValueError(f"ffmpeg decoded no frames from {path}: {errors or 'empty video'}")
+
+
+class VideoAnalyzer:
+    """
+    Measures AssetProperties of a video from a stream of sampled frames.
+    Deterministic; thresholds are class constants, overridable per instance.
+    """
+
+    FFMPEG = "ffmpeg"               # decoder binary
+    SAMPLE_FPS = 4.0                # frames analyzed per second of video
+    BATCH_FRAMES = 32               # frames differenced per vectorized stack
+    CUT_DIFF = 0.2                  # mean absolute luma change that is a cut
+    CUT_HISTOGRAM = 0.6             # luma histogram L1 distance (max 2) that is a cut
+    HISTOGRAM_BINS = 32
+    MIN_SCENE_SECONDS = 0.5         # cuts closer than this to the last one are flashes
+    PACING_CUTS_PER_MINUTE = 30.0   # cut rate at which pacing reaches 1.0
+    MEASURE_EVERY_SECONDS = 1.0     # still-image measurement interval
+
+    def __init__(self, image: Optional[ImageExtractor] = None, **thresholds: Any):
+        self.image = image or ImageExtractor()
+        for name, value in thresholds.items():
+            if not name.isupper() or not hasattr(type(self), name):
+                raise ValueError(f"Unknown analyzer threshold '{name}'")
+            setattr(self, name, value)
+
+    def analyze(self, frames: Iterable[np.ndarray], fps: Optional[float] = None) -> Dict[str, Any]:
+        """Properties of frames sampled at fps (default SAMPLE_FPS), consumed BATCH_FRAMES at a time."""
+        fps = fps or self.SAMPLE_FPS
+        measure_every = max(1, int(round(fps * self.MEASURE_EVERY_SECONDS)))
+        min_gap = self.MIN_SCENE_SECONDS * fps
+        state = {'previous': None, 'last_cut': -np.inf, 'cuts': 0}
+        measured: List[Dict[str, Any]] = []
+        batch: List[np.ndarray] = []
+        count = 0
+        for frame in frames:
+            if count % measure_every == 0:
+                measured.append(self.image.measure(frame))
+            batch.append(frame)
+            count += 1
+            if len(batch) == self.BATCH_FRAMES:
+                self._detect_cuts(batch, count - len(batch), min_gap, state)
+                batch = []
+        if batch:
+            self._detect_cuts(batch, count - len(batch), min_gap, state)
+        if count == 0:
+            raise ValueError("No frames to analyze")
+
+        minutes = count / fps / 60.0
+        cuts = state['cuts']
+        text = _unit(np.mean([m["text_density"] for m in measured]))
+        return {
+            "color_temperature": Counter(m["color_temperature"] for m in measured).most_common(1)[0][0],
+            "background_style": Counter(m["background_style"] for m in measured).most_common(1)[0][0],
+            "saturation": _unit(np.mean([m["saturation"] for m in measured])),
+            "visual_complexity": _unit(np.mean([m["visual_complexity"] for m in measured])),
+            "text_density": text,
+            "on_screen_text_density": text,
+            "scene_count": cuts + 1,
+            "pacing": _unit(cuts / minutes / self.PACING_CUTS_PER_MINUTE),
+        }
+
+    def _detect_cuts(self, batch: List[np.ndarray], start: int, min_gap: float, state: Dict[str, Any]):
+        """Count cuts between consecutive frames of batch (and the previous batch's last frame)."""
+        luma = np.stack(batch).astype(np.float32) @ (_LUMA / 255.0)
+        bins = self.HISTOGRAM_BINS
+        codes = np.minimum((luma * bins).astype(np.intp), bins - 1).reshape(len(batch), -1)
+        offsets = (np.arange(len(batch), dtype=np.intp) * bins)[:, None]
+        histograms = np.bincount((codes + offsets).ravel(), minlength=len(batch) * bins).reshape(len(batch), bins)
+        histograms = histograms / codes.shape[1]
+
+        previous = state['previous']
+        if previous is not None and previous[0].shape == luma.shape[1:]:
+            luma = np.concatenate([previous[0][None], luma])
+            histograms = np.concatenate([previous[1][None], histograms])
+            first = start
+        else:
+            first = start + 1
+        state['previous'] = (luma[-1], histograms[-1])
+        if len(luma) < 2:
+            return
+
+        diff = np.abs(luma[1:] - luma[:-1]).mean(axis=(1, 2))
+        distance = np.abs(histograms[1:] - histograms[:-1]).sum(axis=1)
+        for i in np.flatnonzero((diff > self.CUT_DIFF) | (distance > self.CUT_HISTOGRAM)).tolist():
+            # Frame index at which the new scene starts
+            at = first + i
+            if at - state['last_cut'] >= min_gap:
+                state['cuts'] += 1
+                state['last_cut'] = at
+
+    def extract(self, path: str, asset_id: Optional[str] = None, **overrides: Any) -> AssetProperties:
+        """
+        AssetProperties for one video file, ready for AssetScorer.score.
+        asset_id defaults to the file name without extension; overrides
+        supply the unmeasured fields (e.g. narration_present=True).
+        """
+        frames = ffmpeg_frames(path, self.SAMPLE_FPS, self.image.MAX_SIDE, ffmpeg=self.FFMPEG)
+        properties = self.analyze(frames, self.SAMPLE_FPS)
+        properties.update(overrides)
+        if asset_id is None:
+            asset_id = os.path.splitext(os.path.basename(path))[0]
+        return AssetProperties(asset_id=asset_id, asset_type="video", **properties)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract AssetProperties from video files as NDJSON")
+    parser.add_argument('paths', nargs='+', help="Video files or directories")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--ffmpeg', default=VideoAnalyzer.FFMPEG, help="ffmpeg binary")
+    parser.add_argument('--sample-fps', type=float, default=VideoAnalyzer.SAMPLE_FPS)
+    parser.add_argument('--score', action='store_true', help="Emit AssetScorer results instead of properties")
+    parser.add_argument('--trace', action='store_true', help="Include the trace with --score")
+    parser.add_argument('--rulebook-version', default=RULEBOOK_VERSION)
+    args = parser.parse_args(argv)
+
+    paths = (path for root in args.paths for path in image_paths(root, VIDEO_EXTENSIONS))
+    analyzer = VideoAnalyzer(FFMPEG=args.ffmpeg, SAMPLE_FPS=args.sample_fps)
+    results = extract_files(paths, analyzer, workers=args.workers, chunksize=1)
+    write_ndjson(results, scorer=AssetScorer() if args.score else None, trace=args.trace,
+                 rulebook_version=args.rulebook_version, unit="videos")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
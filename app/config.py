@@ -39,6 +39,51 @@ class Settings(BaseSettings):
     AGENT_TIMEOUT: int = 300  # seconds
     MAX_CONCURRENT_JOBS: int = 10
     
+    # Batch Execution (off-loop pool sized by MAX_CONCURRENT_JOBS: process | thread | inline)
+    EXECUTOR_MODE: str = os.getenv("EXECUTOR_MODE", "thread")
+    EXECUTOR_CHUNK_ROWS: int = 5000  # rows per dispatched chunk
+    EXECUTOR_INLINE_ROWS: int = 256  # smaller batches run on the event loop
+    
+    # A2 Calibration Persistence (write-behind to Postgres when DATABASE_URL is postgres)
+    CALIBRATION_FLUSH_SIZE: int = 500  # events
+    CALIBRATION_FLUSH_INTERVAL: float = 2.0  # seconds
+    CALIBRATION_BUFFER_LIMIT: int = 50000  # pending events before oldest are dropped
+    CALIBRATION_MEMORY_EVENTS: int = 100000  # in-process backfill window
+    
+    # A2 Underwriting Memoization
+    A2_CACHE_MAXSIZE: int = 10000  # entries
+    A2_CACHE_TTL: float = 300.0  # seconds
+    
+    # A2 Request Capture (columnar .npz segments for replay; empty disables)
+    A2_CAPTURE_DIR: str = os.getenv("A2_CAPTURE_DIR", "")
+    A2_CAPTURE_SEGMENT_ROWS: int = 50000  # requests per segment file
+    
+    # A2 Per-Sector Parameters (JSON file, else a2_sector_parameters table when enabled)
+    A2_SECTOR_PARAMETERS_PATH: str = os.getenv("A2_SECTOR_PARAMETERS_PATH", "")
+    A2_SECTOR_PARAMETERS_FROM_DB: bool = os.getenv("A2_SECTOR_PARAMETERS_FROM_DB", "false").lower() == "true"
+    A2_SECTOR_RELOAD_INTERVAL: float = 30.0  # seconds
+    
+    # A2 Data Support Index (k-NN over profiles with backfilled outcomes; used when requests omit data_support)
+    # Seeded at startup from profiles stored with calibration events (migration_004), so workers start from the same history
+    A2_DATA_SUPPORT_INDEX: bool = os.getenv("A2_DATA_SUPPORT_INDEX", "true").lower() == "true"
+    A2_DATA_SUPPORT_MAX_POINTS: int = 50000  # indexed outcomes kept, newest first
+    
+    # Video Generation Store (DATABASE_URL tables; LRU bounds per-worker memory)
+    VIDEO_STORE_POOL_SIZE: int = 10  # Postgres connections per worker
+    VIDEO_STORE_FLUSH_SIZE: int = 200  # saves per insert transaction
+    VIDEO_STORE_FLUSH_INTERVAL: float = 0.005  # seconds a save waits to share a transaction
+    VIDEO_STORE_CACHE_MAXSIZE: int = 10000  # instructions and outputs each, per worker
+    
+    # Asset Score Cache (in-process LRU, plus a shared Redis tier when REDIS_URL is set)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    ASSET_SCORE_CACHE_MAXSIZE: int = 20000  # entries per worker
+    ASSET_SCORE_CACHE_TTL: float = 3600.0  # seconds, local tier
+    ASSET_SCORE_REDIS_TTL: int = 7 * 24 * 3600  # seconds, shared tier
+    
+    # Asset Audit Log (compressed .npz segments of scored assets; empty disables)
+    ASSET_AUDIT_DIR: str = os.getenv("ASSET_AUDIT_DIR", "")
+    ASSET_AUDIT_SEGMENT_ROWS: int = 50000  # assets per segment file
+    
     # Video Generation
     RUNWAY_API_KEY: str = os.getenv("RUNWAY_API_KEY", "")
     PIKA_API_KEY: str = os.getenv("PIKA_API_KEY", "")
@@ -0,0 +1,291 @@
+"""
+Async repository for video generation instructions and outputs.
+
+Rows live in the video_generation_requests / _instructions / _outputs
+tables (migration_003, app/database/models.py) behind a pooled SQLAlchemy
+async engine, so they survive restarts and are visible to every worker. Writes are group
+committed: concurrent saves are queued for up to flush_interval seconds (or
+flush_size saves) and inserted in one transaction with one executemany per
+table, one transaction at a time; each caller still returns only after
+its own rows are committed.
+Reads go through a bounded LRU of API models, so process memory is capped
+by cache_maxsize rather than by traffic.
+
+Without an engine (no database configured, unreachable at startup, or
+the migration not applied) saves raise StoreUnavailableError rather than
+pretend to persist; reads can only miss.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.agents.video_generation.models import (
+    VideoGenerationInstructionOutput,
+    VideoGenerationOutputResult,
+    VideoGenerationRequestInput,
+)
+from app.database.models import (
+    VideoGenerationInstruction,
+    VideoGenerationOutput,
+    VideoGenerationRequest,
+)
+from app.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Insert order within a transaction (foreign keys point up this list)
+TABLES = (VideoGenerationRequest, VideoGenerationInstruction, VideoGenerationOutput)
+
+INSTRUCTION_COLUMNS = [
+    'main_prompt', 'negative_prompt', 'style_guidance',
+    'resolution', 'frame_rate', 'codec',
+    'runway_mode', 'runway_motion_bucket_id', 'runway_conditioning_scale', 'runway_steps',
+    'estimated_generation_time', 'estimated_cost',
+    'sbox_parameters_snapshot', 'dimension_mapping', 'created_at'
+]
+
+OUTPUT_COLUMNS = [
+    'instruction_id', 'request_id', 'status', 'error_code', 'error_message',
+    'video_url', 'video_duration', 'video_resolution', 'video_size_bytes',
+    'runway_generation_id', 'runway_processing_time', 'runway_cost', 'created_at'
+]
+
+
+class RecordConflictError(ValueError):
+    """The save violates a key or reference constraint (duplicate id, unknown instruction/request)."""
+
+
+class StoreUnavailableError(RuntimeError):
+    """No database is attached, so a save cannot be made durable."""
+
+
+def async_database_url(database_url: Optional[str]) -> Optional[str]:
+    """SQLAlchemy async URL for DATABASE_URL (asyncpg / aiosqlite drivers); None if unsupported."""
+    if not database_url:
+        return None
+    scheme, sep, rest = database_url.partition("://")
+    if not sep:
+        return None
+    dialect = scheme.split("+")[0]
+    if dialect in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg://{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return None
+
+
+def _instruction_rows(request: Optional[VideoGenerationRequestInput],
+                      instruction: VideoGenerationInstructionOutput) -> List[Tuple[Any, Dict[str, Any]]]:
+    rows = []
+    if request is not None:
+        rows.append((VideoGenerationRequest, {
+            'id': instruction.request_id,
+            'translation_id': request.translation_id,
+            'allocation_id': request.allocation_id,
+            'platform': request.platform.value,
+            'duration': request.duration,
+            'content_type': request.content_type.value if request.content_type else None,
+            'created_at': instruction.created_at
+        }))
+    values = {name: getattr(instruction, name) for name in INSTRUCTION_COLUMNS}
+    rows.append((VideoGenerationInstruction, dict(values, id=instruction.instruction_id,
+                                                  request_id=instruction.request_id)))
+    return rows
+
+
+def _instruction_model(row: VideoGenerationInstruction) -> VideoGenerationInstructionOutput:
+    values = {name: getattr(row, name) for name in INSTRUCTION_COLUMNS}
+    values['sbox_parameters_snapshot'] = values['sbox_parameters_snapshot'] or {}
+    values['dimension_mapping'] = values['dimension_mapping'] or {}
+    return VideoGenerationInstructionOutput(instruction_id=row.id, request_id=row.request_id, **values)
+
+
+def _output_model(row: VideoGenerationOutput) -> VideoGenerationOutputResult:
+    return VideoGenerationOutputResult(output_id=row.id, **{name: getattr(row, name) for name in OUTPUT_COLUMNS})
+
+
+class VideoRepository:
+    """
+    Instructions and outputs by id: group-committed inserts, read-through LRU.
+
+    Single event loop; start() attaches the engine, stop() drains pending
+    writes and disposes of the pool.
+    """
+
+    FLUSH_SIZE = 200        # saves per transaction
+    FLUSH_INTERVAL = 0.005  # seconds a save waits for others to share its transaction
+    CACHE_MAXSIZE = 10_000  # instructions and outputs, each
+
+    def __init__(self,
+                 engine=None,
+                 cache_maxsize: Optional[int] = None,
+                 flush_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None):
+        self.engine = engine
+        maxsize = cache_maxsize or self.CACHE_MAXSIZE
+        self.instructions = LRUCache(maxsize=maxsize)
+        self.outputs = LRUCache(maxsize=maxsize)
+        self.flush_size = flush_size or self.FLUSH_SIZE
+        self.flush_interval = self.FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._pending: List[Tuple[List[Tuple[Any, Dict[str, Any]]], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+        # One transaction in flight: saves arriving meanwhile form the next batch
+        self._commit_lock = asyncio.Lock()
+        self.counters = {'transactions': 0, 'rows': 0, 'row_retries': 0, 'db_reads': 0}
+
+    @classmethod
+    def create_engine(cls, database_url: str, pool_size: int = 10, max_overflow: int = 10):
+        """Pooled async engine for DATABASE_URL; ValueError if the URL has no async driver here."""
+        url = async_database_url(database_url)
+        if url is None:
+            raise ValueError(f"No async driver for DATABASE_URL scheme '{database_url.partition('://')[0]}'")
+        if url.startswith("sqlite"):
+            # Local file database: SQLAlchemy's default (unpooled) connections for aiosqlite
+            return create_async_engine(url)
+        return create_async_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=True)
+
+    async def start(self, engine):
+        """Attach engine; RuntimeError if the video tables (migration_003) are missing."""
+        async with engine.connect() as conn:
+            missing = await conn.run_sync(
+                lambda sync_conn: [t.__tablename__ for t in TABLES if not inspect(sync_conn).has_table(t.__tablename__)]
+            )
+        if missing:
+            await engine.dispose()
+            raise RuntimeError(f"Video tables missing ({', '.join(missing)}); apply migrations/migration_003_video_generation.sql")
+        self.engine = engine
+
+    async def stop(self):
+        """Commit pending saves, then release the pool."""
+        await self.flush()
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+
+    # Writes
+
+    async def save_instruction(self, instruction: VideoGenerationInstructionOutput,
+                               request: Optional[VideoGenerationRequestInput] = None):
+        """Store instruction (and the request row it links to); returns once committed."""
+        await self._save(_instruction_rows(request, instruction))
+        self.instructions.put(instruction.instruction_id, instruction)
+
+    async def save_output(self, output: VideoGenerationOutputResult):
+        values = {name: getattr(output, name) for name in OUTPUT_COLUMNS}
+        await self._save([(VideoGenerationOutput, dict(values, id=output.output_id))])
+        self.outputs.put(output.output_id, output)
+
+    async def _save(self, rows: List[Tuple[Any, Dict[str, Any]]]):
+        if self.engine is None:
+            raise StoreUnavailableError("Video store has no database attached")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((rows, future))
+        if len(self._pending) >= self.flush_size:
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.flush_interval, self._start_flush)
+        await future
+
+    def _start_flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._commit(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def flush(self):
+        """Commit everything queued so far."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _commit(self, batch):
+        async with self._commit_lock:
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch):
+        """One transaction for the batch; if it fails, each save is retried alone so only bad ones fail."""
+        try:
+            await self._insert([rows for rows, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                self._resolve(batch[0][1], e)
+                return
+            for rows, future in batch:
+                self.counters['row_retries'] += 1
+                try:
+                    await self._insert([rows])
+                except Exception as row_error:
+                    self._resolve(future, row_error)
+                else:
+                    self._resolve(future, None)
+            return
+        for _, future in batch:
+            self._resolve(future, None)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, error: Optional[Exception]):
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        elif isinstance(error, IntegrityError):
+            future.set_exception(RecordConflictError(str(error.orig)))
+        else:
+            future.set_exception(error)
+
+    async def _insert(self, saves: List[List[Tuple[Any, Dict[str, Any]]]]):
+        by_table: Dict[Any, List[Dict[str, Any]]] = {table: [] for table in TABLES}
+        for rows in saves:
+            for table, values in rows:
+                by_table[table].append(values)
+        async with self.engine.begin() as conn:
+            for table in TABLES:
+                if by_table[table]:
+                    await conn.execute(insert(table), by_table[table])
+        self.counters['transactions'] += 1
+        self.counters['rows'] += sum(len(values) for values in by_table.values())
+
+    # Reads
+
+    async def get_instruction(self, instruction_id: str) -> Optional[VideoGenerationInstructionOutput]:
+        instruction = self.instructions.get(instruction_id)
+        if instruction is None and self.engine is not None:
+            row = await self._fetch(VideoGenerationInstruction, instruction_id)
+            if row is not None:
+                instruction = _instruction_model(row)
+                self.instructions.put(instruction_id, instruction)
+        return instruction
+
+    async def get_output(self, output_id: str) -> Optional[VideoGenerationOutputResult]:
+        output = self.outputs.get(output_id)
+        if output is None and self.engine is not None:
+            row = await self._fetch(VideoGenerationOutput, output_id)
+            if row is not None:
+                output = _output_model(row)
+                self.outputs.put(output_id, output)
+        return output
+
+    async def _fetch(self, table, row_id: str):
+        # Misses are not cached: another worker may store the id at any time
+        self.counters['db_reads'] += 1
+        async with AsyncSession(self.engine) as session:
+            return (await session.execute(select(table).where(table.id == row_id))).scalar_one_or_none()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'backend': self.engine.dialect.name if self.engine is not None else 'unavailable',
+            'pending_saves': len(self._pending),
+            'instructions_cache': self.instructions.stats(),
+            'outputs_cache': self.outputs.stats(),
+            **self.counters
+        }
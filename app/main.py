@@ -6,9 +6,25 @@ from fastapi.middleware.cors import CORSMiddleware
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-from app.a2_system_underwriting.a2_underwriting_router import router as a2_router
+from app.a2_system_underwriting.a2_underwriting_router import (
+    router as a2_router,
+    start_calibration_persistence,
+    stop_calibration_persistence,
+    start_request_capture,
+    stop_request_capture,
+    start_sector_registry,
+    stop_sector_registry,
+)
 from app.api.routes.hub_routes import router as hub_router
-from app.api.routes.asset_routes import router as asset_router
+from app.api.routes.asset_routes import (
+    router as asset_router,
+    start_asset_score_cache,
+    stop_asset_score_cache,
+    start_asset_audit_log,
+    stop_asset_audit_log,
+)
+from app.api.routes.pipeline_routes import router as pipeline_router
+from app.services.job_executor import job_executor
 
 app = FastAPI(title="Stardance V2", version="2.2.0")
 
@@ -20,8 +36,21 @@ app.add_middleware(
 )
 
 app.include_router(a2_router)
+app.add_event_handler("startup", start_calibration_persistence)
+app.add_event_handler("shutdown", stop_calibration_persistence)
+app.add_event_handler("startup", start_request_capture)
+app.add_event_handler("shutdown", stop_request_capture)
+app.add_event_handler("startup", start_sector_registry)
+app.add_event_handler("shutdown", stop_sector_registry)
+app.add_event_handler("shutdown", job_executor.shutdown)
 app.include_router(asset_router)
+app.add_event_handler("startup", start_asset_score_cache)
+app.add_event_handler("shutdown", stop_asset_score_cache)
+app.add_event_handler("startup", start_asset_audit_log)
+app.add_event_handler("shutdown", stop_asset_audit_log)
+app.include_router(pipeline_router)
 logger.info("📊 Asset Scorer mounted at /v1/asset")
+logger.info("🔀 Asset→Underwriting pipeline mounted at /v1/pipeline")
 logger.info("🔒 A2 Router mounted at /v1/a2")
 
 app.include_router(hub_router)
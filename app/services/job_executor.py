@@ -0,0 +1,124 @@
+"""
+job_executor.py
+Off-loop execution for CPU-bound batch work
+Runs pure functions on a thread or process pool (sized by
+Settings.MAX_CONCURRENT_JOBS) so large underwriting and scoring batches do
+not stall the event loop serving other requests.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ('process', 'thread', 'inline')
+
+
+def chunk_slices(n: int, chunk_rows: int) -> Iterator[slice]:
+    """Consecutive row slices of at most chunk_rows covering range(n)."""
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be > 0, got {chunk_rows}")
+    for start in range(0, n, chunk_rows):
+        yield slice(start, min(start + chunk_rows, n))
+
+
+class JobExecutor:
+    """
+    Dispatches CPU-bound calls off the event loop.
+
+    mode 'process' uses a spawn-context ProcessPoolExecutor (no GIL
+    contention; arguments and results are pickled, so callables must be
+    module-level functions and their arguments picklable), 'thread' uses a
+    ThreadPoolExecutor (no pickling; NumPy kernels release the GIL) and
+    'inline' calls directly on the loop. The pool is created on first use.
+
+    At most max_workers calls are in flight across all requests; further
+    chunks wait on a semaphore, so chunks of concurrent batches interleave
+    instead of one batch queueing its whole workload ahead of the others.
+    Work below inline_rows rows runs on the loop, where dispatch overhead
+    would exceed the work itself.
+    """
+
+    def __init__(self,
+                 mode: str = 'thread',
+                 max_workers: int = 4,
+                 chunk_rows: int = 5000,
+                 inline_rows: int = 0):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode '{mode}'; expected one of {list(EXECUTOR_MODES)}")
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be > 0, got {max_workers}")
+        if chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be > 0, got {chunk_rows}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.chunk_rows = chunk_rows
+        self.inline_rows = inline_rows
+        self._pool: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+        self.submitted = 0
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            if self.mode == 'process':
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job-executor')
+            logger.info(f"Job executor started: mode={self.mode}, workers={self.max_workers}")
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any, rows: Optional[int] = None) -> Any:
+        """fn(*args) off the loop; rows, if given and below inline_rows, runs it inline."""
+        if self.mode == 'inline' or (rows is not None and rows < self.inline_rows):
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            # asyncio primitives bind to one loop
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._slots_loop = loop
+        async with self._slots:
+            self.submitted += 1
+            return await loop.run_in_executor(self._executor(), fn, *args)
+
+    async def map(self, fn: Callable[..., Any], calls: Sequence[tuple], rows: Optional[int] = None) -> List[Any]:
+        """fn(*args) for every args tuple in calls, concurrently; results in call order."""
+        if self.mode == 'inline' or (rows is not None and rows < self.inline_rows):
+            results = []
+            for args in calls:
+                results.append(fn(*args))
+                # Let other requests run between chunks
+                await asyncio.sleep(0)
+            return results
+        return list(await asyncio.gather(*(self.run(fn, *args) for args in calls)))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        self._slots = None
+        self._slots_loop = None
+
+    def stats(self):
+        return {
+            'mode': self.mode,
+            'max_workers': self.max_workers,
+            'chunk_rows': self.chunk_rows,
+            'inline_rows': self.inline_rows,
+            'started': self._pool is not None,
+            'submitted': self.submitted
+        }
+
+
+# Shared by the A2 and asset scoring routers; shut down with the app
+job_executor = JobExecutor(
+    mode=settings.EXECUTOR_MODE,
+    max_workers=settings.MAX_CONCURRENT_JOBS,
+    chunk_rows=settings.EXECUTOR_CHUNK_ROWS,
+    inline_rows=settings.EXECUTOR_INLINE_ROWS
+)
@@ -1,9 +1,12 @@
 """
 A2SchemaAdapter — Production Boundary Layer (DTC Updated)
 Maps A2 system_underwriting response → T5 canonical (TIS/GCI/CLG)
+Batch form: map_a2_batch_to_canonical → columnar UnderwritingResultBatch
 """
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -37,3 +40,145 @@ def map_a2_to_canonical(a2_response: dict) -> UnderwritingResult:
         calibration_event_id=a2_response.get("calibration_event_id"),
         raw_a2_response=a2_response
     )
+
+
+# Routing band vocabulary; codes in UnderwritingResultBatch index this
+# (extended per batch with any decision string outside it)
+ROUTING_BANDS = ("AUTO_LAUNCH", "HUMAN_REVIEW", "NO_LAUNCH")
+
+
+class UnderwritingResultBatch:
+    """
+    Columnar (struct-of-arrays) canonical T5 results.
+
+    One float64 array per score, uint8 routing band codes into
+    routing_bands, gate_pass packed 8 rows per byte. CLG shares GCI's array
+    (Phase 2: CLG = GCI). raw_a2_responses is None unless retained, since
+    the raw dicts dominate memory for large batches. batch[i] is a cheap
+    UnderwritingResultView over row i.
+    """
+    __slots__ = ('tis', 'gci', 'clg', 'routing_band_codes', 'routing_bands',
+                 'gate_pass_bits', 'penalty_sum', 'calibration_event_ids', 'raw_a2_responses')
+
+    def __init__(self,
+                 tis: np.ndarray,
+                 gci: np.ndarray,
+                 routing_band_codes: np.ndarray,
+                 routing_bands: Tuple[str, ...],
+                 penalty_sum: np.ndarray,
+                 calibration_event_ids: List[Optional[str]],
+                 raw_a2_responses: Optional[List[Dict[str, Any]]] = None):
+        self.tis = tis
+        self.gci = gci
+        self.clg = gci
+        self.routing_band_codes = routing_band_codes
+        self.routing_bands = routing_bands
+        self.gate_pass_bits = np.packbits(routing_band_codes == routing_bands.index("AUTO_LAUNCH"))
+        self.penalty_sum = penalty_sum
+        self.calibration_event_ids = calibration_event_ids
+        self.raw_a2_responses = raw_a2_responses
+
+    @property
+    def gate_pass(self) -> np.ndarray:
+        return np.unpackbits(self.gate_pass_bits, count=len(self)).astype(bool)
+
+    def routing_band(self, i: int) -> str:
+        return self.routing_bands[self.routing_band_codes[i]]
+
+    def __len__(self) -> int:
+        return len(self.tis)
+
+    def __getitem__(self, i: int) -> "UnderwritingResultView":
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError(f"row {i} out of range for batch of {n}")
+        return UnderwritingResultView(self, i % n)
+
+    def __iter__(self) -> Iterator["UnderwritingResultView"]:
+        return (UnderwritingResultView(self, i) for i in range(len(self)))
+
+    def to_results(self) -> List[UnderwritingResult]:
+        return [row.to_result() for row in self]
+
+
+class UnderwritingResultView:
+    """Row i of an UnderwritingResultBatch with UnderwritingResult's fields, read on access."""
+    __slots__ = ('batch', 'index')
+
+    def __init__(self, batch: UnderwritingResultBatch, index: int):
+        self.batch = batch
+        self.index = index
+
+    @property
+    def tis(self) -> float:
+        return float(self.batch.tis[self.index])
+
+    @property
+    def gci(self) -> float:
+        return float(self.batch.gci[self.index])
+
+    @property
+    def clg(self) -> float:
+        return float(self.batch.clg[self.index])
+
+    @property
+    def routing_band(self) -> str:
+        return self.batch.routing_band(self.index)
+
+    @property
+    def gate_pass(self) -> bool:
+        byte, bit = divmod(self.index, 8)
+        return bool((self.batch.gate_pass_bits[byte] >> (7 - bit)) & 1)
+
+    @property
+    def penalty_sum(self) -> float:
+        return float(self.batch.penalty_sum[self.index])
+
+    @property
+    def calibration_event_id(self) -> Optional[str]:
+        return self.batch.calibration_event_ids[self.index]
+
+    @property
+    def raw_a2_response(self) -> Optional[Dict[str, Any]]:
+        raws = self.batch.raw_a2_responses
+        return None if raws is None else raws[self.index]
+
+    def to_result(self) -> UnderwritingResult:
+        return UnderwritingResult(
+            tis=self.tis,
+            gci=self.gci,
+            clg=self.clg,
+            routing_band=self.routing_band,
+            gate_pass=self.gate_pass,
+            penalty_sum=self.penalty_sum,
+            calibration_event_id=self.calibration_event_id,
+            raw_a2_response=self.raw_a2_response
+        )
+
+
+def map_a2_batch_to_canonical(a2_responses: Sequence[dict], retain_raw: bool = False) -> UnderwritingResultBatch:
+    """Batch form of map_a2_to_canonical; row i equals map_a2_to_canonical(a2_responses[i])."""
+    n = len(a2_responses)
+    bands = list(ROUTING_BANDS)
+    band_codes = {band: code for code, band in enumerate(bands)}
+    codes = np.empty(n, dtype=np.uint8)
+    for i, response in enumerate(a2_responses):
+        decision = response.get("decision", "NO_LAUNCH")
+        code = band_codes.get(decision)
+        if code is None:
+            if len(bands) == 256:
+                raise ValueError("Too many distinct routing bands for uint8 codes (max 256)")
+            code = band_codes[decision] = len(bands)
+            bands.append(decision)
+        codes[i] = code
+
+    return UnderwritingResultBatch(
+        tis=np.fromiter((float(r.get("system_fit", 0.0)) for r in a2_responses), dtype=np.float64, count=n),
+        gci=np.fromiter((float(r.get("system_confidence", 0.0)) for r in a2_responses), dtype=np.float64, count=n),
+        routing_band_codes=codes,
+        routing_bands=tuple(bands),
+        penalty_sum=np.fromiter((float(r.get("transition_penalty_sum", 0.0)) for r in a2_responses),
+                                dtype=np.float64, count=n),
+        calibration_event_ids=[r.get("calibration_event_id") for r in a2_responses],
+        raw_a2_responses=list(a2_responses) if retain_raw else None
+    )
@@ -0,0 +1,117 @@
+"""
+ndjson.py
+Incremental newline-delimited JSON request/response streaming
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Longest accepted input line; longer lines are reported and skipped
+MAX_LINE_BYTES = 1 << 20
+
+
+async def ndjson_lines(chunks: AsyncIterator[bytes],
+                       max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[List[Tuple[int, Optional[bytes]]]]:
+    """
+    Split a byte stream into lines as it arrives. Yields, per received
+    chunk, the complete non-blank lines it finished as (line_number, line)
+    with 1-based line numbers; an over-long line is yielded once as
+    (line_number, None) and its remaining bytes are dropped. Only one chunk
+    plus one partial line is ever held, whatever the stream length.
+    """
+    pending = bytearray()
+    line_no = 0
+    oversized = False
+    async for chunk in chunks:
+        lines = []
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            line_no += 1
+            if oversized:
+                oversized = False
+            else:
+                pending += chunk[start:end]
+                line = bytes(pending).strip()
+                if len(pending) > max_line_bytes:
+                    lines.append((line_no, None))
+                elif line:
+                    lines.append((line_no, line))
+            pending.clear()
+            start = end + 1
+        if not oversized:
+            pending += chunk[start:]
+            if len(pending) > max_line_bytes:
+                # Report now rather than buffering the rest of the line
+                lines.append((line_no + 1, None))
+                pending.clear()
+                oversized = True
+        if lines:
+            yield lines
+    if not oversized:
+        line = bytes(pending).strip()
+        if line:
+            yield [(line_no + 1, line)]
+
+
+def error_line(line_no: int, message: str) -> bytes:
+    return json.dumps({"line": line_no, "error": message}).encode("utf-8")
+
+
+async def ndjson_stream(chunks: AsyncIterator[bytes],
+                        handle: Callable[[bytes], bytes],
+                        max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[bytes]:
+    """
+    Response body for a streamed NDJSON endpoint: handle(line) -> one
+    serialized JSON result per input line, in input order. A line that fails
+    (bad JSON, validation, scoring) becomes {"line": n, "error": ...} and
+    the stream continues.
+
+    Nothing is read ahead: the next request chunk is only pulled after the
+    previous chunk's results have been handed to the server, so a slow
+    reader throttles the upload (back-pressure) and memory stays bounded.
+    """
+    async for lines in ndjson_lines(chunks, max_line_bytes):
+        out = []
+        for line_no, line in lines:
+            if line is None:
+                out.append(error_line(line_no, f"Line exceeds {max_line_bytes} bytes"))
+                continue
+            try:
+                out.append(handle(line))
+            except ValueError as e:
+                # json and pydantic validation errors are ValueErrors
+                out.append(error_line(line_no, str(e)))
+            except Exception as e:
+                logger.error(f"NDJSON line {line_no} failed: {str(e)}")
+                out.append(error_line(line_no, f"{type(e).__name__}: {str(e)}"))
+        out.append(b"")
+        yield b"\n".join(out)
+        # Give other requests a turn between chunks
+        await asyncio.sleep(0)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for bodies that consume the request stream while
+    responding. The stock class drains receive() in a disconnect watcher,
+    which would swallow the request body still being uploaded; here a
+    client disconnect surfaces instead through request.stream()
+    (ClientDisconnect) or a failing send.
+    """
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
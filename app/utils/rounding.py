@@ -0,0 +1,30 @@
+"""
+rounding.py
+Vectorized rounding that matches Python's built-in round()
+"""
+import numpy as np
+
+# Half-way detection slack for the scaled value; float64 error on x * 10**ndigits
+# for the score ranges used here is far below this.
+_TIE_TOLERANCE = 1e-6
+
+
+def round_array(values, ndigits: int = 4) -> np.ndarray:
+    """
+    Round every element exactly like round(float(v), ndigits).
+
+    np.round scales, rounds and unscales, which disagrees with Python's
+    correctly-rounded decimal semantics on values that sit on a half-way
+    boundary. Those rare elements are re-rounded with round(); everything
+    else stays vectorized.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+
+    fraction = np.abs(scaled - np.trunc(scaled))
+    ambiguous = np.abs(fraction - 0.5) < _TIE_TOLERANCE
+    if ambiguous.any():
+        rounded[ambiguous] = [round(v, ndigits) for v in values[ambiguous].tolist()]
+    return rounded
@@ -0,0 +1,12 @@
+-- A2 System Underwriting Database Migration
+-- Migration: 002_sector_parameters
+
+CREATE TABLE IF NOT EXISTS a2_sector_parameters (
+    sector_id VARCHAR(50) PRIMARY KEY,  -- '*' overrides the default for unlisted sectors
+    parameters JSONB NOT NULL DEFAULT '{}'::jsonb,
+    version VARCHAR(50) NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE a2_sector_parameters IS 
+    'Per-sector overrides of A2 stage weights, confidence weights, decision thresholds and penalty rules; polled and hot-swapped by SectorRegistry.';
@@ -0,0 +1,71 @@
+-- Video Generation Agent Database Migration
+-- Migration: 003_video_generation
+-- Tables behind VideoRepository (app/database/video_repository.py), matching app/database/models.py.
+-- Plain SQL types only, so the same script also sets up a local SQLite DATABASE_URL.
+
+CREATE TABLE IF NOT EXISTS video_generation_requests (
+    id VARCHAR(36) PRIMARY KEY,
+    translation_id VARCHAR(36) NOT NULL,  -- Links to SBOX
+    allocation_id VARCHAR(36) NOT NULL,   -- Links to CIM
+    platform VARCHAR(50) NOT NULL,
+    duration INTEGER NOT NULL,
+    content_type VARCHAR(50),
+    created_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_video_generation_requests_translation_id
+    ON video_generation_requests(translation_id);
+
+CREATE INDEX IF NOT EXISTS ix_video_generation_requests_allocation_id
+    ON video_generation_requests(allocation_id);
+
+CREATE INDEX IF NOT EXISTS ix_video_generation_requests_created_at
+    ON video_generation_requests(created_at);
+
+CREATE TABLE IF NOT EXISTS video_generation_instructions (
+    id VARCHAR(36) PRIMARY KEY,
+    request_id VARCHAR(36) UNIQUE REFERENCES video_generation_requests(id),
+    main_prompt VARCHAR(2000) NOT NULL,
+    negative_prompt VARCHAR(1000) NOT NULL,
+    style_guidance VARCHAR(500) NOT NULL,
+    resolution VARCHAR(20),
+    frame_rate INTEGER,
+    codec VARCHAR(20),
+    runway_mode VARCHAR(20),
+    runway_motion_bucket_id INTEGER,
+    runway_conditioning_scale DOUBLE PRECISION,
+    runway_steps INTEGER,
+    estimated_generation_time INTEGER,   -- seconds
+    estimated_cost DOUBLE PRECISION,     -- USD
+    sbox_parameters_snapshot JSON,
+    dimension_mapping JSON,
+    created_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_video_generation_instructions_created_at
+    ON video_generation_instructions(created_at);
+
+CREATE TABLE IF NOT EXISTS video_generation_outputs (
+    id VARCHAR(36) PRIMARY KEY,
+    instruction_id VARCHAR(36) REFERENCES video_generation_instructions(id),
+    request_id VARCHAR(36) REFERENCES video_generation_requests(id),
+    status VARCHAR(20),                  -- pending, completed, failed
+    error_code VARCHAR(50),
+    error_message VARCHAR(500),
+    video_url VARCHAR(500),
+    video_duration INTEGER,
+    video_resolution VARCHAR(20),
+    video_size_bytes INTEGER,
+    runway_generation_id VARCHAR(100) UNIQUE,
+    runway_seed INTEGER,
+    runway_processing_time INTEGER,      -- milliseconds
+    runway_cost DOUBLE PRECISION,
+    platform_post_id VARCHAR(200),
+    published_at TIMESTAMP,
+    created_at TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_video_generation_outputs_created_at
+    ON video_generation_outputs(created_at);
@@ -0,0 +1,13 @@
+-- A2 System Underwriting Database Migration
+-- Migration: 004_calibration_stage_profiles
+-- Stage profile behind each calibration event, so DataSupportIndex can be seeded at startup.
+
+ALTER TABLE system_confidence_calibration_events
+    ADD COLUMN IF NOT EXISTS stage_profile FLOAT8[] NULL;  -- 27 values, (3, 9) row-major: PLA_STAGES x NINE_PD_DIMENSIONS
+
+CREATE INDEX IF NOT EXISTS idx_calibration_profiles_with_outcome
+    ON system_confidence_calibration_events(timestamp DESC)
+    WHERE actual_performance_percentile IS NOT NULL AND stage_profile IS NOT NULL;
+
+COMMENT ON COLUMN system_confidence_calibration_events.stage_profile IS
+    'Flattened (3, 9) stage profile underwritten; seeds the A2 data support k-NN index.';
@@ -0,0 +1,125 @@
+"""Batch underwriting must match the scalar /v1/a2/underwrite path exactly."""
+
+import random
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS, PLA_STAGES
+from app.utils.rounding import round_array
+
+client = TestClient(app)
+
+
+def _random_systems(n, seed=7):
+    rng = random.Random(seed)
+    # Coarse grid so penalty deltas and decision thresholds are hit exactly
+    grid = [round(0.05 * k, 2) for k in range(21)]
+    systems = []
+    for _ in range(n):
+        systems.append({
+            "profiles": [[rng.choice(grid) for _ in NINE_PD_DIMENSIONS] for _ in PLA_STAGES],
+            "fits": [rng.choice(grid[12:]) for _ in PLA_STAGES],
+            "confidences": [rng.uniform(0.3, 1.0) for _ in PLA_STAGES],
+            "gates": [rng.random() > 0.1 for _ in PLA_STAGES],
+            "support": [rng.choice(grid), rng.choice(grid)],
+            "measurement": rng.choice(grid),
+        })
+    return systems
+
+
+def _scalar_payload(system):
+    return {
+        "brand_id": "lumiere",
+        "stage_profiles": {
+            stage: dict(zip(NINE_PD_DIMENSIONS, system["profiles"][s]))
+            for s, stage in enumerate(PLA_STAGES)
+        },
+        "stage_fits": dict(zip(PLA_STAGES, system["fits"])),
+        "stage_confidences": dict(zip(PLA_STAGES, system["confidences"])),
+        "stage_gates_passed": dict(zip(PLA_STAGES, system["gates"])),
+        "data_support": {"similarity": system["support"][0], "sample_count": system["support"][1]},
+        "measurement_quality": system["measurement"],
+    }
+
+
+def test_batch_matches_scalar_path():
+    systems = _random_systems(200)
+    batch_payload = {
+        "brand_id": "lumiere",
+        "stage_profiles": [s["profiles"] for s in systems],
+        "stage_fits": [s["fits"] for s in systems],
+        "stage_confidences": [s["confidences"] for s in systems],
+        "stage_gates_passed": [s["gates"] for s in systems],
+        "data_support": [s["support"] for s in systems],
+        "measurement_quality": [s["measurement"] for s in systems],
+    }
+    response = client.post("/v1/a2/underwrite/batch", json=batch_payload)
+    assert response.status_code == 200, response.text
+    batch = response.json()
+    assert batch["count"] == len(systems)
+
+    decisions = set()
+    for system, batch_row in zip(systems, batch["results"]):
+        scalar = client.post("/v1/a2/underwrite", json=_scalar_payload(system))
+        assert scalar.status_code == 200, scalar.text
+        scalar_row = scalar.json()
+        assert batch_row.pop("calibration_event_id")
+        scalar_row.pop("calibration_event_id")
+        assert batch_row == scalar_row
+        decisions.add(batch_row["decision"])
+
+    assert decisions == {"AUTO_LAUNCH", "HUMAN_REVIEW", "NO_LAUNCH"}
+
+
+def test_batch_defaults_match_scalar_defaults():
+    system = _random_systems(1, seed=11)[0]
+    scalar_payload = _scalar_payload(system)
+    del scalar_payload["data_support"]
+    del scalar_payload["measurement_quality"]
+    batch_payload = {
+        "brand_id": "lumiere",
+        "stage_profiles": [system["profiles"]],
+        "stage_fits": [system["fits"]],
+        "stage_confidences": [system["confidences"]],
+        "stage_gates_passed": [system["gates"]],
+    }
+    batch_row = client.post("/v1/a2/underwrite/batch", json=batch_payload).json()["results"][0]
+    scalar_row = client.post("/v1/a2/underwrite", json=scalar_payload).json()
+    batch_row.pop("calibration_event_id")
+    scalar_row.pop("calibration_event_id")
+    assert batch_row == scalar_row
+
+
+def test_batch_rejects_malformed_shapes():
+    payload = {
+        "brand_id": "lumiere",
+        "stage_profiles": [[[0.5] * 9, [0.5] * 9]],
+        "stage_fits": [[0.9, 0.9, 0.9]],
+        "stage_confidences": [[0.9, 0.9, 0.9]],
+        "stage_gates_passed": [[True, True, True]],
+    }
+    response = client.post("/v1/a2/underwrite/batch", json=payload)
+    assert response.status_code == 422
+
+
+def test_batch_rejects_out_of_range_profile():
+    payload = {
+        "brand_id": "lumiere",
+        "stage_profiles": [[[0.5] * 9, [0.5] * 9, [1.5] + [0.5] * 8]],
+        "stage_fits": [[0.9, 0.9, 0.9]],
+        "stage_confidences": [[0.9, 0.9, 0.9]],
+        "stage_gates_passed": [[True, True, True]],
+    }
+    response = client.post("/v1/a2/underwrite/batch", json=payload)
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("values", [
+    [0.00005, 0.00015, 0.12345, 0.67885, 1.00005, 0.7249999999, 0.0],
+    list(np.random.default_rng(3).random(5000)),
+])
+def test_round_array_matches_builtin_round(values):
+    assert round_array(values).tolist() == [round(v, 4) for v in values]
@@ -0,0 +1,198 @@
+"""Write-behind calibration persistence (no database required: fake asyncpg pool)."""
+
+import asyncio
+from datetime import timedelta
+
+import numpy as np
+
+from app.a2_system_underwriting.calibration_store import (
+    CalibrationEventWriter,
+    INSERT_COLUMNS,
+    asyncpg_dsn,
+)
+from app.a2_system_underwriting.calibration_tracker import CalibrationTracker
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def copy_records_to_table(self, table, records, columns):
+        if self.pool.fail:
+            raise ConnectionError("database down")
+        assert columns == INSERT_COLUMNS
+        self.pool.copies.append(list(records))
+
+    async def execute(self, sql, *args):
+        if self.pool.fail:
+            raise ConnectionError("database down")
+        self.pool.updates.append(args)
+
+    async def fetch(self, sql, limit):
+        # PROFILES_SQL over what was copied and backfilled so far
+        outcomes = {event_id for event_ids, percentiles, _, _ in self.pool.updates
+                    for event_id, p in zip(event_ids, percentiles) if p is not None}
+        rows = [dict(zip(INSERT_COLUMNS, record)) for batch in self.pool.copies for record in batch]
+        rows = [r for r in rows if r['event_id'] in outcomes and r['stage_profile'] is not None]
+        return sorted(rows, key=lambda r: r['timestamp'], reverse=True)[:limit]
+
+
+class FakePool:
+    def __init__(self):
+        self.copies = []
+        self.updates = []
+        self.fail = False
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return FakeConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def test_asyncpg_dsn_normalization():
+    assert asyncpg_dsn("sqlite:///./stardance_v2.db") is None
+    assert asyncpg_dsn("postgresql+asyncpg://u:p@db/x") == "postgresql://u:p@db/x"
+    assert asyncpg_dsn("postgres://u:p@db/x") == "postgresql://u:p@db/x"
+
+
+def test_flush_on_size_threshold_and_shutdown():
+    async def scenario():
+        pool = FakePool()
+        writer = CalibrationEventWriter(pool=pool, flush_size=10, flush_interval=60.0)
+        tracker = CalibrationTracker(sink=writer)
+        await writer.start()
+
+        for _ in range(10):
+            tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.8)
+        await asyncio.sleep(0.01)
+        assert sum(len(batch) for batch in pool.copies) == 10
+
+        event = tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.9)
+        tracker.update_performance(event.event_id, 0.1)
+        await writer.stop()
+        return pool, event
+
+    pool, event = asyncio.run(scenario())
+    assert sum(len(batch) for batch in pool.copies) == 11
+    event_ids, percentiles, trigger_ids, _ = pool.updates[-1]
+    assert event_ids == [event.event_id]
+    assert percentiles == [0.1]
+    assert trigger_ids == [None]  # one false positive is below count_window
+
+
+def test_failed_flush_requeues_and_buffer_stays_bounded():
+    async def scenario():
+        pool = FakePool()
+        pool.fail = True
+        writer = CalibrationEventWriter(pool=pool, flush_size=1000, buffer_limit=5)
+        tracker = CalibrationTracker(sink=writer)
+        for _ in range(8):
+            tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.8)
+        assert writer.pending() == 5
+        assert writer.stats['dropped'] == 3
+
+        await writer.flush()
+        assert writer.pending() == 5
+        assert writer.stats['flush_failures'] == 1
+
+        pool.fail = False
+        await writer.flush()
+        return pool, writer
+
+    pool, writer = asyncio.run(scenario())
+    assert writer.pending() == 0
+    assert sum(len(batch) for batch in pool.copies) == 5
+
+
+def test_tracker_memory_window_is_bounded():
+    tracker = CalibrationTracker(max_events=3)
+    events = [tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.5) for _ in range(5)]
+    assert len(tracker.events) == 3
+    assert tracker.get_event(events[0].event_id) is None
+    assert tracker.get_event(events[-1].event_id) is events[-1]
+
+
+def test_shutdown_during_flush_keeps_the_drained_batch(monkeypatch):
+    copy = FakeConnection.copy_records_to_table
+
+    async def scenario():
+        pool = FakePool()
+        copying = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_copy(self, table, records, columns):
+            copying.set()
+            await release.wait()
+            await copy(self, table, records, columns)
+
+        monkeypatch.setattr(FakeConnection, "copy_records_to_table", slow_copy)
+        writer = CalibrationEventWriter(pool=pool, flush_size=5, flush_interval=60.0)
+        tracker = CalibrationTracker(sink=writer)
+        await writer.start()
+        for _ in range(5):
+            tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.8)
+        # Shutdown arrives while the loop's flush is mid-write
+        await copying.wait()
+        stopping = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0.01)
+        release.set()
+        await stopping
+        return pool, writer
+
+    pool, writer = asyncio.run(scenario())
+    assert sum(len(batch) for batch in pool.copies) == 5
+    assert writer.pending() == 0
+
+
+def test_cancelled_flush_requeues(monkeypatch):
+    async def hang(self, table, records, columns):
+        await asyncio.sleep(60)
+
+    async def scenario():
+        monkeypatch.setattr(FakeConnection, "copy_records_to_table", hang)
+        writer = CalibrationEventWriter(pool=FakePool())
+        tracker = CalibrationTracker(sink=writer)
+        for _ in range(3):
+            tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.8)
+        flush = asyncio.create_task(writer.flush())
+        await asyncio.sleep(0.01)
+        flush.cancel()
+        try:
+            await flush
+        except asyncio.CancelledError:
+            pass
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert writer.pending() == 3
+    assert writer.stats['flush_failures'] == 0
+
+
+def test_stage_profiles_round_trip_for_events_with_outcomes():
+    async def scenario():
+        pool = FakePool()
+        writer = CalibrationEventWriter(pool=pool)
+        tracker = CalibrationTracker(sink=writer)
+        profiles = np.arange(4 * 27, dtype=np.float64).reshape(4, 3, 9) / 100
+        events = tracker.track_evaluations("BEAUTY_SKINCARE", "image_video_landing_page", [0.8] * 4, profiles)
+        no_profile = tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.8)
+        for i, event in enumerate(events):
+            event.timestamp += timedelta(milliseconds=i)  # distinct even within one clock tick
+        # Outcomes for all but the second event
+        tracker.update_performance_many([(e.event_id, 0.5) for e in events if e is not events[1]])
+        tracker.update_performance(no_profile.event_id, 0.5)
+        await writer.flush()
+        return profiles, await writer.load_stage_profiles(2), await writer.load_stage_profiles(10)
+
+    profiles, newest, everything = asyncio.run(scenario())
+    assert isinstance(newest, np.ndarray) and newest.shape == (2, 27)
+    # Oldest first; the limit keeps the newest outcomes
+    np.testing.assert_array_equal(newest, profiles[[2, 3]].reshape(2, 27))
+    np.testing.assert_array_equal(everything, profiles[[0, 2, 3]].reshape(3, 27))
@@ -0,0 +1,98 @@
+"""Calibration tracker indexing and bulk performance backfill."""
+
+import random
+from dataclasses import replace
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting.calibration_tracker import CalibrationTracker
+
+client = TestClient(app)
+
+
+def test_update_performance_many_matches_single_updates():
+    rng = random.Random(3)
+    bulk, single = CalibrationTracker(), CalibrationTracker()
+    updates = []
+    for _ in range(500):
+        event = bulk.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", rng.random())
+        updates.append((event.event_id, rng.random()))
+    single.events = [replace(e) for e in bulk.events]
+    single._events_by_id = {e.event_id: e for e in single.events}
+
+    results = bulk.update_performance_many(updates)
+    for (event_id, percentile), event in zip(updates, results):
+        expected = single.update_performance(event_id, percentile)
+        assert event.to_dict() == expected.to_dict()
+
+    assert {e.trigger_id for e in results} == {None, 'FALSE_POSITIVE_CLUSTER', 'FALSE_NEGATIVE_CLUSTER'}
+
+
+def test_update_performance_many_reports_unknown_ids():
+    tracker = CalibrationTracker()
+    event = tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.8)
+    results = tracker.update_performance_many([(uuid4(), 0.5), (event.event_id, 0.2)])
+    assert results[0] is None
+    assert results[1] is event
+    assert event.actual_performance_percentile == 0.2
+    assert tracker.update_performance(uuid4(), 0.5) is None
+
+
+def test_cluster_triggers_fire_on_windowed_counts():
+    tracker = CalibrationTracker()
+    fp = [tracker.track_evaluation("BEAUTY_SKINCARE", "image_video_landing_page", 0.9) for _ in range(7)]
+    other_key = tracker.track_evaluation("BEAUTY_SKINCARE", "image_landing_page", 0.9)
+
+    for event in fp[:2]:
+        tracker.update_performance(event.event_id, 0.1)
+    assert [e.trigger_id for e in fp[:2]] == [None, None]
+
+    # A false positive under another key does not count toward this window
+    tracker.update_performance(other_key.event_id, 0.1)
+    assert other_key.trigger_id is None
+
+    tracker.update_performance(fp[2].event_id, 0.1)
+    assert fp[2].trigger_id == 'FALSE_POSITIVE_CLUSTER'
+    assert fp[2].adjustment_delta == -0.05
+
+    tracker.update_performance_many([(e.event_id, 0.1) for e in fp[3:]])
+    assert fp[-1].adjustment_delta == -0.10  # capped at max_delta
+    assert tracker.window_counts("BEAUTY_SKINCARE", "image_video_landing_page") == {
+        'FALSE_POSITIVE_CLUSTER': 7, 'FALSE_NEGATIVE_CLUSTER': 0
+    }
+
+
+def test_outcome_window_evicts_old_outcomes():
+    tracker = CalibrationTracker()
+    window = tracker.OUTCOME_WINDOW
+    fp = [tracker.track_evaluation("S", "seq", 0.9) for _ in range(2)]
+    neutral = [tracker.track_evaluation("S", "seq", 0.6) for _ in range(window)]
+    late = tracker.track_evaluation("S", "seq", 0.9)
+
+    tracker.update_performance_many([(e.event_id, 0.1) for e in fp])
+    tracker.update_performance_many([(e.event_id, 0.5) for e in neutral])
+    tracker.update_performance(late.event_id, 0.1)
+
+    # The two earlier false positives have slid out of the window
+    assert late.trigger_id is None
+    assert tracker.window_counts("S", "seq")['FALSE_POSITIVE_CLUSTER'] == 1
+
+
+def test_performance_backfill_endpoint():
+    from app.a2_system_underwriting.a2_underwriting_router import calibration_tracker
+    high = [calibration_tracker.track_evaluation("TEST_BACKFILL", "image_video_landing_page", 0.9) for _ in range(3)]
+    low = [calibration_tracker.track_evaluation("TEST_BACKFILL", "image_video_landing_page", 0.4) for _ in range(3)]
+    missing = str(uuid4())
+    updates = [{"event_id": str(e.event_id), "actual_performance_percentile": 0.1} for e in high]
+    updates += [{"event_id": str(e.event_id), "actual_performance_percentile": 0.9} for e in low]
+    updates.append({"event_id": missing, "actual_performance_percentile": 0.5})
+
+    response = client.post("/v1/a2/calibration/performance", json={"updates": updates})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["updated"] == 6
+    assert data["not_found"] == [missing]
+    assert data["trigger_counts"] == {"FALSE_POSITIVE_CLUSTER": 1, "FALSE_NEGATIVE_CLUSTER": 1}
+    assert high[0].actual_performance_percentile == 0.1
@@ -0,0 +1,139 @@
+"""Server-side data_support: k-NN index queries, incremental rebuilds and the underwriting wiring."""
+
+import asyncio
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting import a2_underwriting_router as a2
+from app.a2_system_underwriting.data_support_index import DataSupportIndex
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS, PLA_STAGES
+
+client = TestClient(app)
+
+
+def _expected(points, queries, k, radius, similarity_distance):
+    distances = np.sqrt(((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+    nearest = np.sort(distances, axis=1)[:, :k]
+    similarity = np.clip(1.0 - nearest.mean(axis=1) / similarity_distance, 0.0, 1.0)
+    return np.round(np.column_stack([similarity, (nearest <= radius).sum(axis=1) / k]), 4)
+
+
+def test_queries_match_exhaustive_search_across_rebuilds():
+    rng = np.random.default_rng(7)
+    points = rng.uniform(0.3, 0.9, (230, 27))
+    queries = rng.uniform(0.3, 0.9, (15, 27))
+    index = DataSupportIndex(k=8, radius=0.8, min_points=50, rebuild_every=64)
+
+    index.add(points[:40])
+    assert index.query_many(queries) is None
+    index.add(points[40:])
+    # 230 points: three rebuilds of 64, 38 still in the fresh buffer
+    assert index.rebuilds == 3 and index.stats()['points'] == 230
+    support = index.query_many(queries.reshape(-1, 3, 9))
+    np.testing.assert_array_equal(support, _expected(points, queries, 8, 0.8, 1.0))
+    assert index.query(queries[0].reshape(3, 9)) == tuple(support[0].tolist())
+
+    # max_points keeps the newest outcomes
+    capped = DataSupportIndex(k=8, radius=0.8, min_points=1, rebuild_every=64, max_points=100)
+    capped.add(points)
+    assert capped.size == 100 + 230 % 64
+    kept = np.concatenate([points[:192][-100:], points[192:]])
+    np.testing.assert_array_equal(capped.query_many(queries), _expected(kept, queries, 8, 0.8, 1.0))
+
+    with pytest.raises(ValueError):
+        index.query_many(np.zeros((2, 4)))
+
+
+def test_only_backfilled_events_are_indexed():
+    index = DataSupportIndex(min_points=1, max_pending=2)
+    ids = [uuid4() for _ in range(3)]
+    index.track_many(ids, np.full((3, 3, 9), 0.5))
+    # Oldest pending event dropped; unknown and repeated ids are ignored
+    assert index.add_outcomes([ids[0], uuid4()]) == 0
+    assert index.add_outcomes([ids[1], ids[2], ids[1]]) == 2
+    assert index.size == 2 and index.stats()['dropped_pending'] == 1
+
+
+class StoredProfiles:
+    """Stands in for CalibrationEventWriter.load_stage_profiles."""
+
+    def __init__(self, profiles=None):
+        self.profiles = profiles
+        self.limits = []
+
+    async def load_stage_profiles(self, limit):
+        self.limits.append(limit)
+        if self.profiles is None:
+            raise ConnectionError("database down")
+        return self.profiles[-limit:]
+
+
+def test_startup_seeds_the_index_from_stored_profiles(monkeypatch):
+    points = np.random.default_rng(3).uniform(0.3, 0.9, (12, 27))
+    index = DataSupportIndex(k=4, min_points=10, rebuild_every=8, max_points=10)
+    monkeypatch.setattr(a2, "data_support_index", index)
+
+    asyncio.run(a2.seed_data_support_index(StoredProfiles()))
+    assert index.size == 0
+
+    store = StoredProfiles(points)
+    asyncio.run(a2.seed_data_support_index(store))
+    assert store.limits == [10] and index.size == 10
+    np.testing.assert_array_equal(index.query_many(points), _expected(points[2:], points, 4, index.radius, 1.0))
+
+
+def _request(i, **extra):
+    rng = np.random.default_rng(i)
+    profiles = rng.uniform(0.55, 0.85, (len(PLA_STAGES), len(NINE_PD_DIMENSIONS))).round(4)
+    return dict({
+        "brand_id": f"brand_{i}",
+        "stage_profiles": {
+            stage: dict(zip(NINE_PD_DIMENSIONS, row)) for stage, row in zip(PLA_STAGES, profiles.tolist())
+        },
+        "stage_fits": {"image": 0.8, "video": 0.78, "landing_page": 0.84},
+        "stage_confidences": {"image": 0.8, "video": 0.8, "landing_page": 0.8},
+        "stage_gates_passed": {"image": True, "video": True, "landing_page": True},
+    }, **extra)
+
+
+def test_underwriting_uses_server_data_support_once_warm(monkeypatch):
+    index = DataSupportIndex(k=4, min_points=6, rebuild_every=4)
+    monkeypatch.setattr(a2, "data_support_index", index)
+    default_support = round(0.6 * 0.80 + 0.4 * 0.70, 4)
+
+    event_ids = []
+    for i in range(8):
+        body = client.post("/v1/a2/underwrite", json=_request(i)).json()
+        assert body["confidence_breakdown"]["data_support"] == default_support
+        event_ids.append(body["calibration_event_id"])
+    updates = [{"event_id": e, "actual_performance_percentile": 0.5} for e in event_ids]
+    assert client.post("/v1/a2/calibration/performance", json={"updates": updates}).json()["updated"] == 8
+    assert index.size == 8
+
+    request = _request(100)
+    profiles = np.array([list(request["stage_profiles"][s].values()) for s in PLA_STAGES])
+    similarity, sample_count = index.query(profiles)
+    body = client.post("/v1/a2/underwrite", json=request).json()
+    assert body["confidence_breakdown"]["data_support"] == round(0.6 * similarity + 0.4 * sample_count, 4)
+    assert body["confidence_breakdown"]["data_support"] != default_support
+
+    # Client-sent data_support always wins
+    explicit = _request(100, data_support={"similarity": 0.8, "sample_count": 0.7})
+    assert client.post("/v1/a2/underwrite", json=explicit).json()["confidence_breakdown"]["data_support"] == default_support
+
+    # Batch rows get the same server-side values
+    batch = client.post("/v1/a2/underwrite/batch", json={
+        "brand_id": "brand_batch",
+        "stage_profiles": [profiles.tolist()],
+        "stage_fits": [[0.8, 0.78, 0.84]],
+        "stage_confidences": [[0.8, 0.8, 0.8]],
+        "stage_gates_passed": [[True, True, True]],
+    }).json()
+    row = batch["results"][0]
+    assert row["confidence_breakdown"]["data_support"] == body["confidence_breakdown"]["data_support"]
+    assert row["system_confidence"] == body["system_confidence"]
+    assert client.get("/v1/a2/health").json()["data_support_index"]["pending_outcomes"] == 3
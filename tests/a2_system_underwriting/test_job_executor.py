@@ -0,0 +1,89 @@
+"""Chunked batch evaluation on the job executor must equal one in-process engine call."""
+
+import asyncio
+import pickle
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting import a2_underwriting_router as a2
+from app.a2_system_underwriting.batch_jobs import evaluate_batch
+from app.a2_system_underwriting.sector_registry import compile_sector
+from app.services.job_executor import JobExecutor
+
+client = TestClient(app)
+
+STRICT = {"thresholds": {"auto_launch": {"min_system_fit": 0.7}}, "penalty_cap": 0.2}
+
+
+def _columns(rng, n):
+    return {
+        "stage_profiles": rng.uniform(0.2, 1.0, size=(n, 3, 9)),
+        "stage_fits": rng.uniform(0.4, 1.0, size=(n, 3)),
+        "stage_confidences": rng.uniform(0.4, 1.0, size=(n, 3)),
+        "stage_gates_passed": rng.random((n, 3)) < 0.95,
+        "data_support": rng.uniform(0.0, 1.0, size=(n, 2)),
+        "measurement_quality": rng.uniform(0.5, 1.0, size=n),
+    }
+
+
+def _assert_same(result, expected):
+    for key in ("decision_codes", "system_fit", "system_fit_raw", "system_confidence",
+                "transition_penalty_sum", "triggered_penalties"):
+        np.testing.assert_array_equal(result[key], expected[key])
+    for key, column in expected["confidence_components"].items():
+        np.testing.assert_array_equal(result["confidence_components"][key], column)
+    assert result["count"] == expected["count"]
+
+
+@pytest.mark.parametrize("mode", ["thread", "process", "inline"])
+def test_chunked_evaluation_matches_single_call(mode):
+    snapshot = compile_sector("FRAGRANCE", STRICT, version="t1:FRAGRANCE")
+    columns = _columns(np.random.default_rng(5), 2500)
+    expected = snapshot.batch_engine.evaluate(**columns)
+    executor = JobExecutor(mode=mode, max_workers=2, chunk_rows=700)
+    try:
+        result = asyncio.run(evaluate_batch(executor, snapshot, **columns))
+    finally:
+        executor.shutdown()
+    _assert_same(result, expected)
+    assert executor.submitted == (0 if mode == "inline" else 4)
+
+
+def test_snapshot_pickles_as_its_source():
+    snapshot = compile_sector("FRAGRANCE", STRICT, version="t1:FRAGRANCE")
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert restored.version == "t1:FRAGRANCE"
+    assert restored.aggregator.PENALTY_CAP == 0.2
+    assert restored.decision_engine.THRESHOLDS["auto_launch"]["min_system_fit"] == 0.7
+
+
+def test_small_batches_run_inline_and_row_counts_are_checked():
+    snapshot = compile_sector("*")
+    columns = _columns(np.random.default_rng(1), 10)
+    executor = JobExecutor(mode="thread", max_workers=2, chunk_rows=3, inline_rows=100)
+    _assert_same(asyncio.run(evaluate_batch(executor, snapshot, **columns)), snapshot.batch_engine.evaluate(**columns))
+    assert executor.submitted == 0
+    with pytest.raises(ValueError, match="stage_fits has 9 rows"):
+        asyncio.run(evaluate_batch(executor, snapshot, **dict(columns, stage_fits=columns["stage_fits"][:9])))
+
+
+def test_batch_endpoint_merges_chunks_and_tracks_calibration_in_parent(monkeypatch):
+    columns = _columns(np.random.default_rng(9), 25)
+    payload = {"brand_id": "lumiere", **{k: v.tolist() for k, v in columns.items()}}
+    whole = client.post("/v1/a2/underwrite/batch?verbosity=full", json=payload).json()
+
+    monkeypatch.setattr(a2.job_executor, "chunk_rows", 4)
+    monkeypatch.setattr(a2.job_executor, "inline_rows", 0)
+    tracked = len(a2.calibration_tracker.events)
+    chunked = client.post("/v1/a2/underwrite/batch?verbosity=full", json=payload).json()
+    assert len(a2.calibration_tracker.events) == tracked + 25
+
+    event_ids = [r.pop("calibration_event_id") for r in chunked["results"]]
+    assert len(set(event_ids)) == 25
+    assert chunked["results"] == [{k: v for k, v in r.items() if k != "calibration_event_id"} for r in whole["results"]]
+
+    mismatched = dict(payload, stage_fits=payload["stage_fits"][:-1])
+    assert client.post("/v1/a2/underwrite/batch", json=mismatched).status_code == 422
@@ -0,0 +1,50 @@
+"""NinePDVector: array-backed 9PD profile accepted wherever the dict form is."""
+
+import numpy as np
+import pytest
+
+from app.a2_system_underwriting import NinePDVector, SystemConfidenceCalculator, TransitionPenaltyChecker
+from app.a2_system_underwriting.a2_underwriting_router import NinePDProfile
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS
+from app.a2_system_underwriting.verbosity import Verbosity
+
+
+def test_rows_are_views_and_mapping_interface():
+    matrix = np.linspace(0.1, 0.9, 27).reshape(3, 9)
+    image, video, landing_page = NinePDVector.rows(matrix)
+    assert np.shares_memory(image.array, matrix)
+    assert np.asarray(video) is video.array
+    matrix[1, 1] = 0.42
+    assert video["trust"] == 0.42
+    assert list(landing_page.keys()) == list(NINE_PD_DIMENSIONS)
+    assert landing_page.get("unknown", 0.5) == 0.5
+    assert dict(**image) == image.to_dict()
+    with pytest.raises(ValueError):
+        NinePDVector([0.5] * 8)
+
+
+def test_pydantic_round_trip():
+    values = dict(zip(NINE_PD_DIMENSIONS, [0.5, 0.6, 0.7, 0.8, 0.9, 0.4, 0.3, 0.2, 0.1]))
+    model = NinePDProfile(**values)
+    vector = model.to_vector()
+    assert vector == values
+    assert NinePDProfile(**vector) == model
+    assert NinePDVector.from_mapping(vector) is vector
+
+
+def test_consumers_accept_vectors_and_dicts_identically():
+    rng = np.random.default_rng(0)
+    checker = TransitionPenaltyChecker()
+    calculator = SystemConfidenceCalculator()
+    for _ in range(50):
+        vectors = NinePDVector.rows(rng.uniform(0.3, 1.0, (3, 9)))
+        dicts = [v.to_dict() for v in vectors]
+        assert checker.check_penalties(*vectors, verbosity=Verbosity.MINIMAL) == checker.check_penalties(*dicts, verbosity=Verbosity.MINIMAL)
+
+        mean_vector = NinePDVector((vectors[0].array + vectors[1].array + vectors[2].array) / 3)
+        mean_dict = {k: (dicts[0][k] + dicts[1][k] + dicts[2][k]) / 3 for k in dicts[0]}
+        kwargs = dict(stage_confidences={"image": 0.8, "video": 0.7, "landing_page": 0.9},
+                      data_support={"similarity": 0.8, "sample_count": 0.7},
+                      transition_penalty_sum=0.04)
+        assert calculator.calculate(psychological_profile=mean_vector, **kwargs) == \
+            calculator.calculate(psychological_profile=mean_dict, **kwargs)
@@ -0,0 +1,54 @@
+"""Fused /v1/pipeline/underwrite: same result as three asset scores plus one underwrite."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+ASSETS = {
+    "image": {"asset_id": "img_1", "asset_type": "image", "color_temperature": "cool",
+              "text_density": 0.2, "visual_complexity": 0.3, "saturation": 0.6},
+    "video": {"asset_id": "vid_1", "asset_type": "video", "face_present": True,
+              "background_style": "lifestyle", "pacing": 0.8, "scene_count": 10},
+    "landing_page": {"asset_id": "lp_1", "asset_type": "image", "cta_present": True,
+                     "text_density": 0.4, "saturation": 0.9},
+}
+
+
+def _payload(i):
+    return {
+        "brand_id": f"brand_{i}",
+        "stage_fits": {"image": 0.8, "video": 0.75 - i / 100, "landing_page": 0.85},
+        "stage_confidences": {"image": 0.85, "video": 0.8, "landing_page": 0.85},
+        "stage_gates_passed": {"image": True, "video": True, "landing_page": i % 2 == 0},
+    }
+
+
+def _four_calls(payload, verbosity, trace=False):
+    scores = {
+        stage: client.post(f"/v1/asset/score?trace={str(trace).lower()}", json=asset).json()
+        for stage, asset in ASSETS.items()
+    }
+    request = dict(payload, stage_profiles={stage: s["nine_pd_profile"] for stage, s in scores.items()})
+    return scores, client.post(f"/v1/a2/underwrite?verbosity={verbosity}", json=request).json()
+
+
+def test_fused_matches_separate_calls():
+    for i, verbosity in enumerate(["minimal", "standard", "full"]):
+        payload = _payload(i)
+        scores, expected = _four_calls(payload, verbosity, trace=i == 2)
+        response = client.post(f"/v1/pipeline/underwrite?verbosity={verbosity}&trace={str(i == 2).lower()}",
+                               json=dict(payload, stage_assets=ASSETS))
+        assert response.status_code == 200
+        fused = response.json()
+        assert fused.pop("stage_scores") == scores
+        assert fused.pop("calibration_event_id") and expected.pop("calibration_event_id")
+        assert fused == expected
+
+
+def test_fused_rejects_bad_input():
+    payload = dict(_payload(0), stage_assets=dict(ASSETS, video=dict(ASSETS["video"], pacing=2.0)))
+    assert client.post("/v1/pipeline/underwrite", json=payload).status_code == 422
+    payload = dict(_payload(0), stage_assets=ASSETS)
+    assert client.post("/v1/pipeline/underwrite?rulebook_version=nope", json=payload).status_code == 422
@@ -0,0 +1,119 @@
+"""Capture of /v1/a2/underwrite bodies and replay through the pipeline."""
+
+import asyncio
+import copy
+import os
+
+import httpx
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting import a2_underwriting_router as a2
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS
+from app.a2_system_underwriting import request_capture
+from app.a2_system_underwriting.request_capture import UnderwritingCapture, capture_payloads, load_capture
+from app.a2_system_underwriting.request_replay import replay_batch, replay_http, replay_inprocess
+
+client = TestClient(app)
+
+
+def _payloads(n, seed=0):
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for i in range(n):
+        payload = {
+            "brand_id": f"brand_{i}",
+            "stage_profiles": {
+                stage: dict(zip(NINE_PD_DIMENSIONS, rng.uniform(0.4, 1.0, 9).tolist()))
+                for stage in ("image", "video", "landing_page")
+            },
+            "stage_fits": {"image": rng.uniform(0.6, 1.0), "video": rng.uniform(0.6, 1.0), "landing_page": rng.uniform(0.6, 1.0)},
+            "stage_confidences": {"image": 0.8, "video": 0.75, "landing_page": 0.7},
+            "stage_gates_passed": {"image": True, "video": bool(i % 5), "landing_page": True},
+            "measurement_quality": 0.9,
+        }
+        if i % 2:
+            payload["data_support"] = {"similarity": 0.6, "sample_count": 0.4}
+        payloads.append(payload)
+    # Router defaults for missing stage keys must survive the round trip
+    del payloads[0]["stage_confidences"]["video"]
+    return payloads
+
+
+def _capture(tmp_path, payloads, segment_rows=4):
+    capture = UnderwritingCapture(str(tmp_path), segment_rows=segment_rows)
+    for payload in payloads:
+        capture.record(a2.A2UnderwritingRequest(**payload).model_dump())
+    capture.close()
+    return load_capture(str(tmp_path))
+
+
+def test_capture_round_trip_reproduces_results(tmp_path):
+    payloads = _payloads(10)
+    columns = _capture(tmp_path, payloads)
+    assert len(list(tmp_path.glob("*.npz"))) == 3
+    assert columns["stage_profiles"].shape == (10, 3, 9)
+    assert columns["stage_gates_passed"].dtype == bool
+
+    for original, replayed in zip(payloads, capture_payloads(columns)):
+        assert replayed["brand_id"] == original["brand_id"]
+        assert ("data_support" in replayed) == ("data_support" in original)
+        expected = a2.evaluate_system(a2.A2UnderwritingRequest(**original))
+        assert a2.evaluate_system(a2.A2UnderwritingRequest(**replayed)) == expected
+
+
+def test_workers_sharing_a_directory_keep_their_segments(tmp_path):
+    payloads = _payloads(6)
+    captures = [UnderwritingCapture(str(tmp_path), segment_rows=4) for _ in range(2)]
+    for capture in captures:
+        for payload in payloads:
+            capture.record(a2.A2UnderwritingRequest(**payload).model_dump())
+        capture.close()
+    assert len(os.listdir(tmp_path)) == 4
+    assert len(load_capture(str(tmp_path))["brand_id"]) == 12
+
+
+def test_failed_segment_write_is_logged_and_cleaned_up(tmp_path, monkeypatch, caplog):
+    def broken(f, **data):
+        f.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(request_capture.np, "savez_compressed", broken)
+    capture = UnderwritingCapture(str(tmp_path), segment_rows=4)
+    for payload in _payloads(4):
+        capture.record(a2.A2UnderwritingRequest(**payload).model_dump())
+    capture.close()
+    assert capture.write_failures == 1
+    assert os.listdir(tmp_path) == []
+    assert "4 requests lost: disk full" in caplog.text
+
+
+def test_replay_reports_throughput_and_percentiles(tmp_path):
+    columns = _capture(tmp_path, _payloads(20))
+    report = replay_inprocess(columns, rate=2000.0)
+    assert report["requests"] == 20 and report["errors"] == 0
+    assert report["throughput_rps"] > 0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p95"] <= report["latency_ms"]["p99"]
+
+    batch = replay_batch(columns, batch_size=8, limit=15)
+    assert batch["requests"] == 15 and batch["batch_size"] == 8
+
+    async def over_http():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await replay_http(columns, rate=500.0, concurrency=4, limit=6, client=http)
+
+    report = asyncio.run(over_http())
+    assert report["requests"] == 6 and report["errors"] == 0
+
+
+def test_underwrite_endpoint_captures_when_enabled(tmp_path, monkeypatch):
+    capture = UnderwritingCapture(str(tmp_path), segment_rows=100)
+    monkeypatch.setattr(a2, "request_capture", capture)
+    payload = copy.deepcopy(_payloads(1)[0])
+    assert client.post("/v1/a2/underwrite", json=payload).status_code == 200
+    capture.close()
+    columns = load_capture(str(tmp_path))
+    assert columns["brand_id"].tolist() == ["brand_0"]
+    assert columns["stage_confidences"][0, 1] == 0.5
@@ -0,0 +1,135 @@
+"""Per-sector parameter snapshots with atomic hot reload."""
+
+import asyncio
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting import a2_underwriting_router as a2
+from app.a2_system_underwriting.sector_registry import SectorRegistry
+from app.a2_system_underwriting.system_decision_engine import SystemDecisionEngine
+
+client = TestClient(app)
+
+RULE = {"id": "IMG_VID_TASTE_DROP", "transition": "image_to_video", "dimension": "taste",
+        "comparison": "lt", "threshold": -0.05, "penalty": 0.2, "rationale": "Taste collapse"}
+
+STRICT = {"version": "v2", "sectors": {"FRAGRANCE": {"thresholds": {"auto_launch": {"min_system_fit": 0.9}}}}}
+
+
+@pytest.fixture
+def payload(underwrite_payload):
+    return underwrite_payload(stage_fits={"image": 0.86, "video": 0.84, "landing_page": 0.82},
+                              stage_confidences={"image": 0.85, "video": 0.85, "landing_page": 0.85})
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = SectorRegistry()
+    monkeypatch.setattr(a2, "sector_registry", fresh)
+    a2.underwriting_cache.clear()
+    return fresh
+
+
+def test_unconfigured_sectors_use_class_defaults(registry):
+    snapshot = registry.get("ANYTHING")
+    assert snapshot.version == "builtin"
+    assert dict(snapshot.decision_engine.THRESHOLDS["auto_launch"]) == SystemDecisionEngine.THRESHOLDS["auto_launch"]
+    with pytest.raises(TypeError):
+        snapshot.decision_engine.THRESHOLDS["auto_launch"]["min_system_fit"] = 0.1
+
+
+def test_sector_override_changes_only_that_sector(registry, payload):
+    baseline = client.post("/v1/a2/underwrite?verbosity=full", json=payload).json()
+    assert baseline["decision"] == "AUTO_LAUNCH"
+
+    held = registry.get("FRAGRANCE")
+    registry.load(STRICT)
+    strict = client.post("/v1/a2/underwrite?verbosity=full", json=dict(payload, sector="FRAGRANCE")).json()
+    assert strict["decision"] == "HUMAN_REVIEW"
+    assert strict["reason_codes"] == ["FIT_BELOW_AUTO_LAUNCH"]
+    assert ">= 0.90" in strict["decision_rationale"][0]
+    assert client.post("/v1/a2/underwrite", json=payload).json()["decision"] == "AUTO_LAUNCH"
+    # A snapshot taken before the swap is untouched by it
+    assert held.decision_engine.THRESHOLDS["auto_launch"]["min_system_fit"] == 0.82
+    assert client.get("/v1/a2/health").json()["sector_parameters"] == {"version": "v2", "sectors": {"FRAGRANCE": "v2:FRAGRANCE"}}
+
+
+def test_invalid_configuration_is_rejected_whole(registry, payload):
+    registry.load(STRICT)
+    bad_configs = [
+        {"version": "v3", "sectors": {"FRAGRANCE": {"stage_weights": {"image": 0.5}}}},
+        {"version": "v3", "sectors": {"FRAGRANCE": {"thresholds": {"auto_launch": {"min_fit": 0.5}}}}},
+        {"version": "v3", "sectors": {"A": {}, "B": {"penalty_rules": [{"id": "X", "dimension": "vitality"}]}}},
+        {"version": "v3", "sectors": {"FRAGRANCE": {"colour": 1}}},
+        # Rules replace the list whole, so each one must carry every key the checker reads
+        {"version": "v3", "sectors": {"FRAGRANCE": {"penalty_rules": [dict(RULE, rationale=None)]}}},
+        {"version": "v3", "sectors": {"FRAGRANCE": {"penalty_rules": [{k: v for k, v in RULE.items() if k != "rationale"}]}}},
+        {"version": "v3", "sectors": {"FRAGRANCE": {"penalty_rules": [dict(RULE, penalty="0.2")]}}},
+        {"version": "v3", "sectors": {"FRAGRANCE": {"penalty_rules": ["IMG_VID_TASTE_DROP"]}}},
+    ]
+    for config in bad_configs:
+        with pytest.raises(ValueError):
+            registry.load(config)
+    assert registry.version == "v2"
+    assert registry.get("A").version == "v2:*"
+    # The kept snapshot still underwrites
+    assert client.post("/v1/a2/underwrite", json=dict(payload, sector="FRAGRANCE")).status_code == 200
+
+
+def test_custom_penalty_rules_and_file_reload(registry, tmp_path, payload, profile):
+    path = tmp_path / "sectors.json"
+    path.write_text(json.dumps({"version": "f1", "sectors": {"BEAUTY_SKINCARE": {"penalty_rules": [RULE]}}}))
+    registry.load_file(str(path))
+
+    payload["stage_profiles"]["video"] = dict(profile, taste=0.6)
+    result = client.post("/v1/a2/underwrite", json=payload).json()
+    assert result["triggered_penalties"] == ["IMG_VID_TASTE_DROP"]
+    assert result["transition_penalty_sum"] == 0.2
+
+    assert not registry.reload_file_if_changed(str(path))
+    path.write_text("{not json")
+    os.utime(path, (1, 1))
+    assert not registry.reload_file_if_changed(str(path))
+    assert registry.version == "f1"
+    path.write_text(json.dumps({"version": "f2", "sectors": {}}))
+    os.utime(path, (2, 2))
+    assert registry.reload_file_if_changed(str(path))
+    assert client.post("/v1/a2/underwrite", json=payload).json()["triggered_penalties"] == []
+
+
+def test_load_from_database_rows(registry):
+    class FakeConnection:
+        async def fetch(self, sql):
+            return [
+                {"sector_id": "FRAGRANCE", "parameters": json.dumps(STRICT["sectors"]["FRAGRANCE"]), "version": "10"},
+                {"sector_id": "*", "parameters": {"penalty_cap": 0.2}, "version": "9"},
+            ]
+
+    class FakePool:
+        def acquire(self):
+            class _Acquire:
+                async def __aenter__(self):
+                    return FakeConnection()
+
+                async def __aexit__(self, *exc):
+                    return False
+            return _Acquire()
+
+    # The newest row's version (rows come ordered by updated_at), not the lexicographic max "9"
+    assert asyncio.run(registry.load_db(FakePool())) == "10"
+    assert registry.get("FRAGRANCE").decision_engine.THRESHOLDS["auto_launch"]["min_system_fit"] == 0.9
+    assert registry.get("OTHER").aggregator.PENALTY_CAP == 0.2
+
+
+def test_reload_under_same_version_label_is_not_served_from_cache(registry, payload):
+    lenient = {"version": "7", "sectors": {"FRAGRANCE": {"thresholds": {"auto_launch": {"min_system_fit": 0.5}}}}}
+    payload = dict(payload, sector="FRAGRANCE", stage_fits={"image": 0.8, "video": 0.78, "landing_page": 0.8})
+    assert client.post("/v1/a2/underwrite", json=payload).json()["decision"] == "HUMAN_REVIEW"
+    registry.load(lenient)
+    assert client.post("/v1/a2/underwrite", json=payload).json()["decision"] == "AUTO_LAUNCH"
+    registry.load({"version": "7", "sectors": {}})
+    assert client.post("/v1/a2/underwrite", json=payload).json()["decision"] == "HUMAN_REVIEW"
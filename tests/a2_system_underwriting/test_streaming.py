@@ -0,0 +1,73 @@
+"""Streamed NDJSON endpoints: per-line results in order, bad lines reported in place."""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.ndjson import ndjson_lines
+
+client = TestClient(app)
+
+
+def _payload(make, profile, i):
+    return make(
+        brand_id=f"brand_{i}",
+        stage_profiles={"image": profile, "video": dict(profile, trust=0.5 + i / 100), "landing_page": profile},
+        stage_fits={"image": 0.8, "video": 0.8 - i / 200, "landing_page": 0.85},
+        stage_confidences={"image": 0.85, "video": 0.85, "landing_page": 0.85},
+        stage_gates_passed={"image": True, "video": True, "landing_page": i % 7 != 0},
+    )
+
+
+def _collect(chunks, max_line_bytes=64):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        return [line async for lines in ndjson_lines(source(), max_line_bytes) for line in lines]
+    return asyncio.run(run())
+
+
+def test_lines_split_across_chunk_boundaries():
+    assert _collect([b'{"a"', b':1}\r\n\n{"b":2}\n{"c"', b":3}"]) == [
+        (1, b'{"a":1}'), (3, b'{"b":2}'), (4, b'{"c":3}')
+    ]
+    long = b"x" * 100
+    assert _collect([b"1\n" + long[:50], long[50:], b"\n2\n" + long + b"\n3"]) == [
+        (1, b"1"), (2, None), (3, b"2"), (4, None), (5, b"3")
+    ]
+
+
+def test_underwrite_stream_matches_single_requests(underwrite_payload, profile):
+    payloads = [_payload(underwrite_payload, profile, i) for i in range(30)]
+    body = "\n".join(json.dumps(p) for p in payloads[:10]) + "\nnot json\n" + \
+        "\n".join(json.dumps(p) for p in payloads[10:]) + "\n"
+    response = client.post("/v1/a2/underwrite/stream?verbosity=minimal", content=body.encode())
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 31
+    assert rows[10]["line"] == 11 and "error" in rows[10]
+    del rows[10]
+    for payload, row in zip(payloads, rows):
+        single = client.post("/v1/a2/underwrite?verbosity=minimal", json=payload).json()
+        assert row.pop("calibration_event_id") != single.pop("calibration_event_id")
+        assert row == single
+
+
+def test_asset_score_stream():
+    assets = [
+        {"asset_id": "a1", "asset_type": "image", "cta_present": True},
+        {"asset_id": "a2", "asset_type": "video", "background_style": "nope"},
+        {"asset_id": "a3", "asset_type": "image", "face_present": True},
+    ]
+    body = "".join(json.dumps(a) + "\n" for a in assets)
+    response = client.post("/v1/asset/score/stream?trace=true", content=body.encode())
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r.get("asset_id") for r in rows] == ["a1", None, "a3"]
+    assert rows[1]["line"] == 2
+    assert rows[0] == client.post("/v1/asset/score?trace=true", json=assets[0]).json()
+    assert rows[2]["trace_enabled"] is True
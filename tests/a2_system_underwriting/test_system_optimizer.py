@@ -0,0 +1,125 @@
+"""Top-k PLA system search must match exhaustive evaluation of every triplet."""
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting import BatchUnderwritingEngine, SystemOptimizer
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS
+from app.a2_system_underwriting.system_optimizer import CandidatePool
+
+client = TestClient(app)
+
+
+def _pool(rng, n, gate_rate=0.9):
+    return CandidatePool(
+        profiles=rng.uniform(0.3, 1.0, size=(n, 9)),
+        fits=rng.uniform(0.4, 1.0, size=n),
+        confidences=rng.uniform(0.5, 1.0, size=n),
+        gates=rng.random(n) < gate_rate,
+    )
+
+
+def _brute_force(engine, pools, top_k, require_gates_passed=True):
+    idx = [np.flatnonzero(p.gates) if require_gates_passed else np.arange(len(p.fits)) for p in pools]
+    grid = np.array(np.meshgrid(*idx, indexing="ij")).reshape(3, -1)
+    result = engine.evaluate(
+        stage_profiles=np.stack([p.profiles[g] for p, g in zip(pools, grid)], axis=1),
+        stage_fits=np.stack([p.fits[g] for p, g in zip(pools, grid)], axis=1),
+        stage_confidences=np.stack([p.confidences[g] for p, g in zip(pools, grid)], axis=1),
+        stage_gates_passed=np.stack([p.gates[g] for p, g in zip(pools, grid)], axis=1),
+    )
+    order = np.lexsort((-result["system_confidence"], -result["system_fit"]))[:top_k]
+    return grid.T[order], result["system_fit"][order], result["system_confidence"][order]
+
+
+def test_top_k_matches_exhaustive_search():
+    engine = BatchUnderwritingEngine()
+    optimizer = SystemOptimizer(engine)
+    for seed in range(5):
+        rng = np.random.default_rng(seed)
+        pools = [_pool(rng, 12), _pool(rng, 10), _pool(rng, 14)]
+        for top_k in (1, 7, 50):
+            expected_idx, expected_fit, expected_conf = _brute_force(engine, pools, top_k)
+            found = optimizer.top_systems(*pools, top_k=top_k)
+            result = found["result"]
+            np.testing.assert_array_equal(result["system_fit"], expected_fit)
+            np.testing.assert_array_equal(result["system_confidence"], expected_conf)
+            assert found["stats"]["systems_scored"] <= found["stats"]["systems_eligible"]
+            # Exact (fit, confidence) ties may legitimately order differently
+            if len(set(zip(expected_fit.tolist(), expected_conf.tolist()))) == len(expected_fit):
+                np.testing.assert_array_equal(found["indices"], expected_idx)
+
+
+def test_top_k_without_gate_filter_and_small_pools():
+    engine = BatchUnderwritingEngine()
+    rng = np.random.default_rng(42)
+    pools = [_pool(rng, 3, 0.5), _pool(rng, 2, 0.5), _pool(rng, 4, 0.5)]
+    found = SystemOptimizer(engine).top_systems(*pools, top_k=100, require_gates_passed=False)
+    assert found["stats"]["systems_scored"] == 24
+    _, expected_fit, _ = _brute_force(engine, pools, 100, require_gates_passed=False)
+    np.testing.assert_array_equal(found["result"]["system_fit"], expected_fit)
+
+
+def test_large_pool_prunes_search():
+    rng = np.random.default_rng(7)
+    pools = [_pool(rng, 200), _pool(rng, 150), _pool(rng, 200)]
+    found = SystemOptimizer().top_systems(*pools, top_k=10)
+    assert found["result"]["count"] == 10
+    assert found["stats"]["systems_scored"] < found["stats"]["systems_eligible"] // 100
+    fits = found["result"]["system_fit"]
+    assert (np.diff(fits) <= 0).all()
+
+
+def test_optimize_endpoint():
+    rng = np.random.default_rng(3)
+
+    def candidates(prefix, n):
+        return [
+            {
+                "candidate_id": f"{prefix}_{i}",
+                "profile": dict(zip(NINE_PD_DIMENSIONS, rng.uniform(0.5, 1.0, 9).round(3).tolist())),
+                "fit": round(float(rng.uniform(0.5, 1.0)), 3),
+                "confidence": round(float(rng.uniform(0.6, 1.0)), 3),
+                "gate_passed": i != 0,
+            }
+            for i in range(n)
+        ]
+
+    payload = {"brand_id": "lumiere", "images": candidates("img", 5),
+               "videos": candidates("vid", 4), "landing_pages": candidates("lp", 6), "top_k": 3}
+    response = client.post("/v1/a2/optimize", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["systems_total"] == 120
+    assert body["systems_eligible"] == 4 * 3 * 5
+    assert len(body["systems"]) == 3
+    best = body["systems"][0]
+    assert not best["image_id"].endswith("_0")
+    assert best["decision"] in ("AUTO_LAUNCH", "HUMAN_REVIEW", "NO_LAUNCH")
+    assert body["systems"][0]["system_fit"] >= body["systems"][-1]["system_fit"]
+
+    payload["top_k"] = 0
+    assert client.post("/v1/a2/optimize", json=payload).status_code == 422
+
+
+def test_tied_fits_are_broken_by_confidence_across_batches():
+    # Equal fits everywhere: every triplet ties, only confidence decides
+    engine = BatchUnderwritingEngine()
+    rng = np.random.default_rng(11)
+    pools = []
+    for n in (20, 16, 18):
+        pool = _pool(rng, n, gate_rate=1.0)
+        pools.append(pool._replace(profiles=np.full((n, 9), 0.8), fits=np.full(n, 0.8),
+                                   confidences=np.full(n, 0.7)))
+    pools[1].confidences[13] = 0.99
+    optimizer = SystemOptimizer(engine)
+    # Batches far smaller than the tie group
+    optimizer.MAX_CANDIDATES = 500
+    for top_k in (1, 5):
+        _, expected_fit, expected_conf = _brute_force(engine, pools, top_k)
+        found = optimizer.top_systems(*pools, top_k=top_k)
+        np.testing.assert_array_equal(found["result"]["system_fit"], expected_fit)
+        np.testing.assert_array_equal(found["result"]["system_confidence"], expected_conf)
+        assert (found["indices"][:, 1] == 13).all()
+        assert found["stats"]["systems_scored"] == found["stats"]["systems_eligible"]
@@ -0,0 +1,72 @@
+"""Threshold what-if sweep: grid banding must equal per-set production banding."""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.a2_system_underwriting import SystemDecisionEngine, ThresholdSweep
+from app.a2_system_underwriting.threshold_sweep import load_corpus, main, threshold_grid
+
+
+def _corpus(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "system_fit": np.round(rng.uniform(0.5, 1.0, n), 4),
+        "system_confidence": np.round(rng.uniform(0.4, 1.0, n), 4),
+        # Values sitting exactly on thresholds exercise the strict/non-strict edges
+        "transition_penalty_sum": rng.choice([0.0, 0.04, 0.08, 0.1, 0.15, 0.18, 0.2], n),
+        "gates_passed": rng.random((n, 3)) < 0.97,
+    }
+
+
+def test_sweep_matches_per_set_banding():
+    corpus = _corpus()
+    corpus["system_fit"][:50] = 0.82
+    corpus["system_confidence"][50:100] = 0.72
+    grid = threshold_grid({
+        "auto_launch.min_system_fit": [0.80, 0.82, 0.84],
+        "auto_launch.min_system_confidence": [0.70, 0.72],
+        "auto_launch.max_transition_penalty": [0.08, 0.10],
+        "no_launch.max_transition_penalty": [0.15, 0.18],
+    })
+    result = ThresholdSweep().run(corpus, grid)
+    engine = SystemDecisionEngine()
+    assert result["counts"].shape == (len(grid), 3)
+    assert result["rows"] == len(corpus["system_fit"])
+    for thresholds, counts in zip(grid, result["counts"]):
+        codes = engine.make_decision_array(
+            corpus["system_fit"], corpus["system_confidence"],
+            corpus["transition_penalty_sum"], corpus["gates_passed"], thresholds=thresholds,
+        )
+        np.testing.assert_array_equal(np.bincount(codes, minlength=3), counts)
+
+
+def test_default_grid_matches_scalar_engine():
+    corpus = _corpus(n=300, seed=1)
+    result = ThresholdSweep().run(corpus, threshold_grid({}))
+    engine = SystemDecisionEngine()
+    expected = {"AUTO_LAUNCH": 0, "HUMAN_REVIEW": 0, "NO_LAUNCH": 0}
+    for fit, conf, penalty, gates in zip(*(corpus[k] for k in
+                                          ("system_fit", "system_confidence", "transition_penalty_sum", "gates_passed"))):
+        gate_flags = dict(zip(("image", "video", "landing_page"), gates.tolist()))
+        expected[engine.make_decision(float(fit), float(conf), float(penalty), gate_flags)["decision"]] += 1
+    assert dict(zip(result["bands"], result["counts"][0].tolist())) == expected
+
+
+def test_unknown_threshold_rejected():
+    with pytest.raises(ValueError):
+        threshold_grid({"human_review.min_system_fit": [0.7]})
+
+
+def test_cli_reads_npz_and_emits_json(tmp_path, capsys):
+    path = tmp_path / "corpus.npz"
+    np.savez(path, **_corpus(n=1000))
+    assert set(load_corpus(str(path))) == {"system_fit", "system_confidence", "transition_penalty_sum", "gates_passed"}
+
+    main([str(path), "--grid", "auto_launch.min_system_fit=0.78:0.86:0.02", "--grid",
+          "no_launch.max_system_confidence=0.45,0.5", "--json"])
+    output = json.loads(capsys.readouterr().out)
+    assert len(output["threshold_sets"]) == 5 * 2
+    assert output["threshold_sets"][-1]["auto_launch.min_system_fit"] == 0.86
+    assert all(sum(row) == 1000 for row in output["counts"])
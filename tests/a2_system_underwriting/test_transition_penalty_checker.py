@@ -0,0 +1,87 @@
+"""Compiled transition-penalty table must reproduce the original per-rule checks."""
+
+import numpy as np
+import pytest
+
+from app.a2_system_underwriting.nine_pd import NINE_PD_DIMENSIONS
+from app.a2_system_underwriting.verbosity import Verbosity
+from app.a2_system_underwriting.transition_penalty_checker import (
+    TransitionPenaltyChecker,
+    compile_penalty_rules,
+)
+
+# Original lambda rule set, kept as the reference implementation
+REFERENCE_RULES = [
+    ('IMG_VID_TRUST_DROP', 'image_to_video', 'trust', lambda v, i: v - i < -0.10, 0.10),
+    ('IMG_VID_MOMENTUM_SPIKE', 'image_to_video', 'momentum', lambda v, i: v - i > 0.20, 0.06),
+    ('VID_LP_TRUST_INSUFFICIENT_LIFT', 'video_to_landing_page', 'trust', lambda lp, v: lp - v < 0.10, 0.08),
+    ('VID_LP_AUTONOMY_DROP', 'video_to_landing_page', 'autonomy', lambda lp, v: lp - v < -0.10, 0.07),
+    ('VID_LP_MOMENTUM_NO_TAPER', 'video_to_landing_page', 'momentum', lambda lp, v: lp - v > 0.00, 0.06),
+]
+
+
+def _reference(image, video, lp):
+    total = 0.0
+    triggered = []
+    for rule_id, transition, dim, check, penalty in REFERENCE_RULES:
+        if transition == 'image_to_video':
+            from_val, to_val = image[dim], video[dim]
+        else:
+            from_val, to_val = video[dim], lp[dim]
+        if check(to_val, from_val):
+            total += penalty
+            triggered.append(rule_id)
+    return round(total, 4), triggered
+
+
+def _profiles(n, seed=5):
+    rng = np.random.default_rng(seed)
+    # Mix coarse grid values (exact threshold hits) with continuous values
+    coarse = rng.integers(0, 21, size=(n, 3, 9)) * 0.05
+    fine = rng.random((n, 3, 9))
+    return np.where(rng.random((n, 3, 9)) < 0.5, coarse, fine)
+
+
+def test_scalar_check_matches_reference():
+    checker = TransitionPenaltyChecker()
+    for triplet in _profiles(500):
+        image, video, lp = (dict(zip(NINE_PD_DIMENSIONS, stage.tolist())) for stage in triplet)
+        result = checker.check_penalties(image, video, lp)
+        expected_sum, expected_ids = _reference(image, video, lp)
+        assert result['transition_penalty_sum'] == expected_sum
+        assert result['triggered_penalty_ids'] == expected_ids
+        assert [p.id for p in result['triggered_penalties']] == expected_ids
+        assert len(result['all_checks']) == len(REFERENCE_RULES)
+
+
+def test_array_check_matches_scalar_check():
+    checker = TransitionPenaltyChecker()
+    profiles = _profiles(1000, seed=9)
+    batch = checker.check_penalties_array(profiles)
+    for row, triplet in enumerate(profiles):
+        image, video, lp = (dict(zip(NINE_PD_DIMENSIONS, stage.tolist())) for stage in triplet)
+        scalar = checker.check_penalties(image, video, lp, verbosity=Verbosity.MINIMAL)
+        assert batch['transition_penalty_sum'][row] == scalar['transition_penalty_sum']
+        hits = [batch['penalty_ids'][j] for j in np.nonzero(batch['triggered'][row])[0]]
+        assert hits == scalar['triggered_penalty_ids']
+
+
+def test_details_only_built_on_request():
+    checker = TransitionPenaltyChecker()
+    flat = {dim: 0.5 for dim in NINE_PD_DIMENSIONS}
+    result = checker.check_penalties(flat, flat, flat, verbosity=Verbosity.MINIMAL)
+    assert set(result) == {'transition_penalty_sum', 'triggered_penalty_ids'}
+    # Flat profile: LP does not lift trust by 0.10
+    assert result['triggered_penalty_ids'] == ['VID_LP_TRUST_INSUFFICIENT_LIFT']
+
+    standard = checker.check_penalties(flat, flat, flat, verbosity=Verbosity.STANDARD)
+    assert [r.id for r in standard['triggered_penalties']] == ['VID_LP_TRUST_INSUFFICIENT_LIFT']
+    assert 'all_checks' not in standard
+    full = checker.check_penalties(flat, flat, flat)
+    assert len(full['all_checks']) == len(checker.PENALTY_RULES)
+
+
+def test_compile_rejects_unknown_dimension():
+    rule = dict(TransitionPenaltyChecker.PENALTY_RULES[0], dimension='vitality')
+    with pytest.raises(ValueError):
+        compile_penalty_rules([rule])
@@ -0,0 +1,63 @@
+"""Content-hash memoization of /v1/a2/underwrite."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting import a2_underwriting_router as a2
+from app.utils import lru_cache
+from app.utils.lru_cache import LRUCache
+
+client = TestClient(app)
+
+def test_cache_hit_skips_recompute_but_emits_fresh_calibration_event(monkeypatch, underwrite_payload):
+    a2.underwriting_cache.clear()
+    calls = []
+    original = a2.evaluate_system
+    monkeypatch.setattr(a2, "evaluate_system", lambda *args: calls.append(1) or original(*args))
+
+    payload = underwrite_payload()
+    first = client.post("/v1/a2/underwrite", json=payload).json()
+    # Different brand, explicit default data_support and reordered keys: same system
+    second_payload = underwrite_payload(
+        brand_id="other_brand",
+        data_support={"similarity": 0.80, "sample_count": 0.70},
+        stage_fits=dict(reversed(list(payload["stage_fits"].items())))
+    )
+    second = client.post("/v1/a2/underwrite", json=second_payload).json()
+
+    assert len(calls) == 1
+    assert second["brand_id"] == "other_brand"
+    assert second["calibration_event_id"] != first["calibration_event_id"]
+    for key in ("decision", "system_fit", "system_confidence", "confidence_breakdown", "triggered_penalties"):
+        assert first[key] == second[key]
+
+    changed = underwrite_payload(measurement_quality=0.5)
+    client.post("/v1/a2/underwrite", json=changed)
+    assert len(calls) == 2
+
+
+def test_health_exposes_cache_counters(underwrite_payload):
+    a2.underwriting_cache.clear()
+    client.post("/v1/a2/underwrite", json=underwrite_payload())
+    client.post("/v1/a2/underwrite", json=underwrite_payload())
+    stats = client.get("/v1/a2/health").json()["underwriting_cache"]
+    assert stats["hits"] >= 1
+    assert stats["misses"] >= 1
+    assert stats["size"] >= 1
+
+
+def test_lru_cache_eviction_and_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lru_cache.time, "monotonic", lambda: now[0])
+    cache = LRUCache(maxsize=2, ttl=10.0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts least recently used "b"
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    now[0] += 11.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+    assert cache.stats()["hits"] == 1
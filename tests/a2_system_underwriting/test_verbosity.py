@@ -0,0 +1,81 @@
+"""verbosity=minimal|standard|full across the A2 pipeline and endpoints."""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.a2_system_underwriting import SystemDecisionEngine, Verbosity
+from app.a2_system_underwriting import a2_underwriting_router as a2
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def payload(underwrite_payload, profile):
+    # Flat profile across all three stages
+    return underwrite_payload(stage_profiles={"image": profile, "video": profile, "landing_page": profile})
+
+
+def test_endpoint_levels(payload):
+    standard = client.post("/v1/a2/underwrite", json=payload).json()
+    minimal = client.post("/v1/a2/underwrite?verbosity=minimal", json=payload).json()
+    full = client.post("/v1/a2/underwrite?verbosity=full", json=payload).json()
+
+    # Default response is unchanged apart from the reason codes
+    assert standard["decision_rationale"] == [f"Decision: {standard['decision']}"]
+    assert "confidence_breakdown" in standard and "audit" not in standard
+    assert set(minimal) == {"brand_id", "decision", "system_fit", "system_fit_raw", "system_confidence",
+                            "transition_penalty_sum", "triggered_penalties", "reason_codes", "calibration_event_id"}
+    for key in ("decision", "system_fit", "system_confidence", "reason_codes", "triggered_penalties"):
+        assert minimal[key] == standard[key] == full[key]
+    # Flat profile: VID_LP_TRUST_INSUFFICIENT_LIFT triggers, below both penalty ceilings
+    assert full["triggered_penalties"] == ["VID_LP_TRUST_INSUFFICIENT_LIFT"]
+    assert len(full["audit"]["penalty_checks"]) == 5
+    assert full["audit"]["weights_used"]["stage_component"] == 0.40
+    assert full["decision_rationale"] == SystemDecisionEngine().make_decision(
+        full["system_fit"], full["system_confidence"], full["transition_penalty_sum"], payload["stage_gates_passed"]
+    )["decision_rationale"]
+    assert len(client.post("/v1/a2/underwrite?verbosity=minimal", json=payload).content) < \
+        len(client.post("/v1/a2/underwrite", json=payload).content)
+
+
+def test_cache_is_per_verbosity(payload):
+    a2.underwriting_cache.clear()
+    client.post("/v1/a2/underwrite?verbosity=minimal", json=payload)
+    assert "audit" in client.post("/v1/a2/underwrite?verbosity=full", json=payload).json()
+
+
+def test_batch_reason_codes_match_scalar():
+    rng = np.random.default_rng(5)
+    n = 40
+    batch = {
+        "brand_id": "lumiere",
+        "stage_profiles": rng.uniform(0.4, 1.0, (n, 3, 9)).tolist(),
+        "stage_fits": rng.uniform(0.6, 1.0, (n, 3)).tolist(),
+        "stage_confidences": rng.uniform(0.5, 1.0, (n, 3)).tolist(),
+        "stage_gates_passed": (rng.random((n, 3)) > 0.1).tolist(),
+    }
+    minimal = client.post("/v1/a2/underwrite/batch?verbosity=minimal", json=batch).json()["results"]
+    full = client.post("/v1/a2/underwrite/batch?verbosity=full", json=batch).json()["results"]
+    engine = SystemDecisionEngine()
+    for row, m, f in zip(range(n), minimal, full):
+        assert "confidence_breakdown" not in m and "decision_rationale" not in m
+        gates = dict(zip(("image", "video", "landing_page"), batch["stage_gates_passed"][row]))
+        expected = engine.make_decision(f["system_fit"], f["system_confidence"], f["transition_penalty_sum"], gates)
+        assert m["reason_codes"] == expected["reason_codes"]
+        assert f["decision_rationale"] == expected["decision_rationale"]
+
+
+def test_component_levels(payload, profile):
+    request = a2.A2UnderwritingRequest(**payload)
+    minimal = a2.evaluate_system(request, Verbosity.MINIMAL)
+    full = a2.evaluate_system(request, Verbosity.FULL)
+    assert "confidence_breakdown" not in minimal and "decision_rationale" not in minimal
+    assert {k: full[k] for k in minimal} == minimal
+
+    result = a2.confidence_calculator.calculate(
+        stage_confidences={"image": 0.8}, data_support={}, psychological_profile=profile,
+        transition_penalty_sum=0.0, verbosity=Verbosity.MINIMAL,
+    )
+    assert set(result) == {"system_confidence", "components"}
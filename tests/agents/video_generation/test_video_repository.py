@@ -0,0 +1,163 @@
+"""Unit tests for the video instruction/output repository and the routes backed by it."""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.agents.video_generation import routes
+from app.agents.video_generation.agent import VideoGenerationAgent
+from app.agents.video_generation.models import VideoGenerationOutputResult, VideoGenerationRequestInput
+from app.config import settings
+from app.database.video_repository import RecordConflictError, StoreUnavailableError, VideoRepository
+
+pytest.importorskip("aiosqlite")
+
+MIGRATION = Path(__file__).resolve().parents[3] / "migrations" / "migration_003_video_generation.sql"
+
+SBOX_PARAMETERS = {
+    'cuts_per_30s': 8, 'bpm_equivalent': 82, 'tempo_curve': 'accelerating',
+    'saturation': 0.379, 'contrast': 'medium', 'palette': 'vibrant',
+    'framing': 'medium', 'motion_style': 'dynamic', 'focal_point': 'distributed',
+    'voiceover_style': 'direct', 'music_energy': 'driving', 'voice_tone': 'friendly',
+    'structure': 'observational', 'cta_strength': 'medium', 'proof_elements': 'moderate',
+    'hook_placement': 'gradual'
+}
+
+
+def _request(i):
+    return VideoGenerationRequestInput(
+        translation_id=f"sbox_{i}", allocation_id=f"cim_{i}",
+        sbox_parameters=SBOX_PARAMETERS, duration=30
+    )
+
+
+def _output(instruction, i, generation_id=None):
+    return VideoGenerationOutputResult(
+        output_id=f"vgen_output_{i}", instruction_id=instruction.instruction_id,
+        request_id=instruction.request_id, video_url=f"s3://bucket/{i}.mp4",
+        video_duration=30, video_resolution="1080x1920",
+        runway_generation_id=generation_id or f"gen_{i}",
+        runway_processing_time=42000, runway_cost=0.09
+    )
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """A SQLite database with migration_003 applied."""
+    path = tmp_path / 'video.db'
+    with sqlite3.connect(path) as conn:
+        conn.executescript(MIGRATION.read_text())
+    return f"sqlite:///{path}"
+
+
+class TestVideoRepository:
+    """Group-committed writes, durable reads, bounded cache."""
+
+    def test_saves_are_batched_and_survive_restart(self, database_url):
+        agent = VideoGenerationAgent()
+        requests = [_request(i) for i in range(40)]
+        instructions = [agent.translate(r) for r in requests]
+
+        async def write():
+            store = VideoRepository(cache_maxsize=8, flush_interval=0.01)
+            await store.start(VideoRepository.create_engine(database_url))
+            await asyncio.gather(*(store.save_instruction(ins, req) for ins, req in zip(instructions, requests)))
+            # One duplicate runway_generation_id fails alone; the rest of its transaction commits
+            results = await asyncio.gather(
+                store.save_output(_output(instructions[0], 0)),
+                store.save_output(_output(instructions[1], 1, generation_id="gen_0")),
+                store.save_output(_output(instructions[2], 2)),
+                return_exceptions=True
+            )
+            stats = store.stats()
+            await store.stop()
+            return results, stats
+
+        results, stats = asyncio.run(write())
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], RecordConflictError)
+        # 40 concurrent instruction saves share one transaction (80 rows with their request rows)
+        assert stats['transactions'] <= 4 and stats['rows'] == 82
+        assert stats['instructions_cache']['size'] == 8
+
+        async def read():
+            # A fresh repository: nothing cached, everything comes from the database
+            store = VideoRepository(cache_maxsize=8)
+            await store.start(VideoRepository.create_engine(database_url))
+            fetched = [await store.get_instruction(ins.instruction_id) for ins in instructions]
+            outputs = [await store.get_output(f"vgen_output_{i}") for i in range(3)]
+            again = await store.get_instruction(instructions[-1].instruction_id)
+            missing = await store.get_instruction("vgen_instr_missing")
+            stats = store.stats()
+            await store.stop()
+            return fetched, outputs, again, missing, stats
+
+        fetched, outputs, again, missing, stats = asyncio.run(read())
+        assert fetched == instructions
+        assert outputs[0] == _output(instructions[0], 0).model_copy(update={'created_at': outputs[0].created_at})
+        assert outputs[1] is None and outputs[2].runway_generation_id == "gen_2"
+        assert again == instructions[-1] and missing is None
+        # Read-through: 40 + 3 + 1 database reads; the repeated read was a cache hit
+        assert stats['db_reads'] == 44
+        assert stats['instructions_cache']['size'] == 8 and stats['outputs_cache']['size'] == 2
+
+
+    def test_unmigrated_database_is_not_attached(self, tmp_path):
+        async def scenario():
+            store = VideoRepository()
+            with pytest.raises(RuntimeError, match="migration_003"):
+                await store.start(VideoRepository.create_engine(f"sqlite:///{tmp_path / 'empty.db'}"))
+            with pytest.raises(StoreUnavailableError):
+                await store.save_instruction(VideoGenerationAgent().translate(_request(0)), _request(0))
+            return store.stats()
+
+        assert asyncio.run(scenario())['backend'] == 'unavailable'
+
+
+class TestVideoRoutes:
+    """Routes persist through video_store when the router's startup hook runs."""
+
+    def test_round_trip_persists_across_restarts(self, database_url, monkeypatch):
+        monkeypatch.setattr(settings, "DATABASE_URL", database_url)
+        monkeypatch.setattr(routes, "video_store", VideoRepository(cache_maxsize=4))
+        app = FastAPI()
+        app.include_router(routes.router)
+        payload = {"translation_id": "sbox_1", "allocation_id": "cim_1",
+                   "sbox_parameters": SBOX_PARAMETERS, "platform": "tiktok", "duration": 30}
+
+        with TestClient(app) as client:
+            instruction = client.post("/agents/video/translate", json=payload).json()
+            result = dict(_output(VideoGenerationAgent().translate(_request(1)), 1).model_dump(mode='json'),
+                          instruction_id=instruction["instruction_id"], request_id=instruction["request_id"])
+            assert client.post("/agents/video/result", json=result).status_code == 201
+            assert client.post("/agents/video/result", json=result).status_code == 409
+            unknown = dict(result, instruction_id="vgen_instr_missing", output_id="vgen_output_2")
+            assert client.post("/agents/video/result", json=unknown).status_code == 404
+            assert client.get("/agents/video/health").json()["store"]["backend"] == "sqlite"
+
+        # New process state: empty cache, same database
+        monkeypatch.setattr(routes, "video_store", VideoRepository(cache_maxsize=4))
+        with TestClient(app) as client:
+            assert client.get(f"/agents/video/instruction/{instruction['instruction_id']}").json() == instruction
+            assert client.get("/agents/video/output/vgen_output_1").json()["video_url"] == result["video_url"]
+            assert client.get("/agents/video/output/vgen_output_2").status_code == 404
+
+    def test_writes_are_refused_without_a_database(self, tmp_path, monkeypatch):
+        # Startup fails (tables missing), so nothing can be stored
+        monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{tmp_path / 'empty.db'}")
+        monkeypatch.setattr(routes, "video_store", VideoRepository())
+        app = FastAPI()
+        app.include_router(routes.router)
+        payload = {"translation_id": "sbox_1", "allocation_id": "cim_1",
+                   "sbox_parameters": SBOX_PARAMETERS, "platform": "tiktok", "duration": 30}
+
+        with TestClient(app) as client:
+            assert client.post("/agents/video/translate", json=payload).status_code == 503
+            instruction = VideoGenerationAgent().translate(_request(1))
+            result = _output(instruction, 1).model_dump(mode='json')
+            assert client.post("/agents/video/result", json=result).status_code == 503
+            assert client.get("/agents/video/health").json()["store"]["backend"] == "unavailable"
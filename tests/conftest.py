@@ -6,3 +6,37 @@ from pathlib import Path
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+import copy
+
+import pytest
+
+# Flat 9PD stage profile shared by the A2 endpoint tests
+PROFILE = {"presence": 0.8, "trust": 0.7, "authenticity": 0.8, "momentum": 0.6, "taste": 0.8,
+           "empathy": 0.7, "autonomy": 0.8, "resonance": 0.8, "ethics": 0.9}
+
+
+@pytest.fixture
+def profile():
+    """A fresh copy of PROFILE."""
+    return dict(PROFILE)
+
+
+@pytest.fixture
+def underwrite_payload():
+    """
+    Factory for /v1/a2/underwrite bodies: an AUTO_LAUNCH system (trust lifts
+    on the landing page) with any top-level field replaced by keyword.
+    Every call returns a new deep copy.
+    """
+    def make(**overrides):
+        payload = {
+            "brand_id": "lumiere",
+            "stage_profiles": {"image": PROFILE, "video": PROFILE, "landing_page": dict(PROFILE, trust=0.85)},
+            "stage_fits": {"image": 0.9, "video": 0.88, "landing_page": 0.86},
+            "stage_confidences": {"image": 0.8, "video": 0.8, "landing_page": 0.8},
+            "stage_gates_passed": {"image": True, "video": True, "landing_page": True},
+        }
+        payload.update(overrides)
+        return copy.deepcopy(payload)
+    return make
@@ -0,0 +1,54 @@
+"""Columnar T5 batch rows must equal the scalar boundary mapping."""
+
+import numpy as np
+import pytest
+
+from app.t5.a2_schema_adapter import (
+    UnderwritingResult,
+    map_a2_to_canonical,
+    map_a2_batch_to_canonical,
+)
+
+
+def _responses(n):
+    rng = np.random.default_rng(0)
+    bands = ["AUTO_LAUNCH", "HUMAN_REVIEW", "NO_LAUNCH"]
+    responses = [
+        {
+            "brand_id": f"b{i}",
+            "decision": bands[i % 3],
+            "system_fit": float(rng.uniform()),
+            "system_confidence": float(rng.uniform()),
+            "transition_penalty_sum": float(rng.choice([0.0, 0.1, 0.25])),
+            "triggered_penalties": [],
+            "calibration_event_id": f"evt-{i}",
+        }
+        for i in range(n)
+    ]
+    responses.append({"decision": "ERROR"})
+    responses.append({})
+    return responses
+
+
+def test_batch_rows_equal_scalar_mapping():
+    responses = _responses(21)
+    batch = map_a2_batch_to_canonical(responses, retain_raw=True)
+    assert len(batch) == 23
+    assert batch.routing_bands == ("AUTO_LAUNCH", "HUMAN_REVIEW", "NO_LAUNCH", "ERROR")
+    assert batch.to_results() == [map_a2_to_canonical(r) for r in responses]
+    np.testing.assert_array_equal(batch.gate_pass, [r.get("decision") == "AUTO_LAUNCH" for r in responses])
+    assert batch[-1].routing_band == "NO_LAUNCH" and batch[-1].calibration_event_id is None
+    assert batch[3].raw_a2_response is responses[3]
+    with pytest.raises(IndexError):
+        batch[23]
+
+
+def test_raw_responses_dropped_by_default():
+    responses = _responses(5)
+    batch = map_a2_batch_to_canonical(responses)
+    assert batch.raw_a2_responses is None
+    row = batch[0]
+    assert isinstance(row.to_result(), UnderwritingResult)
+    assert row.raw_a2_response is None
+    assert row.tis == responses[0]["system_fit"] and row.clg == row.gci
+    assert batch.gate_pass_bits.nbytes == 1